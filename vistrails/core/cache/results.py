@@ -0,0 +1,314 @@
+###############################################################################
+##
+## Copyright (C) 2014-2016, New York University.
+## Copyright (C) 2011-2014, NYU-Poly.
+## Copyright (C) 2006-2011, University of Utah.
+## All rights reserved.
+## Contact: contact@vistrails.org
+##
+## This file is part of VisTrails.
+##
+## "Redistribution and use in source and binary forms, with or without
+## modification, are permitted provided that the following conditions are met:
+##
+##  - Redistributions of source code must retain the above copyright notice,
+##    this list of conditions and the following disclaimer.
+##  - Redistributions in binary form must reproduce the above copyright
+##    notice, this list of conditions and the following disclaimer in the
+##    documentation and/or other materials provided with the distribution.
+##  - Neither the name of the New York University nor the names of its
+##    contributors may be used to endorse or promote products derived from
+##    this software without specific prior written permission.
+##
+## THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+## AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+## THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+## PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+## CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+## EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+## PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+## OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+## WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR
+## OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF
+## ADVISED OF THE POSSIBILITY OF SUCH DAMAGE."
+##
+###############################################################################
+
+"""Second-tier caches for module results.
+
+The CachedInterpreter keeps module instances in memory, matching them by
+subpipeline signature. A ResultCache stores the output port values of modules
+under that same signature so that they can be reused by another process or
+after a restart. DiskResultCache keeps them as pickle files in a directory
+that can be shared by several VisTrails processes.
+"""
+
+from __future__ import division
+
+import cPickle as pickle
+import errno
+import os
+import tempfile
+
+from vistrails.core import debug, system
+from vistrails.core.configuration import get_vistrails_configuration
+
+##############################################################################
+
+class ResultCache(object):
+    """Interface for result caches.
+
+    Results are dictionaries mapping output port names to values, keyed by
+    the (hexadecimal) subpipeline signature of the module that produced them.
+    """
+
+    def get(self, signature):
+        """get(signature: str) -> dict or None
+
+        Returns the outputs stored for this signature, or None.
+        """
+        return None
+
+    def put(self, signature, outputs):
+        """put(signature: str, outputs: dict) -> bool
+
+        Stores outputs for a signature, returning whether they were stored.
+        """
+        return False
+
+    def clear(self):
+        """clear() -> None
+
+        Removes every stored result.
+        """
+        pass
+
+
+class CacheEntry(object):
+    def __init__(self, abs_name, time, size):
+        self.abs_name = abs_name
+        self.time = time
+        self.size = size
+
+
+class DiskResultCache(ResultCache):
+    """Stores results as pickle files in a directory.
+
+    Files are written atomically and their modification time is updated when
+    they are read, so least-recently used entries can be evicted when the
+    total size goes over max_size (in bytes), even if the directory is shared
+    between several processes.
+    """
+
+    SUFFIX = '.result'
+
+    def __init__(self, directory, max_size):
+        self.directory = directory
+        self.max_size = max_size
+        self.elements = {}
+        self._size = 0
+        self.init_cache()
+
+    def init_cache(self):
+        self.elements = {}
+        self._size = 0
+        if not os.path.isdir(self.directory):
+            return
+        for root, dirs, files in os.walk(self.directory):
+            for f in files:
+                if not f.endswith(self.SUFFIX):
+                    continue
+                fname = os.path.join(root, f)
+                try:
+                    statinfo = os.stat(fname)
+                except OSError:
+                    continue
+                signature = f[:-len(self.SUFFIX)]
+                self.elements[signature] = CacheEntry(fname,
+                                                      statinfo.st_mtime,
+                                                      statinfo.st_size)
+                self._size += statinfo.st_size
+
+    def size(self):
+        return self._size
+
+    def get_filename(self, signature):
+        return os.path.join(self.directory, signature[:2],
+                            signature + self.SUFFIX)
+
+    def get(self, signature):
+        fname = self.get_filename(signature)
+        try:
+            with open(fname, 'rb') as fp:
+                outputs = pickle.load(fp)
+        except IOError, e:
+            if e.errno != errno.ENOENT:
+                debug.warning("Could not read cached result %s" % fname, e)
+            self._forget(signature)
+            return None
+        except Exception, e:
+            debug.warning("Removing invalid cached result %s" % fname, e)
+            self.remove(signature)
+            return None
+        # Mark as recently used
+        try:
+            os.utime(fname, None)
+        except OSError:
+            pass
+        else:
+            if signature in self.elements:
+                self.elements[signature].time = os.path.getmtime(fname)
+        return outputs
+
+    def put(self, signature, outputs):
+        try:
+            data = pickle.dumps(outputs, pickle.HIGHEST_PROTOCOL)
+        except Exception, e:
+            debug.debug("Results for %s cannot be pickled" % signature, e)
+            return False
+        if len(data) > self.max_size:
+            return False
+
+        fname = self.get_filename(signature)
+        dirname = os.path.dirname(fname)
+        try:
+            if not os.path.isdir(dirname):
+                os.makedirs(dirname)
+            fd, tmpname = tempfile.mkstemp(dir=dirname, prefix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as fp:
+                    fp.write(data)
+                if system.systemType in ['Windows', 'Microsoft'] and \
+                        os.path.exists(fname):
+                    os.unlink(fname)
+                os.rename(tmpname, fname)
+            except:
+                os.unlink(tmpname)
+                raise
+        except (IOError, OSError), e:
+            debug.warning("Could not store cached result %s" % fname, e)
+            return False
+
+        self._forget(signature)
+        self.elements[signature] = CacheEntry(fname,
+                                              os.path.getmtime(fname),
+                                              len(data))
+        self._size += len(data)
+        if self._size > self.max_size:
+            self.remove_lru()
+        return True
+
+    def _forget(self, signature):
+        entry = self.elements.pop(signature, None)
+        if entry is not None:
+            self._size -= entry.size
+
+    def remove(self, signature):
+        entry = self.elements.get(signature)
+        fname = entry.abs_name if entry else self.get_filename(signature)
+        self._forget(signature)
+        try:
+            os.unlink(fname)
+        except OSError:
+            pass
+
+    def remove_lru(self):
+        """remove_lru() -> None
+
+        Removes the least recently used entries until the cache is back
+        under 90% of its maximum size.
+        """
+        # Other processes might share this directory
+        self.init_cache()
+        target = self.max_size * 0.9
+        elements = sorted(self.elements.iteritems(),
+                          key=lambda (sig, entry): entry.time)
+        for signature, entry in elements:
+            if self._size <= target:
+                break
+            self.remove(signature)
+
+    def clear(self):
+        for signature in self.elements.keys():
+            self.remove(signature)
+
+##############################################################################
+
+_result_cache = None
+_default_result_cache = None
+
+def get_result_cache():
+    """get_result_cache() -> ResultCache or None
+
+    Returns the result cache set with set_result_cache(), or the disk cache
+    described by the 'resultCache' configuration if it is enabled.
+    """
+    global _default_result_cache
+    if _result_cache is not None:
+        return _result_cache
+    conf = get_vistrails_configuration()
+    if conf is None or not (conf.has_deep_value('resultCache.enabled') and
+                            conf.get_deep_value('resultCache.enabled')):
+        return None
+    directory = system.get_vistrails_directory('resultCache.cacheDir')
+    if directory is None:
+        return None
+    max_size = conf.resultCache.cacheSize * 1024 * 1024
+    if (_default_result_cache is None or
+            _default_result_cache.directory != directory):
+        _default_result_cache = DiskResultCache(directory, max_size)
+    else:
+        _default_result_cache.max_size = max_size
+    return _default_result_cache
+
+def set_result_cache(cache):
+    """set_result_cache(cache: ResultCache) -> None
+
+    Overrides the result cache used by the interpreter (None restores the
+    configured one).
+    """
+    global _result_cache
+    _result_cache = cache
+
+##############################################################################
+
+import shutil
+import unittest
+
+
+class TestDiskResultCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='vt_results_')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_roundtrip(self):
+        cache = DiskResultCache(self.directory, 1024 * 1024)
+        self.assertIsNone(cache.get('abcdef'))
+        self.assertTrue(cache.put('abcdef', {'value': [1, 2, 3]}))
+        self.assertEqual(cache.get('abcdef'), {'value': [1, 2, 3]})
+
+        # Another process sharing the directory sees the entry
+        other = DiskResultCache(self.directory, 1024 * 1024)
+        self.assertEqual(other.get('abcdef'), {'value': [1, 2, 3]})
+        self.assertEqual(other.size(), cache.size())
+
+    def test_unpicklable(self):
+        cache = DiskResultCache(self.directory, 1024 * 1024)
+        self.assertFalse(cache.put('abcdef', {'value': lambda: 42}))
+        self.assertIsNone(cache.get('abcdef'))
+
+    def test_lru(self):
+        cache = DiskResultCache(self.directory, 3000)
+        for i, sig in enumerate(['aa01', 'bb02', 'cc03']):
+            self.assertTrue(cache.put(sig, {'value': 'x' * 900}))
+            os.utime(cache.get_filename(sig), (i * 10, i * 10))
+            cache.elements[sig].time = i * 10
+        # Use the oldest entry so it isn't evicted
+        self.assertIsNotNone(cache.get('aa01'))
+        self.assertTrue(cache.put('dd04', {'value': 'x' * 900}))
+        self.assertLessEqual(cache.size(), 3000)
+        self.assertIsNotNone(cache.get('aa01'))
+        self.assertIsNone(cache.get('bb02'))
+        self.assertIsNotNone(cache.get('dd04'))
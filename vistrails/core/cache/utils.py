@@ -37,6 +37,8 @@
 
 from __future__ import division
 
+import sys
+
 try:
     import hashlib
     sha_hash = hashlib.sha1
@@ -52,3 +54,45 @@ def hash_list(lst, hasher_f, constant_hasher_map={}):
     hash_l.sort()
     for hel in hash_l: hasher.update(hel)
     return hasher.digest()
+
+def estimate_size(value, skip=(), seen=None):
+    """estimate_size(value, skip: tuple of types, seen: set) -> int
+
+    Estimates the number of bytes retained by a value, following the builtin
+    containers. Other objects are measured with sys.getsizeof(), so classes
+    holding large buffers should report them from __sizeof__(); objects with
+    an 'nbytes' attribute (NumPy arrays) count at least that much. Instances
+    of the types in skip are not counted, nor are the objects whose id is in
+    seen (which gets updated, so that objects shared between several values
+    are only counted once).
+    """
+    if seen is None:
+        seen = set()
+    size = 0
+    to_visit = [value]
+    while to_visit:
+        value = to_visit.pop()
+        if isinstance(value, (bool, int, long, float, complex, type(None))):
+            # Small and immutable, not worth remembering
+            size += sys.getsizeof(value)
+            continue
+        if id(value) in seen or isinstance(value, skip):
+            continue
+        seen.add(id(value))
+        try:
+            shallow = sys.getsizeof(value)
+        except TypeError:
+            continue
+        # An array that owns its buffer already includes it in getsizeof(),
+        # a view doesn't but keeps its base alive
+        nbytes = getattr(value, 'nbytes', None)
+        if isinstance(nbytes, (int, long)):
+            size += max(shallow, nbytes)
+            continue
+        size += shallow
+        if isinstance(value, dict):
+            to_visit.extend(value.iterkeys())
+            to_visit.extend(value.itervalues())
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            to_visit.extend(value)
+    return size
@@ -64,6 +64,8 @@ autoConnect: Automatically connect dragged in modules
 autoSave: Automatically save backup vistrails every two minutes
 batch: Run in batch mode instead of interactive mode
 cache: Cache previous results so they may be used in future computations
+cacheMemoryLimit: Memory used by cached results before evicting them (MB)
+concurrentModules: Run modules such as command-line tools at the same time
 customVersionColors: Allow setting custom colors for versions
 dataDir: Default data directory
 db: The name for the database to load the vistrail from
@@ -90,6 +92,8 @@ jobAutorun: Run jobs automatically when they finish
 jobCheckInterval: How often to check for jobs (in seconds)
 jobList: List running workflows
 jobInfo: List jobs in running workflow
+jobMinCheckInterval: First delay before checking a suspended job (in seconds)
+lazyActionLoading: Only read the operations of versions when they are used
 loadPackages: Whether to load the packages enabled in the configuration file
 logDir: Log files directory
 maxRecentVistrails: Number of recent vistrails
@@ -100,7 +104,9 @@ multithread: Server will start a thread for each request
 outputDirectory: Directory in which to place output files
 outputPipelineGraph: Output the workflow graph as an image
 outputVersionTree: Output the version tree as an image
+parallelWorkers: Number of threads used to run independent modules
 parameterExploration: Run parameter exploration instead of workflow
+parameterExplorationWorkers: Number of processes used to run parameter explorations
 parameters: List of parameters to use when running workflow
 port: The port for the database to load the vistrail from
 remoteShutdown: If connecting to single instance, make that instance exit
@@ -109,6 +115,9 @@ enableUsage: Enable sending anonymous usage statistics
 disableUsage: Disable sending anonymous usage statistics
 repositoryHTTPURL: Remote package repository URL
 repositoryLocalPath: Local package repository directory
+resultCache.cacheDir: Result cache directory
+resultCache.cacheSize: Result cache size (MB)
+resultCache.enabled: Store module results on disk between sessions
 rootDirectory: Directory that contains the VisTrails source code
 rpcConfig: Config file for server connection options
 rpcInstances: Number of other instances that vistrails should start
@@ -138,6 +147,9 @@ thumbs.cacheDir: Thumbnail cache directory
 thumbs.cacheSize: Thumbnail cache size (MB)
 thumbs.mouseHover: Show thumbnails when mouse is hovering above a version
 thumbs.tagsOnly: Store thumbnails only for tagged versions
+translationCache.cacheDir: Translated vistrails directory
+translationCache.cacheSize: Translated vistrails cache size (MB)
+translationCache.enabled: Keep vistrails from older versions once translated
 upgradeDelay: Persist upgrade only after other changes
 upgradeModuleFailPrompt: Alert when a subworkflow upgrade fails
 upgrades: Attempt to automatically upgrade old workflows
@@ -167,6 +179,19 @@ cache: Boolean
 
     Cache previous results so they may be used in future computations.
 
+cacheMemoryLimit: Integer
+
+    The estimated amount of memory (in MB) that results cached by the
+    interpreter may retain. When it is exceeded after an execution, the
+    least recently used modules (and the modules depending on them) are
+    removed from the cache. 0 means no limit.
+
+concurrentModules: Boolean
+
+    When parallelWorkers is 0, whether modules that support it (such as
+    command-line tools) are still run at the same time as each other, up
+    to their own limit. If False, all modules are executed sequentially.
+
 customVersionColors: Boolean
 
     Allow setting custom colors for versions, and display these colors in the
@@ -279,6 +304,18 @@ jobInfo: Boolean
 
     List jobs in running workflow.
 
+jobMinCheckInterval: Integer
+
+    How long to wait before checking a job that was just suspended (in
+    seconds, default=10). The delay doubles every time the jobs of the same
+    queue are found still running, up to jobCheckInterval.
+
+lazyActionLoading: Boolean
+
+    When opening a .vt file, only read the version tree and load the
+    operations of each version the first time it is needed. This makes
+    opening large vistrails faster and uses less memory.
+
 loadPackages: Boolean
 
     Whether to load the packages enabled in the configuration file.
@@ -347,11 +384,27 @@ outputVersionTree: Boolean
 
     Output the version tree as an image.
 
+parallelWorkers: Integer
+
+    If positive, modules that do not depend on each other are executed
+    concurrently on this many threads. Modules creating widgets or running
+    subworkflows are still run one at a time. Set to 0 to execute modules
+    sequentially (default).
+
 parameterExploration: Boolean
 
     Open and execute parameter exploration specified by the
     version argument after the .vt file.
 
+parameterExplorationWorkers: Integer
+
+    If greater than 1, the pipelines of a parameter exploration are
+    executed in this many worker processes, forked from VisTrails.
+    Explorations using the spreadsheet are always executed in the
+    VisTrails process, and this is not available on Windows. Jobs
+    started by the explored pipelines are not tracked by the job
+    monitor. Set to 0 to execute them one after the other (default).
+
 parameters: String
 
     List of parameters to use when running workflow.
@@ -396,6 +449,26 @@ reviewMode: Boolean
 
     *Deprecated* Used to interactively export a pipeline.
 
+resultCache: ConfigurationObject
+
+    Settings for the on-disk cache of module results.
+
+resultCache.cacheDir: Path
+
+    The directory where module results are stored. It can be shared
+    between several VisTrails processes.
+
+resultCache.cacheSize: Integer
+
+    The size (in MB) of the result cache. Least recently used results are
+    removed when it is full.
+
+resultCache.enabled: Boolean
+
+    Whether to store the outputs of cacheable modules on disk, keyed by
+    their signature, so they can be reused by later executions and other
+    processes.
+
 rootDirectory: Path
 
     Directory that contains the VisTrails source code.
@@ -538,6 +611,28 @@ thumbs.tagsOnly: Boolean
     If True, only stores thumbnails for tagged versions. Otherwise,
     stores thumbnails for all versions.
 
+translationCache: ConfigurationObject
+
+    Settings for the cache of vistrails translated from older schema
+    versions.
+
+translationCache.cacheDir: Path
+
+    The directory where vistrails translated to the current schema
+    version are stored, named after the content of the original file.
+    Files in it can be removed at any time.
+
+translationCache.cacheSize: Integer
+
+    The size (in MB) of the translation cache. Least recently used
+    translations are removed when it is full.
+
+translationCache.enabled: Boolean
+
+    Whether to store vistrails read from files using an older schema
+    version once they are translated, so opening the same file again
+    doesn't need to translate it.
+
 upgradeDelay: Boolean
 
     Persist upgrade only after other changes.
@@ -696,7 +791,11 @@ base_config = {
     [ConfigField('autoSave', True, bool, ConfigType.ON_OFF),
      ConfigField('dbDefault', False, bool, ConfigType.ON_OFF),
      ConfigField('cache', True, bool, ConfigType.ON_OFF),
+     ConfigField('cacheMemoryLimit', 0, int, depends_on='cache'),
      ConfigField('stopOnError', True, bool, ConfigType.ON_OFF),
+     ConfigField('parallelWorkers', 0, int),
+     ConfigField('concurrentModules', True, bool, ConfigType.ON_OFF),
+     ConfigField('parameterExplorationWorkers', 0, int),
      ConfigField('executionLog', True, bool, ConfigType.ON_OFF),
      ConfigField('errorLog', True, bool, ConfigType.ON_OFF),
      ConfigField('defaultFileType', system.vistrails_default_file_type(), str,
@@ -761,6 +860,18 @@ base_config = {
          ConfigField('cacheDir', "thumbs", ConfigPath,
                      ConfigType.NORMAL),
          ConfigField('cacheSize', 20, int, widget_type='thumbnailcache')])],
+    "Result Cache":
+    [ConfigFieldParent('resultCache',
+        [ConfigField('enabled', False, bool, ConfigType.ON_OFF),
+         ConfigField('cacheDir', "results", ConfigPath,
+                     ConfigType.NORMAL),
+         ConfigField('cacheSize', 1024, int)])],
+    "Translation Cache":
+    [ConfigFieldParent('translationCache',
+        [ConfigField('enabled', True, bool, ConfigType.ON_OFF),
+         ConfigField('cacheDir', "translated", ConfigPath,
+                     ConfigType.NORMAL),
+         ConfigField('cacheSize', 100, int)])],
     "Packages":
     [ConfigField('enablePackagesSilently', False, bool, ConfigType.ON_OFF),
      ConfigField('loadPackages', True, bool, ConfigType.ON_OFF),
@@ -781,6 +892,7 @@ base_config = {
      ConfigField('temporaryDir', None,  ConfigPath)],
     "Advanced":
     [ConfigField('singleInstance', True, bool, ConfigType.ON_OFF),
+     ConfigField('lazyActionLoading', False, bool, ConfigType.ON_OFF),
      ConfigField('staticRegistry', None, ConfigPath)],
     "Web Sharing":
     [ConfigField('webRepositoryURL', "http://www.crowdlabs.org", ConfigURL),
@@ -798,6 +910,7 @@ base_config = {
      ConfigField('lastShownNews', '', str, ConfigType.INTERNAL)],
     "Jobs":
     [ConfigField('jobCheckInterval', 600, int),
+     ConfigField('jobMinCheckInterval', 10, int),
      ConfigField('jobAutorun', False, bool),
      ConfigField('jobList', False, bool, ConfigType.COMMAND_LINE_FLAG),
      ConfigField('jobInfo', False, bool, ConfigType.COMMAND_LINE_FLAG)],
@@ -108,8 +108,9 @@ def serialize(object):
     """
     return vistrails.db.services.io.serialize(object)
 
-def open_log(fname, was_appended=False):
-    log = vistrails.db.services.io.open_log_from_xml(fname, was_appended)
+def open_log(fname, was_appended=False, exec_ids=None):
+    log = vistrails.db.services.io.open_log_from_xml(fname, was_appended,
+                                                     exec_ids)
     Log.convert(log)
     return log
 
@@ -191,7 +191,9 @@ class BaseInterpreter(object):
             try:
                 info = pipeline.aliases[alias]
                 param = pipeline.db_get_object(info[0],info[1])
-                param.strValue = str(aliases[alias])
+                if param.strValue != str(aliases[alias]):
+                    param.strValue = str(aliases[alias])
+                    pipeline.invalidate_signatures([info[4]])
             except KeyError:
                 pass
                     
@@ -206,12 +208,20 @@ class BaseInterpreter(object):
         
         """
         if customParams:
+            changed = set()
             for (vttype, oId, strval) in customParams:
                 try:
                     param = pipeline.db_get_object(vttype,oId)
-                    param.strValue = str(strval)
+                    if param.strValue != str(strval):
+                        param.strValue = str(strval)
+                        changed.add(id(param))
                 except Exception, e:
                     debug.debug("Problem when updating params", e)
+            if changed:
+                pipeline.invalidate_signatures(
+                        [m.id for m in pipeline.module_list
+                         if any(id(p) in changed
+                                for f in m.functions for p in f.params)])
 
     def resolve_variables(self, vistrail_variables, pipeline):
         for m in pipeline.module_list:
@@ -221,8 +231,10 @@ class BaseInterpreter(object):
                     continue
                 strValue = vistrail_var.value
                 for func in m.functions:
-                    if func.name == 'value':
+                    if (func.name == 'value' and
+                            func.params[0].strValue != strValue):
                         func.params[0].strValue = strValue
+                        pipeline.invalidate_signatures([m.id])
 
     def set_done_summon_hook(self, hook):
         """ set_done_summon_hook(hook: function(pipeline, objects)) -> None
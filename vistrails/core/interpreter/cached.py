@@ -43,19 +43,27 @@ import cPickle as pickle
 
 import time
 
+import os
+import weakref
+
+from vistrails.core.cache import results
+from vistrails.core.cache.hasher import Hasher
+from vistrails.core.cache.utils import estimate_size
 from vistrails.core.common import InstanceObject, VistrailsInternalError
+from vistrails.core.configuration import get_vistrails_configuration
 from vistrails.core.data_structures.bijectivedict import Bidict
 from vistrails.core import debug
 import vistrails.core.interpreter.base
 from vistrails.core.interpreter.base import AbortExecution
+from vistrails.core.interpreter.parallel import ParallelScheduler
 import vistrails.core.interpreter.utils
 from vistrails.core.log.controller import DummyLogController
 from vistrails.core.modules.basic_modules import identifier as basic_pkg, \
-                                                 Generator
+                                                 Generator, PathObject
 from vistrails.core.modules.module_registry import get_module_registry
-from vistrails.core.modules.vistrails_module import ModuleBreakpoint, \
-    ModuleConnector, ModuleError, ModuleErrors, ModuleHadError, \
-    ModuleSuspended, ModuleWasSuspended
+from vistrails.core.modules.vistrails_module import Concurrent, Module, \
+    ModuleBreakpoint, ModuleConnector, ModuleError, ModuleErrors, \
+    ModuleHadError, ModuleSuspended, ModuleWasSuspended
 from vistrails.core.reportusage import record_usage
 from vistrails.core.utils import DummyView
 import vistrails.core.system
@@ -198,6 +206,90 @@ class ViewUpdatingLogController(object):
 
 ###############################################################################
 
+class ExecutionPlan(object):
+    """A subworkflow prepared for repeated executions.
+
+    Groups and abstractions execute their pipeline each time they are
+    computed, for example once per element of a list, and don't keep
+    its modules in the cache. The plan validates the pipeline and
+    creates its module objects once; each execution then gets copies
+    of them, connected together, that are not part of the persistent
+    pipeline.
+    """
+
+    def __init__(self, interpreter, pipeline):
+        from vistrails.core.modules.sub_module import InputPort
+        pipeline.validate()
+        self.interpreter = interpreter
+        self.templates = {}
+        self.errors = {}
+        for module in pipeline.module_list:
+            obj, error = interpreter.create_module_object(module, module.id)
+            self.templates[module.id] = obj
+            if error is not None:
+                self.errors[module.id] = error
+        self.connections = pipeline.connection_list
+        self.id_map = dict((i, i) for i in self.templates)
+        # InputPort signatures change with the values outside the group
+        self._checked_ids = [i for i, obj in self.templates.iteritems()
+                             if not isinstance(obj, InputPort)]
+        self._key = self.structure_key(pipeline)
+
+    def structure_key(self, pipeline):
+        """structure_key(pipeline: Pipeline) -> tuple
+        Identifies the modules, parameters and connections of the pipeline
+        """
+        return (frozenset(pipeline.modules.iterkeys()),
+                frozenset((c_id, c.sourceId, c.destinationId,
+                           Hasher.connection_signature(c))
+                          for c_id, c in pipeline.connections.iteritems()),
+                tuple(pipeline.module_signature(i)
+                      for i in self._checked_ids
+                      if i in pipeline.modules))
+
+    def matches(self, pipeline):
+        """matches(pipeline: Pipeline) -> bool
+        Whether the plan can still execute the pipeline
+        """
+        return self.structure_key(pipeline) == self._key
+
+    def instantiate(self, pipeline):
+        """instantiate(pipeline: Pipeline) -> dict
+        Returns new module objects for an execution of the pipeline,
+        indexed by module id
+        """
+        objs = {}
+        for i, template in self.templates.iteritems():
+            obj = copy.copy(template)
+            obj.inputPorts = dict((port, list(connectors)) for port, connectors
+                                  in template.inputPorts.iteritems())
+            obj.moduleInfo = dict(template.moduleInfo)
+            obj.signature = base64.b16encode(
+                    pipeline.subpipeline_signature(i)).lower()
+            objs[i] = obj
+        for conn in self.connections:
+            self.interpreter.make_connection(conn, objs[conn.sourceId],
+                                             objs[conn.destinationId])
+        return objs
+
+###############################################################################
+
+class _CountedIds(object):
+    """The seen set given to estimate_size() for one module.
+
+    Ids already counted for other modules are skipped, and the new ones are
+    kept apart so they can be forgotten when the module is evicted.
+    """
+    def __init__(self, counted):
+        self.counted = counted
+        self.added = set()
+
+    def __contains__(self, value_id):
+        return value_id in self.counted or value_id in self.added
+
+    def add(self, value_id):
+        self.added.add(value_id)
+
 Variant_desc = None
 InputPort_desc = None
 
@@ -216,6 +308,14 @@ class CachedInterpreter(vistrails.core.interpreter.base.BaseInterpreter):
         self._objects = {}
         self.filePool = self._file_pool
         self._streams = []
+        # persistent id -> number of the last execution that used the module
+        self._last_used = {}
+        self._nb_executions = 0
+        # persistent id -> (estimated bytes, ids of the values counted)
+        self._retained = {}
+        self._retained_ids = set()
+        # subworkflow pipeline -> ExecutionPlan
+        self._plans = weakref.WeakKeyDictionary()
 
     def clear(self):
         self._file_pool.cleanup()
@@ -223,6 +323,10 @@ class CachedInterpreter(vistrails.core.interpreter.base.BaseInterpreter):
         for obj in self._objects.itervalues():
             obj.clear()
         self._objects = {}
+        self._last_used = {}
+        self._retained = {}
+        self._retained_ids = set()
+        self._plans.clear()
 
     def __del__(self):
         self.clear()
@@ -241,6 +345,10 @@ class CachedInterpreter(vistrails.core.interpreter.base.BaseInterpreter):
         for v in dependencies:
             self._persistent_pipeline.delete_module(v)
             del self._objects[v]
+            self._last_used.pop(v, None)
+            retained = self._retained.pop(v, None)
+            if retained is not None:
+                self._retained_ids.difference_update(retained[1])
 
     def clean_non_cacheable_modules(self):
         """clean_non_cacheable_modules() -> None
@@ -253,6 +361,163 @@ class CachedInterpreter(vistrails.core.interpreter.base.BaseInterpreter):
                                  if not mod.is_cacheable()]
         self.clean_modules(non_cacheable_modules)
 
+    def get_retained_bytes(self):
+        """get_retained_bytes() -> dict of persistent id to int
+
+        Estimates the memory retained by the outputs of each cached module.
+        Values shared between modules are counted for the upstream module.
+        The outputs of a module don't change once it is computed, so each
+        one is only measured once, after its first execution.
+        """
+        g = self._persistent_pipeline.graph
+        new_ids = [i for i in g.vertices_topological_sort()
+                   if i not in self._retained]
+        for i in new_ids:
+            obj = self._objects.get(i)
+            if obj is None or not (obj.upToDate or obj.computed):
+                continue
+            seen = _CountedIds(self._retained_ids)
+            size = sum(estimate_size(value, (Module,), seen)
+                       for port_name, value in obj.outputPorts.iteritems()
+                       if port_name != 'self')
+            self._retained[i] = (size, seen.added)
+            self._retained_ids.update(seen.added)
+        return dict((i, size)
+                    for i, (size, ids) in self._retained.iteritems())
+
+    def get_memory_limit(self):
+        """get_memory_limit() -> int or None
+
+        Returns the amount of memory (in bytes) cached modules can retain,
+        from the 'cacheMemoryLimit' configuration, or None if unlimited.
+        """
+        conf = get_vistrails_configuration()
+        if conf is None or not conf.check('cacheMemoryLimit'):
+            return None
+        return conf.cacheMemoryLimit * 1024 * 1024
+
+    def get_concurrent_modules(self):
+        """get_concurrent_modules() -> bool
+
+        Returns whether Concurrent modules run at the same time when
+        parallel_workers is 0, from the 'concurrentModules' configuration.
+        """
+        conf = get_vistrails_configuration()
+        if conf is None or not conf.has('concurrentModules'):
+            return True
+        return bool(conf.concurrentModules)
+
+    def evict_modules(self, memory_limit):
+        """evict_modules(memory_limit: int) -> list of persistent ids
+
+        Removes modules from the cache until the memory they retain is under
+        memory_limit bytes. Least recently used modules go first, the largest
+        ones first among those last used by the same execution. The modules
+        depending on them are removed too, through clean_modules().
+        """
+        sizes = self.get_retained_bytes()
+        total = sum(sizes.itervalues())
+        if total <= memory_limit:
+            return []
+        order = sorted(sizes.iterkeys(),
+                       key=lambda i: (self._last_used.get(i, 0), -sizes[i]))
+        evicted = []
+        for i in order:
+            if total <= memory_limit:
+                break
+            if i not in self._objects:
+                # Already removed with a module it depends on
+                continue
+            before = set(self._objects.iterkeys())
+            self.clean_modules([i])
+            removed = before.difference(self._objects.iterkeys())
+            total -= sum(sizes.get(j, 0) for j in removed)
+            evicted.extend(removed)
+        debug.debug("Evicted %d modules from the cache, retaining about %d "
+                    "bytes" % (len(evicted), total))
+        return evicted
+
+    def get_result_cache(self):
+        """get_result_cache() -> ResultCache or None
+
+        Returns the cache used to store module results between executions
+        and processes, if any.
+        """
+        return results.get_result_cache()
+
+    def _uses_result_cache(self, obj):
+        if (not obj.signature or not obj.is_cacheable() or
+                not self._is_persistent(obj)):
+            return False
+        try:
+            module = self._persistent_pipeline.modules[obj.id]
+        except KeyError:
+            return False
+        if not module.module_descriptor.disk_cache_enabled():
+            return False
+        # The 'self' port gives access to the module instance itself, which
+        # is not restored from the cache
+        graph = self._persistent_pipeline.graph
+        for _, conn_id in graph.edges_from(obj.id):
+            conn = self._persistent_pipeline.connections[conn_id]
+            if conn.source.name == 'self':
+                return False
+        return True
+
+    def load_cached_results(self, obj):
+        """load_cached_results(obj: Module) -> bool
+
+        Sets the outputs of a module from the result cache if they were
+        stored by a previous execution, and marks the module as up to date.
+        """
+        cache = self.get_result_cache()
+        if cache is None or not self._uses_result_cache(obj):
+            return False
+        outputs = cache.get(obj.signature)
+        if outputs is None:
+            return False
+        for port_name, value in outputs.iteritems():
+            obj.set_output(port_name, value)
+        obj.upToDate = True
+        return True
+
+    def store_cached_results(self, obj):
+        """store_cached_results(obj: Module) -> bool
+
+        Stores the outputs of a module that was just computed in the result
+        cache. Modules that depend on non-cacheable modules, and outputs
+        that can't be reused (modules, temporary files) are not stored.
+        """
+        cache = self.get_result_cache()
+        if (cache is None or obj.from_result_cache or
+                not obj.upToDate or not self._uses_result_cache(obj)):
+            return False
+        to_check = [c.obj for connectors in obj.inputPorts.itervalues()
+                    for c in connectors]
+        seen = set()
+        while to_check:
+            upstream = to_check.pop()
+            if id(upstream) in seen:
+                continue
+            seen.add(id(upstream))
+            if not upstream.is_cacheable():
+                return False
+            to_check.extend(c.obj
+                            for connectors in upstream.inputPorts.itervalues()
+                            for c in connectors)
+        temp_dir = os.path.join(self._file_pool.directory, '')
+        outputs = {}
+        for port_name, value in obj.outputPorts.iteritems():
+            if port_name == 'self':
+                continue
+            if isinstance(value, Module):
+                return False
+            if (isinstance(value, PathObject) and
+                    os.path.abspath(value.name).startswith(temp_dir)):
+                return False
+            outputs[port_name] = value
+        return cache.put(obj.signature, outputs)
+
     def _clear_package(self, identifier):
         """clear_package(identifier: str) -> None
 
@@ -262,6 +527,7 @@ class CachedInterpreter(vistrails.core.interpreter.base.BaseInterpreter):
         modules = [mod.id
                    for mod in self._persistent_pipeline.module_list
                    if mod.module_descriptor.identifier == identifier]
+        self._plans.clear()
         self.clean_modules(modules)
 
     def make_connection(self, conn, src, dst):
@@ -281,6 +547,106 @@ class CachedInterpreter(vistrails.core.interpreter.base.BaseInterpreter):
                            ModuleConnector(src, oport, conn.source.spec,
                                            typecheck))
 
+    def create_module_object(self, module, obj_id):
+        """create_module_object(module: Module, obj_id: int)
+                                -> (Module, ModuleError)
+        Creates the object that executes a pipeline module, with its
+        functions connected as constants. The error is None unless a
+        parameter value couldn't be read.
+        """
+        reg = get_module_registry()
+
+        def create_null():
+            """Creates a Null value"""
+            getter = reg.get_descriptor_by_name
+            descriptor = getter(basic_pkg, 'Null')
+            return descriptor.module()
+        
+        def create_constant(param, module):
+            """Creates a Constant from a parameter spec"""
+            getter = reg.get_descriptor_by_name
+            desc = getter(param.identifier, param.type, param.namespace)
+            constant = desc.module()
+            constant.id = module.id
+#             if param.evaluatedStrValue:
+#                 constant.setValue(param.evaluatedStrValue)
+            if param.strValue != '':
+                constant.setValue(param.strValue)
+            else:
+                constant.setValue( \
+                    constant.translate_to_string(constant.default_value))
+            return constant
+
+        error = None
+        obj = module.summon()
+        obj.interpreter = self
+        obj.id = obj_id
+
+        # Checking if output should be stored
+        if module.has_annotation_with_key('annotate_output'):
+            annotate_output = module.get_annotation_by_key('annotate_output')
+            #print annotate_output
+            if annotate_output:
+                obj.annotate_output = True
+
+        for f in module.functions:
+            connector = None
+            if len(f.params) == 0:
+                connector = ModuleConnector(create_null(), 'value',
+                                            f.get_spec('output'))
+            elif len(f.params) == 1:
+                p = f.params[0]
+                try:
+                    constant = create_constant(p, module)
+                    connector = ModuleConnector(constant, 'value',
+                                                f.get_spec('output'))
+                except Exception, e:
+                    debug.unexpected_exception(e)
+                    error = ModuleError(
+                            module,
+                            "Uncaught exception creating Constant from "
+                            "%r: %s" % (
+                            p.strValue,
+                            debug.format_exception(e)))
+            else:
+                tupleModule = vistrails.core.interpreter.base.InternalTuple()
+                tupleModule.length = len(f.params)
+                for (j,p) in enumerate(f.params):
+                    try:
+                        constant = create_constant(p, module)
+                        constant.update()
+                        connector = ModuleConnector(constant, 'value',
+                                                    f.get_spec('output'))
+                        tupleModule.set_input_port(j, connector)
+                    except Exception, e:
+                        debug.unexpected_exception(e)
+                        error = ModuleError(
+                                module,
+                                "Uncaught exception creating Constant "
+                                "from %r: %s" % (
+                                p.strValue,
+                                debug.format_exception(e)))
+                connector = ModuleConnector(tupleModule, 'value',
+                                            f.get_spec('output'))
+            if connector:
+                obj.set_input_port(f.name, connector, is_method=True)
+        return obj, error
+
+    def get_execution_plan(self, pipeline):
+        """get_execution_plan(pipeline: Pipeline) -> ExecutionPlan
+        Returns the plan used to execute a subworkflow, building it if
+        the pipeline changed since it was last executed.
+        """
+        plan = self._plans.get(pipeline)
+        if plan is None or not plan.matches(pipeline):
+            plan = self._plans[pipeline] = ExecutionPlan(self, pipeline)
+        return plan
+
+    def _is_persistent(self, obj):
+        """Whether a module object belongs to the persistent pipeline.
+        """
+        return self._objects.get(obj.id) is obj
+
     def setup_pipeline(self, pipeline, **kwargs):
         """setup_pipeline(controller, pipeline, locator, currentVersion,
                           view, aliases, **kwargs)
@@ -304,6 +670,7 @@ class CachedInterpreter(vistrails.core.interpreter.base.BaseInterpreter):
         done_summon_hooks = fetch('done_summon_hooks', [])
         module_executed_hook = fetch('module_executed_hook', [])
         stop_on_error = fetch('stop_on_error', True)
+        fetch('parallel_workers', 0) # only used by execute_pipeline()
         parent_exec = fetch('parent_exec', None)
         job_monitor = fetch('job_monitor', None)
 
@@ -313,27 +680,6 @@ class CachedInterpreter(vistrails.core.interpreter.base.BaseInterpreter):
             raise VistrailsInternalError('Wrong parameters passed '
                                          'to setup_pipeline: %s' % kwargs)
 
-        def create_null():
-            """Creates a Null value"""
-            getter = reg.get_descriptor_by_name
-            descriptor = getter(basic_pkg, 'Null')
-            return descriptor.module()
-        
-        def create_constant(param, module):
-            """Creates a Constant from a parameter spec"""
-            getter = reg.get_descriptor_by_name
-            desc = getter(param.identifier, param.type, param.namespace)
-            constant = desc.module()
-            constant.id = module.id
-#             if param.evaluatedStrValue:
-#                 constant.setValue(param.evaluatedStrValue)
-            if param.strValue != '':
-                constant.setValue(param.strValue)
-            else:
-                constant.setValue( \
-                    constant.translate_to_string(constant.default_value))
-            return constant
-
         ### BEGIN METHOD ###
 
 #         if self.debugger:
@@ -362,63 +708,12 @@ class CachedInterpreter(vistrails.core.interpreter.base.BaseInterpreter):
         for i in module_added_set:
             persistent_id = tmp_to_persistent_module_map[i]
             module = self._persistent_pipeline.modules[persistent_id]
-            obj = self._objects[persistent_id] = module.summon()
-            obj.interpreter = self
-            obj.id = persistent_id
+            obj, err = self.create_module_object(module, persistent_id)
+            self._objects[persistent_id] = obj
             obj.signature = module._signature
-            
-            # Checking if output should be stored
-            if module.has_annotation_with_key('annotate_output'):
-                annotate_output = module.get_annotation_by_key('annotate_output')
-                #print annotate_output
-                if annotate_output:
-                    obj.annotate_output = True
-
-            for f in module.functions:
-                connector = None
-                if len(f.params) == 0:
-                    connector = ModuleConnector(create_null(), 'value',
-                                                f.get_spec('output'))
-                elif len(f.params) == 1:
-                    p = f.params[0]
-                    try:
-                        constant = create_constant(p, module)
-                        connector = ModuleConnector(constant, 'value',
-                                                    f.get_spec('output'))
-                    except Exception, e:
-                        debug.unexpected_exception(e)
-                        err = ModuleError(
-                                module,
-                                "Uncaught exception creating Constant from "
-                                "%r: %s" % (
-                                p.strValue,
-                                debug.format_exception(e)))
-                        errors[i] = err
-                        to_delete.append(obj.id)
-                else:
-                    tupleModule = vistrails.core.interpreter.base.InternalTuple()
-                    tupleModule.length = len(f.params)
-                    for (j,p) in enumerate(f.params):
-                        try:
-                            constant = create_constant(p, module)
-                            constant.update()
-                            connector = ModuleConnector(constant, 'value',
-                                                        f.get_spec('output'))
-                            tupleModule.set_input_port(j, connector)
-                        except Exception, e:
-                            debug.unexpected_exception(e)
-                            err = ModuleError(
-                                    module,
-                                    "Uncaught exception creating Constant "
-                                    "from %r: %s" % (
-                                    p.strValue,
-                                    debug.format_exception(e)))
-                            errors[i] = err
-                            to_delete.append(obj.id)
-                    connector = ModuleConnector(tupleModule, 'value',
-                                                f.get_spec('output'))
-                if connector:
-                    obj.set_input_port(f.name, connector, is_method=True)
+            if err is not None:
+                errors[i] = err
+                to_delete.append(obj.id)
 
         # Create the new connections
         for i in conn_added_set:
@@ -459,6 +754,7 @@ class CachedInterpreter(vistrails.core.interpreter.base.BaseInterpreter):
         done_summon_hooks = fetch('done_summon_hooks', [])
         clean_pipeline = fetch('clean_pipeline', False)
         stop_on_error = fetch('stop_on_error', True)
+        parallel_workers = fetch('parallel_workers', 0)
         parent_exec = fetch('parent_exec', None)
         job_monitor = fetch('job_monitor', None)
 
@@ -486,7 +782,10 @@ class CachedInterpreter(vistrails.core.interpreter.base.BaseInterpreter):
             return lambda *args: change_parameter(obj, *args)
 
         # Update **all** modules in the current pipeline
+        self._nb_executions += 1
         for i, obj in tmp_id_to_module_map.iteritems():
+            if self._is_persistent(obj):
+                self._last_used[obj.id] = self._nb_executions
             obj.in_pipeline = True # set flag to indicate in pipeline
             obj.logging = logging_obj
             obj.change_parameter = make_change_parameter(obj)
@@ -514,16 +813,35 @@ class CachedInterpreter(vistrails.core.interpreter.base.BaseInterpreter):
         # Note that we accept any module in 'sinks', even if it's not actually
         # a sink in the graph
         if sinks is not None:
-            persistent_sinks = [tmp_id_to_module_map[sink]
-                                for sink in sinks
-                                if sink in tmp_id_to_module_map]
+            sink_ids = [sink for sink in sinks
+                        if sink in tmp_id_to_module_map]
         else:
-            persistent_sinks = [tmp_id_to_module_map[sink]
-                                for sink in pipeline.graph.sinks()]
+            sink_ids = pipeline.graph.sinks()
+        persistent_sinks = [tmp_id_to_module_map[sink] for sink in sink_ids]
 
         self._streams.append(Generator.generators)
         Generator.generators = []
 
+        if parallel_workers > 0:
+            # The scheduler updates the sinks and everything upstream of them,
+            # leaving nothing for the loop below
+            self.execute_parallel(pipeline, tmp_id_to_module_map, sink_ids,
+                                  logging_obj, stop_on_error,
+                                  parallel_workers)
+            persistent_sinks = []
+        elif self.get_concurrent_modules():
+            # Concurrent modules (such as command-line tools) still overlap
+            # with each other
+            limits = [obj.max_concurrent()
+                      for obj in tmp_id_to_module_map.itervalues()
+                      if isinstance(obj, Concurrent)]
+            if len(limits) >= 2 and max(limits) >= 2:
+                self.execute_parallel(pipeline, tmp_id_to_module_map,
+                                      sink_ids, logging_obj, stop_on_error,
+                                      min(len(limits), max(limits)),
+                                      concurrent_only=True)
+                persistent_sinks = []
+
         # Update new sinks
         for obj in persistent_sinks:
             abort = False
@@ -620,6 +938,7 @@ class CachedInterpreter(vistrails.core.interpreter.base.BaseInterpreter):
             if obj.id in logging_obj.executed:
                 execs[tmp_id] = logging_obj.executed[obj.id]
                 executed = True
+                self.store_cached_results(obj)
             if obj.id in logging_obj.suspended:
                 suspends[tmp_id] = logging_obj.suspended[obj.id]
                 if not clean_pipeline:
@@ -634,6 +953,28 @@ class CachedInterpreter(vistrails.core.interpreter.base.BaseInterpreter):
 
         return (to_delete, objs, errs, execs, suspends, caches, parameter_changes)
 
+    def execute_parallel(self, pipeline, tmp_id_to_module_map, sink_ids,
+                         logging_obj, stop_on_error, nb_workers,
+                         concurrent_only=False):
+        """execute_parallel(pipeline, tmp_id_to_module_map, sink_ids,
+                            logging_obj, stop_on_error, nb_workers,
+                            concurrent_only: bool) -> None
+
+        Updates the given sinks of the pipeline, running independent modules
+        concurrently on nb_workers threads. If concurrent_only is set, only
+        Concurrent modules are run on those threads.
+        """
+        scheduler = ParallelScheduler(nb_workers, concurrent_only)
+        scheduler.execute(pipeline, tmp_id_to_module_map, sink_ids,
+                          logging_obj, stop_on_error)
+
+        # Generators were registered in completion order; streams expect
+        # them in topological order
+        if Generator.generators:
+            order = dict((v, i) for i, v in enumerate(
+                    self._persistent_pipeline.graph.vertices_topological_sort()))
+            Generator.generators.sort(key=lambda m: order.get(m.id, -1))
+
     def finalize_pipeline(self, pipeline, to_delete, objs, errs, execs,
                           suspended, cached, **kwargs):
         def fetch(name, default):
@@ -676,6 +1017,8 @@ class CachedInterpreter(vistrails.core.interpreter.base.BaseInterpreter):
           actions = fetch('actions', None)
           done_summon_hooks = fetch('done_summon_hooks', [])
           module_executed_hook = fetch('module_executed_hook', [])
+          stop_on_error = fetch('stop_on_error', True)
+          parallel_workers = fetch('parallel_workers', 0)
           job_monitor = fetch('job_monitor', None)
 
         Executes a pipeline using caching. Caching works by reusing
@@ -696,7 +1039,16 @@ class CachedInterpreter(vistrails.core.interpreter.base.BaseInterpreter):
         whether they were executed or not.
 
         If modules have no error associated with but were not executed, it
-        means they were cached."""
+        means they were cached.
+
+        If parallel_workers is positive, modules that don't depend on each
+        other are updated concurrently on that many threads. Otherwise, only
+        Concurrent modules are (see Concurrent.max_concurrent()), unless the
+        'concurrentModules' configuration is False.
+
+        Once the pipeline is executed, modules are evicted from the cache if
+        they retain more memory than the 'cacheMemoryLimit' configuration
+        allows (see evict_modules())."""
 
         # Setup named arguments. We don't use named parameters so
         # that positional parameter calls fail earlier
@@ -719,6 +1071,7 @@ class CachedInterpreter(vistrails.core.interpreter.base.BaseInterpreter):
         done_summon_hooks = fetch('done_summon_hooks', [])
         module_executed_hook = fetch('module_executed_hook', [])
         stop_on_error = fetch('stop_on_error', True)
+        fetch('parallel_workers', 0) # passed on to execute_pipeline()
         parent_exec = fetch('parent_exec', None)
         job_monitor = fetch('job_monitor', None)
 
@@ -761,6 +1114,9 @@ class CachedInterpreter(vistrails.core.interpreter.base.BaseInterpreter):
             for (i, error) in errors.iteritems():
                 view.set_module_error(i, error.msg, error.errorTrace)
         self.finalize_pipeline(pipeline, *(res[:-1]), **new_kwargs)
+        memory_limit = self.get_memory_limit()
+        if memory_limit:
+            self.evict_modules(memory_limit)
         time_end = time.time()
 
         result = InstanceObject(objects=res[1],
@@ -810,7 +1166,7 @@ class CachedInterpreter(vistrails.core.interpreter.base.BaseInterpreter):
         connection_id_map = Bidict()
         modules_added = set()
         connections_added = set()
-        pipeline.refresh_signatures()
+        pipeline.compute_signatures()
         # we must traverse vertices in topological sort order
         verts = pipeline.graph.vertices_topological_sort()
         for new_module_id in verts:
@@ -859,7 +1215,7 @@ class CachedInterpreter(vistrails.core.interpreter.base.BaseInterpreter):
         object_map = {}
         module_id_map = {}
         connection_id_map = {}
-        pipeline.refresh_signatures()
+        pipeline.compute_signatures()
         # we must traverse vertices in topological sort order
         verts = pipeline.graph.vertices_topological_sort()
         for module_id in verts:
@@ -958,6 +1314,115 @@ class TestCachedInterpreter(unittest.TestCase):
         finally:
             StandardOutput.compute = old_compute
 
+    def test_result_cache(self):
+        """Results are reused from the disk cache by a new interpreter."""
+        import shutil
+        import tempfile
+        from vistrails.core.modules.basic_modules import ConcatenateString
+        from vistrails.tests.utils import execute, intercept_result
+
+        def run(interpreter):
+            with intercept_result(ConcatenateString, 'value') as results:
+                result = execute([
+                        ('String', 'org.vistrails.vistrails.basic', [
+                            ('value', [('String', 'disk')]),
+                        ]),
+                        ('ConcatenateString', 'org.vistrails.vistrails.basic', [
+                            ('str2', [('String', 'cache')]),
+                        ]),
+                    ],
+                    [
+                        (0, 'value', 1, 'str1'),
+                    ],
+                    full_results=True,
+                    interpreter=interpreter)
+            self.assertFalse(result.errors)
+            self.assertEqual(results, ['diskcache'])
+            return result.executed
+
+        directory = tempfile.mkdtemp(prefix='vt_results_')
+        results.set_result_cache(results.DiskResultCache(directory,
+                                                         1024 * 1024))
+        try:
+            executed = run(CachedInterpreter())
+            self.assertEqual(executed, {0: True, 1: True})
+            # Upstream module doesn't run again
+            executed = run(CachedInterpreter())
+            self.assertEqual(executed, {0: False})
+        finally:
+            results.set_result_cache(None)
+            shutil.rmtree(directory)
+
+    def test_group_plan(self):
+        """A group executed over a list reuses the same execution plan."""
+        from vistrails.core.modules.basic_modules import ConcatenateString
+        from vistrails.core.vistrail.controller import VistrailController
+        from vistrails.core.vistrail.vistrail import Vistrail
+        from vistrails.tests.utils import intercept_result
+
+        controller = VistrailController(Vistrail(), auto_save=False)
+        controller.change_selected_version(0L)
+        strings = controller.add_module(basic_pkg, 'List')
+        controller.update_function(strings, 'value', ['["a", "b", "c"]'])
+        concat = controller.add_module(basic_pkg, 'ConcatenateString')
+        controller.update_function(concat, 'str2', ['!'])
+        conn = controller.add_connection(strings.id, 'value',
+                                         concat.id, 'str1')
+        controller.create_group([concat.id], [conn.id])
+
+        interpreter = CachedInterpreter()
+        plans = []
+        get_execution_plan = interpreter.get_execution_plan
+        def get_plan(pipeline):
+            plans.append(get_execution_plan(pipeline))
+            return plans[-1]
+        interpreter.get_execution_plan = get_plan
+        with intercept_result(ConcatenateString, 'value') as results:
+            result = interpreter.execute(controller.current_pipeline)
+        self.assertFalse(result.errors)
+        self.assertEqual(results, ['a!', 'b!', 'c!'])
+        self.assertEqual(len(plans), 3)
+        self.assertTrue(all(plan is plans[0] for plan in plans))
+        # modules inside the group are not kept in the cache
+        self.assertEqual(len(interpreter._objects), 2)
+
+    def test_evict_modules(self):
+        """Least recently used modules are evicted with their dependents."""
+        from vistrails.tests.utils import execute
+
+        def run(interpreter, value):
+            self.assertFalse(execute([
+                    ('String', 'org.vistrails.vistrails.basic', [
+                        ('value', [('String', value * 4096)]),
+                    ]),
+                    ('ConcatenateString', 'org.vistrails.vistrails.basic', [
+                        ('str2', [('String', '!')]),
+                    ]),
+                ],
+                [
+                    (0, 'value', 1, 'str1'),
+                ],
+                interpreter=interpreter))
+
+        interpreter = CachedInterpreter()
+        run(interpreter, 'a')
+        old_ids = set(interpreter._objects)
+        run(interpreter, 'b')
+        sizes = interpreter.get_retained_bytes()
+        self.assertEqual(len(sizes), 4)
+        self.assertTrue(all(size > 4096 for size in sizes.itervalues()))
+
+        # Only the modules from the first execution need to go
+        limit = sum(size for i, size in sizes.iteritems()
+                    if i not in old_ids)
+        evicted = interpreter.evict_modules(limit)
+        self.assertEqual(set(evicted), old_ids)
+        self.assertEqual(set(interpreter._objects) & old_ids, set())
+        self.assertEqual(len(interpreter._persistent_pipeline.modules), 2)
+        self.assertEqual(interpreter.evict_modules(limit), [])
+        # the sizes of the evicted modules are forgotten, the others kept
+        self.assertEqual(set(interpreter._retained), set(interpreter._objects))
+
 
 if __name__ == '__main__':
     unittest.main()
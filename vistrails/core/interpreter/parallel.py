@@ -0,0 +1,558 @@
+###############################################################################
+##
+## Copyright (C) 2014-2016, New York University.
+## Copyright (C) 2011-2014, NYU-Poly.
+## Copyright (C) 2006-2011, University of Utah.
+## All rights reserved.
+## Contact: contact@vistrails.org
+##
+## This file is part of VisTrails.
+##
+## "Redistribution and use in source and binary forms, with or without
+## modification, are permitted provided that the following conditions are met:
+##
+##  - Redistributions of source code must retain the above copyright notice,
+##    this list of conditions and the following disclaimer.
+##  - Redistributions in binary form must reproduce the above copyright
+##    notice, this list of conditions and the following disclaimer in the
+##    documentation and/or other materials provided with the distribution.
+##  - Neither the name of the New York University nor the names of its
+##    contributors may be used to endorse or promote products derived from
+##    this software without specific prior written permission.
+##
+## THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+## AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+## THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+## PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+## CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+## EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+## PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+## OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+## WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR
+## OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF
+## ADVISED OF THE POSSIBILITY OF SUCH DAMAGE."
+##
+###############################################################################
+
+"""Parallel scheduling of pipeline modules.
+
+The default interpreter updates each sink in turn, and every module walks its
+upstream connectors one at a time. The ParallelScheduler instead looks at the
+pipeline graph, and hands every module whose upstream modules are done to a
+pool of worker threads, so that independent branches of a pipeline overlap.
+
+Modules are still run through Module.update(), so caching, suspension and
+error reporting work exactly as they do for sequential execution. Logging and
+view callbacks are always forwarded to the thread that started the execution.
+"""
+
+from __future__ import division
+
+from itertools import izip
+from multiprocessing.pool import ThreadPool
+import Queue
+import threading
+
+from vistrails.core.interpreter.base import AbortExecution
+from vistrails.core.modules.vistrails_module import Concurrent, Module, \
+    ModuleBreakpoint, ModuleError, ModuleErrors, ModuleHadError, \
+    ModuleSuspended, NotThreadSafe
+
+
+###############################################################################
+
+class MainThreadProxy(object):
+    """Forwards the method calls made on an object to the scheduler's thread.
+
+    This is used to wrap the logging object of modules so that the log
+    controller and the view (which might be a Qt widget) are only touched from
+    the thread that started the execution.
+    """
+    def __init__(self, obj, scheduler, wrap_results=()):
+        self._obj = obj
+        self._scheduler = scheduler
+        self._wrap_results = wrap_results
+
+    def __getattr__(self, name):
+        attr = getattr(self._obj, name)
+        if not callable(attr):
+            return attr
+        def call(*args, **kwargs):
+            result = self._scheduler.call_in_main_thread(attr, args, kwargs)
+            if name in self._wrap_results:
+                result = MainThreadProxy(result, self._scheduler)
+            return result
+        return call
+
+
+def runs_own_upstream(obj):
+    """runs_own_upstream(obj: Module) -> bool
+
+    Whether a module overrides the way it updates its upstream modules (If,
+    Map, ExecuteInOrder, ...). The upstream of these modules is not scheduled
+    eagerly since they might only need part of it.
+    """
+    cls = type(obj)
+    return (cls.update_upstream.im_func is not
+                Module.update_upstream.im_func or
+            cls.update.im_func is not Module.update.im_func)
+
+
+class MainThreadCalls(object):
+    """Base class for executors that run modules on worker threads.
+
+    Workers use call_in_main_thread() to get something done by the thread
+    that started the execution, which services these calls while it waits
+    for results in _next_result().
+    """
+    def __init__(self):
+        self._main_thread = None
+        self._events = None
+        self._aborted = False
+
+    def call_in_main_thread(self, func, args=(), kwargs={}):
+        """call_in_main_thread(func, args, kwargs) -> result of func
+
+        Calls a function from the thread running the scheduler, blocking the
+        current thread until it returns.
+        """
+        if threading.current_thread() is self._main_thread:
+            return func(*args, **kwargs)
+        reply = [threading.Event(), None, None]
+        self._events.put(('call', (func, args, kwargs, reply)))
+        reply[0].wait()
+        if reply[2] is not None:
+            raise reply[2]
+        return reply[1]
+
+    def _do_call(self, func, args, kwargs, reply):
+        try:
+            reply[1] = func(*args, **kwargs)
+        except Exception, e:
+            if isinstance(e, AbortExecution):
+                self._aborted = True
+            reply[2] = e
+        reply[0].set()
+
+    def _next_result(self):
+        while True:
+            try:
+                what, data = self._events.get(True, 0.1)
+            except Queue.Empty:
+                continue
+            if what == 'call':
+                self._do_call(*data)
+            else:
+                return data
+
+
+class ParallelScheduler(MainThreadCalls):
+    """Executes modules on a pool of threads as soon as they are ready.
+
+    A module is ready once every module it is connected to has been updated.
+    Modules that are NotThreadSafe, or that drive their own upstream
+    execution, are run from the calling thread while no worker is busy.
+
+    If concurrent_only is set, only Concurrent modules are handed to the
+    workers; the other modules run from the calling thread, in between
+    results, without waiting for the workers.
+    """
+    def __init__(self, nb_workers, concurrent_only=False):
+        MainThreadCalls.__init__(self)
+        self.nb_workers = max(1, nb_workers)
+        self.concurrent_only = concurrent_only
+
+    def _runs_in_pool(self, obj):
+        if isinstance(obj, NotThreadSafe) or runs_own_upstream(obj):
+            return False
+        return not self.concurrent_only or isinstance(obj, Concurrent)
+
+    def _can_overlap(self, obj):
+        # Whether obj can run from the calling thread while workers are busy
+        return self.concurrent_only and not (isinstance(obj, NotThreadSafe) or
+                                             runs_own_upstream(obj))
+
+    def _update(self, obj):
+        try:
+            obj.update()
+        except Exception, e:
+            self._events.put(('done', (obj, e)))
+        else:
+            self._events.put(('done', (obj, None)))
+
+    @staticmethod
+    def build_plan(pipeline, tmp_id_to_module_map, sinks):
+        """build_plan(pipeline, tmp_id_to_module_map, sinks)
+          -> (objects, dependencies)
+
+        Finds the modules that need to run to update the sinks, keyed by
+        their persistent id, and the persistent ids each of them waits for.
+        The upstream of modules restored from the result cache is skipped.
+        """
+        graph = pipeline.graph
+        objects = {}
+        dependencies = {}
+        visited = set()
+        to_visit = list(sinks)
+        while to_visit:
+            tmp_id = to_visit.pop()
+            if tmp_id in visited:
+                continue
+            visited.add(tmp_id)
+            obj = tmp_id_to_module_map[tmp_id]
+            objects[obj.id] = obj
+            deps = dependencies.setdefault(obj.id, set())
+            if runs_own_upstream(obj) or obj.load_result_cache():
+                continue
+            for (upstream_id, _) in graph.edges_to(tmp_id):
+                deps.add(tmp_id_to_module_map[upstream_id].id)
+                to_visit.append(upstream_id)
+        return objects, dependencies
+
+    def execute(self, pipeline, tmp_id_to_module_map, sinks, logging_obj,
+                stop_on_error=True):
+        """execute(pipeline, tmp_id_to_module_map, sinks: list of tmp ids,
+                   logging_obj: ViewUpdatingLogController,
+                   stop_on_error: bool) -> None
+
+        Updates the given sinks and everything upstream of them, reporting
+        errors to logging_obj the same way CachedInterpreter does.
+        """
+        objects, dependencies = self.build_plan(pipeline,
+                                                tmp_id_to_module_map,
+                                                sinks)
+        dependents = dict((i, []) for i in dependencies)
+        for i, deps in dependencies.iteritems():
+            for dep in deps:
+                dependents[dep].append(i)
+        waiting = dict((i, len(deps)) for i, deps in dependencies.iteritems())
+        ready = sorted(i for i, n in waiting.iteritems() if n == 0)
+
+        self._main_thread = threading.current_thread()
+        self._events = Queue.Queue()
+        self._aborted = False
+        logging_proxy = MainThreadProxy(logging_obj, self,
+                                        ('begin_loop_execution',))
+        for obj in objects.itervalues():
+            obj.logging = logging_proxy
+
+        pool = ThreadPool(self.nb_workers)
+        running = 0
+        stop = False
+        unexpected = None
+        try:
+            while ready or running:
+                if not stop:
+                    main_thread_ids = []
+                    for i in ready:
+                        obj = objects[i]
+                        if self._runs_in_pool(obj):
+                            pool.apply_async(self._update, (obj,))
+                            running += 1
+                        else:
+                            main_thread_ids.append(i)
+                    ready = main_thread_ids
+                    if ready and not running:
+                        # Only run these while no worker is busy
+                        running += 1
+                        self._update(objects[ready.pop(0)])
+                    else:
+                        for n, i in enumerate(ready):
+                            if self._can_overlap(objects[i]):
+                                running += 1
+                                self._update(objects[ready.pop(n)])
+                                break
+                elif not running:
+                    break
+
+                obj, e = self._next_result()
+                running -= 1
+                for i in dependents[obj.id]:
+                    waiting[i] -= 1
+                    if waiting[i] == 0:
+                        ready.append(i)
+
+                abort = False
+                error = False
+                if e is None or isinstance(e, ModuleHadError):
+                    # ModuleHadError & ModuleWasSuspended were already
+                    # reported by the module that failed
+                    pass
+                elif isinstance(e, AbortExecution):
+                    abort = True
+                elif isinstance(e, ModuleSuspended):
+                    e.module.logging.end_update(e.module, e,
+                                                was_suspended=True)
+                elif isinstance(e, ModuleErrors):
+                    for me in e.module_errors:
+                        me.module.logging.end_update(me.module, me)
+                        logging_obj.signalError(me.module, me)
+                        abort = abort or me.abort
+                    error = True
+                elif isinstance(e, ModuleError):
+                    e.module.logging.end_update(e.module, e, e.errorTrace)
+                    logging_obj.signalError(e.module, e)
+                    abort = e.abort
+                    error = True
+                elif isinstance(e, ModuleBreakpoint):
+                    e.module.logging.end_update(e.module)
+                    logging_obj.signalError(e.module, e)
+                    abort = True
+                else:
+                    # Sequential execution would have let this propagate
+                    unexpected = unexpected or e
+                    abort = True
+                if abort or self._aborted or (error and stop_on_error):
+                    stop = True
+        finally:
+            pool.close()
+            pool.join()
+            self._main_thread = None
+            self._events = None
+        if unexpected is not None:
+            raise unexpected
+
+
+_SKIPPED = object()
+
+
+class ParallelLoop(MainThreadCalls):
+    """Runs the iterations of a module over its input lists on a thread pool.
+
+    This is used by Module.compute_all() when the loop_workers control
+    parameter is set. Iterations are started in order; each of them is logged
+    as a loop iteration from the calling thread. Once an iteration fails, the
+    ones that haven't started yet are skipped.
+    """
+    def __init__(self, nb_workers):
+        MainThreadCalls.__init__(self)
+        self.nb_workers = max(1, nb_workers)
+        self._stop = False
+
+    def _run_iteration(self, loop, module, i):
+        if self._stop:
+            self._events.put(('done', (i, _SKIPPED)))
+            return
+        try:
+            self.call_in_main_thread(loop.begin_iteration, (module, i))
+            module.update()
+        except Exception, e:
+            self._events.put(('done', (i, e)))
+        else:
+            self._events.put(('done', (i, None)))
+
+    def execute(self, modules, loop, iteration_done):
+        """execute(modules: list of Module, loop,
+                   iteration_done: callable) -> None
+
+        Updates every module, calling iteration_done(i, module, error) from
+        the calling thread as each of them finishes or gets suspended (error
+        is then the ModuleSuspended exception). The first other error, in
+        iteration order, is raised once the running iterations are done.
+        """
+        self._main_thread = threading.current_thread()
+        self._events = Queue.Queue()
+        self._aborted = False
+        self._stop = False
+        loggings = [module.logging for module in modules]
+        for module in modules:
+            module.logging = MainThreadProxy(module.logging, self,
+                                             ('begin_loop_execution',))
+
+        pool = ThreadPool(max(1, min(self.nb_workers, len(modules))))
+        errors = {}
+        try:
+            for i, module in enumerate(modules):
+                pool.apply_async(self._run_iteration, (loop, module, i))
+            for _ in xrange(len(modules)):
+                i, e = self._next_result()
+                if e is None or isinstance(e, ModuleSuspended):
+                    iteration_done(i, modules[i], e)
+                elif e is not _SKIPPED:
+                    errors[i] = e
+                    self._stop = True
+        finally:
+            self._stop = True
+            pool.close()
+            pool.join()
+            # Errors are reported on these modules after we are done
+            for module, logging in izip(modules, loggings):
+                module.logging = logging
+            self._main_thread = None
+            self._events = None
+        if errors:
+            raise errors[min(errors)]
+
+###############################################################################
+# Testing
+
+import time
+import unittest
+import urllib2
+
+
+class Rendezvous(object):
+    """Lets the modules of a test check that they run at the same time.
+
+    meet() only returns True once `count` threads called it, so it can't
+    succeed if they run one after the other.
+    """
+    def __init__(self, count, timeout=10.0):
+        self._condition = threading.Condition()
+        self._count = count
+        self._timeout = timeout
+        self._arrived = 0
+        self._finished = set()
+
+    def _wait(self, predicate):
+        # Condition.wait() has no return value in Python 2
+        end = time.time() + self._timeout
+        while not predicate():
+            remaining = end - time.time()
+            if remaining <= 0:
+                return False
+            self._condition.wait(remaining)
+        return True
+
+    def meet(self):
+        with self._condition:
+            self._arrived += 1
+            self._condition.notify_all()
+            return self._wait(lambda: self._arrived >= self._count)
+
+    def finish(self, key):
+        with self._condition:
+            self._finished.add(key)
+            self._condition.notify_all()
+
+    def wait_for(self, key):
+        with self._condition:
+            return self._wait(lambda: key in self._finished)
+
+
+class TestParallelScheduler(unittest.TestCase):
+    rendezvous = None
+
+    def run_branches(self, nb_workers, source_a, source_b):
+        from vistrails.core.modules.basic_modules import PythonSource
+        from vistrails.tests.utils import execute, intercept_result
+        sum_src = urllib2.quote('o = a + b')
+        with intercept_result(PythonSource, 'o') as results:
+            errors = execute([
+                    ('PythonSource', 'org.vistrails.vistrails.basic', [
+                        ('source', [('String', urllib2.quote(source_a))]),
+                    ]),
+                    ('PythonSource', 'org.vistrails.vistrails.basic', [
+                        ('source', [('String', urllib2.quote(source_b))]),
+                    ]),
+                    ('PythonSource', 'org.vistrails.vistrails.basic', [
+                        ('source', [('String', sum_src)]),
+                    ]),
+                ],
+                [
+                    (0, 'o', 2, 'a'),
+                    (1, 'o', 2, 'b'),
+                ],
+                add_port_specs=[
+                    (0, 'output', 'o', 'org.vistrails.vistrails.basic:Integer'),
+                    (1, 'output', 'o', 'org.vistrails.vistrails.basic:Integer'),
+                    (2, 'input', 'a', 'org.vistrails.vistrails.basic:Integer'),
+                    (2, 'input', 'b', 'org.vistrails.vistrails.basic:Integer'),
+                    (2, 'output', 'o', 'org.vistrails.vistrails.basic:Integer'),
+                ],
+                parallel_workers=nb_workers)
+        return errors, results
+
+    def test_branches_overlap(self):
+        """Independent branches run at the same time."""
+        meet = ('from vistrails.core.interpreter.parallel import '
+                'TestParallelScheduler\n'
+                'if not TestParallelScheduler.rendezvous.meet():\n'
+                '    raise RuntimeError("branches did not overlap")\n')
+        TestParallelScheduler.rendezvous = Rendezvous(2)
+        try:
+            errors, results = self.run_branches(2,
+                                                meet + 'o = 4',
+                                                meet + 'o = 38')
+        finally:
+            TestParallelScheduler.rendezvous = None
+        self.assertFalse(errors)
+        self.assertEqual(sorted(results), [4, 38, 42])
+
+    def test_error(self):
+        """Errors are reported for the failing module only."""
+        errors, results = self.run_branches(
+                2,
+                'o = 4',
+                'raise ValueError("branch failed")')
+        self.assertEqual(errors.keys(), [1])
+        self.assertIn("branch failed", errors[1].msg)
+
+    def test_runs_own_upstream(self):
+        class Lazy(Module):
+            def update_upstream(self):
+                pass
+        self.assertFalse(runs_own_upstream(Module()))
+        self.assertTrue(runs_own_upstream(Lazy()))
+
+
+class TestParallelLoop(unittest.TestCase):
+    rendezvous = None
+
+    def run_loop(self, nb_workers, source):
+        from vistrails.core.modules.basic_modules import PythonSource
+        from vistrails.core.vistrail.module_control_param import \
+            ModuleControlParam
+        from vistrails.tests.utils import execute, intercept_result
+        with intercept_result(PythonSource, 'o') as results:
+            errors = execute([
+                    ('List', 'org.vistrails.vistrails.basic', [
+                        ('value', [('List', '[1, 2, 3, 4]')]),
+                    ]),
+                    ('PythonSource', 'org.vistrails.vistrails.basic', [
+                        ('source', [('String', urllib2.quote(source))]),
+                    ]),
+                ],
+                [
+                    (0, 'value', 1, 'i'),
+                ],
+                add_port_specs=[
+                    (1, 'input', 'i', 'org.vistrails.vistrails.basic:Integer'),
+                    (1, 'output', 'o', 'org.vistrails.vistrails.basic:Integer'),
+                ],
+                control_params=[
+                    (1, ModuleControlParam.LOOP_WORKERS_KEY, str(nb_workers)),
+                ])
+        return errors, results
+
+    def test_iterations_overlap(self):
+        """List iterations run at the same time and keep their order."""
+        # All iterations wait for each other, then they complete in reverse
+        # order: the last one first
+        source = ('from vistrails.core.interpreter.parallel import '
+                  'TestParallelLoop\n'
+                  'r = TestParallelLoop.rendezvous\n'
+                  'if not r.meet():\n'
+                  '    raise RuntimeError("iterations did not overlap")\n'
+                  'if i < 4 and not r.wait_for(i + 1):\n'
+                  '    raise RuntimeError("next iteration did not finish")\n'
+                  'o = i * 10\n'
+                  'r.finish(i)\n')
+        TestParallelLoop.rendezvous = Rendezvous(4)
+        try:
+            errors, results = self.run_loop(4, source)
+        finally:
+            TestParallelLoop.rendezvous = None
+        self.assertFalse(errors)
+        # Each iteration sets its output, then the looping module sets the
+        # list
+        self.assertEqual(sorted(results[:4]), [10, 20, 30, 40])
+        self.assertEqual(results[4:], [[10, 20, 30, 40]])
+
+    def test_error(self):
+        """The first failing iteration is reported."""
+        errors, results = self.run_loop(
+                2,
+                'if i >= 3:\n    raise ValueError("iteration %d" % i)\no = i')
+        self.assertEqual(errors.keys(), [1])
+        self.assertIn("iteration 3", errors[1].msg)
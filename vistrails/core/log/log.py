@@ -38,7 +38,7 @@ from __future__ import division
 import copy
 
 from vistrails.core.log.workflow_exec import WorkflowExec
-from vistrails.db.domain import DBLog
+from vistrails.db.domain import DBLog, DBWorkflowExec
 
 class Log(DBLog):
     """ Class that stores info for logging a workflow execution. """
@@ -78,6 +78,25 @@ class Log(DBLog):
     def add_workflow_exec(self, wf_exec):
         self.db_add_workflow_exec(wf_exec)
 
+    def add_workflow_exec_copy(self, wf_exec):
+        """add_workflow_exec_copy(wf_exec: WorkflowExec) -> WorkflowExec
+        Adds a copy of a workflow execution that was logged in another
+        Log, for example by another process, with new ids taken from
+        this log.
+
+        """
+        wf_exec_copy = DBWorkflowExec.do_copy(wf_exec, True, self.id_scope,
+                                              {})
+        # machines are copied after the executions that reference them
+        machine_ids = dict((old.db_id, new.db_id) for old, new in
+                           zip(wf_exec.db_machines, wf_exec_copy.db_machines))
+        for obj, _, _ in wf_exec_copy.db_children():
+            if getattr(obj, 'db_machine_id', None) in machine_ids:
+                obj.db_machine_id = machine_ids[obj.db_machine_id]
+        WorkflowExec.convert(wf_exec_copy)
+        self.add_workflow_exec(wf_exec_copy)
+        return wf_exec_copy
+
     def delete_all_workflow_execs(self):
         for wf_exec in copy.copy(self.workflow_execs):
             self.db_delete_workflow_exec(wf_exec)
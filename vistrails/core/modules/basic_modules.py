@@ -51,12 +51,14 @@ from vistrails.core import debug
 
 from abc import ABCMeta
 from ast import literal_eval
+from collections import OrderedDict
 from itertools import izip
 import mimetypes
 import os
 import pickle
 import re
 import shutil
+import threading
 import zipfile
 import urllib
 
@@ -1002,6 +1004,33 @@ class Unpickle(Module):
 
 ##############################################################################
 
+_compiled_code = OrderedDict()
+_compiled_code_max = 256
+# Modules run from several threads with the parallel schedulers
+_compiled_code_lock = threading.Lock()
+
+def compile_code(code_str):
+    """compile_code(code_str: str) -> code
+
+    Compiles a piece of code run by a CodeRunnerMixin module. Code objects
+    are kept by hash of their source, so a module that is executed many
+    times (in a loop, or over a list) only compiles its code once. At most
+    _compiled_code_max of them are kept, the least recently used being
+    dropped first.
+    """
+    key = sha_hash(code_str).digest()
+    with _compiled_code_lock:
+        try:
+            # Mark as recently used
+            code = _compiled_code.pop(key)
+        except KeyError:
+            # Python 2.6 needs code to end with newline
+            code = compile(code_str + '\n', '<string>', 'exec')
+            while len(_compiled_code) >= _compiled_code_max:
+                _compiled_code.popitem(last=False)
+        _compiled_code[key] = code
+    return code
+
 class CodeRunnerMixin(object):
     def __init__(self):
         self.output_ports_order = []
@@ -1015,11 +1044,19 @@ class CodeRunnerMixin(object):
 
     def run_code(self, code_str,
                  use_input=False,
-                 use_output=False):
+                 use_output=False,
+                 batch=None):
         """run_code runs a piece of code as a VisTrails module.
         use_input and use_output control whether to use the inputport
         and output port dictionary as local variables inside the
-        execution."""
+        execution.
+
+        batch is an optional (port_names, elements) pair, as returned by
+        get_loop_elements(). The code is then run once per element, with
+        the variables in port_names set to the element's values, and each
+        output is the list of the values it got for each element. The other
+        inputs are read the way a copy of the module running one element
+        would, and each element is logged as an iteration of the loop."""
         import vistrails.core.packagemanager
         def fail(msg):
             raise ModuleError(self, msg)
@@ -1028,7 +1065,11 @@ class CodeRunnerMixin(object):
         locals_ = locals()
         if use_input:
             for k in self.inputPorts:
-                locals_[k] = self.get_input(k)
+                if batch is None:
+                    locals_[k] = self.get_input(k)
+                elif k not in batch[0]:
+                    locals_[k] = self.get_input(
+                            k, list_depth=self.list_depth - 1)
         if use_output:
             for output_portname in self.output_ports_order:
                 if output_portname not in self.inputPorts:
@@ -1042,12 +1083,37 @@ class CodeRunnerMixin(object):
                         'self': self})
         if 'source' in locals_:
             del locals_['source']
-        # Python 2.6 needs code to end with newline
-        exec code_str + '\n' in locals_, locals_
-        if use_output:
-            for k in self.output_ports_order:
-                if locals_.get(k) is not None:
-                    self.set_output(k, locals_[k])
+        code = compile_code(code_str)
+        if batch is None:
+            exec code in locals_, locals_
+            if use_output:
+                for k in self.output_ports_order:
+                    if locals_.get(k) is not None:
+                        self.set_output(k, locals_[k])
+            return
+
+        port_names, elements = batch
+        num_inputs = len(elements)
+        loop = self.logging.begin_loop_execution(self, num_inputs)
+        outputs = dict((k, []) for k in self.output_ports_order)
+        try:
+            for i, element in enumerate(elements):
+                self.logging.update_progress(self, i / num_inputs)
+                loop.begin_iteration(self, i)
+                try:
+                    element_locals = dict(locals_)
+                    element_locals.update(izip(port_names, element))
+                    exec code in element_locals, element_locals
+                    for k, values in outputs.iteritems():
+                        values.append(element_locals.get(k))
+                finally:
+                    loop.end_iteration(self)
+            if use_output:
+                for k in self.output_ports_order:
+                    if any(v is not None for v in outputs[k]):
+                        self.set_output(k, outputs[k])
+        finally:
+            loop.end_loop_execution()
 
 ##############################################################################
 
@@ -1063,6 +1129,12 @@ class PythonSource(CodeRunnerMixin, NotCacheable, Module):
 
     If you want a PythonSource execution to be cached, call
     cache_this().
+
+    When it is executed over a list, the code is run once for each
+    element. If the source contains the line "# pragma: batch", it is
+    run on all the elements by this module, instead of a copy of the
+    module for each element; the code should then only use its port
+    variables, not self.
     """
     _settings = ModuleSettings(
         configure_widget=("vistrails.gui.modules.python_source_configure:"
@@ -1074,6 +1146,20 @@ class PythonSource(CodeRunnerMixin, NotCacheable, Module):
         s = urllib.unquote(str(self.get_input('source')))
         self.run_code(s, use_input=True, use_output=True)
 
+    def compute_all(self):
+        if self.list_depth != 1:
+            return super(PythonSource, self).compute_all()
+        # read the source the way a copy of the module would
+        s = urllib.unquote(str(self.get_input('source', list_depth=0)))
+        # Magic tag: "# pragma: batch"
+        if '# pragma: batch' not in s:
+            return super(PythonSource, self).compute_all()
+        elements, port_names = self.get_loop_elements()
+        if not self.upToDate:
+            self.typeChecking(self, port_names, elements)
+        self.run_code(s, use_input=True, use_output=True,
+                      batch=(port_names, elements))
+
 ##############################################################################
 
 def zip_extract_file(archive, filename_in_archive, output_filename):
@@ -1651,6 +1737,91 @@ class TestPythonSource(unittest.TestCase):
                 ]))
         self.assertEqual(results[-1], "nb is 42")
 
+    def run_list(self, source, fails=False, **kwargs):
+        import urllib2
+        from vistrails.tests.utils import execute, intercept_result
+        source = urllib2.quote(source)
+        with intercept_result(PythonSource, 'customout') as results:
+            self.assertEqual(fails, bool(execute([
+                    ('List', 'org.vistrails.vistrails.basic', [
+                        ('value', [('List', '[1, 2, 3]')])
+                    ]),
+                    ('PythonSource', 'org.vistrails.vistrails.basic', [
+                        ('source', [('String', source)]),
+                        ('offset', [('Integer', '10')]),
+                    ]),
+                ],
+                [
+                    (0, 'value', 1, 'customin'),
+                ],
+                add_port_specs=[
+                    (1, 'input', 'customin',
+                     'org.vistrails.vistrails.basic:Integer'),
+                    (1, 'input', 'offset',
+                     'org.vistrails.vistrails.basic:Integer'),
+                    (1, 'output', 'customout',
+                     'org.vistrails.vistrails.basic:Integer'),
+                ],
+                **kwargs)))
+        return results
+
+    def logged_iterations(self, source, fails=False):
+        """Runs run_list() and returns the loop iterations it logged."""
+        from vistrails.core.log.controller import LogController
+        from vistrails.core.log.log import Log
+        log = Log()
+        self.run_list(source, fails, logger=LogController(log))
+        workflow_exec, = log.workflow_execs
+        loop_execs = [loop_exec
+                      for module_exec in workflow_exec.item_execs
+                      if module_exec.module_name == 'PythonSource'
+                      for loop_exec in module_exec.loop_execs]
+        self.assertEqual(len(loop_execs), 1)
+        self.assertIsNotNone(loop_execs[0].ts_end)
+        return [(i.iteration, i.completed)
+                for i in loop_execs[0].loop_iterations]
+
+    def test_list(self):
+        """A PythonSource executed over a list, with a copy per element"""
+        source = 'customout = customin + offset'
+        self.assertEqual(self.run_list(source)[-1], [11, 12, 13])
+        self.assertIs(compile_code(source), compile_code(source))
+        self.assertEqual(self.logged_iterations(source),
+                         [(0, 1), (1, 1), (2, 1)])
+
+    def test_batch(self):
+        """A PythonSource running over a list by itself"""
+        source = '# pragma: batch\ncustomout = customin + offset'
+        results = self.run_list(source)
+        self.assertEqual(results, [[11, 12, 13]])
+        self.assertEqual(self.logged_iterations(source),
+                         [(0, 1), (1, 1), (2, 1)])
+
+    def test_batch_error(self):
+        """A failing batch still ends its iteration and its loop"""
+        source = ('# pragma: batch\n'
+                  'if customin == 2:\n'
+                  '    fail("no 2")\n'
+                  'customout = customin + offset')
+        self.assertEqual(self.logged_iterations(source, fails=True),
+                         [(0, 1), (1, 1)])
+
+    def test_compiled_code_lru(self):
+        """The least recently used code objects are dropped first"""
+        global _compiled_code_max
+        old_max = _compiled_code_max
+        _compiled_code_max = 2
+        try:
+            first = compile_code('a = 1')
+            second = compile_code('a = 2')
+            self.assertIs(compile_code('a = 1'), first)
+            compile_code('a = 3')
+            self.assertIs(compile_code('a = 1'), first)
+            self.assertIsNot(compile_code('a = 2'), second)
+            self.assertLessEqual(len(_compiled_code), 2)
+        finally:
+            _compiled_code_max = old_max
+
 
 class TestNumericConversions(unittest.TestCase):
     def test_full(self):
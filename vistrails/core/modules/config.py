@@ -281,6 +281,13 @@ _documentation = \
       Internal use only.  This is used to designate the base Module
       class and should not be used by any other module.
 
+   ModuleSettings.disk_cache: Boolean
+
+      If False, the outputs of this module are never stored in the
+      on-disk result cache (see the 'resultCache' configuration), for
+      example because they are large, cheap to compute, or refer to
+      external state. Defaults to True.
+
    ModuleSettings.ghost_package: String
 
       If not None, then the 'ghost_identifier' is set on the
@@ -475,6 +482,7 @@ ModuleSettings = namedtuple('ModuleSettings',
                            (('hide_namespace', False),),
                            (('hide_descriptor', False),),
                            (('is_root', False),),
+                           (('disk_cache', True),),
                            (('ghost_package', None),),
                            (('ghost_package_version', None),),
                            (('ghost_namespace', None),),])
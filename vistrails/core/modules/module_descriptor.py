@@ -141,6 +141,7 @@ class ModuleDescriptor(DBModuleDescriptor):
             self._right_fringe = None
             self._module_color = None
             self._hasher_callable = None
+            self._disk_cache = True
             self._widget_item = None
             self._is_hidden = False
             self._namespace_hidden = False
@@ -167,6 +168,7 @@ class ModuleDescriptor(DBModuleDescriptor):
             self._right_fringe = other._right_fringe
             self._module_color = other._module_color
             self._hasher_callable = other._hasher_callable
+            self._disk_cache = other._disk_cache
             self._widget_item = other._widget_item
             self._is_hidden = other._is_hidden
             self._widget_classes = dict((k,copy.copy(v)) for k, v in \
@@ -371,6 +373,11 @@ class ModuleDescriptor(DBModuleDescriptor):
     def hasher_callable(self):
         return self._hasher_callable
 
+    def set_disk_cache_enabled(self, enabled):
+        self._disk_cache = enabled
+    def disk_cache_enabled(self):
+        return self._disk_cache
+
     def _get_is_hidden(self):
         return self._is_hidden
     def _set_is_hidden(self, hidden):
@@ -555,6 +555,12 @@ class ModuleRegistry(DBRegistry):
         self.package_versions = self.db_packages_identifier_index
         self.packages = {}
         self._module_key_map = {}
+        # Lookup indices, filled as descriptors are queried:
+        # _hierarchy_index maps a descriptor to (module, hierarchy, set of
+        # superclass descriptors); _port_spec_index maps (port name, port
+        # type) to a dict of descriptor -> resolved spec (None if missing)
+        self._hierarchy_index = {}
+        self._port_spec_index = {}
         for pkg in self.package_versions.itervalues():
             for key in chain(pkg.old_identifiers, [pkg.identifier]):
                 if key in self.packages:
@@ -632,6 +638,7 @@ class ModuleRegistry(DBRegistry):
         # self.descriptors[(desc.package, desc.name, desc.namespace)] = desc
         self.descriptors_by_id[desc.id] = desc
         package.add_descriptor(desc)
+        self._hierarchy_index.pop(desc, None)
     def delete_descriptor(self, desc, package=None):
         if package is None:
             try:
@@ -643,6 +650,7 @@ class ModuleRegistry(DBRegistry):
         # del self.descriptors[(desc.package, desc.name, desc.namespace)]
         del self.descriptors_by_id[desc.id]
         package.delete_descriptor(desc)
+        self._invalidate_descriptor(desc)
     def add_package(self, package):
         DBRegistry.db_add_package(self, package)
         for key in chain(package.old_identifiers, [package.identifier]):
@@ -659,6 +667,14 @@ class ModuleRegistry(DBRegistry):
         # this can be slow
         self.setup_indices()
 
+    def _invalidate_descriptor(self, desc):
+        """Removes the lookup index entries that depend on desc."""
+        for d, (_, _, superclasses) in self._hierarchy_index.items():
+            if desc in superclasses:
+                del self._hierarchy_index[d]
+        # Specs might have been resolved from desc for any subclass
+        self._port_spec_index.clear()
+
     def has_abs_upgrade(self, identifier, name, namespace='',
                         package_version='', module_version=''):
 
@@ -1217,6 +1233,7 @@ class ModuleRegistry(DBRegistry):
         # descriptor.set_configuration_widget(configureWidget)
         descriptor.is_hidden = settings.hide_descriptor
         descriptor.namespace_hidden = settings.hide_namespace
+        descriptor.set_disk_cache_enabled(settings.disk_cache)
 
         if settings.signature:
             descriptor.set_hasher_callable(settings.signature)
@@ -1502,6 +1519,7 @@ class ModuleRegistry(DBRegistry):
             raise InvalidPortSpec(descriptor, spec.name, spec.type, e)
 
         descriptor.add_port_spec(spec)
+        self._port_spec_index.pop((spec.name, spec.type), None)
         if spec.type == 'input':
             self.signals.emit_new_input_port(descriptor.identifier,
                                              descriptor.name, spec.name, spec)
@@ -1509,13 +1527,34 @@ class ModuleRegistry(DBRegistry):
             self.signals.emit_new_output_port(descriptor.identifier,
                                               descriptor.name, spec.name, spec)
 
-    def get_port_spec_from_descriptor(self, desc, port_name, port_type):
+    def _find_port_spec(self, desc, port_name, port_type):
+        """_find_port_spec(desc, port_name, port_type) -> PortSpec or None
+
+        Returns the spec of the port on desc or its closest superclass,
+        using the index when possible.
+        """
+        try:
+            specs = self._port_spec_index[(port_name, port_type)]
+        except KeyError:
+            specs = self._port_spec_index[(port_name, port_type)] = {}
+        try:
+            return specs[desc]
+        except KeyError:
+            pass
+        spec = None
         for d in self.get_module_hierarchy(desc):
             if d.has_port_spec(port_name, port_type):
-                return d.get_port_spec(port_name, port_type)
+                spec = d.get_port_spec(port_name, port_type)
+                break
+        specs[desc] = spec
+        return spec
 
-        # if we don't find it, raise MissingPort exception
-        raise MissingPort(desc, port_name, port_type)
+    def get_port_spec_from_descriptor(self, desc, port_name, port_type):
+        spec = self._find_port_spec(desc, port_name, port_type)
+        if spec is None:
+            # if we don't find it, raise MissingPort exception
+            raise MissingPort(desc, port_name, port_type)
+        return spec
 
     def get_port_spec(self, package, module_name, namespace, 
                       port_name, port_type):
@@ -1524,10 +1563,7 @@ class ModuleRegistry(DBRegistry):
                                                   port_type)
 
     def has_port_spec_from_descriptor(self, desc, port_name, port_type):
-        for d in self.get_module_hierarchy(desc):
-            if d.has_port_spec(port_name, port_type):
-                return True
-        return False
+        return self._find_port_spec(desc, port_name, port_type) is not None
 
     def has_port_spec(self, package, module_name, namespace,
                       port_name, port_type):
@@ -1748,10 +1784,12 @@ class ModuleRegistry(DBRegistry):
     def delete_input_port(self, descriptor, port_name):
         """ Just remove a name input port with all of its specs """
         descriptor.delete_input_port(port_name)
+        self._port_spec_index.pop((port_name, 'input'), None)
 
     def delete_output_port(self, descriptor, port_name):
         """ Just remove a name output port with all of its specs """
         descriptor.delete_output_port(port_name)
+        self._port_spec_index.pop((port_name, 'output'), None)
 
     def source_ports_from_descriptor(self, descriptor, sorted=True):
         ports = [p[1] for p in self.module_ports('output', descriptor)]
@@ -1954,21 +1992,36 @@ class ModuleRegistry(DBRegistry):
 
         return False
 
+    def _get_hierarchy_entry(self, descriptor):
+        """_get_hierarchy_entry(descriptor) -> (module, [descriptor], set)
+
+        Returns the indexed hierarchy of a descriptor and the set of its
+        superclasses (including itself), computing it if needed.
+        """
+        module = descriptor.module
+        entry = self._hierarchy_index.get(descriptor)
+        if entry is not None and entry[0] is module:
+            return entry
+        if module is None:
+            descriptors = [descriptor]
+            base_id = descriptor.base_descriptor_id
+            while base_id >= 0:
+                d = self.descriptors_by_id[base_id]
+                descriptors.append(d)
+                base_id = d.base_descriptor_id
+        else:
+            descriptors = [self.get_descriptor(klass)
+                           for klass in module.mro()
+                           if issubclass(klass, vistrails.core.modules.vistrails_module.Module)]
+        entry = (module, descriptors, frozenset(descriptors))
+        self._hierarchy_index[descriptor] = entry
+        return entry
+
     def get_module_hierarchy(self, descriptor):
         """get_module_hierarchy(descriptor) -> [klass].
         Returns the module hierarchy all the way to Module, excluding
         any mixins."""
-        if descriptor.module is None:
-            descriptors = [descriptor]
-            base_id = descriptor.base_descriptor_id
-            while base_id >= 0:
-                descriptor = self.descriptors_by_id[base_id]
-                descriptors.append(descriptor)
-                base_id = descriptor.base_descriptor_id
-            return descriptors
-        return [self.get_descriptor(klass)
-                for klass in descriptor.module.mro()
-                if issubclass(klass, vistrails.core.modules.vistrails_module.Module)]
+        return list(self._get_hierarchy_entry(descriptor)[1])
 
     def get_descriptor_subclasses(self, descriptor):
         # need to find all descriptors that are subdescriptors of descriptor
@@ -2093,15 +2146,10 @@ class ModuleRegistry(DBRegistry):
         if sub.module is not None and super.module is not None:
             return issubclass(sub.module, super.module)
         
-        # otherwise, use descriptors themselves
+        # otherwise, use the indexed superclasses of sub
         if sub == super:
             return True
-        while sub != self.root_descriptor:
-            sub = sub.base_descriptor
-            if sub == super:
-                return True
-
-        return False
+        return super in self._get_hierarchy_entry(sub)[2]
 
     def find_descriptor_subclass(self, d1, d2):
         if self.is_descriptor_subclass(d1, d2):
@@ -2190,3 +2238,30 @@ class TestModuleRegistry(unittest.TestCase):
         t1 = PortSpec(signature=[Float, Integer])
         t2 = PortSpec(signature=[Integer, Float])
         self.assertNotEquals(t1, t2)
+
+    def test_port_spec_index(self):
+        reg = get_module_registry()
+        basic_pkg = get_vistrails_basic_pkg_id()
+        constant = reg.get_descriptor_by_name(basic_pkg, 'Constant')
+        float_desc = reg.get_descriptor_by_name(basic_pkg, 'Float')
+        self.assertEqual(reg.get_module_hierarchy(float_desc)[:2],
+                         [float_desc, constant])
+        self.assertTrue(reg.is_descriptor_subclass(float_desc, constant))
+        self.assertFalse(reg.is_descriptor_subclass(constant, float_desc))
+
+        self.assertFalse(reg.has_port_spec_from_descriptor(
+                float_desc, 'index_test', 'input'))
+        reg.add_input_port(constant.module, 'index_test',
+                           '(%s:Integer)' % basic_pkg)
+        try:
+            spec = reg.get_port_spec_from_descriptor(
+                    float_desc, 'index_test', 'input')
+            self.assertEqual(spec.name, 'index_test')
+            self.assertIs(reg.get_port_spec_from_descriptor(
+                    float_desc, 'index_test', 'input'), spec)
+        finally:
+            reg.delete_input_port(constant, 'index_test')
+        self.assertFalse(reg.has_port_spec_from_descriptor(
+                float_desc, 'index_test', 'input'))
+        self.assertRaises(MissingPort, reg.get_port_spec_from_descriptor,
+                          float_desc, 'index_test', 'input')
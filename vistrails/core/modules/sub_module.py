@@ -47,7 +47,7 @@ from vistrails.core.modules import module_registry
 from vistrails.core.modules.basic_modules import identifier as basic_pkg
 from vistrails.core.modules.config import ModuleSettings, IPort, OPort
 from vistrails.core.modules.vistrails_module import Module, InvalidOutput, new_module, \
-    ModuleError, ModuleSuspended, ModuleConnector
+    ModuleError, ModuleSuspended, ModuleConnector, NotThreadSafe
 from vistrails.core.utils import VistrailsInternalError
 import os.path
 
@@ -106,6 +106,16 @@ class OutputPort(Module):
     
 ###############################################################################
 
+def set_input_port_signature(pipeline, input_module, sig):
+    """Sets the signature an InputPort module gets from outside its group.
+
+    Only the signatures downstream of that module need to be recomputed if it
+    changes.
+    """
+    if getattr(input_module, '_input_port_signature', None) != sig:
+        input_module._input_port_signature = sig
+        pipeline.invalidate_signatures([input_module.id])
+
 def group_signature(pipeline, module, chm):
     if module._port_specs is None:
         module.make_port_specs()
@@ -133,7 +143,7 @@ def group_signature(pipeline, module, chm):
             function_sig = hash_list(input_functions[input_port_name], 
                                      Hasher.function_signature, chm)
             sig = Hasher.compound_signature([sig, function_sig])
-        input_module._input_port_signature = sig
+        set_input_port_signature(module.pipeline, input_module, sig)
     for input_port_name, done in covered_modules.iteritems():
         if done:
             continue
@@ -146,9 +156,9 @@ def group_signature(pipeline, module, chm):
             sig = Hasher.compound_signature([module_sig, function_sig])
         else:
             sig = Hasher.module_signature(input_module, chm)
-        input_module._input_port_signature = sig
+        set_input_port_signature(module.pipeline, input_module, sig)
 
-    module.pipeline.refresh_signatures()
+    module.pipeline.compute_signatures()
 
     sig_list = []
     sig_list.append(Hasher.module_signature(module, chm))
@@ -156,7 +166,7 @@ def group_signature(pipeline, module, chm):
         sig_list.append(module.pipeline.subpipeline_signature(m_id))
     return Hasher.compound_signature(sig_list)
 
-class Group(Module):
+class Group(NotThreadSafe, Module):
     _settings = ModuleSettings(signature=group_signature,
                                hide_descriptor=True)
     _output_ports = [OPort("self", "Group", optional=True)]
@@ -178,13 +188,15 @@ class Group(Module):
                     "%s cannot execute -- remap dictionaries don't exist" %
                     self.__class__.__name__)
 
-        # Setup pipeline for execution
-        res = self.interpreter.setup_pipeline(self.pipeline)
-        self.persistent_modules = res[0].values()
-        if len(res[5]) > 0:
+        # Setup pipeline for execution, from the plan the interpreter keeps
+        # for this group
+        plan = self.interpreter.get_execution_plan(self.pipeline)
+        if len(plan.errors) > 0:
             raise ModuleError(self, "Error(s) inside group:\n" +
-                              "\n".join(me.msg for me in res[5].itervalues()))
-        tmp_id_to_module_map = res[0]
+                              "\n".join(me.msg
+                                        for me in plan.errors.itervalues()))
+        tmp_id_to_module_map = plan.instantiate(self.pipeline)
+        self.persistent_modules = tmp_id_to_module_map.values()
 
         # Connect Group's external input ports to internal InputPort modules
         for iport_name, conn in self.inputPorts.iteritems():
@@ -200,7 +212,6 @@ class Group(Module):
 
         # Execute pipeline
         kwargs = {'logger': self.logging.log.recursing(self),
-                  'clean_pipeline': True,
                   'current_version': self.moduleInfo['version']}
         module_info_args = set(['locator', 'reason', 'extra_info', 'actions', 'job_monitor'])
         for arg in module_info_args:
@@ -208,7 +219,8 @@ class Group(Module):
                 kwargs[arg] = self.moduleInfo[arg]
 
         res = self.interpreter.execute_pipeline(self.pipeline,
-                                                *res[:2],
+                                                tmp_id_to_module_map,
+                                                plan.id_map,
                                                 **kwargs)
 
         # Check and propagate errors
@@ -231,9 +243,6 @@ class Group(Module):
                 self.set_output(oport_name,
                                 oport_obj.get_output('ExternalPipe'))
 
-        self.interpreter.finalize_pipeline(self.pipeline, *res[:-1],
-                                           reset_computed=False)
-
     def is_cacheable(self):
         return all(m.is_cacheable() for m in self.persistent_modules)
 
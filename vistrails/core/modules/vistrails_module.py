@@ -318,6 +318,9 @@ class Module(object):
 
         self.signature = None
 
+        # stores whether the outputs were loaded from the result cache
+        self.from_result_cache = False
+
         # stores whether the output of the module should be annotated in the
         # execution log
         self.annotate_output = False
@@ -408,6 +411,21 @@ class Module(object):
                 return p_module
         return False
 
+    def load_result_cache(self):
+        """ load_result_cache() -> Boolean
+            Loads the outputs of this module from the interpreter's result
+            cache, in which case the upstream modules don't need to run
+        """
+        if self.from_result_cache:
+            return True
+        if self.upToDate or self.computed:
+            return False
+        interpreter = getattr(self, 'interpreter', None)
+        if interpreter is None:
+            return False
+        self.from_result_cache = interpreter.load_cached_results(self)
+        return self.from_result_cache
+
     def setJobCache(self):
         """ setJobCache() -> Boolean
             Checks if this is a job cache and it exists
@@ -553,7 +571,7 @@ class Module(object):
         elif self.computed:
             return
         self.logging.begin_update(self)
-        if not self.setJobCache():
+        if not self.setJobCache() and not self.load_result_cache():
             self.update_upstream()
         if self.upToDate:
             if not self.computed:
@@ -643,19 +661,38 @@ class Module(object):
             return self.control_params[ModuleControlParam.LOOP_KEY]
         return default
 
-    def compute_all(self):
-        """This method executes the module once for each input.
-           Similarly to controlflow's fold.
+    def get_loop_workers(self):
+        """get_loop_workers() -> int
 
+        Returns the number of list iterations that compute_all() may run at
+        the same time, as set by the loop_workers control parameter, or by
+        max_concurrent() for Concurrent modules. Modules that are not
+        thread-safe or that update their own upstream always iterate
+        sequentially.
+        """
+        if isinstance(self, NotThreadSafe):
+            return 1
+        if (isinstance(self, Concurrent) and
+                ModuleControlParam.LOOP_WORKERS_KEY not in
+                self.control_params):
+            nb_workers = self.max_concurrent()
+        else:
+            nb_workers = int(self.control_params.get(
+                    ModuleControlParam.LOOP_WORKERS_KEY, 1))
+        if nb_workers > 1:
+            from vistrails.core.interpreter.parallel import runs_own_upstream
+            if runs_own_upstream(self):
+                return 1
+        return nb_workers
+
+    def get_loop_elements(self):
+        """get_loop_elements() -> (list of tuple, list of str)
+
+        Returns the values the module is to be executed on by compute_all(),
+        combined as set by the loop_type control parameter, along with the
+        name of the port each value of an element goes to.
         """
-        from vistrails.core.modules.sub_module import InputPort
-        if isinstance(self, InputPort):
-            return self.compute()
-        if self.list_depth < 1:
-            raise ModuleError(self, "List compute has wrong depth: %s" %
-                                    self.list_depth)
         combine_type = self.get_combine_type('cartesian')
-        suspended = []
 
         inputs = {} # dict of port_name: value
         port_names = []
@@ -672,13 +709,26 @@ class Module(object):
             combine_type = custom_order[0]
             port_names = custom_order[1:]
 
-        elements, port_names = self.do_combine(combine_type, inputs, port_names)
+        return self.do_combine(combine_type, inputs, port_names)
+
+    def compute_all(self):
+        """This method executes the module once for each input.
+           Similarly to controlflow's fold.
+
+        """
+        from vistrails.core.modules.sub_module import InputPort
+        if isinstance(self, InputPort):
+            return self.compute()
+        if self.list_depth < 1:
+            raise ModuleError(self, "List compute has wrong depth: %s" %
+                                    self.list_depth)
+        suspended = []
+
+        elements, port_names = self.get_loop_elements()
         num_inputs = len(elements)
         loop = self.logging.begin_loop_execution(self, num_inputs)
-        ## Update everything for each value inside the list
-        outputs = {}
-        for i in xrange(num_inputs):
-            self.logging.update_progress(self, float(i)/num_inputs)
+
+        def make_iteration(i):
             module = copy.copy(self)
             module.list_depth = self.list_depth - 1
             module.had_error = False
@@ -692,20 +742,16 @@ class Module(object):
                 module.upToDate = False
                 module.computed = False
                 self.setInputValues(module, port_names, elements[i], i)
+            return module
 
-            loop.begin_iteration(module, i)
-
-            try:
-                module.update()
-            except ModuleSuspended, e:
+        def iteration_done(i, module, e=None):
+            if e is not None:
                 e.loop_iteration = i
                 module.logging.end_update(module, e, was_suspended=True)
                 suspended.append(e)
-                loop.end_iteration(module)
-                continue
-
             loop.end_iteration(module)
 
+        def collect_outputs(module):
             ## Getting the result from the output port
             for nameOutput in module.outputPorts:
                 if nameOutput == 'self':
@@ -715,7 +761,41 @@ class Module(object):
                 output = module.get_output(nameOutput)
                 outputs[nameOutput].append(output)
 
-            self.logging.update_progress(self, i * 1.0 / num_inputs)
+        ## Update everything for each value inside the list
+        outputs = {}
+        nb_workers = self.get_loop_workers()
+        if nb_workers > 1 and num_inputs > 1:
+            from vistrails.core.interpreter.parallel import ParallelLoop
+            modules = [make_iteration(i) for i in xrange(num_inputs)]
+            done = set()
+            def parallel_iteration_done(i, module, e):
+                iteration_done(i, module, e)
+                if e is None:
+                    done.add(i)
+                self.logging.update_progress(self,
+                                             float(len(done)) / num_inputs)
+            ParallelLoop(nb_workers).execute(modules, loop,
+                                             parallel_iteration_done)
+            for i, module in enumerate(modules):
+                if i in done:
+                    collect_outputs(module)
+        else:
+            for i in xrange(num_inputs):
+                self.logging.update_progress(self, float(i)/num_inputs)
+                module = make_iteration(i)
+
+                loop.begin_iteration(module, i)
+
+                try:
+                    module.update()
+                except ModuleSuspended, e:
+                    iteration_done(i, module, e)
+                    continue
+
+                iteration_done(i, module)
+                collect_outputs(module)
+
+                self.logging.update_progress(self, i * 1.0 / num_inputs)
 
         if suspended:
             raise ModuleSuspended(
@@ -845,6 +925,8 @@ class Module(object):
         module.had_error = False
         module.upToDate = False
         module.computed = False
+        # the copy will get the accumulated values, not the streams
+        module.streamed_ports = {}
 
         inputs = dict([(port, []) for port in ports])
         def generator(self):
@@ -908,6 +990,8 @@ class Module(object):
         module.had_error = False
         module.upToDate = False
         module.computed = False
+        # the copy will get the final values, not the streams
+        module.streamed_ports = {}
 
         def generator(self):
             self.logging.begin_update(module)
@@ -1170,13 +1254,16 @@ class Module(object):
         """
         pass
 
-    def get_input(self, port_name, allow_default=True):
+    def get_input(self, port_name, allow_default=True, list_depth=None):
         """Returns the value coming in on the input port named **port_name**.
 
         :param port_name: the name of the input port being queried
         :type port_name: str
         :param allow_default: whether to return the default value if it exists
         :type allow_default: bool
+        :param list_depth: the list depth to read the port at, if not the
+            module's (0 reads it the way an iteration of the module would)
+        :type list_depth: int
         :returns: the value being passed in on the input port
         :raises: ``ModuleError`` if there is no value on the port (and no default value if allow_default is True)
 
@@ -1199,9 +1286,11 @@ class Module(object):
             list_desc = self.registry.get_descriptor_by_name(
                     'org.vistrails.vistrails.basic', 'List')
 
-            if (self.input_specs[port_name].depth + self.list_depth > 0) or \
+            if list_depth is None:
+                list_depth = self.list_depth
+            if (self.input_specs[port_name].depth + list_depth > 0) or \
                 self.input_specs[port_name].descriptors() == [list_desc]:
-                ret = self.get_input_list(port_name)
+                ret = self.get_input_list(port_name, list_depth)
                 if len(ret) > 1:
                     ret = list(chain.from_iterable(ret))
                 else:
@@ -1212,13 +1301,16 @@ class Module(object):
         value = self.inputPorts[port_name][0]()
         return value
 
-    def get_input_list(self, port_name):
+    def get_input_list(self, port_name, list_depth=None):
         """Returns the value(s) coming in on the input port named
         **port_name**.  When a port can accept more than one input,
         this method obtains all the values being passed in.
 
         :param port_name: the name of the input port being queried
         :type port_name: str
+        :param list_depth: the list depth to read the port at, if not the
+            module's
+        :type list_depth: int
         :returns: a list of all the values being passed in on the input port
         :raises: ``ModuleError`` if there is no value on the port
         """
@@ -1245,7 +1337,9 @@ class Module(object):
                 continue
             # Give List an additional depth
             dest_descs = self.input_specs[port_name].descriptors()
-            dest_depth = self.input_specs[port_name].depth + self.list_depth
+            if list_depth is None:
+                list_depth = self.list_depth
+            dest_depth = self.input_specs[port_name].depth + list_depth
             if len(dest_descs) == 1 and dest_descs[0].module == List:
                 dest_depth += 1
             if connector.spec:
@@ -1520,6 +1614,76 @@ class Module(object):
 
             self.set_output(name_output, iterator)
 
+    def set_streaming_reduce(self, update, finish):
+        """Creates a generator object that folds the streamed inputs into
+        final outputs.
+
+        `update(module)` is called for each element of the stream, once it
+        is set on the input ports of `module` (a copy of this module).
+        `finish(module)` is called once the stream is exhausted and should
+        set the outputs. Like with compute_accumulate(), downstream modules
+        only compute once these final outputs are set, but the elements don't
+        need to be kept in memory.
+        """
+        from vistrails.core.modules.basic_modules import Generator
+
+        ports = self.streamed_ports.keys()
+        num_inputs = self.streamed_ports[ports[0]].size
+        module = copy.copy(self)
+        module.list_depth = self.list_depth - 1
+        module.had_error = False
+        module.upToDate = False
+        module.computed = False
+
+        if num_inputs:
+            milestones = [i*num_inputs//10 for i in xrange(1, 11)]
+
+        def call(function):
+            try:
+                function(module)
+            except ModuleError:
+                raise
+            except Exception, e:
+                raise ModuleError(module, str(e),
+                                  errorTrace=traceback.format_exc())
+
+        def generator(self):
+            self.logging.begin_compute(module)
+            i = 0
+            for name_output in module.outputPorts:
+                module.set_output(name_output, None)
+            while 1:
+                elements = [self.streamed_ports[port].next() for port in ports]
+                if None in elements:
+                    break
+                ## Type checking
+                if i == 0:
+                    self.typeChecking(module, ports, [elements])
+                self.setInputValues(module, ports, elements, i)
+                call(update)
+                if num_inputs:
+                    if i in milestones:
+                        self.logging.update_progress(self, float(i)/num_inputs)
+                else:
+                    self.logging.update_progress(self, 0.5)
+                i += 1
+                yield True
+            call(finish)
+            self.logging.update_progress(self, 1.0)
+            self.logging.end_update(module)
+            while 1:
+                yield None
+
+        _generator = generator(self)
+        # set streaming outputs
+        for name_output in self.outputPorts:
+            iterator = Generator(size=num_inputs,
+                                 module=module,
+                                 generator=_generator,
+                                 port=name_output,
+                                 accumulated=True)
+            self.set_output(name_output, iterator)
+
     def set_streaming_output(self, port, generator, size=0):
         """This method is used to set a streaming output port.
 
@@ -1657,6 +1821,34 @@ class Streaming(object):
 
 ################################################################################
 
+class NotThreadSafe(object):
+    """ A mixin indicating that a module has to be updated from the thread
+    that started the execution, for instance because it creates GUI widgets or
+    runs a subworkflow. Parallel execution never runs it concurrently with
+    other modules.
+
+    """
+    pass
+
+################################################################################
+
+class Concurrent(object):
+    """ A mixin indicating that a module spends most of its time waiting,
+    for instance on a subprocess. Independent Concurrent modules, and the
+    list iterations of such a module, are run at the same time even if
+    parallel execution is not enabled.
+
+    """
+    @classmethod
+    def max_concurrent(cls):
+        """max_concurrent() -> int
+
+        Returns how many instances of this module may run at the same time.
+        """
+        return 1
+
+################################################################################
+
 class Converter(Module):
     """Base class for automatic conversion modules.
 
@@ -42,6 +42,8 @@ from vistrails.core import debug
 from vistrails.core.vistrail.module_function import ModuleFunction
 from vistrails.core.vistrail.module_param import ModuleParam
 import copy
+import multiprocessing
+import os
 
 import unittest
 
@@ -176,6 +178,7 @@ class InterpolateDiscreteParam(object):
             p.strValue = str(v)
             f.params.append(p)
         m.functions.append(f)
+        pipeline.invalidate_signatures([m.id])
 
 class ActionBasedParameterExploration(object):
     """
@@ -205,42 +208,226 @@ class ActionBasedParameterExploration(object):
         pipeline and a set of actions leading to that interpolated
         pipeline. This is useful for update the parameter exploration
         back to the builder.
+
+        This builds every pipeline of the exploration at once; use
+        iter_explore() to get them one at a time.
         
         """
-        results = []
-        resultActions = []
-        
-        def exploreDimension(pipeline, performedActions, dim):
-            """ exploreDimension(pipeline: Pipeline, performedActions: [actions],
-                                 dim: int) -> None
-            Start applying actions to the pipeline at dimension
-            dim. 'pipeline' will not be modified in the function
-            
+        count = self.count(actions)
+        results = [None] * count
+        resultActions = [None] * count
+        for index, p, performedActions in self.iter_explore(pipeline, actions,
+                                                            pre_actions):
+            results[index] = p
+            resultActions[index] = performedActions
+        return (results, resultActions)
+
+    def count(self, actions):
+        """ count(actions: [action set]) -> int
+        Returns the number of pipelines in the exploration. Empty
+        dimensions count as a single step.
+
+        """
+        count = 1
+        for currentActions in actions:
+            count *= max(1, len(currentActions))
+        return count
+
+    def iter_explore(self, pipeline, actions, pre_actions=[]):
+        """ iter_explore(pipeline: Pipeline, actions: [action set],
+                         pre_actions: [action set])
+                         -> iterator of (int, Pipeline, [actions])
+        Same as explore(), but yields the interpolated pipelines one at
+        a time, with their index in the list explore() returns.
+
+        The dimension whose parameters belong to the most downstream
+        modules varies fastest, so that consecutive pipelines share as
+        much of their upstream part as possible, which the interpreter
+        can then get from its cache. Only one copy of the pipeline per
+        dimension is alive at any time.
+
+        """
+        currentPipeline, dims, strides = self._prepare(pipeline, actions,
+                                                       pre_actions)
+        steps = [None] * len(actions)
+
+        def exploreDimension(pipeline, level, index):
+            """ exploreDimension(pipeline: Pipeline, level: int,
+                                 index: int) -> iterator
+            Yields the pipelines obtained by applying actions to the
+            pipeline for dimensions dims[level] and below. 'pipeline'
+            will not be modified in the function
+
             """
-            if dim<0:
-                results.append(pipeline)
-                resultActions.append(performedActions)
+            if level < 0:
+                performedActions = list(pre_actions)
+                for dim in xrange(len(actions)-1, -1, -1):
+                    if steps[dim] is not None:
+                        performedActions.extend(actions[dim][steps[dim]])
+                yield index, pipeline, performedActions
                 return
-            currentActions = actions[dim]
-            if len(currentActions)==0:
-                # Ignore empty dimension
-                exploreDimension(pipeline, performedActions, dim-1)
-                return
-            for actionSet in currentActions:
+            dim = dims[level]
+            for step, actionSet in enumerate(actions[dim]):
                 currentPipeline = copy.copy(pipeline)
-                currentPeformedActions = copy.copy(performedActions)
                 for action in actionSet:
                     currentPipeline.perform_action(action)
-                    currentPeformedActions.append(action)
-                exploreDimension(currentPipeline, currentPeformedActions, dim-1)
-        
-        # perform pre_actions
+                steps[dim] = step
+                for point in exploreDimension(currentPipeline, level-1,
+                                              index + step*strides[dim]):
+                    yield point
+
+        return exploreDimension(currentPipeline, len(dims)-1, 0)
+
+    def explore_order(self, pipeline, actions, pre_actions=[]):
+        """ explore_order(pipeline: Pipeline, actions: [action set],
+                          pre_actions: [action set]) -> list of int
+        Returns the indices of the pipelines in the order iter_explore()
+        yields them.
+
+        """
+        _, dims, strides = self._prepare(pipeline, actions, pre_actions)
+        indices = [0]
+        for dim in reversed(dims):
+            indices = [index + step*strides[dim]
+                       for index in indices
+                       for step in xrange(len(actions[dim]))]
+        return indices
+
+    def explore_point(self, pipeline, actions, pre_actions, index):
+        """ explore_point(pipeline: Pipeline, actions: [action set],
+                          pre_actions: [action set], index: int)
+                          -> (Pipeline, [actions])
+        Returns the pipeline at position 'index' in the list explore()
+        returns, and the actions leading to it, without building the
+        other ones.
+
+        """
         currentPipeline = copy.copy(pipeline)
+        performedActions = list(pre_actions)
         for action in pre_actions:
             currentPipeline.perform_action(action)
-        
-        exploreDimension(currentPipeline, pre_actions, len(actions)-1)
-        return (results, resultActions)
+        stride = self.count(actions)
+        for dim in xrange(len(actions)-1, -1, -1):
+            currentActions = actions[dim]
+            if not currentActions:
+                continue
+            stride //= len(currentActions)
+            step, index = divmod(index, stride)
+            for action in currentActions[step]:
+                currentPipeline.perform_action(action)
+                performedActions.append(action)
+        return currentPipeline, performedActions
+
+    def _prepare(self, pipeline, actions, pre_actions):
+        """ _prepare(pipeline: Pipeline, actions: [action set],
+                     pre_actions: [action set])
+                     -> (Pipeline, list of int, list of int)
+        Returns a copy of the pipeline with pre_actions applied, the
+        non-empty dimensions from fastest to slowest, and the stride of
+        each dimension in explore()'s ordering, where the first
+        dimension varies fastest.
+
+        """
+        currentPipeline = copy.copy(pipeline)
+        for action in pre_actions:
+            currentPipeline.perform_action(action)
+        strides = []
+        stride = 1
+        for currentActions in actions:
+            strides.append(stride)
+            stride *= max(1, len(currentActions))
+        dims = [dim for dim in self._dimension_order(currentPipeline, actions)
+                if actions[dim]]
+        return currentPipeline, dims, strides
+
+    def _dimension_order(self, pipeline, actions):
+        """ _dimension_order(pipeline: Pipeline, actions: [action set])
+                             -> list of int
+        Returns the dimensions sorted from the one that should vary
+        fastest to the one that should vary slowest, i.e. by decreasing
+        topological rank of the modules their actions change.
+        Dimensions that cannot be located keep the default order.
+
+        """
+        modules = {}
+        for module in pipeline.module_list:
+            for function in module.functions:
+                modules[(function.vtType, function.real_id)] = module.id
+        try:
+            ranks = dict((m_id, rank) for rank, m_id in
+                         enumerate(pipeline.graph.vertices_topological_sort()))
+        except Exception:
+            return range(len(actions))
+
+        def dimension_rank(dim):
+            rank = -1
+            for actionSet in actions[dim]:
+                for action in actionSet:
+                    for op in action.operations:
+                        if op.parentObjType == 'module':
+                            m_id = op.parentObjId
+                        else:
+                            m_id = modules.get((op.parentObjType,
+                                                op.parentObjId))
+                        rank = max(rank, ranks.get(m_id, -1))
+            return rank
+        return sorted(xrange(len(actions)), key=lambda d: -dimension_rank(d))
+
+_point_function = None
+
+def _execute_points(indices):
+    return [(index, _point_function(index)) for index in indices]
+
+def iter_parallel_points(function, indices, nb_workers, chunk_size=None):
+    """ iter_parallel_points(function: callable, indices: list of int,
+                             nb_workers: int, chunk_size: int)
+                             -> iterator of (int, object)
+    Calls function(index) for each index in worker processes and
+    yields the (index, result) pairs as they complete. The results
+    have to be picklable.
+
+    The workers are forked from this process, so the function can use
+    any state it has. Consecutive indices are sent to the same worker in
+    chunks of chunk_size, so that they can share its interpreter cache.
+
+    """
+    global _point_function
+    if chunk_size is None:
+        chunk_size = max(1, len(indices) // (nb_workers * 4))
+    chunks = [indices[i:i+chunk_size]
+              for i in xrange(0, len(indices), chunk_size)]
+    _point_function = function
+    try:
+        pool = multiprocessing.Pool(nb_workers)
+    finally:
+        _point_function = None
+    try:
+        for results in pool.imap_unordered(_execute_points, chunks):
+            for result in results:
+                yield result
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+
+def can_run_parallel():
+    """ can_run_parallel() -> bool
+    Whether iter_parallel_points() can be used on this platform
+
+    """
+    return hasattr(os, 'fork')
+
+def _pipelinePosition(sheetCount, rowCount, colCount, pId):
+    """ _pipelinePosition(sheetCount: int, rowCount: int, colCount: int,
+                          pId: int) -> (int, int, int)
+    Returns the (row, col, sheet) position of pipeline pId in a
+    parameter exploration
+
+    """
+    col = pId % colCount
+    row = (pId // colCount) % rowCount
+    sheet = (pId // (colCount*rowCount)) % sheetCount
+    return (row, col, sheet)
 
 def _pipelinePositions(sheetCount, rowCount, colCount,
                        pipelines):
@@ -254,13 +441,8 @@ def _pipelinePositions(sheetCount, rowCount, colCount,
 
     """
 
-    pipelinePositions = []
-    for pId in xrange(len(pipelines)):
-        col = pId % colCount
-        row = (pId // colCount) % rowCount
-        sheet = (pId // (colCount*rowCount)) % sheetCount
-        pipelinePositions.append((row, col, sheet))
-    return pipelinePositions
+    return [_pipelinePosition(sheetCount, rowCount, colCount, pId)
+            for pId in xrange(len(pipelines))]
 
 
 ################################################################################
@@ -283,5 +465,84 @@ class TestParameterExploration(unittest.TestCase):
                           (5, 5.0, 'two'),
                           (10, 10.0, 'three')])
 
+    def make_exploration(self):
+        """Builds a Float -> PythonCalc pipeline and a 2 x 3 exploration,
+        where the first dimension changes the upstream module.
+
+        """
+        from vistrails.core.db.action import create_action
+        from vistrails.core.vistrail.connection import Connection
+        from vistrails.core.vistrail.module import Module
+        from vistrails.core.vistrail.pipeline import Pipeline
+        from vistrails.core.vistrail.port import Port
+
+        pipeline = Pipeline()
+        params = []
+        for i, (name, port) in enumerate([('Float', 'value'),
+                                          ('PythonCalc', 'value2')]):
+            param = ModuleParam(id=i, pos=0, type='Float', val='0.0')
+            function = ModuleFunction(id=i, pos=0, name=port,
+                                      parameters=[param])
+            pipeline.add_module(Module(id=i, name=name,
+                                       package='org.vistrails.vistrails.basic',
+                                       functions=[function]))
+            params.append((function, param))
+        pipeline.add_connection(Connection(
+                id=0,
+                ports=[Port(id=0, type='source', moduleId=0, name='value',
+                            signature='(Float)'),
+                       Port(id=1, type='destination', moduleId=1,
+                            name='value1', signature='(Float)')]))
+
+        actions = []
+        new_id = 10
+        for (function, param), values in zip(params, [['1.0', '2.0'],
+                                                      ['3.0', '4.0', '5.0']]):
+            dimension = []
+            for value in values:
+                new_param = ModuleParam(id=new_id, pos=0, type='Float',
+                                        val=value)
+                new_id += 1
+                dimension.append((create_action([
+                        ('change', param, new_param,
+                         function.vtType, function.real_id)]),))
+            actions.append(dimension)
+        return pipeline, actions
+
+    def get_values(self, pipeline):
+        return tuple(pipeline.modules[m_id].functions[0].params[0].strValue
+                     for m_id in (0, 1))
+
+    def test_iter_explore(self):
+        pipeline, actions = self.make_exploration()
+        explorer = ActionBasedParameterExploration()
+        self.assertEqual(explorer.count(actions + [[]]), 6)
+
+        # downstream dimension varies fastest
+        order = explorer.explore_order(pipeline, actions)
+        self.assertEqual(order, [0, 2, 4, 1, 3, 5])
+        points = list(explorer.iter_explore(pipeline, actions))
+        self.assertEqual([index for index, p, a in points], order)
+
+        # indices and actions match explore()'s ordering
+        pipelines, performed = explorer.explore(pipeline, actions)
+        for index, p, a in points:
+            expected = (['1.0', '2.0'][index % 2],
+                        ['3.0', '4.0', '5.0'][index // 2])
+            self.assertEqual(self.get_values(p), expected)
+            self.assertEqual(self.get_values(pipelines[index]), expected)
+            self.assertEqual(a, performed[index])
+            point, point_actions = explorer.explore_point(pipeline, actions,
+                                                          [], index)
+            self.assertEqual(self.get_values(point), expected)
+            self.assertEqual(point_actions, performed[index])
+        self.assertEqual(self.get_values(pipeline), ('0.0', '0.0'))
+
+    def test_parallel_points(self):
+        if not can_run_parallel():
+            self.skipTest("Needs os.fork()")
+        results = iter_parallel_points(lambda i: i * i, range(10), 2)
+        self.assertEqual(sorted(results), [(i, i * i) for i in xrange(10)])
+
 if __name__ == '__main__':
     unittest.main()
@@ -137,7 +137,12 @@ class Action(DBAction):
         _action.__class__ = Action
         for _annotation in _action.annotations:
             Annotation.convert(_annotation)
-        for _operation in _action.operations:
+        # operations that are not loaded yet get converted when they are read
+        if not _action.db_has_lazy_operations():
+            _action.db_operations_loaded()
+
+    def db_operations_loaded(self):
+        for _operation in self.operations:
             if _operation.vtType == 'add':
                 AddOp.convert(_operation)
             elif _operation.vtType == 'change':
@@ -2624,6 +2624,8 @@ class VistrailController(object):
 
         stop_on_error = getattr(get_vistrails_configuration(),
                                 'stopOnError')
+        parallel_workers = getattr(get_vistrails_configuration(),
+                                   'parallelWorkers')
         interpreter = get_default_interpreter()
         changed = False
         results = []
@@ -2649,6 +2651,7 @@ class VistrailController(object):
                       'sinks': sinks,
                       'extra_info': extra_info,
                       'stop_on_error': stop_on_error,
+                      'parallel_workers': parallel_workers,
                       }    
             if self.get_vistrail_variables():
                 kwargs['vistrail_variables'] = \
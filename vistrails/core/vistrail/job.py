@@ -44,11 +44,14 @@ from vistrails.core import debug
 from vistrails.core.modules.vistrails_module import NotCacheable, \
     ModuleError, ModuleSuspended
 
+from itertools import izip
 from uuid import uuid1
 
+import base64
 import datetime
 import getpass
 import json
+import threading
 import time
 import unittest
 import weakref
@@ -188,6 +191,13 @@ class JobMixin(object):
 
         JobHandle needs the following method:
           * finished(): returns True if the job is finished
+
+        Handles of jobs that can be checked together, for instance because
+        they run on the same queue, can also provide:
+          * batch_key(): returns a hashable value identifying the queue
+          * finished_batch(handles): returns a list of booleans telling
+            whether each job in the list is finished; it is called on one of
+            the handles with all the handles that have the same batch_key()
         """
         return None
 
@@ -226,6 +236,9 @@ class Workflow(object):
         self.jobs = jobs if jobs else {}
         # parent modules are stored as temporary exceptions
         self.parents = {}
+        # jobs that are not part of the current execution, see
+        # JobMonitor.resumeWorkflow()
+        self.skipped = set()
 
     def to_dict(self):
         wf = dict()
@@ -263,6 +276,7 @@ class Workflow(object):
         for job in self.jobs.itervalues():
             job.reset()
         self.parents = {}
+        self.skipped = set()
 
     def completed(self):
         """ Returns true if there are no suspended jobs
@@ -342,6 +356,99 @@ class Job(object):
         return True
 
 
+def is_done(handle):
+    """ is_done(handle: JobHandle) -> bool
+
+        A job is done when it reaches finished or failed state
+        val() is used by stable batchq branch
+    """
+    finished = handle.finished()
+    if hasattr(finished, 'val'):
+        finished = finished.val()
+    if finished:
+        return True
+
+    # FIXME : deprecate this, remove from RemoteQ
+    # finished should just return True here too
+    if hasattr(handle, 'failed'):
+        failed = handle.failed()
+        if hasattr(failed, 'val'):
+            failed = failed.val()
+        if failed:
+            return True
+    return False
+
+def batch_key(handle):
+    """ batch_key(handle: JobHandle) -> hashable
+
+        Returns the key of the group of handles this one can be checked with,
+        see JobMixin.job_get_handle()
+    """
+    if hasattr(handle, 'batch_key'):
+        key = handle.batch_key()
+        if key is not None:
+            return ('batch', key)
+    return ('handle', id(handle))
+
+def check_handles(handles):
+    """ check_handles(handles: dict) -> set
+
+        Checks the jobs of a dict of handles and returns the keys of those
+        that are done. Handles with the same batch_key() are checked with a
+        single finished_batch() call, e.g. one connection per server; the
+        others are checked one at a time. Errors are logged and the jobs are
+        considered still running.
+    """
+    done = set()
+    batches = {}
+    for key, handle in handles.iteritems():
+        batches.setdefault(batch_key(handle), []).append((key, handle))
+    singles = []
+    for (kind, _), batch in batches.iteritems():
+        if kind != 'batch':
+            singles.extend(batch)
+            continue
+        try:
+            results = batch[0][1].finished_batch([h for k, h in batch])
+        except Exception, e:
+            debug.warning("Error checking %d jobs at once, checking them "
+                          "separately" % len(batch), e)
+            singles.extend(batch)
+            continue
+        for (key, handle), finished in izip(batch, results):
+            if finished:
+                done.add(key)
+    for key, handle in singles:
+        try:
+            if is_done(handle):
+                done.add(key)
+        except Exception, e:
+            debug.warning("Error checking job %s" % key, e)
+    return done
+
+def resumable_sinks(workflow, pipeline):
+    """ resumable_sinks(workflow: Workflow, pipeline: Pipeline) -> list
+
+        Returns the sinks of the pipeline that don't depend on a job of the
+        workflow that is still running, or None if some of these jobs are not
+        modules of the pipeline (e.g. they run inside a group).
+    """
+    running = set(job.id for job in workflow.jobs.itervalues()
+                  if not job.finished and not job.ready)
+    blocked = set()
+    found = set()
+    for module_id in pipeline.modules:
+        signature = base64.b16encode(
+                pipeline.subpipeline_signature(module_id)).lower()
+        if signature in running:
+            found.add(signature)
+            blocked.add(module_id)
+            blocked.update(pipeline.graph.bfs(module_id))
+    if found != running:
+        return None
+    return [sink for sink in pipeline.graph.sinks() if sink not in blocked]
+
+
 class JobMonitor(object):
     """ Keeps a list of running jobs and the current job for a vistrail.
 
@@ -440,6 +547,7 @@ class JobMonitor(object):
                     delete = False
             if delete:
                 del self.jobs[job_id]
+                self.unwatchJob(job_id)
         if self.callback is not None and self.callback() is not None:
             self.callback().deleteWorkflow(id)
 
@@ -448,6 +556,7 @@ class JobMonitor(object):
             deletes a job from all workflows
         """
         del self.jobs[id]
+        self.unwatchJob(id)
         for wf in self.workflows.itervalues():
             if id in wf.jobs:
                 del wf.jobs[id]
@@ -475,6 +584,29 @@ class JobMonitor(object):
         if self.callback is not None and self.callback() is not None:
             self.callback().startWorkflow(workflow)
 
+    def resumeWorkflow(self, workflow, pipeline):
+        """ resumeWorkflow(workflow: Workflow, pipeline: Pipeline) -> list
+
+            Starts the workflow to resume only the jobs that completed, and
+            returns the sinks of the pipeline to execute. Jobs that are still
+            running are neither checked nor assumed finished. Returns an
+            empty list and doesn't start the workflow if no sink can be
+            resumed, and all the sinks if the running jobs can't be located.
+
+        """
+        sinks = resumable_sinks(workflow, pipeline)
+        if sinks is None:
+            skipped = set()
+            sinks = pipeline.graph.sinks()
+        elif not sinks:
+            return []
+        else:
+            skipped = set(job.id for job in workflow.jobs.itervalues()
+                          if not job.finished and not job.ready)
+        self.startWorkflow(workflow)
+        workflow.skipped = skipped
+        return sinks
+
     def addJobRec(self, obj, parent_id=None):
         workflow = self.currentWorkflow()
         id = obj.module.signature
@@ -488,9 +620,10 @@ class JobMonitor(object):
             workflow.jobs[id].mark()
             # trigger job update
             self.addJob(id, workflow.jobs[id].parameters)
-            return
-        # this is a new old-style job that we need to add
-        self.addJob(id, {'__message__': obj.msg}, obj.name)
+        else:
+            # this is a new old-style job that we need to add
+            self.addJob(id, {'__message__': obj.msg}, obj.name)
+        self.watchJob(id, obj.handle)
 
     def finishWorkflow(self):
         """ finish_job() -> None
@@ -514,7 +647,8 @@ class JobMonitor(object):
 
             # Assume all unfinished jobs that were not updated are now finished
             for job in workflow.jobs.values():
-                if not job.finished and not job.updated:
+                if (not job.finished and not job.updated and
+                        job.id not in workflow.skipped):
                     job.finish()
             if self.callback is not None and self.callback() is not None:
                 self.callback().finishWorkflow(workflow)
@@ -540,6 +674,8 @@ class JobMonitor(object):
         else:
             job = Job(id, params, name, finished=finished)
             self.jobs[id] = job
+        if finished:
+            self.unwatchJob(id)
 
         workflow = self.currentWorkflow()
         if workflow:
@@ -578,20 +714,26 @@ class JobMonitor(object):
                                       handle=handle)
         job = self.getJob(id)
         if self.callback is not None and self.callback() is not None:
-            self.callback().checkJob(module, id, handle)
+            try:
+                self.callback().checkJob(module, id, handle)
+            except ModuleSuspended:
+                self.watchJob(id, handle)
+                raise
             return
 
         conf = get_vistrails_configuration()
         interval = conf.jobCheckInterval
         if interval and not conf.jobAutorun:
-            if handle:
+            if handle and not self.isDone(handle):
                 # wait for module to complete
+                watcher = get_job_watcher()
+                watcher.watch(self, id, handle)
                 try:
-                    while not self.isDone(handle):
-                        time.sleep(interval)
+                    while not watcher.wait(self, id, interval):
                         print ("Waiting for job: %s,"
                                "press Ctrl+C to suspend") % job.name
                 except KeyboardInterrupt:
+                    watcher.unwatch(self, id)
                     raise ModuleSuspended(module, 'Interrupted by user, job'
                                           ' is still running', handle=handle)
         else:
@@ -629,23 +771,244 @@ class JobMonitor(object):
         """ isDone(self, monitor) -> bool
 
             A job is done when it reaches finished or failed state
-            val() is used by stable batchq branch
         """
-        finished = handle.finished()
-        if hasattr(finished, 'val'):
-            finished = finished.val()
-        if finished:
-            return True
+        return is_done(handle)
+
+    def checkHandles(self, handles):
+        """ checkHandles(handles: dict) -> set
 
-        # FIXME : deprecate this, remove from RemoteQ
-        # finished should just return True here too
-        if hasattr(handle, 'failed'):
-            failed = handle.failed()
-            if hasattr(failed, 'val'):
-                failed = failed.val()
-            if failed:
-                return True
-        return False
+            Checks a dict of job ids to handles in batches, returns the ids of
+            the jobs that are done
+        """
+        return check_handles(handles)
+
+    def watchJob(self, id, handle):
+        """ watchJob(id: str, handle: JobHandle) -> None
+
+            Polls the job in the background if something monitors this
+            JobMonitor, jobsReady() is called once it is done
+        """
+        if handle and self.callback is not None and \
+                self.callback() is not None:
+            get_job_watcher().watch(self, id, handle)
+
+    def unwatchJob(self, id):
+        """ unwatchJob(id: str) -> None
+
+            Stops polling the job in the background
+        """
+        if _job_watcher is not None:
+            _job_watcher.unwatch(self, id)
+
+    def jobsReady(self, ids):
+        """ jobsReady(ids: list) -> None
+
+            Called by the JobWatcher, possibly from its thread, when jobs
+            are done
+        """
+        for id in ids:
+            job = self.getJob(id)
+            if job is not None:
+                job.ready = True
+        if self.callback is not None and self.callback() is not None:
+            self.callback().jobsReady(ids)
+
+
+class JobWatcher(object):
+    """ Polls the handles of suspended jobs from a background thread.
+
+    Jobs are checked with check_handles(), so the ones running on the same
+    queue take a single request. Each batch has its own delay, which starts at
+    jobMinCheckInterval and doubles every time none of its jobs completed, up
+    to jobCheckInterval. When jobs are done, they are no longer watched and
+    JobMonitor.jobsReady() is called.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        # (id(monitor), job id) -> (weakref(monitor), job id, handle, batch)
+        self._watched = {}
+        # batch key -> (delay, time of next check)
+        self._delays = {}
+        self._thread = None
+        self._stopping = False
+
+    def intervals(self):
+        """ intervals() -> (int, int)
+
+            Returns the first and the maximum delay between checks, the
+            latter being 0 if jobs are only checked on request
+        """
+        conf = get_vistrails_configuration()
+        maximum = max(conf.jobCheckInterval, 0)
+        minimum = max(conf.jobMinCheckInterval, 1)
+        if maximum:
+            minimum = min(minimum, maximum)
+        return minimum, maximum
+
+    def watch(self, monitor, job_id, handle):
+        """ watch(monitor: JobMonitor, job_id: str, handle: JobHandle)
+              -> None
+
+            Starts polling a job. This resets the delay of its batch.
+        """
+        batch = batch_key(handle)
+        minimum, maximum = self.intervals()
+        with self._lock:
+            self._watched[(id(monitor), job_id)] = (weakref.ref(monitor),
+                                                    job_id, handle, batch)
+            self._delays[batch] = (minimum, time.time() + minimum)
+            self._changed.notify_all()
+
+    def unwatch(self, monitor, job_id):
+        """ unwatch(monitor: JobMonitor, job_id: str) -> None
+
+        """
+        with self._lock:
+            entry = self._watched.pop((id(monitor), job_id), None)
+            if entry is not None:
+                self._forget_batches()
+                self._changed.notify_all()
+
+    def is_watched(self, monitor, job_id):
+        with self._lock:
+            return (id(monitor), job_id) in self._watched
+
+    def _forget_batches(self):
+        batches = set(entry[3] for entry in self._watched.itervalues())
+        for batch in self._delays.keys():
+            if batch not in batches:
+                del self._delays[batch]
+
+    def poll(self, now=None, force=False):
+        """ poll(now: float, force: bool) -> list
+
+            Checks the batches that are due, or all of them if force is True,
+            and returns the (monitor, job id) pairs of the jobs that are done
+        """
+        if now is None:
+            now = time.time()
+        with self._lock:
+            due = set(batch
+                      for batch, (delay, next_check) in self._delays.iteritems()
+                      if force or next_check <= now)
+            handles = dict((key, entry[2])
+                           for key, entry in self._watched.iteritems()
+                           if entry[3] in due)
+        if not handles:
+            return []
+        done = check_handles(handles)
+
+        minimum, maximum = self.intervals()
+        finished = []
+        with self._lock:
+            completed = set(self._watched[key][3] for key in done
+                            if key in self._watched)
+            for batch in due:
+                if batch not in self._delays:
+                    continue
+                if batch in completed:
+                    delay = minimum
+                else:
+                    delay = self._delays[batch][0] * 2
+                    if maximum:
+                        delay = min(delay, maximum)
+                self._delays[batch] = (delay, now + delay)
+            for key in done:
+                entry = self._watched.pop(key, None)
+                if entry is not None and entry[0]() is not None:
+                    finished.append((entry[0](), entry[1]))
+            # drop jobs whose JobMonitor is gone
+            for key, entry in self._watched.items():
+                if entry[0]() is None:
+                    del self._watched[key]
+            self._forget_batches()
+            self._changed.notify_all()
+
+        monitors = {}
+        for monitor, job_id in finished:
+            monitors.setdefault(monitor, []).append(job_id)
+        for monitor, job_ids in monitors.iteritems():
+            monitor.jobsReady(job_ids)
+        return finished
+
+    def wait(self, monitor, job_id, timeout):
+        """ wait(monitor: JobMonitor, job_id: str, timeout: float) -> bool
+
+            Waits for a watched job to be done, returns False if it is still
+            watched after timeout seconds
+        """
+        key = (id(monitor), job_id)
+        end = time.time() + timeout
+        with self._lock:
+            while key in self._watched:
+                remaining = end - time.time()
+                if remaining <= 0:
+                    return False
+                self._changed.wait(remaining)
+        return True
+
+    def wakeup(self):
+        """ wakeup() -> None
+
+            Makes the thread read the configuration again
+        """
+        with self._lock:
+            self._changed.notify_all()
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run,
+                                            name='JobWatcher')
+            self._thread.daemon = True
+            self._thread.start()
+
+    def stop(self):
+        with self._lock:
+            thread, self._thread = self._thread, None
+            self._stopping = True
+            self._changed.notify_all()
+        if thread is not None:
+            thread.join()
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if self._stopping:
+                    return
+                minimum, maximum = self.intervals()
+                if maximum and self._delays:
+                    timeout = (min(next_check for delay, next_check
+                                   in self._delays.itervalues()) -
+                               time.time())
+                else:
+                    timeout = None
+                if timeout is None or timeout > 0:
+                    self._changed.wait(timeout)
+                if self._stopping:
+                    return
+            if maximum:
+                try:
+                    self.poll()
+                except Exception, e:
+                    debug.unexpected_exception(e)
+
+_job_watcher = None
+
+def get_job_watcher():
+    """ get_job_watcher() -> JobWatcher
+
+        Returns the JobWatcher shared by all the vistrails, starting its
+        thread the first time
+    """
+    global _job_watcher
+    if _job_watcher is None:
+        _job_watcher = JobWatcher()
+        _job_watcher.start()
+    return _job_watcher
 
 
 ###############################################################################
@@ -688,3 +1051,125 @@ class TestJob(unittest.TestCase):
         self.assertIn(workflow2.id, jm.workflows)
         self.assertEqual(workflow1, jm.workflows[workflow1.id])
         self.assertEqual(workflow2, jm.workflows[workflow2.id])
+
+    def test_check_handles(self):
+        class Handle(object):
+            def __init__(self, done):
+                self.done = done
+            def finished(self):
+                return self.done
+        class QueueHandle(Handle):
+            calls = []
+            def __init__(self, queue, done):
+                Handle.__init__(self, done)
+                self.queue = queue
+            def finished(self):
+                raise AssertionError("should be checked in batch")
+            def batch_key(self):
+                return self.queue
+            def finished_batch(self, handles):
+                self.calls.append(self.queue)
+                if self.queue == 'broken':
+                    raise IOError
+                return [h.done for h in handles]
+
+        handles = {'a': QueueHandle('q1', True),
+                   'b': QueueHandle('q1', False),
+                   'c': QueueHandle('q2', True),
+                   'd': Handle(True),
+                   'e': Handle(False)}
+        self.assertEqual(check_handles(handles), set(['a', 'c', 'd']))
+        self.assertEqual(sorted(QueueHandle.calls), ['q1', 'q2'])
+
+        # If a batch fails, its handles are checked one at a time
+        broken = QueueHandle('broken', True)
+        broken.finished = lambda: True
+        self.assertEqual(check_handles({'f': broken}), set(['f']))
+
+    def test_watcher_backoff(self):
+        class Handle(object):
+            checks = 0
+            done = False
+            def finished(self):
+                self.checks += 1
+                return self.done
+
+        conf = get_vistrails_configuration()
+        old_intervals = conf.jobMinCheckInterval, conf.jobCheckInterval
+        conf.jobMinCheckInterval, conf.jobCheckInterval = 10, 60
+        try:
+            jm = JobMonitor()
+            jm.addJob('job', {})
+            handle = Handle()
+            watcher = JobWatcher()
+            start = time.time()
+            watcher.watch(jm, 'job', handle)
+            # checked after 10s, then 20s, 40s and 60s
+            checks = []
+            for t in xrange(1, 200):
+                watcher.poll(start + t + 0.5)
+                checks.append(handle.checks)
+            self.assertEqual([t + 1 for t in xrange(1, 199)
+                              if checks[t] != checks[t - 1]],
+                             [10, 30, 70, 130, 190])
+            self.assertFalse(jm.getJob('job').ready)
+
+            handle.done = True
+            self.assertEqual(watcher.poll(force=True), [(jm, 'job')])
+            self.assertTrue(jm.getJob('job').ready)
+            self.assertFalse(watcher.is_watched(jm, 'job'))
+            self.assertTrue(watcher.wait(jm, 'job', 0))
+        finally:
+            conf.jobMinCheckInterval, conf.jobCheckInterval = old_intervals
+
+    def test_resume_workflow(self):
+        from vistrails.core.modules.basic_modules import identifier as basic
+        from vistrails.core.vistrail.connection import Connection
+        from vistrails.core.vistrail.module import Module
+        from vistrails.core.vistrail.pipeline import Pipeline
+        from vistrails.core.vistrail.port import Port
+
+        # String -> StandardOutput and Integer -> StandardOutput
+        modules = [Module(id=i, package=basic, name=name)
+                   for i, name in [(1, 'String'), (2, 'Integer'),
+                                   (3, 'StandardOutput'),
+                                   (4, 'StandardOutput')]]
+        connections = [
+            Connection(id=i, ports=[
+                Port(id=i * 2, type='source', moduleId=src,
+                     moduleName=name, name='value',
+                     signature='(%s:%s)' % (basic, name)),
+                Port(id=i * 2 + 1, type='destination', moduleId=dst,
+                     moduleName='StandardOutput', name='value',
+                     signature='(%s:Module)' % basic)])
+            for i, (src, dst, name) in [(1, (1, 3, 'String')),
+                                        (2, (2, 4, 'Integer'))]]
+        pipeline = Pipeline(modules=modules, connections=connections)
+        running, ready = [base64.b16encode(
+                              pipeline.subpipeline_signature(i)).lower()
+                          for i in (1, 2)]
+
+        jm = JobMonitor()
+        workflow = Workflow(1)
+        workflow.jobs[running] = Job(running, {})
+        workflow.jobs[ready] = Job(ready, {})
+        jm.addWorkflow(workflow)
+
+        # Nothing to resume
+        self.assertEqual(jm.resumeWorkflow(workflow, pipeline), [])
+        self.assertIsNone(jm.currentWorkflow())
+
+        # Only the chain of the completed job is executed
+        workflow.jobs[ready].ready = True
+        self.assertEqual(jm.resumeWorkflow(workflow, pipeline), [4])
+        self.assertIs(jm.currentWorkflow(), workflow)
+        jm.finishWorkflow()
+        self.assertFalse(workflow.jobs[running].finished)
+        self.assertTrue(workflow.jobs[ready].finished)
+
+        # Jobs that are not in the pipeline cause a full execution
+        workflow.jobs['other'] = Job('other', {})
+        self.assertEqual(sorted(jm.resumeWorkflow(workflow, pipeline)),
+                         [3, 4])
+        self.assertEqual(workflow.skipped, set())
+        jm.finishWorkflow()
@@ -44,6 +44,7 @@ class ModuleControlParam(DBControlParameter):
 
     # Valid control parameters should be put here
     LOOP_KEY = 'loop_type' # How input lists are combined
+    LOOP_WORKERS_KEY = 'loop_workers' # Number of concurrent list iterations
     WHILE_COND_KEY = 'while_cond' # Run module in a while loop
     WHILE_INPUT_KEY = 'while_input' # input port for forwarded value
     WHILE_OUTPUT_KEY = 'while_output' # output port for forwarded value
@@ -128,6 +128,7 @@ class Pipeline(DBWorkflow):
         self.set_defaults()
 
     def set_defaults(self, other=None):
+        self._function_modules = None
         if other is None:
             self.is_valid = False
             self.aliases = Bidict()
@@ -262,6 +263,7 @@ class Pipeline(DBWorkflow):
         self._subpipeline_signatures = Bidict()
         self._module_signatures = Bidict()
         self._connection_signatures = Bidict()
+        self._function_modules = None
 
     def get_tmp_id(self, type):
         """get_tmp_id(type: str) -> long
@@ -367,13 +369,21 @@ class Pipeline(DBWorkflow):
 #             m.abstraction = self.abstraction_map[m.abstraction_id]
         self.db_add_object(m)
         self.graph.add_vertex(m.id)
+        self.invalidate_signatures([m.id])
+        if self._function_modules is not None:
+            for function in m.functions:
+                self._function_modules[function.real_id] = m.id
 
     def change_module(self, old_id, m, *args):
         if not self.has_module_with_id(old_id):
             raise VistrailsInternalError("module %s doesn't exist" % old_id)
+        self.invalidate_signatures([old_id])
         self.db_change_object(old_id, m)
         self.graph.delete_vertex(old_id)
         self.graph.add_vertex(m.id)
+        if self._function_modules is not None:
+            for function in m.functions:
+                self._function_modules[function.real_id] = m.id
 
     def delete_module(self, id, *args):
         """delete_module(id:int) -> None 
@@ -382,6 +392,7 @@ class Pipeline(DBWorkflow):
         """
         if not self.has_module_with_id(id):
             raise VistrailsInternalError("id missing in modules")
+        self.invalidate_signatures([id])
 
         # we're hiding the necessary operations by doing this!
         for (_, conn_id) in self.graph.adjacency_list[id][:]:
@@ -392,10 +403,6 @@ class Pipeline(DBWorkflow):
         # self.modules.pop(id)
         self.db_delete_object(id, Module.vtType)
         self.graph.delete_vertex(id)
-        if id in self._module_signatures:
-            del self._module_signatures[id]
-        if id in self._subpipeline_signatures:
-            del self._subpipeline_signatures[id]
 
     def add_connection(self, c, *args):
         """add_connection(c: Connection) -> None 
@@ -410,6 +417,8 @@ class Pipeline(DBWorkflow):
             assert(c.sourceId != c.destinationId)        
             self.graph.add_edge(c.sourceId, c.destinationId, c.id)
             self.ensure_connection_specs([c.id])
+            self.invalidate_signatures([c.destinationId],
+                                       module_changed=False)
 
             source_name = c.source.name
             output_ports = self.modules[c.sourceId].connected_output_ports
@@ -433,6 +442,8 @@ class Pipeline(DBWorkflow):
 
         old_conn = self.connections[old_id]
         if old_conn.source is not None and old_conn.destination is not None:
+            self.invalidate_signatures([old_conn.destinationId],
+                                       module_changed=False)
             self.graph.delete_edge(old_conn.sourceId, old_conn.destinationId,
                                    old_conn.id)
             if self.graph.out_degree(old_conn.sourceId) < 1:
@@ -450,6 +461,8 @@ class Pipeline(DBWorkflow):
             assert(c.sourceId != c.destinationId)
             self.graph.add_edge(c.sourceId, c.destinationId, c.id)
             self.ensure_connection_specs([c.id])
+            self.invalidate_signatures([c.destinationId],
+                                       module_changed=False)
             self.modules[c.sourceId].connected_output_ports.add(c.source.name)
             self.modules[c.destinationId].connected_input_ports.add(
                 c.destination.name)
@@ -468,6 +481,8 @@ class Pipeline(DBWorkflow):
         if conn.source is not None and conn.destination is not None and \
                 (conn.destinationId, conn.id) in \
                 self.graph.edges_from(conn.sourceId):
+            self.invalidate_signatures([conn.destinationId],
+                                       module_changed=False)
             self.graph.delete_edge(conn.sourceId, conn.destinationId, conn.id)
 
             c = conn
@@ -482,8 +497,48 @@ class Pipeline(DBWorkflow):
         if id in self._connection_signatures:
             del self._connection_signatures[id]
         
+    def add_function(self, function, parent_type, parent_id):
+        self.db_add_object(function, parent_type, parent_id)
+        self.invalidate_signatures([parent_id])
+        if self._function_modules is not None:
+            self._function_modules[function.real_id] = parent_id
+
+    def delete_function(self, function_id, function_type, parent_type,
+                        parent_id):
+        self.db_delete_object(function_id, function_type,
+                              parent_type, parent_id)
+        self.invalidate_signatures([parent_id])
+        if self._function_modules is not None:
+            self._function_modules.pop(function_id, None)
+
+    def change_function(self, old_function_id, function, parent_type,
+                        parent_id):
+        self.db_change_object(old_function_id, function,
+                              parent_type, parent_id)
+        self.invalidate_signatures([parent_id])
+        if self._function_modules is not None:
+            self._function_modules.pop(old_function_id, None)
+            self._function_modules[function.real_id] = parent_id
+
+    def add_controlParameter(self, control_param, parent_type, parent_id):
+        self.db_add_object(control_param, parent_type, parent_id)
+        self.invalidate_signatures([parent_id])
+
+    def delete_controlParameter(self, control_param_id, control_param_type,
+                                parent_type, parent_id):
+        self.db_delete_object(control_param_id, control_param_type,
+                              parent_type, parent_id)
+        self.invalidate_signatures([parent_id])
+
+    def change_controlParameter(self, old_control_param_id, control_param,
+                                parent_type, parent_id):
+        self.db_change_object(old_control_param_id, control_param,
+                              parent_type, parent_id)
+        self.invalidate_signatures([parent_id])
+
     def add_parameter(self, param, parent_type, parent_id):
         self.db_add_object(param, parent_type, parent_id)
+        self.invalidate_function_signatures(parent_id)
         if not self.has_alias(param.alias):
             self.change_alias(param.alias, 
                               param.vtType, 
@@ -495,6 +550,7 @@ class Pipeline(DBWorkflow):
     def delete_parameter(self, param_id, param_type, parent_type, parent_id):
         self.db_delete_object(param_id, ModuleParam.vtType,
                               parent_type, parent_id)
+        self.invalidate_function_signatures(parent_id)
         self.remove_alias(ModuleParam.vtType, param_id, parent_type, 
                           parent_id, None)
 
@@ -503,6 +559,7 @@ class Pipeline(DBWorkflow):
                           parent_type, parent_id, None)
         self.db_change_object(old_param_id, param,
                               parent_type, parent_id)
+        self.invalidate_function_signatures(parent_id)
         if not self.has_alias(param.alias):
             self.change_alias(param.alias, 
                               param.vtType, 
@@ -519,6 +576,8 @@ class Pipeline(DBWorkflow):
             self.graph.add_edge(connection.sourceId, 
                                 connection.destinationId, 
                                 connection.id)
+            self.invalidate_signatures([connection.destinationId],
+                                       module_changed=False)
             c = connection
             source_name = c.source.name
             output_ports = self.modules[c.sourceId].connected_output_ports
@@ -535,6 +594,8 @@ class Pipeline(DBWorkflow):
     def delete_port(self, port_id, port_type, parent_type, parent_id):
         conn = self.connections[parent_id]
         if len(conn.ports) >= 2:
+            self.invalidate_signatures([conn.destinationId],
+                                       module_changed=False)
             self.graph.delete_edge(conn.sourceId, 
                                    conn.destinationId, 
                                    conn.id)
@@ -552,6 +613,8 @@ class Pipeline(DBWorkflow):
     def change_port(self, old_port_id, port, parent_type, parent_id):
         connection = self.connections[parent_id]
         if len(connection.ports) >= 2:
+            self.invalidate_signatures([connection.destinationId],
+                                       module_changed=False)
             source_list = self.graph.adjacency_list[connection.sourceId]
             source_list.remove((connection.destinationId, connection.id))
             dest_list = \
@@ -559,6 +622,8 @@ class Pipeline(DBWorkflow):
             dest_list.remove((connection.sourceId, connection.id))
         self.db_change_object(old_port_id, port, parent_type, parent_id)
         if len(connection.ports) >= 2:
+            self.invalidate_signatures([connection.destinationId],
+                                       module_changed=False)
             source_list = self.graph.adjacency_list[connection.sourceId]
             source_list.append((connection.destinationId, connection.id))
             dest_list = \
@@ -568,6 +633,7 @@ class Pipeline(DBWorkflow):
     def add_port_to_registry(self, portSpec, moduleId):
         m = self.get_module_by_id(moduleId)
         m.add_port_spec(portSpec)
+        self.invalidate_signatures([moduleId])
 
     def add_portSpec(self, port_spec, parent_type, parent_id):
         # self.db_add_object(port_spec, parent_type, parent_id)
@@ -577,6 +643,7 @@ class Pipeline(DBWorkflow):
         m = self.get_module_by_id(moduleId)
         portSpec = m.port_specs[id]
         m.delete_port_spec(portSpec)
+        self.invalidate_signatures([moduleId])
 
     def delete_portSpec(self, spec_id, portSpec_type, parent_type, parent_id):
         self.delete_port_from_registry(spec_id, parent_id)
@@ -825,15 +892,77 @@ class Pipeline(DBWorkflow):
     def has_connection_signature(self, signature):
         return signature in self._connection_signatures.inverse
 
+    def invalidate_signatures(self, module_ids, module_changed=True):
+        """invalidate_signatures(module_ids: list of ids,
+                                 module_changed: bool) -> None
+        Forgets the subpipeline signatures of the given modules and of the
+        modules downstream of them, along with the signatures of their
+        connections. If module_changed is True, the signatures of the given
+        modules themselves are forgotten too (their functions, parameters
+        or port specs changed).
+
+        Operations performed on the pipeline call this automatically; it
+        has to be called if modules are changed directly."""
+        if module_changed:
+            for module_id in module_ids:
+                if module_id in self._module_signatures:
+                    del self._module_signatures[module_id]
+        to_visit = [m for m in module_ids if m in self.graph.vertices]
+        visited = set()
+        while to_visit:
+            module_id = to_visit.pop()
+            if module_id in visited:
+                continue
+            visited.add(module_id)
+            if module_id not in self._subpipeline_signatures:
+                # Nothing downstream can have been computed
+                continue
+            del self._subpipeline_signatures[module_id]
+            for (_, conn_id) in self.graph.edges_to(module_id):
+                if conn_id in self._connection_signatures:
+                    del self._connection_signatures[conn_id]
+            for (dest_id, conn_id) in self.graph.edges_from(module_id):
+                if conn_id in self._connection_signatures:
+                    del self._connection_signatures[conn_id]
+                to_visit.append(dest_id)
+
+    def function_module_id(self, function_id):
+        """function_module_id(function_id: int) -> int
+        Returns the id of the module that has the given function, or None.
+
+        Uses an index that is built on first use and kept current by the
+        module and function operations; it is rebuilt if it turns out to
+        be stale (modules edited directly)."""
+        if self._function_modules is not None:
+            module_id = self._function_modules.get(function_id)
+            if module_id in self.modules and \
+                    self.modules[module_id].has_function_with_real_id(
+                        function_id):
+                return module_id
+        self._function_modules = {}
+        for module in self.modules.itervalues():
+            for function in module.functions:
+                self._function_modules[function.real_id] = module.id
+        return self._function_modules.get(function_id)
+
+    def invalidate_function_signatures(self, function_id):
+        """invalidate_function_signatures(function_id: int) -> None
+        Forgets the signatures that depend on the given function, see
+        invalidate_signatures()."""
+        module_id = self.function_module_id(function_id)
+        if module_id is not None:
+            self.invalidate_signatures([module_id])
+
     def refresh_signatures(self):
-        self._connection_signatures = {}
-        self._subpipeline_signatures = {}
-        self._module_signatures = {}
+        self._connection_signatures = Bidict()
+        self._subpipeline_signatures = Bidict()
+        self._module_signatures = Bidict()
         self.compute_signatures()
 
     def compute_signatures(self):
         """compute_signatures(): compute all module and subpipeline signatures
-        for this pipeline."""
+        for this pipeline. Signatures that are already known (and haven't
+        been invalidated since) are not computed again."""
         for i in self.modules.iterkeys():
             self.subpipeline_signature(i)
         for c in self.connections.iterkeys():
@@ -1457,6 +1586,63 @@ class TestPipeline(unittest.TestCase):
         self.assertNotEquals(c_sig_size_before, c_sig_size_after)
         self.assertNotEquals(p_sig_size_before, p_sig_size_after)
 
+    def test_incremental_signatures(self):
+        """Only the signatures downstream of a change are recomputed."""
+        basic_pkg = get_vistrails_basic_pkg_id()
+        id_scope = IdScope()
+        def string_module(value):
+            param = ModuleParam(id=id_scope.getNewId(ModuleParam.vtType),
+                                type='String', val=value)
+            function = ModuleFunction(
+                    id=id_scope.getNewId(ModuleFunction.vtType),
+                    name='value', parameters=[param])
+            return Module(id=id_scope.getNewId(Module.vtType),
+                          package=basic_pkg, name='String',
+                          functions=[function])
+        def connection(src, dst, dst_port):
+            source = Port(id=id_scope.getNewId(Port.vtType),
+                          type='source', moduleId=src.id,
+                          moduleName=src.name, name='value',
+                          signature='(%s:String)' % basic_pkg)
+            destination = Port(id=id_scope.getNewId(Port.vtType),
+                               type='destination', moduleId=dst.id,
+                               moduleName=dst.name, name=dst_port,
+                               signature='(%s:String)' % basic_pkg)
+            return Connection(id=id_scope.getNewId(Connection.vtType),
+                              ports=[source, destination])
+        m1 = string_module('a')
+        m2 = string_module('b')
+        m3 = Module(id=id_scope.getNewId(Module.vtType),
+                    package=basic_pkg, name='ConcatenateString')
+        p = Pipeline(id=id_scope.getNewId(Pipeline.vtType),
+                     modules=[m1, m2, m3],
+                     connections=[connection(m1, m3, 'str1'),
+                                  connection(m2, m3, 'str2')])
+        p.build_index()
+        p.compute_signatures()
+        sigs = dict((i, p.subpipeline_signature(i)) for i in p.modules)
+
+        function = m1.functions[0]
+        new_param = ModuleParam(id=id_scope.getNewId(ModuleParam.vtType),
+                                type='String', val='c')
+        p.change_parameter(function.params[0].real_id, new_param,
+                           ModuleFunction.vtType, function.real_id)
+        self.assertNotIn(m1.id, p._module_signatures)
+        self.assertNotIn(m3.id, p._subpipeline_signatures)
+        self.assertEqual(p._subpipeline_signatures[m2.id], sigs[m2.id])
+        self.assertEqual(len(p._connection_signatures), 0)
+        self.assertEqual(p.function_module_id(function.real_id), m1.id)
+        self.assertIsNone(p.function_module_id(-1))
+
+        p.compute_signatures()
+        self.assertNotEqual(p.subpipeline_signature(m1.id), sigs[m1.id])
+        self.assertNotEqual(p.subpipeline_signature(m3.id), sigs[m3.id])
+        incremental = dict((i, p.subpipeline_signature(i)) for i in p.modules)
+        p.refresh_signatures()
+        self.assertEqual(
+                incremental,
+                dict((i, p.subpipeline_signature(i)) for i in p.modules))
+
     def test_delete_connections(self):
         p = self.create_default_pipeline()
         p.delete_connection(0)
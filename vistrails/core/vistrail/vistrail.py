@@ -37,6 +37,7 @@ from __future__ import division
 
 from vistrails.core.paramexplore.paramexplore import ParameterExploration
 
+from collections import OrderedDict
 import copy
 import datetime
 import getpass
@@ -83,6 +84,11 @@ class Vistrail(DBVistrail):
 
     self.actionMap: dictionary from version number to action object.
 
+    self.checkpoint_interval, self.max_checkpoints: deep versions are
+    materialized from checkpoints, pipelines kept every checkpoint_interval
+    actions along the paths that were requested. At most max_checkpoints
+    of them are kept, the least recently used being dropped first.
+
     Simple use cases:
 
     To get a version number given a tag name, use
@@ -90,6 +96,9 @@ class Vistrail(DBVistrail):
 
     """
 
+    checkpoint_interval = 100
+    max_checkpoints = 20
+
     def __init__(self, locator=None):
         DBVistrail.__init__(self)
 
@@ -121,6 +130,9 @@ class Vistrail(DBVistrail):
             self.is_abstraction = other.is_abstraction
             self.locator = other.locator
 
+        # materialized pipelines, version -> Pipeline, in LRU order
+        self._checkpoints = OrderedDict()
+
         # object to keep explicit expanded 
         # version tree always updated
         self.tree = ExplicitExpandedVersionTree(self)
@@ -328,10 +340,64 @@ class Vistrail(DBVistrail):
         """getPipelineVersionNumber(version:int) -> Pipeline
         Returns a pipeline given a version number.
 
+        The pipeline is built from the closest checkpointed ancestor, and
+        new checkpoints are stored every checkpoint_interval actions along
+        the way.
+
         """
-        workflow = vistrails.core.db.io.get_workflow(self, version)
+        interval = self.checkpoint_interval
+        if (not interval or self.max_checkpoints <= 0 or
+                not self.db_has_action_with_id(version)):
+            return vistrails.core.db.io.get_workflow(self, version)
+
+        # Walk up to the closest checkpoint
+        path = []
+        base = version
+        while base != 0 and base not in self._checkpoints:
+            path.append(base)
+            base = self.db_get_action_by_id(base).db_prevId
+        path.reverse()
+        if base == 0 and len(path) < interval:
+            return vistrails.core.db.io.get_workflow(self, version)
+
+        workflow = None
+        if base != 0:
+            workflow = copy.copy(self._checkpoints[base])
+            # Mark as recently used
+            self._checkpoints[base] = self._checkpoints.pop(base)
+        for i in xrange(interval - 1, len(path), interval):
+            checkpoint = path[i]
+            if workflow is None:
+                workflow = vistrails.core.db.io.get_workflow(self, checkpoint)
+            else:
+                workflow.perform_action(self.general_action_chain(base,
+                                                                  checkpoint))
+            self.add_checkpoint(checkpoint, workflow)
+            base = checkpoint
+        if base != version:
+            workflow.perform_action(self.general_action_chain(base, version))
+        workflow.db_id = version
+        workflow.db_vistrailId = self.db_id
         return workflow
 
+    def add_checkpoint(self, version, workflow):
+        """add_checkpoint(version: int, workflow: Pipeline) -> None
+        Keeps a copy of the pipeline for that version, used to materialize
+        its descendants.
+
+        """
+        self._checkpoints.pop(version, None)
+        self._checkpoints[version] = copy.copy(workflow)
+        while len(self._checkpoints) > self.max_checkpoints:
+            self._checkpoints.popitem(last=False)
+
+    def clear_checkpoints(self):
+        """clear_checkpoints() -> None
+        Drops the materialized pipelines kept by getPipelineVersionNumber.
+
+        """
+        self._checkpoints.clear()
+
     def get_pipeline_diff_with_connections(self, v1, v2):
         """like get_pipeline_diff but returns connection info
         Keyword arguments:
@@ -1384,5 +1450,31 @@ class TestVistrail(unittest.TestCase):
         do_test('/tests/resources/dummy.xml', XMLFileLocator)
         do_test('/tests/resources/terminator.vt', FileLocator)
 
+    def test_checkpoints(self):
+        """Pipelines built from checkpoints match the full replay."""
+        from vistrails.core.db.locator import FileLocator
+        import vistrails.core.system
+        v = FileLocator(vistrails.core.system.vistrails_root_directory() +
+                        '/tests/resources/terminator.vt').load()
+        if not isinstance(v, Vistrail):
+            v = v.vistrail
+        v.checkpoint_interval = 3
+        v.max_checkpoints = 4
+        versions = sorted(v.actionMap.keys(), reverse=True)[:10]
+        for version in versions + versions:
+            p = v.getPipeline(version)
+            p2 = vistrails.core.db.io.get_workflow(v, version)
+            self.assertEqual(p, p2)
+            self.assertEqual(p.db_id, version)
+            self.assertLessEqual(len(v._checkpoints), 4)
+        self.assertTrue(v._checkpoints)
+
+        # Checkpoints don't share state with the returned pipelines
+        p = v.getPipeline(versions[0])
+        for module_id in p.modules.keys():
+            p.delete_module(module_id)
+        self.assertEqual(v.getPipeline(versions[0]),
+                         vistrails.core.db.io.get_workflow(v, versions[0]))
+
 if __name__ == '__main__':
     unittest.main()
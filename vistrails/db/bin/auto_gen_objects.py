@@ -348,6 +348,13 @@ class Object(object):
     def getChildren(self):
         return 'db_children'
 
+    def shouldUseSlots(self):
+        try:
+            return self.params['slots'] != 'false'
+        except KeyError:
+            pass
+        return True
+
     def getKey(self):
         for property in self.properties:
             if property.isPrimaryKey():
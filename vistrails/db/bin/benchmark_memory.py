@@ -0,0 +1,163 @@
+###############################################################################
+##
+## Copyright (C) 2014-2016, New York University.
+## Copyright (C) 2011-2014, NYU-Poly.
+## Copyright (C) 2006-2011, University of Utah.
+## All rights reserved.
+## Contact: contact@vistrails.org
+##
+## This file is part of VisTrails.
+##
+## "Redistribution and use in source and binary forms, with or without
+## modification, are permitted provided that the following conditions are met:
+##
+##  - Redistributions of source code must retain the above copyright notice,
+##    this list of conditions and the following disclaimer.
+##  - Redistributions in binary form must reproduce the above copyright
+##    notice, this list of conditions and the following disclaimer in the
+##    documentation and/or other materials provided with the distribution.
+##  - Neither the name of the New York University nor the names of its
+##    contributors may be used to endorse or promote products derived from
+##    this software without specific prior written permission.
+##
+## THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+## AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+## THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+## PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+## CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+## EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+## PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+## OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+## WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR
+## OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF
+## ADVISED OF THE POSSIBILITY OF SUCH DAMAGE."
+##
+###############################################################################
+"""measures the memory used by the domain classes to load a large vistrail
+
+A synthetic vistrail is written to a file, then loaded in a separate process
+with the domain classes of each requested schema version. 1.0.3 was
+generated without __slots__ and 1.0.4 with them (generate.py -l), so
+comparing the two shows what the slotted classes save.
+
+Run from the root of the source tree:
+
+    python -m vistrails.db.bin.benchmark_memory [-n <actions>]
+
+"""
+
+from __future__ import division
+
+import getopt
+import gc
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+def make_vistrail(nb_actions):
+    from vistrails.db.versions.v1_0_4.domain import DBVistrail, DBAction, \
+        DBAdd, DBModule, DBLocation, DBFunction, DBParameter
+
+    vistrail = DBVistrail(id=1, name='benchmark', version='1.0.4')
+    ids = {}
+    def new_id(vtType):
+        ids[vtType] = ids.get(vtType, 0) + 1
+        return ids[vtType]
+    for i in xrange(1, nb_actions + 1):
+        module = DBModule(id=new_id('module'), cache=1, name='String',
+                          namespace='',
+                          package='org.vistrails.vistrails.basic',
+                          version='1.6')
+        location = DBLocation(id=new_id('location'), x=i * 10.0, y=0.0)
+        parameter = DBParameter(id=new_id('parameter'), pos=0,
+                                type='org.vistrails.vistrails.basic:String',
+                                val='value %d' % i, alias='')
+        function = DBFunction(id=new_id('function'), pos=0, name='value',
+                              parameters=[parameter])
+        operations = [
+            DBAdd(id=new_id('operation'), what='module',
+                  objectId=module.db_id, data=module),
+            DBAdd(id=new_id('operation'), what='location',
+                  objectId=location.db_id, parentObjId=module.db_id,
+                  parentObjType='module', data=location),
+            DBAdd(id=new_id('operation'), what='function',
+                  objectId=function.db_id, parentObjId=module.db_id,
+                  parentObjType='module', data=function),
+            DBAdd(id=new_id('operation'), what='parameter',
+                  objectId=parameter.db_id, parentObjId=function.db_id,
+                  parentObjType='function', data=parameter),
+            ]
+        vistrail.db_add_action(DBAction(id=i, prevId=i - 1, session=1,
+                                        user='benchmark',
+                                        operations=operations))
+    return vistrail
+
+def max_rss():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        # bytes on Mac OS, kilobytes on Linux
+        return rss / 1024.0
+    return float(rss)
+
+def load(filename, version):
+    from vistrails.db.versions import getVersionDAO
+    dao_list = getVersionDAO(version)
+    tree = dao_list.parse_xml_file(filename)
+    gc.collect()
+    rss = max_rss()
+    start = time.time()
+    vistrail = dao_list.open_from_xml(filename, 'vistrail', tree)
+    elapsed = time.time() - start
+    del tree
+    gc.collect()
+    print '%d %.0f %.2f' % (len(vistrail.db_actions), max_rss() - rss,
+                           elapsed)
+
+def usage():
+    print 'Usage: python -m vistrails.db.bin.benchmark_memory ' \
+        '[-n <actions>] [-v <version>,...]'
+    print '    -n <actions>  number of actions to generate (default 20000)'
+    print '    -v <versions> schema versions to compare (default 1.0.3,1.0.4)'
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    try:
+        (optlist, args) = getopt.getopt(argv, 'n:v:l:')
+    except getopt.GetoptError:
+        usage()
+        return 1
+    opts = dict(optlist)
+    if '-l' in opts:
+        # child process: load the file with the given version
+        load(args[0], opts['-l'])
+        return 0
+
+    nb_actions = int(opts.get('-n', 20000))
+    versions = opts.get('-v', '1.0.3,1.0.4').split(',')
+
+    from vistrails.db.versions import getVersionDAO
+    (fd, filename) = tempfile.mkstemp(prefix='vt_bench_', suffix='.xml')
+    os.close(fd)
+    try:
+        getVersionDAO('1.0.4').save_to_xml(make_vistrail(nb_actions),
+                                           filename, {}, '1.0.4')
+        print 'vistrail with %d actions: %.1f MB of XML' % \
+            (nb_actions, os.path.getsize(filename) / (1024.0 * 1024.0))
+        print '%-8s %12s %10s' % ('version', 'memory (MB)', 'time (s)')
+        for version in versions:
+            output = subprocess.check_output(
+                [sys.executable, '-m', 'vistrails.db.bin.benchmark_memory',
+                 '-l', version, filename])
+            (count, rss, elapsed) = output.split()
+            assert int(count) == nb_actions
+            print '%-8s %12.1f %10s' % (version, float(rss) / 1024.0, elapsed)
+    finally:
+        os.remove(filename)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
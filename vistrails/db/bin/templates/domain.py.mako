@@ -25,6 +25,25 @@ def shouldIgnoreIndexDelete(index):
     if type(index) == type([]):
         return index[0][0] == '!'
     return index[0] == '!'
+
+def getLazySlots(obj):
+    lazy_slots = []
+    for field in obj.getPythonFields():
+        if field.isReference() and not field.isInverse():
+            lazy_slots.append(('db_deleted_%s' % field.getRegularName(),
+                               'list'))
+        if field.isPlural():
+            for index in field.getAllIndices():
+                lazy_slots.append(('db_%s_%s_index' % \
+                                       (field.getRegularName(),
+                                        getIndexName(index)),
+                                   'dict'))
+    return lazy_slots
+
+def getSlots(obj):
+    return [field.getPrivateName() for field in obj.getPythonFields()] + \
+        [name for (name, _) in getLazySlots(obj)] + \
+        ['is_dirty', 'is_new', '__dict__', '__weakref__']
 %> \\
 <%text>###############################################################################
 ##
@@ -66,14 +85,67 @@ def shouldIgnoreIndexDelete(index):
 
 import copy
 
+% if slots:
+class _DBSlotsBase(object):
+    """Base of the domain classes that keep their fields in __slots__.
+
+    The deleted-object lists and the indexes listed in _db_lazy_slots are
+    only created the first time they are accessed.
+
+    """
+
+    __slots__ = ()
+    _db_lazy_slots = {}
+
+    def __getattr__(self, name):
+        # only called if the slot hasn't been set yet
+        try:
+            value = self._db_lazy_slots[name]()
+        except KeyError:
+            raise AttributeError(name)
+        setattr(self, name, value)
+        return value
+
+    def _db_get_deleted(self, name, remove):
+        # doesn't create the list if nothing was deleted
+        try:
+            deleted = object.__getattribute__(self, name)
+        except AttributeError:
+            return []
+        if remove:
+            delattr(self, name)
+        return deleted
+
+% endif
 % for obj in objs:
+<% use_slots = slots and obj.shouldUseSlots() %> \\
+% if use_slots:
+class ${obj.getClassName()}(_DBSlotsBase):
+% else:
 class ${obj.getClassName()}(object):
+% endif
 
     vtType = '${obj.getRegularName()}'
 
+    % if use_slots:
+    __slots__ = (
+        % for name in getSlots(obj):
+        '${name}',
+        % endfor
+        )
+    % if len(getLazySlots(obj)) > 0:
+    _db_lazy_slots = {
+        % for (name, factory) in getLazySlots(obj):
+        '${name}': ${factory},
+        % endfor
+        }
+    % endif
+
+    % endif
     def __init__(self, ${', '.join(['%s=None' % n \
                                     for n in obj.getConstructorNames()])}):
         % for field in obj.getPythonFields():
+        % if not use_slots:
         % if field.isReference() and not field.isInverse():
         self.db_deleted_${field.getRegularName()} = []
         % endif
@@ -81,6 +153,9 @@ class ${obj.getClassName()}(object):
         % for index in field.getAllIndices():
         self.db_${field.getRegularName()}_${getIndexName(index)}_index = {}
         % endfor
+        % endif
+        % endif
+        % if field.isPlural():
         if ${field.getRegularName()} is None:
             % if field.getPythonType() == 'hash':
             self.${field.getPrivateName()} = {}
@@ -187,12 +262,21 @@ class ${obj.getClassName()}(object):
         # recreate indices and set flags
         % for field in obj.getPythonFields():
         % if len(field.getAllIndices()) > 0:
+        % if use_slots:
+        if cp.${field.getPrivateName()}:
+            % for index in field.getAllIndices():
+            cp.db_${field.getRegularName()}_${getIndexName(index)}_index = \
+                dict((${getIndexKey('v', index)}, v) \
+                         for v in cp.${field.getPrivateIterator()})
+            % endfor
+        % else:
         % for index in field.getAllIndices():
         cp.db_${field.getRegularName()}_${getIndexName(index)}_index = \
             dict((${getIndexKey('v', index)}, v) \
                      for v in cp.${field.getPrivateIterator()})
         % endfor
         % endif
+        % endif
         % endfor
         if not new_ids:
             cp.is_dirty = self.is_dirty
@@ -260,8 +344,12 @@ class ${obj.getClassName()}(object):
             % endif
             % endif
         % if not field.isInverse():
+        % if use_slots:
+        if hasattr(old_obj, 'db_deleted_${field.getRegularName()}'):
+        % else:
         if hasattr(old_obj, 'db_deleted_${field.getRegularName()}') \
                 and hasattr(new_obj, 'db_deleted_${field.getRegularName()}'):
+        % endif
             ## refObj = field.getReferencedObject()
             for obj in old_obj.db_deleted_${field.getRegularName()}:
                 % if field.isChoice():
@@ -339,7 +427,12 @@ class ${obj.getClassName()}(object):
     ## get deleted method
     def db_deleted_children(self, remove=False):
         children = []
-        % if len(obj.getNonInverseReferences()) > 0:
+        % if use_slots:
+        % for ref in obj.getNonInverseReferences():
+        children.extend(self._db_get_deleted( \!
+            'db_deleted_${ref.getRegularName()}', remove))
+        % endfor
+        % elif len(obj.getNonInverseReferences()) > 0:
         % for ref in obj.getNonInverseReferences():
         children.extend(self.db_deleted_${ref.getRegularName()})
         % endfor
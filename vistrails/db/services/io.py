@@ -37,7 +37,8 @@ from __future__ import division, with_statement
 
 from vistrails.core import debug
 from vistrails.core.bundles import py_import
-from vistrails.core.system import get_elementtree_library, strftime
+from vistrails.core.system import get_elementtree_library, strftime, \
+    time_strptime
 from vistrails.core.utils import Chdir
 from vistrails.core.mashup.mashup_trail import Mashuptrail
 from vistrails.core.modules.sub_module import get_cur_abs_namespace,\
@@ -45,8 +46,11 @@ from vistrails.core.modules.sub_module import get_cur_abs_namespace,\
 
 import vistrails.core.requirements
 
+from cStringIO import StringIO
 from datetime import datetime
+import hashlib
 import os.path
+import posixpath
 import shutil
 import tempfile
 import copy
@@ -55,7 +59,7 @@ import zipfile
 
 from vistrails.db import VistrailsDBException
 from vistrails.db.domain import DBVistrail, DBWorkflow, DBLog, DBAbstraction, DBGroup, \
-    DBRegistry, DBWorkflowExec, DBOpmGraph, DBProvDocument, DBAnnotation, \
+    DBAction, DBRegistry, DBWorkflowExec, DBOpmGraph, DBProvDocument, DBAnnotation, \
     DBMashuptrail, DBStartup
 import vistrails.db.services.abstraction
 import vistrails.db.services.log
@@ -65,7 +69,8 @@ import vistrails.db.services.registry
 import vistrails.db.services.workflow
 import vistrails.db.services.vistrail
 from vistrails.db.versions import getVersionDAO, currentVersion, getVersionSchemaDir, \
-    translate_vistrail, translate_workflow, translate_log, translate_registry, translate_startup
+    translate_vistrail, translate_workflow, translate_log, translate_registry, translate_startup, \
+    translate_mashuptrail
 
 import unittest
 import vistrails.core.system
@@ -574,9 +579,9 @@ def save_to_xml(obj, filename, version=None):
         raise VistrailsDBException("cannot save object of type "
                                    "'%s' to xml" % type)
 
-def open_bundle_from_zip_xml(bundle_type, filename):
+def open_bundle_from_zip_xml(bundle_type, filename, lazy=False):
     if bundle_type == DBVistrail.vtType:
-        return open_vistrail_bundle_from_zip_xml(filename)
+        return open_vistrail_bundle_from_zip_xml(filename, lazy)
     else:
         raise VistrailsDBException("cannot open bundle of type '%s' from zip" %\
                                        bundle_type)
@@ -682,16 +687,31 @@ def unserialize(str, obj_type):
 ##############################################################################
 # Vistrail I/O
 
-def open_vistrail_from_xml(filename):
-    """open_vistrail_from_xml(filename) -> Vistrail"""
-    tree = ElementTree.parse(filename)
-    version = get_version_for_xml(tree.getroot())
+def open_vistrail_from_xml(filename, lazy=False):
+    """open_vistrail_from_xml(filename, lazy: bool) -> Vistrail
+    filename can also be a file object, for instance a member of a zip file.
+    If lazy is True, the operations of the actions are only read when they
+    are first used (see read_lazy_action). Vistrails from older versions
+    that are found in the translation cache are loaded completely; lazy
+    doesn't apply to them.
+
+    """
     try:
-        daoList = getVersionDAO(version)
-        vistrail = daoList.open_from_xml(filename, DBVistrail.vtType, tree)
+        vistrail = None
+        key = None
+        cache = get_translation_cache()
+        if cache is not None:
+            filename, key = open_translation_cache(filename)
+            if key is not None:
+                vistrail = read_translated_vistrail(cache, key)
         if vistrail is None:
-            raise VistrailsDBException("Couldn't read vistrail from XML")
-        vistrail = translate_vistrail(vistrail, version)
+            vistrail, version = read_xml_stream(filename, DBVistrail.vtType,
+                                                lazy)
+            if vistrail is None:
+                raise VistrailsDBException("Couldn't read vistrail from XML")
+            vistrail = translate_vistrail(vistrail, version)
+            if key is not None:
+                write_translated_vistrail(cache, vistrail, key)
         vistrails.db.services.vistrail.update_id_scope(vistrail)
     except VistrailsDBException, e:
         if str(e).startswith('VistrailsDBException: Cannot find DAO for'):
@@ -702,8 +722,176 @@ def open_vistrail_from_xml(filename):
 
     return vistrail
 
-def open_vistrail_bundle_from_zip_xml(filename):
-    """open_vistrail_bundle_from_zip_xml(filename) -> SaveBundle
+_translation_cache = None
+
+def get_translation_cache():
+    """get_translation_cache() -> DiskResultCache or None
+    Returns the cache where vistrails from older schema versions are kept
+    once translated, or None if the 'translationCache' configuration
+    disables it.
+
+    """
+    global _translation_cache
+    from vistrails.core.cache.results import DiskResultCache
+    from vistrails.core.configuration import get_vistrails_configuration
+    conf = get_vistrails_configuration()
+    if conf is None or not (conf.has_deep_value('translationCache.enabled') and
+                            conf.get_deep_value('translationCache.enabled')):
+        return None
+    directory = vistrails.core.system.get_vistrails_directory(
+            'translationCache.cacheDir', conf)
+    if directory is None:
+        return None
+    max_size = conf.translationCache.cacheSize * 1024 * 1024
+    if (_translation_cache is None or
+            _translation_cache.directory != directory):
+        _translation_cache = DiskResultCache(directory, max_size)
+    else:
+        _translation_cache.max_size = max_size
+    return _translation_cache
+
+_translation_fingerprint = None
+
+def get_translation_fingerprint():
+    """get_translation_fingerprint() -> str
+    Returns a hash of the code that reads, translates and unpickles old
+    vistrails, so that translations made by other releases or modified
+    sources are not used.
+
+    """
+    global _translation_fingerprint
+    if _translation_fingerprint is None:
+        import vistrails.db.versions
+        h = hashlib.sha1(vistrails.core.system.vistrails_version())
+        h.update(currentVersion)
+        versions_dir = os.path.dirname(
+                os.path.abspath(vistrails.db.versions.__file__))
+        paths = [os.path.splitext(os.path.abspath(__file__))[0] + '.py',
+                 os.path.join(versions_dir, '__init__.py')]
+        for version_dir in sorted(os.listdir(versions_dir)):
+            for subdir in ('domain', 'translate'):
+                dirname = os.path.join(versions_dir, version_dir, subdir)
+                if os.path.isdir(dirname):
+                    paths.extend(os.path.join(dirname, f)
+                                 for f in sorted(os.listdir(dirname))
+                                 if f.endswith('.py'))
+        for path in paths:
+            try:
+                with open(path, 'rb') as fp:
+                    h.update(fp.read())
+            except IOError:
+                pass
+        _translation_fingerprint = h.hexdigest()
+    return _translation_fingerprint
+
+class PrefixedFile(object):
+    """File object that returns some data already read from a file, then
+    the rest of that file.
+
+    """
+    def __init__(self, prefix, fp):
+        self._prefix = prefix
+        self._fp = fp
+
+    def read(self, size=-1):
+        if not self._prefix:
+            return self._fp.read(size)
+        if size < 0:
+            data = self._prefix + self._fp.read()
+            self._prefix = ''
+        else:
+            data = self._prefix[:size]
+            self._prefix = self._prefix[size:]
+        return data
+
+class RecordingFile(object):
+    """File object that keeps a copy of the data read from a file, until
+    stop() is called.
+
+    """
+    def __init__(self, fp):
+        self._fp = fp
+        self._data = []
+
+    def read(self, size=-1):
+        data = self._fp.read(size)
+        if self._data is not None:
+            self._data.append(data)
+        return data
+
+    def stop(self):
+        self._data = None
+
+    def getvalue(self):
+        return ''.join(self._data)
+
+def open_translation_cache(source):
+    """open_translation_cache(source: str or file) -> (str or file, str or None)
+    Reads the start of an XML vistrail to find its version. If it needs to
+    be translated, the file is read completely and the key of its
+    translation in the translation cache, computed from the content and the
+    translation code, is returned along with a file object reading the same
+    data. Otherwise, returns a source that can still be read from the
+    beginning and None.
+
+    """
+    if isinstance(source, basestring):
+        fp = open(source, 'rb')
+    else:
+        fp = source
+    try:
+        head = fp.read(16384)
+        version = None
+        try:
+            for event, root in ElementTree.iterparse(StringIO(head),
+                                                     ('start',)):
+                version = root.get('version', None)
+                break
+        except SyntaxError:
+            pass
+        if version is None or version == currentVersion:
+            if fp is source:
+                return PrefixedFile(head, fp), None
+            return source, None
+        data = head + fp.read()
+    finally:
+        if fp is not source:
+            fp.close()
+    h = hashlib.sha1(data)
+    h.update(get_translation_fingerprint())
+    return StringIO(data), h.hexdigest()
+
+def read_translated_vistrail(cache, key):
+    """read_translated_vistrail(cache: DiskResultCache, key: str)
+         -> DBVistrail or None
+    Reads a vistrail stored by write_translated_vistrail(), if it exists.
+
+    """
+    vistrail = cache.get(key)
+    if vistrail is not None and (not isinstance(vistrail, DBVistrail) or
+                                 vistrail.db_version != currentVersion):
+        debug.warning("Removing invalid translated vistrail %s" %
+                      cache.get_filename(key))
+        cache.remove(key)
+        return None
+    return vistrail
+
+def write_translated_vistrail(cache, vistrail, key):
+    """write_translated_vistrail(cache: DiskResultCache, vistrail: DBVistrail,
+                                 key: str) -> None
+    Stores a vistrail translated to the current version so that the next
+    open_vistrail_from_xml() of the original file doesn't translate it
+    again. It is pickled rather than written as XML, since the XML schema
+    doesn't tell empty strings from None, which the translations
+    distinguish. Least recently used translations are removed when the
+    cache goes over its size.
+
+    """
+    cache.put(key, vistrail)
+
+
+def open_vistrail_bundle_from_zip_xml(filename, lazy=False):
+    """open_vistrail_bundle_from_zip_xml(filename, lazy: bool) -> SaveBundle
     Open a vistrail from a zip compressed format.
     It expects that the vistrail file inside archive has name 'vistrail',
     the log inside archive has name 'log',
@@ -713,12 +901,6 @@ def open_vistrail_bundle_from_zip_xml(filename):
     """
     vt_save_dir = tempfile.mkdtemp(prefix='vt_save')
 
-    z = zipfile.ZipFile(filename)
-    try:
-        z.extractall(vt_save_dir)
-    finally:
-        z.close()
-
     vistrail = None
     log = None
     log_fname = None
@@ -726,41 +908,56 @@ def open_vistrail_bundle_from_zip_xml(filename):
     unknown_files = []
     thumbnail_files = []
     mashups = []
+    # The vistrail and mashups are parsed straight from the archive; only
+    # the files that are referenced by filename get extracted
+    z = zipfile.ZipFile(filename)
     try:
-        for root, dirs, files in os.walk(vt_save_dir):
-            for fname in files:
-                if fname == 'vistrail' and root == vt_save_dir:
-                    vistrail = open_vistrail_from_xml(os.path.join(root, fname))
-                elif fname == 'log' and root == vt_save_dir:
-                    # FIXME read log to get execution info
-                    # right now, just ignore the file
-                    log = None 
-                    log_fname = os.path.join(root, fname)
-                    # log = open_log_from_xml(os.path.join(root, fname))
-                    # objs.append(DBLog.vtType, log)
-                elif fname.startswith('abstraction_'):
-                    abstraction_file = os.path.join(root, fname)
-                    abstraction_files.append(abstraction_file)
-                elif (fname.endswith('.png') and
-                      root == os.path.join(vt_save_dir,'thumbs')):
-                    thumbnail_file = os.path.join(root, fname)
-                    thumbnail_files.append(thumbnail_file)
-                elif root == os.path.join(vt_save_dir,'mashups'):
-                    mashup_file = os.path.join(root, fname)
-                    mashup = open_mashuptrail_from_xml(mashup_file)
-                    mashups.append(mashup)
+        for info in z.infolist():
+            if info.filename.endswith('/'):
+                continue
+            root, fname = posixpath.split(info.filename)
+            if fname == 'vistrail' and root == '':
+                member = z.open(info)
+                try:
+                    vistrail = open_vistrail_from_xml(member, lazy)
+                finally:
+                    member.close()
+            elif fname == 'log' and root == '':
+                # FIXME read log to get execution info
+                # right now, just ignore the file
+                log = None 
+                log_fname = z.extract(info, vt_save_dir)
+                # log = open_log_from_xml(log_fname)
+                # objs.append(DBLog.vtType, log)
+            elif fname.startswith('abstraction_'):
+                abstraction_file = z.extract(info, vt_save_dir)
+                abstraction_files.append(abstraction_file)
+            elif fname.endswith('.png') and root == 'thumbs':
+                thumbnail_file = z.extract(info, vt_save_dir)
+                thumbnail_files.append(thumbnail_file)
+            elif root == 'mashups':
+                member = z.open(info)
+                try:
+                    mashup = open_mashuptrail_from_xml(member)
+                finally:
+                    member.close()
+                mashups.append(mashup)
+            else:
+                handled = False
+                from vistrails.core.packagemanager import get_package_manager
+                pm = get_package_manager()
+                for package in pm.enabled_package_list():
+                    if package.can_handle_vt_file(fname):
+                        handled = True
+                        continue
+                if handled:
+                    z.extract(info, vt_save_dir)
                 else:
-                    handled = False
-                    from vistrails.core.packagemanager import get_package_manager
-                    pm = get_package_manager()
-                    for package in pm.enabled_package_list():
-                        if package.can_handle_vt_file(fname):
-                            handled = True
-                            continue
-                    if not handled:
-                        unknown_files.append(os.path.join(root, fname))
-    except OSError, e:
+                    unknown_files.append(info.filename)
+    except (OSError, IOError), e:
         raise VistrailsDBException("Error when reading vt file")
+    finally:
+        z.close()
     if len(unknown_files) > 0:
         raise VistrailsDBException("Unknown files in vt file: %s" % \
                                        unknown_files)
@@ -1195,9 +1392,200 @@ def get_saved_workflows(vistrail, db_connection):
 ##############################################################################
 # Logging I/O
 
-def open_log_from_xml(filename, was_appended=False):
-    """open_log_from_xml(filename) -> DBLog"""
-    if was_appended:
+class AppendedLogIndex(object):
+    """Index of the workflow executions stored in an appended log file.
+
+    Appended logs are <workflowExec> elements written one after the other
+    (see save_log_to_xml). The index records the offset of each of them with
+    the version it ran and its start time, so that some executions can be
+    read without parsing the whole file. Since these files are only ever
+    appended to, updating the index only scans the bytes added since.
+
+    Executions are identified by their position in the file, starting at 1,
+    which is also the id update_ids() gives them when reading the whole log.
+
+    """
+
+    TAG = '<workflowExec'
+    CHUNK_SIZE = 1 << 20
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.reset()
+
+    def reset(self):
+        self.size = 0
+        self.offsets = []
+        self.parent_versions = []
+        self.ts_starts = []
+        self._last_header = None
+
+    def _read_header(self, f, offset):
+        f.seek(offset)
+        header = ''
+        while '>' not in header:
+            data = f.read(4096)
+            if not data:
+                return None
+            header += data
+        return header[:header.index('>') + 1]
+
+    def update(self):
+        """update() -> None
+        Indexes the executions appended to the file since the last update.
+
+        """
+        try:
+            size = os.path.getsize(self.filename)
+        except OSError:
+            size = 0
+        if size == 0:
+            self.reset()
+            return
+        with open(self.filename, 'rb') as f:
+            # the file might have been replaced rather than appended to
+            if size < self.size or (
+                    self.offsets and
+                    self._read_header(f, self.offsets[-1]) !=
+                        self._last_header):
+                self.reset()
+            if size == self.size:
+                return
+
+            tag_len = len(self.TAG)
+            pos = max(0, self.size - tag_len + 1)
+            f.seek(pos)
+            new_offsets = []
+            buf = ''
+            while True:
+                data = f.read(self.CHUNK_SIZE)
+                if not data:
+                    break
+                buf += data
+                i = buf.find(self.TAG)
+                while i != -1:
+                    new_offsets.append(pos + i)
+                    i = buf.find(self.TAG, i + 1)
+                # keep the end of the buffer, it might hold part of a tag
+                keep = min(len(buf), tag_len - 1)
+                pos += len(buf) - keep
+                buf = buf[len(buf) - keep:]
+            self.size = pos + len(buf)
+
+            for offset in new_offsets:
+                header = self._read_header(f, offset)
+                if header is None:
+                    break
+                self.offsets.append(offset)
+                self._last_header = header
+                if header.endswith('/>'):
+                    header = header[:-2]
+                else:
+                    header = header[:-1]
+                node = ElementTree.fromstring(header + '/>')
+                parent_version = node.get('parentVersion', None)
+                if parent_version is not None:
+                    parent_version = long(parent_version)
+                self.parent_versions.append(parent_version)
+                ts_start = node.get('tsStart', None)
+                if ts_start is not None:
+                    ts_start = datetime(*time_strptime(
+                            ts_start, '%Y-%m-%d %H:%M:%S')[0:6])
+                self.ts_starts.append(ts_start)
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def find(self, parent_version=None, start_time=None, end_time=None):
+        """find(parent_version: long, start_time: datetime,
+                end_time: datetime) -> list of ids
+        Returns the executions of a version and/or that started in the
+        given time range.
+
+        """
+        ids = []
+        for i in xrange(len(self.offsets)):
+            if (parent_version is not None and
+                    self.parent_versions[i] != parent_version):
+                continue
+            ts_start = self.ts_starts[i]
+            if start_time is not None and (ts_start is None or
+                                           ts_start < start_time):
+                continue
+            if end_time is not None and (ts_start is None or
+                                         ts_start > end_time):
+                continue
+            ids.append(i + 1)
+        return ids
+
+    def read(self, exec_ids):
+        """read(exec_ids: list of ids) -> list of DBWorkflowExec
+        Reads the given executions, setting their ids.
+
+        """
+        workflow_execs = []
+        with open(self.filename, 'rb') as f:
+            for exec_id in sorted(set(exec_ids)):
+                if not 1 <= exec_id <= len(self.offsets):
+                    raise VistrailsDBException("No workflow execution %s in "
+                                               "log %s" % (exec_id,
+                                                           self.filename))
+                start = self.offsets[exec_id - 1]
+                if exec_id < len(self.offsets):
+                    end = self.offsets[exec_id]
+                else:
+                    end = self.size
+                f.seek(start)
+                node = ElementTree.fromstring(f.read(end - start))
+                workflow_exec = read_appended_workflow_exec(node)
+                workflow_exec.db_id = exec_id
+                workflow_execs.append(workflow_exec)
+        return workflow_execs
+
+_appended_log_indexes = {}
+
+def get_appended_log_index(filename):
+    """get_appended_log_index(filename: str) -> AppendedLogIndex
+    Returns the up-to-date index of an appended log file.
+
+    """
+    filename = os.path.abspath(filename)
+    try:
+        index = _appended_log_indexes[filename]
+    except KeyError:
+        index = _appended_log_indexes[filename] = AppendedLogIndex(filename)
+    index.update()
+    return index
+
+def read_appended_workflow_exec(node):
+    version = get_version_for_xml(node)
+    daoList = getVersionDAO(version)
+    workflow_exec = \
+        daoList.read_xml_object(DBWorkflowExec.vtType, node)
+    if version != currentVersion:
+        # if version is wrong, dump this into a dummy log object, 
+        # then translate, then get workflow_exec back
+        log = DBLog()
+        translate_log(log, currentVersion, version)
+        log.db_add_workflow_exec(workflow_exec)
+        log = translate_log(log, version)
+        workflow_exec = log.db_workflow_execs[0]
+    return workflow_exec
+
+def open_log_from_xml(filename, was_appended=False, exec_ids=None):
+    """open_log_from_xml(filename, was_appended: bool, exec_ids: list)
+         -> DBLog
+    For appended logs, exec_ids can be used to only read some of the
+    executions (see AppendedLogIndex).
+
+    """
+    if was_appended and exec_ids is not None:
+        index = get_appended_log_index(filename)
+        log = DBLog(workflow_execs=index.read(exec_ids))
+        for workflow_exec in log.db_workflow_execs:
+            log.id_scope.updateBeginId(DBWorkflowExec.vtType,
+                                       workflow_exec.db_id + 1)
+    elif was_appended:
         parser = ElementTree.XMLTreeBuilder()
         parser.feed("<log>\n")
         f = open(filename, "rb")
@@ -1206,19 +1594,7 @@ def open_log_from_xml(filename, was_appended=False):
         root = parser.close()
         workflow_execs = []
         for node in root:
-            version = get_version_for_xml(node)
-            daoList = getVersionDAO(version)
-            workflow_exec = \
-                daoList.read_xml_object(DBWorkflowExec.vtType, node)
-            if version != currentVersion:
-                # if version is wrong, dump this into a dummy log object, 
-                # then translate, then get workflow_exec back
-                log = DBLog()
-                translate_log(log, currentVersion, version)
-                log.db_add_workflow_exec(workflow_exec)
-                log = translate_log(log, version)
-                workflow_exec = log.db_workflow_execs[0]
-            workflow_execs.append(workflow_exec)
+            workflow_execs.append(read_appended_workflow_exec(node))
         log = DBLog(workflow_execs=workflow_execs)
         vistrails.db.services.log.update_ids(log)
     else:
@@ -1652,6 +2028,7 @@ def open_mashuptrail_from_xml(filename):
         mashuptrail = daoList.open_from_xml(filename, DBMashuptrail.vtType, tree)
         if old_version == "0.1.0":
             mashuptrail.db_version = version
+        mashuptrail = translate_mashuptrail(mashuptrail, version)
         Mashuptrail.convert(mashuptrail)
         mashuptrail.currentVersion = mashuptrail.getLatestVersion()
         mashuptrail.updateIdScope()
@@ -1684,6 +2061,7 @@ def open_mashuptrail_from_db(db_connection, mashup_id, lock=False):
     try:
         daoList = getVersionDAO(version)
         mashuptrail = daoList.open_from_db(db_connection, DBMashuptrail.vtType, mashup_id, lock)
+        mashuptrail = translate_mashuptrail(mashuptrail, version)
         Mashuptrail.convert(mashuptrail)
         mashuptrail.currentVersion = mashuptrail.getLatestVersion()
         mashuptrail.updateIdScope()
@@ -1779,6 +2157,113 @@ def delete_entity_from_db(db_connection, type, obj_id):
     dao_list.delete_from_db(db_connection, type, obj_id)
     db_connection.commit()
     
+def read_xml_stream(source, vtType, lazy=False):
+    """read_xml_stream(source: str or file, vtType: str, lazy: bool)
+         -> (object, version: str)
+
+    Reads an object from an XML file with iterparse. If the file uses the
+    current schema, the children of the root element are converted as soon
+    as they are parsed and then dropped, so the complete tree is never held
+    in memory. Files from other versions are read from the whole tree.
+
+    If lazy is True, actions are read with read_lazy_action().
+
+    """
+    daoList = None
+    version = None
+    root = None
+    obj = None
+    dao_names = {}
+    depth = 0
+    if isinstance(source, basestring):
+        recorder = None
+        stream = source
+    else:
+        # Older DAOs parse the file again themselves, and file objects such
+        # as zip members can't be rewound; keep a copy of the data until we
+        # know the version
+        recorder = stream = RecordingFile(source)
+    for event, elem in ElementTree.iterparse(stream, ('start', 'end')):
+        if event == 'start':
+            depth += 1
+            if root is None:
+                root = elem
+                version = get_version_for_xml(root)
+                daoList = getVersionDAO(version)
+                if version == currentVersion:
+                    if recorder is not None:
+                        recorder.stop()
+                    # Read the attributes now, the children get added below
+                    obj = daoList.read_xml_object(
+                            vtType, ElementTree.Element(root.tag, root.attrib))
+                    if obj is None:
+                        return None, version
+                    dao_names = dict((name.replace('_', '').lower(), name)
+                                     for name in daoList['xml'])
+            continue
+        depth -= 1
+        if obj is not None and depth == 1:
+            tag = elem.tag.split('}')[-1]
+            name = dao_names.get(tag.lower())
+            add = name and getattr(obj, 'db_add_%s' % name, None)
+            if add is not None:
+                if lazy and name == DBAction.vtType:
+                    add(read_lazy_action(daoList, obj, elem))
+                else:
+                    add(daoList.read_xml_object(name, elem))
+            elif elem.text is not None and elem.text.strip() != '':
+                debug.warning("Unexpected element in %s: %s" % (vtType, tag))
+            root.clear()
+    if root is None:
+        raise VistrailsDBException("Empty XML file")
+    if obj is None:
+        if recorder is not None:
+            source = StringIO(recorder.getvalue())
+        obj = daoList.open_from_xml(source, vtType,
+                                    ElementTree.ElementTree(root))
+    else:
+        obj.is_dirty = False
+    return obj, version
+
+def read_lazy_action(daoList, vistrail, node):
+    """read_lazy_action(daoList, vistrail: DBVistrail, node: Element)
+         -> DBAction
+
+    Reads an action but keeps its operations as XML strings, to be converted
+    the first time they are used. The id scope of the vistrail is updated
+    from the attributes of the operations right away.
+
+    """
+    shell = ElementTree.Element(node.tag, node.attrib)
+    operations = []
+    for child in node:
+        tag = child.tag.split('}')[-1]
+        if tag not in ('add', 'change', 'delete'):
+            shell.append(child)
+            continue
+        vistrail.idScope.updateBeginId('operation', long(child.get('id'))+1)
+        if tag == 'change':
+            obj_id = child.get('newObjId')
+        elif tag == 'add':
+            obj_id = child.get('objectId')
+        else:
+            obj_id = None
+        if obj_id is not None:
+            vistrail.idScope.updateBeginId(child.get('what'), long(obj_id)+1)
+        operations.append((tag, ElementTree.tostring(child)))
+    action = daoList.read_xml_object(DBAction.vtType, shell)
+
+    def load_operations(action):
+        result = []
+        for tag, xml in operations:
+            operation = daoList.read_xml_object(tag,
+                                                ElementTree.fromstring(xml))
+            vistrail.update_operation_id_scope(operation)
+            result.append(operation)
+        return result
+    action.db_set_operations_loader(load_operations)
+    return action
+
 def get_version_for_xml(root):
     version = root.get('version', None)
     if version is not None:
@@ -1881,3 +2366,251 @@ class TestDBIO(unittest.TestCase):
                 self.fail(str(e))
         finally:
             os.rmdir(testdir)
+
+    def test_stream(self):
+        """test that streaming a vistrail matches reading the whole tree"""
+
+        (save_bundle, vt_save_dir) = open_vistrail_bundle_from_zip_xml(
+            os.path.join(vistrails.core.system.vistrails_root_directory(),
+                         'tests/resources/terminator.vt'))
+        try:
+            # Only the files referenced by name get extracted
+            self.assertFalse(os.path.exists(os.path.join(vt_save_dir,
+                                                         'vistrail')))
+            (fd, fname) = tempfile.mkstemp(prefix='vt_', suffix='.xml')
+            os.close(fd)
+            try:
+                save_vistrail_to_xml(save_bundle.vistrail, fname)
+                streamed, version = read_xml_stream(fname, DBVistrail.vtType)
+                self.assertEqual(version, currentVersion)
+                whole = getVersionDAO(version).open_from_xml(
+                        fname, DBVistrail.vtType)
+            finally:
+                os.unlink(fname)
+        finally:
+            close_zip_xml(vt_save_dir)
+        self.assertFalse(streamed.is_dirty)
+        self.assertEqual(streamed.db_id, whole.db_id)
+        self.assertEqual(streamed.db_name, whole.db_name)
+        self.assertEqual([a.db_id for a in streamed.db_actions],
+                         [a.db_id for a in whole.db_actions])
+        self.assertEqual([len(a.db_operations) for a in streamed.db_actions],
+                         [len(a.db_operations) for a in whole.db_actions])
+        for attr in ('db_tags', 'db_annotations', 'db_actionAnnotations',
+                     'db_vistrailVariables', 'db_parameter_explorations'):
+            self.assertEqual([o.db_id for o in getattr(streamed, attr)],
+                             [o.db_id for o in getattr(whole, attr)])
+        self.assertTrue(streamed.db_has_action_with_id(
+                streamed.db_actions[-1].db_id))
+
+    def test_lazy_actions(self):
+        """test that actions read lazily give the same pipelines"""
+        from vistrails.core.vistrail.vistrail import Vistrail
+
+        (save_bundle, vt_save_dir) = open_vistrail_bundle_from_zip_xml(
+            os.path.join(vistrails.core.system.vistrails_root_directory(),
+                         'tests/resources/terminator.vt'))
+        close_zip_xml(vt_save_dir)
+        (fd, fname) = tempfile.mkstemp(prefix='vt_', suffix='.xml')
+        os.close(fd)
+        try:
+            save_vistrail_to_xml(save_bundle.vistrail, fname)
+            eager = open_vistrail_from_xml(fname)
+            lazy = open_vistrail_from_xml(fname, lazy=True)
+            Vistrail.convert(eager)
+            Vistrail.convert(lazy)
+            self.assertTrue(all(a.db_has_lazy_operations()
+                                for a in lazy.db_actions))
+            self.assertEqual(lazy.idScope.getNewId('operation'),
+                             eager.idScope.getNewId('operation'))
+            self.assertEqual(lazy.idScope.getNewId('module'),
+                             eager.idScope.getNewId('module'))
+
+            version = max(lazy.actionMap)
+            self.assertEqual(lazy.getPipeline(version),
+                             eager.getPipeline(version))
+            nb_loaded = sum(1 for a in lazy.db_actions
+                            if not a.db_has_lazy_operations())
+            self.assertGreater(nb_loaded, 0)
+            self.assertLess(nb_loaded, len(lazy.db_actions))
+
+            # Saving reads the remaining operations
+            save_vistrail_to_xml(lazy, fname)
+            saved = open_vistrail_from_xml(fname)
+            self.assertEqual([len(a.db_operations) for a in saved.db_actions],
+                             [len(a.db_operations) for a in eager.db_actions])
+        finally:
+            os.unlink(fname)
+
+    def test_fused_translation(self):
+        """test that skipping structural translations gives the same file"""
+        import vistrails.db.versions
+
+        fname = os.path.join(vistrails.core.system.vistrails_root_directory(),
+                             'tests/resources/dummy.xml')
+        tags = {}
+        dao_list = getVersionDAO(currentVersion)
+        outputs = []
+        structural_hops = vistrails.db.versions.structural_hops
+        try:
+            for hops in (structural_hops, {}):
+                vistrails.db.versions.structural_hops = hops
+                vistrail, version = read_xml_stream(fname, DBVistrail.vtType)
+                self.assertEqual(version, '0.3.0')
+                vistrail = translate_vistrail(vistrail, version)
+                (fd, out) = tempfile.mkstemp(prefix='vt_', suffix='.xml')
+                os.close(fd)
+                try:
+                    dao_list.save_to_xml(vistrail, out, tags, currentVersion)
+                    with open(out, 'rb') as fp:
+                        outputs.append(fp.read())
+                finally:
+                    os.unlink(out)
+        finally:
+            vistrails.db.versions.structural_hops = structural_hops
+        self.assertEqual(outputs[0], outputs[1])
+
+    def test_translation_cache(self):
+        """test that vistrails from older versions are translated once"""
+        from vistrails.core.configuration import get_vistrails_configuration
+        import vistrails.db.services.io as io
+
+        fname = os.path.join(vistrails.core.system.vistrails_root_directory(),
+                             'tests/resources/dummy.xml')
+        versions = []
+        original_translate = io.translate_vistrail
+        def translate(vistrail, version=None, target_version=None):
+            versions.append(version)
+            return original_translate(vistrail, version, target_version)
+
+        conf = get_vistrails_configuration().translationCache
+        old_conf = (conf.enabled, conf.cacheDir, conf.cacheSize)
+        old_fingerprint = io._translation_fingerprint
+        cache_dir = tempfile.mkdtemp(prefix='vt_translated_')
+        conf.enabled = True
+        conf.cacheDir = cache_dir
+        io.translate_vistrail = translate
+        try:
+            first = open_vistrail_from_xml(fname)
+            self.assertEqual(versions, ['0.3.0'])
+            cache = get_translation_cache()
+            self.assertEqual(len(cache.elements), 1)
+
+            # The cached file is found from the content
+            with open(fname, 'rb') as fp:
+                second = open_vistrail_from_xml(StringIO(fp.read()))
+            self.assertEqual(versions, ['0.3.0'])
+            self.assertEqual(second.db_version, currentVersion)
+            self.assertEqual(second.db_name, first.db_name)
+            self.assertEqual([a.db_id for a in second.db_actions],
+                             [a.db_id for a in first.db_actions])
+            self.assertEqual([len(a.db_operations)
+                              for a in second.db_actions],
+                             [len(a.db_operations) for a in first.db_actions])
+            self.assertEqual(second.idScope.getNewId('module'),
+                             first.idScope.getNewId('module'))
+
+            # Current files don't get cached
+            open_vistrail_from_xml(
+                os.path.join(vistrails.core.system.vistrails_root_directory(),
+                             'tests/resources/upgrades1.xml'))
+            self.assertEqual(len(cache.elements), 1)
+
+            # Translations made by other code are not used
+            io._translation_fingerprint = 'other'
+            open_vistrail_from_xml(fname)
+            self.assertEqual(versions.count('0.3.0'), 2)
+            self.assertEqual(len(cache.elements), 2)
+
+            # Translations that don't fit are not kept
+            conf.cacheSize = 0
+            io._translation_fingerprint = 'another'
+            open_vistrail_from_xml(fname)
+            self.assertEqual(versions.count('0.3.0'), 3)
+            self.assertEqual(len(get_translation_cache().elements), 2)
+        finally:
+            io.translate_vistrail = original_translate
+            io._translation_fingerprint = old_fingerprint
+            conf.enabled, conf.cacheDir, conf.cacheSize = old_conf
+            shutil.rmtree(cache_dir)
+
+    def test_old_bundles_without_cache(self):
+        """test reading old vistrails from zip members, without the cache"""
+        from vistrails.core.configuration import get_vistrails_configuration
+
+        conf = get_vistrails_configuration().translationCache
+        old_enabled = conf.enabled
+        conf.enabled = False
+        root = vistrails.core.system.vistrails_root_directory()
+        (fd, zip_fname) = tempfile.mkstemp(prefix='vt_', suffix='.zip')
+        os.close(fd)
+        try:
+            for name in ('terminator.vt', 'dummy_new.vt'):
+                (save_bundle, vt_save_dir) = \
+                    open_vistrail_bundle_from_zip_xml(
+                        os.path.join(root, 'tests/resources', name))
+                close_zip_xml(vt_save_dir)
+                self.assertEqual(save_bundle.vistrail.db_version,
+                                 currentVersion)
+
+            # Versions whose DAOs parse the file again
+            with zipfile.ZipFile(zip_fname, 'w') as zf:
+                zf.write(os.path.join(root, 'tests/resources/dummy.xml'),
+                         'vistrail')
+            with zipfile.ZipFile(zip_fname, 'r') as zf:
+                fp = zf.open('vistrail')
+                try:
+                    vistrail = open_vistrail_from_xml(fp)
+                finally:
+                    fp.close()
+            self.assertEqual(vistrail.db_version, currentVersion)
+            self.assertGreater(len(vistrail.db_actions), 0)
+        finally:
+            conf.enabled = old_enabled
+            os.unlink(zip_fname)
+
+    def test_appended_log_index(self):
+        """test reading some executions of an appended log"""
+
+        def append(parent_versions):
+            log = DBLog()
+            for i, parent_version in enumerate(parent_versions):
+                log.db_add_workflow_exec(DBWorkflowExec(
+                        id=i + 1, parent_version=parent_version,
+                        ts_start=datetime(2014, 1, 1, 0, 0, parent_version),
+                        completed=1))
+            save_log_to_xml(log, fname, do_append=True)
+
+        (fd, fname) = tempfile.mkstemp(prefix='vt_log_')
+        os.close(fd)
+        try:
+            append([3, 5, 3])
+            index = get_appended_log_index(fname)
+            self.assertEqual(len(index), 3)
+            self.assertEqual(index.find(parent_version=3), [1, 3])
+
+            # Only the new executions get indexed
+            append([7, 3])
+            index = get_appended_log_index(fname)
+            self.assertEqual(len(index), 5)
+            self.assertEqual(index.find(parent_version=3), [1, 3, 5])
+            self.assertEqual(index.find(start_time=datetime(2014, 1, 1,
+                                                            0, 0, 5)),
+                             [2, 4])
+
+            full = open_log_from_xml(fname, True)
+            partial = open_log_from_xml(fname, True, [2, 4])
+            self.assertEqual([(e.db_id, e.db_parent_version)
+                              for e in partial.db_workflow_execs],
+                             [(e.db_id, e.db_parent_version)
+                              for e in full.db_workflow_execs
+                              if e.db_id in (2, 4)])
+            self.assertEqual(partial.id_scope.getNewId(
+                    DBWorkflowExec.vtType), 5)
+
+            # Replacing the file resets the index
+            os.unlink(fname)
+            append([1])
+            self.assertEqual(get_appended_log_index(fname).find(), [1])
+        finally:
+            os.unlink(fname)
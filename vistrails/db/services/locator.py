@@ -622,7 +622,13 @@ class ZIPFileLocator(XMLFileLocator):
             obj = io.open_from_xml(fname, type)
             return SaveBundle(DBVistrail.vtType, obj)
         else:
-            (save_bundle, tmp_dir) = io.open_bundle_from_zip_xml(type, self._name)
+            from vistrails.core.configuration import \
+                get_vistrails_configuration
+            conf = get_vistrails_configuration()
+            lazy = conf is not None and conf.check('lazyActionLoading')
+            (save_bundle, tmp_dir) = io.open_bundle_from_zip_xml(type,
+                                                                 self._name,
+                                                                 lazy)
             self.tmp_dir = tmp_dir
             for obj in save_bundle.get_db_objs():
                 obj.locator = self
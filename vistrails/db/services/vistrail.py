@@ -642,22 +642,29 @@ def normalOperations(adds, deletes, do_copy=False):
 
 def getPathAsAction(vistrail, v1, v2, do_copy=False):
     sharedRoot = getSharedRoot(vistrail, [v1, v2])
-    sharedActionChain = getActionChain(vistrail, sharedRoot)
-    sharedOperationDict = getCurrentOperationDict(sharedActionChain)
-    v1Actions = getActionChain(vistrail, v1, sharedRoot)
     v2Actions = getActionChain(vistrail, v2, sharedRoot)
-    (v1AddDict, v1DeleteDict) = getOperationDiff(v1Actions, 
-                                                 sharedOperationDict)
-    (v2AddDict, v2DeleteDict) = getOperationDiff(v2Actions,
-                                                 sharedOperationDict)
-    
-    # need to invert one of them (v1)
-    v1Adds = v1AddDict.values()
-    v1Adds.sort(key=lambda x: x.db_id) # faster than sort(lambda x, y: cmp(x.db_id, y.db_id))
-    v1Deletes = v1DeleteDict.values()
-    v1Deletes.sort(key=lambda x: x.db_id) # faster than sort(lambda x, y: cmp(x.db_id, y.db_id))
-    v1InverseOps = \
-        invertOperations(sharedOperationDict, v1Adds, v1Deletes, do_copy)
+    if sharedRoot == v1:
+        # v1 is an ancestor of v2: nothing to invert, and we don't need to
+        # replay the chain up to the shared root to know which objects
+        # existed before the path
+        v1InverseOps = []
+        (v2AddDict, v2DeleteDict) = getOperationDiff(v2Actions, None)
+    else:
+        sharedActionChain = getActionChain(vistrail, sharedRoot)
+        sharedOperationDict = getCurrentOperationDict(sharedActionChain)
+        v1Actions = getActionChain(vistrail, v1, sharedRoot)
+        (v1AddDict, v1DeleteDict) = getOperationDiff(v1Actions, 
+                                                     sharedOperationDict)
+        (v2AddDict, v2DeleteDict) = getOperationDiff(v2Actions,
+                                                     sharedOperationDict)
+
+        # need to invert one of them (v1)
+        v1Adds = v1AddDict.values()
+        v1Adds.sort(key=lambda x: x.db_id) # faster than sort(lambda x, y: cmp(x.db_id, y.db_id))
+        v1Deletes = v1DeleteDict.values()
+        v1Deletes.sort(key=lambda x: x.db_id) # faster than sort(lambda x, y: cmp(x.db_id, y.db_id))
+        v1InverseOps = \
+            invertOperations(sharedOperationDict, v1Adds, v1Deletes, do_copy)
     
     # need to normalize ops of the other (v2)
     v2Adds = v2AddDict.values()
@@ -728,8 +735,19 @@ def getSharedRoot(vistrail, versions):
     return 0
 
 def getOperationDiff(actions, operationDict):
+    """getOperationDiff(actions, operationDict) -> (addDict, deleteDict)
+
+    operationDict holds the operations that created the objects existing
+    before the actions. If it is None, any object that the actions delete
+    or change without having added it is assumed to exist before them.
+    """
     addDict = {}
     deleteDict = {}
+    if operationDict is None:
+        def existed_before(key):
+            return key not in addDict
+    else:
+        existed_before = operationDict.has_key
     for action in actions:
 #         print 'action: %d' % action.db_id
         for operation in action.db_operations:
@@ -741,8 +759,8 @@ def getOperationDiff(actions, operationDict):
             elif operation.vtType == 'delete':
 #                 print "del: %s %s" % (operation.db_what, 
 #                                       operation.db_objectId)
-                if operationDict.has_key((operation.db_what,
-                                          operation.db_objectId)):
+                if existed_before((operation.db_what,
+                                   operation.db_objectId)):
                     deleteDict[(operation.db_what,
                                 operation.db_objectId)] = operation
 #                     del operationDict[(operation.db_what, 
@@ -757,8 +775,8 @@ def getOperationDiff(actions, operationDict):
 #                 print "chg: %s %s %s" % (operation.db_what, 
 #                                          operation.db_oldObjId,
 #                                          operation.db_newObjId)
-                if operationDict.has_key((operation.db_what,
-                                          operation.db_oldObjId)):
+                if existed_before((operation.db_what,
+                                   operation.db_oldObjId)):
                     deleteDict[(operation.db_what,
                                 operation.db_oldObjId)] = operation
 #                     del operationDict[(operation.db_what, 
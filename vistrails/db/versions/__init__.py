@@ -44,6 +44,15 @@ from vistrails.db import VistrailsDBException
 
 currentVersion = '1.0.4'
 
+# Translations that only copy the objects into the classes of the next
+# version (update_version without changes). When several of them follow each
+# other, the last one is applied directly to the objects of the first version
+# instead of building every intermediate object graph.
+_structural_hops = set([('0.9.5', '1.0.0'), ('1.0.0', '1.0.1'),
+                        ('1.0.1', '1.0.0'), ('1.0.0', '0.9.5')])
+structural_hops = {'translateVistrail': _structural_hops,
+                   'translateWorkflow': _structural_hops}
+
 def getVersionDAO(version=None):
     if version is None:
         version = currentVersion
@@ -103,7 +112,6 @@ def translate_object(obj, method_name, version=None, target_version=None):
             get_version_name(start_version)
         return __import__(translate_dir, {}, {}, [''])
 
-    path = []
     old_tuple = version.split('.')
     new_tuple = target_version.split('.')
     map = version_map
@@ -117,11 +125,25 @@ def translate_object(obj, method_name, version=None, target_version=None):
             break
 
     # don't get stuck in an infinite loop
-    count = 0
+    hops = []
     while version != target_version:
-        if count > len(map):
+        if len(hops) > len(map):
             break
         next_version = map[version]
+        hops.append((version, next_version))
+        version = next_version
+
+    if version != target_version:
+        msg = "An error occurred when translating,"
+        msg += "only able to translate to version '%s'" % version
+        raise VistrailsDBException(msg)
+
+    structural = structural_hops.get(method_name, ())
+    for i, (version, next_version) in enumerate(hops):
+        if (i + 1 < len(hops) and (version, next_version) in structural and
+                hops[i + 1] in structural):
+            # the next translation can read the objects directly
+            continue
         try:
             translate_module = get_translate_module(map, version, next_version)
         except Exception, e:
@@ -134,13 +156,6 @@ def translate_object(obj, method_name, version=None, target_version=None):
                                        "version %s missing method '%s'" % \
                                            (version, method_name))
         obj = getattr(translate_module, method_name)(obj)
-        version = next_version
-        count += 1
-
-    if version != target_version:
-        msg = "An error occurred when translating,"
-        msg += "only able to translate to version '%s'" % version
-        raise VistrailsDBException(msg)
 
     return obj
 
@@ -163,6 +178,10 @@ def translate_startup(startup, version=None, target_version=None):
     return translate_object(startup, 'translateStartup', version,
                             target_version)
 
+def translate_mashuptrail(mashuptrail, version=None, target_version=None):
+    return translate_object(mashuptrail, 'translateMashuptrail', version,
+                            target_version)
+
 def get_version_name(version_no):
     return 'v' + version_no.replace('.', '_')
 
@@ -0,0 +1,120 @@
+###############################################################################
+##
+## Copyright (C) 2014-2016, New York University.
+## Copyright (C) 2011-2014, NYU-Poly.
+## Copyright (C) 2006-2011, University of Utah.
+## All rights reserved.
+## Contact: contact@vistrails.org
+##
+## This file is part of VisTrails.
+##
+## "Redistribution and use in source and binary forms, with or without
+## modification, are permitted provided that the following conditions are met:
+##
+##  - Redistributions of source code must retain the above copyright notice,
+##    this list of conditions and the following disclaimer.
+##  - Redistributions in binary form must reproduce the above copyright
+##    notice, this list of conditions and the following disclaimer in the
+##    documentation and/or other materials provided with the distribution.
+##  - Neither the name of the New York University nor the names of its
+##    contributors may be used to endorse or promote products derived from
+##    this software without specific prior written permission.
+##
+## THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+## AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+## THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+## PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+## CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+## EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+## PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+## OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+## WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR
+## OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF
+## ADVISED OF THE POSSIBILITY OF SUCH DAMAGE."
+##
+###############################################################################
+
+from __future__ import division
+
+from auto_gen import DBAction as _DBAction
+
+class DBAction(_DBAction):
+    """DBAction whose operations can be read the first time they are used.
+
+    db_set_operations_loader() drops the operations and keeps a function
+    that returns them instead. It is called with the action the first time
+    _db_operations or db_operations_id_index is accessed, so that opening a
+    vistrail doesn't need to convert the operations of every version.
+
+    """
+
+    def __getattr__(self, name):
+        # only called if the attribute wasn't found the normal way
+        if name in ('_db_operations', 'db_operations_id_index'):
+            loader = self.__dict__.pop('_db_operations_loader', None)
+            if loader is not None:
+                operations = loader(self)
+                self._db_operations = operations
+                self.db_operations_id_index = dict((v.db_id, v)
+                                                   for v in operations)
+                self.db_operations_loaded()
+                return getattr(self, name)
+        return _DBAction.__getattr__(self, name)
+
+    def __copy__(self):
+        return DBAction.do_copy(self)
+
+    def do_copy(self, new_ids=False, id_scope=None, id_remap=None):
+        cp = _DBAction.do_copy(self, new_ids, id_scope, id_remap)
+        cp.__class__ = DBAction
+        return cp
+
+    def db_set_operations_loader(self, loader):
+        for name in ('_db_operations', 'db_operations_id_index'):
+            try:
+                delattr(self, name)
+            except AttributeError:
+                pass
+        self._db_operations_loader = loader
+
+    def db_has_lazy_operations(self):
+        return '_db_operations_loader' in self.__dict__
+
+    def db_operations_loaded(self):
+        """db_operations_loaded() -> None
+        Called once the operations returned by the loader are set.
+
+        """
+        pass
+
+import unittest
+
+class TestDBAction(unittest.TestCase):
+    def test_lazy_slots(self):
+        from auto_gen import DBAdd
+        action = DBAction(id=1)
+        self.assertEqual(action.__dict__, {})
+        self.assertEqual(action.db_deleted_children(), [])
+        # indexes and deleted lists are created when needed
+        self.assertEqual(action.db_operations_id_index, {})
+        action.db_add_operation(DBAdd(id=2))
+        self.assertIs(action.db_get_operation_by_id(2), action.db_operations[0])
+        cp = action.do_copy()
+        self.assertIsInstance(cp, DBAction)
+        self.assertEqual(cp.db_operations_id_index.keys(), [2])
+        self.assertEqual(cp.db_annotations_key_index, {})
+
+    def test_operations_loader(self):
+        from auto_gen import DBAdd
+        action = DBAction(id=1, operations=[DBAdd(id=2)])
+        loaded = []
+        def loader(a):
+            loaded.append(a)
+            return [DBAdd(id=3)]
+        action.db_set_operations_loader(loader)
+        self.assertTrue(action.db_has_lazy_operations())
+        self.assertEqual(loaded, [])
+        self.assertEqual(action.db_operations_id_index.keys(), [3])
+        self.assertEqual(loaded, [action])
+        self.assertFalse(action.db_has_lazy_operations())
+        self.assertEqual([op.db_id for op in action.db_operations], [3])
@@ -40,23 +40,72 @@ from __future__ import division
 
 import copy
 
-class DBOpmWasGeneratedBy(object):
+class _DBSlotsBase(object):
+    """Base of the domain classes that keep their fields in __slots__.
+
+    The deleted-object lists and the indexes listed in _db_lazy_slots are
+    only created the first time they are accessed.
+
+    """
+
+    __slots__ = ()
+    _db_lazy_slots = {}
+
+    def __getattr__(self, name):
+        # only called if the slot hasn't been set yet
+        try:
+            value = self._db_lazy_slots[name]()
+        except KeyError:
+            raise AttributeError(name)
+        setattr(self, name, value)
+        return value
+
+    def _db_get_deleted(self, name, remove):
+        # doesn't create the list if nothing was deleted
+        try:
+            deleted = object.__getattribute__(self, name)
+        except AttributeError:
+            return []
+        if remove:
+            delattr(self, name)
+        return deleted
+
+class DBOpmWasGeneratedBy(_DBSlotsBase):
 
     vtType = 'opm_was_generated_by'
 
+    __slots__ = (
+        '_db_effect',
+        '_db_role',
+        '_db_cause',
+        '_db_accounts',
+        '_db_opm_times',
+        'db_deleted_effect',
+        'db_deleted_role',
+        'db_deleted_cause',
+        'db_deleted_accounts',
+        'db_deleted_opm_times',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+    _db_lazy_slots = {
+        'db_deleted_effect': list,
+        'db_deleted_role': list,
+        'db_deleted_cause': list,
+        'db_deleted_accounts': list,
+        'db_deleted_opm_times': list,
+        }
+
     def __init__(self, effect=None, role=None, cause=None, accounts=None, opm_times=None):
-        self.db_deleted_effect = []
         self._db_effect = effect
-        self.db_deleted_role = []
         self._db_role = role
-        self.db_deleted_cause = []
         self._db_cause = cause
-        self.db_deleted_accounts = []
         if accounts is None:
             self._db_accounts = []
         else:
             self._db_accounts = accounts
-        self.db_deleted_opm_times = []
         if opm_times is None:
             self._db_opm_times = []
         else:
@@ -112,7 +161,7 @@ class DBOpmWasGeneratedBy(object):
         elif hasattr(old_obj, 'db_effect') and old_obj.db_effect is not None:
             obj = old_obj.db_effect
             new_obj.db_add_effect(DBOpmArtifactIdEffect.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_effect') and hasattr(new_obj, 'db_deleted_effect'):
+        if hasattr(old_obj, 'db_deleted_effect'):
             for obj in old_obj.db_deleted_effect:
                 n_obj = DBOpmArtifactIdEffect.update_version(obj, trans_dict)
                 new_obj.db_deleted_effect.append(n_obj)
@@ -122,7 +171,7 @@ class DBOpmWasGeneratedBy(object):
         elif hasattr(old_obj, 'db_role') and old_obj.db_role is not None:
             obj = old_obj.db_role
             new_obj.db_add_role(DBOpmRole.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_role') and hasattr(new_obj, 'db_deleted_role'):
+        if hasattr(old_obj, 'db_deleted_role'):
             for obj in old_obj.db_deleted_role:
                 n_obj = DBOpmRole.update_version(obj, trans_dict)
                 new_obj.db_deleted_role.append(n_obj)
@@ -132,7 +181,7 @@ class DBOpmWasGeneratedBy(object):
         elif hasattr(old_obj, 'db_cause') and old_obj.db_cause is not None:
             obj = old_obj.db_cause
             new_obj.db_add_cause(DBOpmProcessIdCause.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_cause') and hasattr(new_obj, 'db_deleted_cause'):
+        if hasattr(old_obj, 'db_deleted_cause'):
             for obj in old_obj.db_deleted_cause:
                 n_obj = DBOpmProcessIdCause.update_version(obj, trans_dict)
                 new_obj.db_deleted_cause.append(n_obj)
@@ -143,7 +192,7 @@ class DBOpmWasGeneratedBy(object):
         elif hasattr(old_obj, 'db_accounts') and old_obj.db_accounts is not None:
             for obj in old_obj.db_accounts:
                 new_obj.db_add_account(DBOpmAccountId.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_accounts') and hasattr(new_obj, 'db_deleted_accounts'):
+        if hasattr(old_obj, 'db_deleted_accounts'):
             for obj in old_obj.db_deleted_accounts:
                 n_obj = DBOpmAccountId.update_version(obj, trans_dict)
                 new_obj.db_deleted_accounts.append(n_obj)
@@ -154,7 +203,7 @@ class DBOpmWasGeneratedBy(object):
         elif hasattr(old_obj, 'db_opm_times') and old_obj.db_opm_times is not None:
             for obj in old_obj.db_opm_times:
                 new_obj.db_add_opm_time(DBOpmTime.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_opm_times') and hasattr(new_obj, 'db_deleted_opm_times'):
+        if hasattr(old_obj, 'db_deleted_opm_times'):
             for obj in old_obj.db_deleted_opm_times:
                 n_obj = DBOpmTime.update_version(obj, trans_dict)
                 new_obj.db_deleted_opm_times.append(n_obj)
@@ -194,17 +243,11 @@ class DBOpmWasGeneratedBy(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_effect)
-        children.extend(self.db_deleted_role)
-        children.extend(self.db_deleted_cause)
-        children.extend(self.db_deleted_accounts)
-        children.extend(self.db_deleted_opm_times)
-        if remove:
-            self.db_deleted_effect = []
-            self.db_deleted_role = []
-            self.db_deleted_cause = []
-            self.db_deleted_accounts = []
-            self.db_deleted_opm_times = []
+        children.extend(self._db_get_deleted('db_deleted_effect', remove))
+        children.extend(self._db_get_deleted('db_deleted_role', remove))
+        children.extend(self._db_get_deleted('db_deleted_cause', remove))
+        children.extend(self._db_get_deleted('db_deleted_accounts', remove))
+        children.extend(self._db_get_deleted('db_deleted_opm_times', remove))
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -309,12 +352,24 @@ class DBOpmWasGeneratedBy(object):
     
 
 
-class DBConfigKey(object):
+class DBConfigKey(_DBSlotsBase):
 
     vtType = 'config_key'
 
+    __slots__ = (
+        '_db_value',
+        '_db_name',
+        'db_deleted_value',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+    _db_lazy_slots = {
+        'db_deleted_value': list,
+        }
+
     def __init__(self, value=None, name=None):
-        self.db_deleted_value = []
         self._db_value = value
         self._db_name = name
         self.is_dirty = True
@@ -365,7 +420,7 @@ class DBConfigKey(object):
                 new_obj.db_add_value(DBConfigBool.update_version(obj, trans_dict))
             elif obj.vtType == 'configuration':
                 new_obj.db_add_value(DBConfiguration.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_value') and hasattr(new_obj, 'db_deleted_value'):
+        if hasattr(old_obj, 'db_deleted_value'):
             for obj in old_obj.db_deleted_value:
                 if obj.vtType == 'config_str':
                     n_obj = DBConfigStr.update_version(obj, trans_dict)
@@ -401,9 +456,7 @@ class DBConfigKey(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_value)
-        if remove:
-            self.db_deleted_value = []
+        children.extend(self._db_get_deleted('db_deleted_value', remove))
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -442,14 +495,27 @@ class DBConfigKey(object):
     def getPrimaryKey(self):
         return self._db_name
 
-class DBMashupAlias(object):
+class DBMashupAlias(_DBSlotsBase):
 
     vtType = 'mashup_alias'
 
+    __slots__ = (
+        '_db_id',
+        '_db_name',
+        '_db_component',
+        'db_deleted_component',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+    _db_lazy_slots = {
+        'db_deleted_component': list,
+        }
+
     def __init__(self, id=None, name=None, component=None):
         self._db_id = id
         self._db_name = name
-        self.db_deleted_component = []
         self._db_component = component
         self.is_dirty = True
         self.is_new = True
@@ -501,7 +567,7 @@ class DBMashupAlias(object):
         elif hasattr(old_obj, 'db_component') and old_obj.db_component is not None:
             obj = old_obj.db_component
             new_obj.db_add_component(DBMashupComponent.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_component') and hasattr(new_obj, 'db_deleted_component'):
+        if hasattr(old_obj, 'db_deleted_component'):
             for obj in old_obj.db_deleted_component:
                 n_obj = DBMashupComponent.update_version(obj, trans_dict)
                 new_obj.db_deleted_component.append(n_obj)
@@ -519,9 +585,7 @@ class DBMashupAlias(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_component)
-        if remove:
-            self.db_deleted_component = []
+        children.extend(self._db_get_deleted('db_deleted_component', remove))
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -1071,28 +1135,49 @@ class DBGroup(object):
     def getPrimaryKey(self):
         return self._db_id
 
-class DBOpmWasControlledBy(object):
+class DBOpmWasControlledBy(_DBSlotsBase):
 
     vtType = 'opm_was_controlled_by'
 
+    __slots__ = (
+        '_db_effect',
+        '_db_role',
+        '_db_cause',
+        '_db_accounts',
+        '_db_starts',
+        '_db_ends',
+        'db_deleted_effect',
+        'db_deleted_role',
+        'db_deleted_cause',
+        'db_deleted_accounts',
+        'db_deleted_starts',
+        'db_deleted_ends',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+    _db_lazy_slots = {
+        'db_deleted_effect': list,
+        'db_deleted_role': list,
+        'db_deleted_cause': list,
+        'db_deleted_accounts': list,
+        'db_deleted_starts': list,
+        'db_deleted_ends': list,
+        }
+
     def __init__(self, effect=None, role=None, cause=None, accounts=None, starts=None, ends=None):
-        self.db_deleted_effect = []
         self._db_effect = effect
-        self.db_deleted_role = []
         self._db_role = role
-        self.db_deleted_cause = []
         self._db_cause = cause
-        self.db_deleted_accounts = []
         if accounts is None:
             self._db_accounts = []
         else:
             self._db_accounts = accounts
-        self.db_deleted_starts = []
         if starts is None:
             self._db_starts = []
         else:
             self._db_starts = starts
-        self.db_deleted_ends = []
         if ends is None:
             self._db_ends = []
         else:
@@ -1152,7 +1237,7 @@ class DBOpmWasControlledBy(object):
         elif hasattr(old_obj, 'db_effect') and old_obj.db_effect is not None:
             obj = old_obj.db_effect
             new_obj.db_add_effect(DBOpmProcessIdEffect.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_effect') and hasattr(new_obj, 'db_deleted_effect'):
+        if hasattr(old_obj, 'db_deleted_effect'):
             for obj in old_obj.db_deleted_effect:
                 n_obj = DBOpmProcessIdEffect.update_version(obj, trans_dict)
                 new_obj.db_deleted_effect.append(n_obj)
@@ -1162,7 +1247,7 @@ class DBOpmWasControlledBy(object):
         elif hasattr(old_obj, 'db_role') and old_obj.db_role is not None:
             obj = old_obj.db_role
             new_obj.db_add_role(DBOpmRole.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_role') and hasattr(new_obj, 'db_deleted_role'):
+        if hasattr(old_obj, 'db_deleted_role'):
             for obj in old_obj.db_deleted_role:
                 n_obj = DBOpmRole.update_version(obj, trans_dict)
                 new_obj.db_deleted_role.append(n_obj)
@@ -1172,7 +1257,7 @@ class DBOpmWasControlledBy(object):
         elif hasattr(old_obj, 'db_cause') and old_obj.db_cause is not None:
             obj = old_obj.db_cause
             new_obj.db_add_cause(DBOpmAgentId.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_cause') and hasattr(new_obj, 'db_deleted_cause'):
+        if hasattr(old_obj, 'db_deleted_cause'):
             for obj in old_obj.db_deleted_cause:
                 n_obj = DBOpmAgentId.update_version(obj, trans_dict)
                 new_obj.db_deleted_cause.append(n_obj)
@@ -1183,7 +1268,7 @@ class DBOpmWasControlledBy(object):
         elif hasattr(old_obj, 'db_accounts') and old_obj.db_accounts is not None:
             for obj in old_obj.db_accounts:
                 new_obj.db_add_account(DBOpmAccountId.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_accounts') and hasattr(new_obj, 'db_deleted_accounts'):
+        if hasattr(old_obj, 'db_deleted_accounts'):
             for obj in old_obj.db_deleted_accounts:
                 n_obj = DBOpmAccountId.update_version(obj, trans_dict)
                 new_obj.db_deleted_accounts.append(n_obj)
@@ -1194,7 +1279,7 @@ class DBOpmWasControlledBy(object):
         elif hasattr(old_obj, 'db_starts') and old_obj.db_starts is not None:
             for obj in old_obj.db_starts:
                 new_obj.db_add_start(DBOpmTime.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_starts') and hasattr(new_obj, 'db_deleted_starts'):
+        if hasattr(old_obj, 'db_deleted_starts'):
             for obj in old_obj.db_deleted_starts:
                 n_obj = DBOpmTime.update_version(obj, trans_dict)
                 new_obj.db_deleted_starts.append(n_obj)
@@ -1205,7 +1290,7 @@ class DBOpmWasControlledBy(object):
         elif hasattr(old_obj, 'db_ends') and old_obj.db_ends is not None:
             for obj in old_obj.db_ends:
                 new_obj.db_add_end(DBOpmTime.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_ends') and hasattr(new_obj, 'db_deleted_ends'):
+        if hasattr(old_obj, 'db_deleted_ends'):
             for obj in old_obj.db_deleted_ends:
                 n_obj = DBOpmTime.update_version(obj, trans_dict)
                 new_obj.db_deleted_ends.append(n_obj)
@@ -1252,19 +1337,12 @@ class DBOpmWasControlledBy(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_effect)
-        children.extend(self.db_deleted_role)
-        children.extend(self.db_deleted_cause)
-        children.extend(self.db_deleted_accounts)
-        children.extend(self.db_deleted_starts)
-        children.extend(self.db_deleted_ends)
-        if remove:
-            self.db_deleted_effect = []
-            self.db_deleted_role = []
-            self.db_deleted_cause = []
-            self.db_deleted_accounts = []
-            self.db_deleted_starts = []
-            self.db_deleted_ends = []
+        children.extend(self._db_get_deleted('db_deleted_effect', remove))
+        children.extend(self._db_get_deleted('db_deleted_role', remove))
+        children.extend(self._db_get_deleted('db_deleted_cause', remove))
+        children.extend(self._db_get_deleted('db_deleted_accounts', remove))
+        children.extend(self._db_get_deleted('db_deleted_starts', remove))
+        children.extend(self._db_get_deleted('db_deleted_ends', remove))
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -1392,12 +1470,28 @@ class DBOpmWasControlledBy(object):
     
 
 
-class DBAdd(object):
+class DBAdd(_DBSlotsBase):
 
     vtType = 'add'
 
+    __slots__ = (
+        '_db_data',
+        '_db_id',
+        '_db_what',
+        '_db_objectId',
+        '_db_parentObjId',
+        '_db_parentObjType',
+        'db_deleted_data',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+    _db_lazy_slots = {
+        'db_deleted_data': list,
+        }
+
     def __init__(self, data=None, id=None, what=None, objectId=None, parentObjId=None, parentObjType=None):
-        self.db_deleted_data = []
         self._db_data = data
         self._db_id = id
         self._db_what = what
@@ -1476,7 +1570,7 @@ class DBAdd(object):
                 new_obj.db_add_data(DBOther.update_version(obj, trans_dict))
             elif obj.vtType == 'plugin_data':
                 new_obj.db_add_data(DBPluginData.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_data') and hasattr(new_obj, 'db_deleted_data'):
+        if hasattr(old_obj, 'db_deleted_data'):
             for obj in old_obj.db_deleted_data:
                 if obj.vtType == 'module':
                     n_obj = DBModule.update_version(obj, trans_dict)
@@ -1556,9 +1650,7 @@ class DBAdd(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_data)
-        if remove:
-            self.db_deleted_data = []
+        children.extend(self._db_get_deleted('db_deleted_data', remove))
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -1649,14 +1741,28 @@ class DBAdd(object):
     def getPrimaryKey(self):
         return self._db_id
 
-class DBProvGeneration(object):
+class DBProvGeneration(_DBSlotsBase):
 
     vtType = 'prov_generation'
 
+    __slots__ = (
+        '_db_prov_entity',
+        '_db_prov_activity',
+        '_db_prov_role',
+        'db_deleted_prov_entity',
+        'db_deleted_prov_activity',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+    _db_lazy_slots = {
+        'db_deleted_prov_entity': list,
+        'db_deleted_prov_activity': list,
+        }
+
     def __init__(self, prov_entity=None, prov_activity=None, prov_role=None):
-        self.db_deleted_prov_entity = []
         self._db_prov_entity = prov_entity
-        self.db_deleted_prov_activity = []
         self._db_prov_activity = prov_activity
         self._db_prov_role = prov_role
         self.is_dirty = True
@@ -1700,7 +1806,7 @@ class DBProvGeneration(object):
         elif hasattr(old_obj, 'db_prov_entity') and old_obj.db_prov_entity is not None:
             obj = old_obj.db_prov_entity
             new_obj.db_add_prov_entity(DBRefProvEntity.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_prov_entity') and hasattr(new_obj, 'db_deleted_prov_entity'):
+        if hasattr(old_obj, 'db_deleted_prov_entity'):
             for obj in old_obj.db_deleted_prov_entity:
                 n_obj = DBRefProvEntity.update_version(obj, trans_dict)
                 new_obj.db_deleted_prov_entity.append(n_obj)
@@ -1710,7 +1816,7 @@ class DBProvGeneration(object):
         elif hasattr(old_obj, 'db_prov_activity') and old_obj.db_prov_activity is not None:
             obj = old_obj.db_prov_activity
             new_obj.db_add_prov_activity(DBRefProvActivity.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_prov_activity') and hasattr(new_obj, 'db_deleted_prov_activity'):
+        if hasattr(old_obj, 'db_deleted_prov_activity'):
             for obj in old_obj.db_deleted_prov_activity:
                 n_obj = DBRefProvActivity.update_version(obj, trans_dict)
                 new_obj.db_deleted_prov_activity.append(n_obj)
@@ -1737,11 +1843,8 @@ class DBProvGeneration(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_prov_entity)
-        children.extend(self.db_deleted_prov_activity)
-        if remove:
-            self.db_deleted_prov_entity = []
-            self.db_deleted_prov_activity = []
+        children.extend(self._db_get_deleted('db_deleted_prov_entity', remove))
+        children.extend(self._db_get_deleted('db_deleted_prov_activity', remove))
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -1796,23 +1899,42 @@ class DBProvGeneration(object):
     
 
 
-class DBOpmUsed(object):
+class DBOpmUsed(_DBSlotsBase):
 
     vtType = 'opm_used'
 
+    __slots__ = (
+        '_db_effect',
+        '_db_role',
+        '_db_cause',
+        '_db_accounts',
+        '_db_opm_times',
+        'db_deleted_effect',
+        'db_deleted_role',
+        'db_deleted_cause',
+        'db_deleted_accounts',
+        'db_deleted_opm_times',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+    _db_lazy_slots = {
+        'db_deleted_effect': list,
+        'db_deleted_role': list,
+        'db_deleted_cause': list,
+        'db_deleted_accounts': list,
+        'db_deleted_opm_times': list,
+        }
+
     def __init__(self, effect=None, role=None, cause=None, accounts=None, opm_times=None):
-        self.db_deleted_effect = []
         self._db_effect = effect
-        self.db_deleted_role = []
         self._db_role = role
-        self.db_deleted_cause = []
         self._db_cause = cause
-        self.db_deleted_accounts = []
         if accounts is None:
             self._db_accounts = []
         else:
             self._db_accounts = accounts
-        self.db_deleted_opm_times = []
         if opm_times is None:
             self._db_opm_times = []
         else:
@@ -1868,7 +1990,7 @@ class DBOpmUsed(object):
         elif hasattr(old_obj, 'db_effect') and old_obj.db_effect is not None:
             obj = old_obj.db_effect
             new_obj.db_add_effect(DBOpmProcessIdEffect.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_effect') and hasattr(new_obj, 'db_deleted_effect'):
+        if hasattr(old_obj, 'db_deleted_effect'):
             for obj in old_obj.db_deleted_effect:
                 n_obj = DBOpmProcessIdEffect.update_version(obj, trans_dict)
                 new_obj.db_deleted_effect.append(n_obj)
@@ -1878,7 +2000,7 @@ class DBOpmUsed(object):
         elif hasattr(old_obj, 'db_role') and old_obj.db_role is not None:
             obj = old_obj.db_role
             new_obj.db_add_role(DBOpmRole.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_role') and hasattr(new_obj, 'db_deleted_role'):
+        if hasattr(old_obj, 'db_deleted_role'):
             for obj in old_obj.db_deleted_role:
                 n_obj = DBOpmRole.update_version(obj, trans_dict)
                 new_obj.db_deleted_role.append(n_obj)
@@ -1888,7 +2010,7 @@ class DBOpmUsed(object):
         elif hasattr(old_obj, 'db_cause') and old_obj.db_cause is not None:
             obj = old_obj.db_cause
             new_obj.db_add_cause(DBOpmArtifactIdCause.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_cause') and hasattr(new_obj, 'db_deleted_cause'):
+        if hasattr(old_obj, 'db_deleted_cause'):
             for obj in old_obj.db_deleted_cause:
                 n_obj = DBOpmArtifactIdCause.update_version(obj, trans_dict)
                 new_obj.db_deleted_cause.append(n_obj)
@@ -1899,7 +2021,7 @@ class DBOpmUsed(object):
         elif hasattr(old_obj, 'db_accounts') and old_obj.db_accounts is not None:
             for obj in old_obj.db_accounts:
                 new_obj.db_add_account(DBOpmAccountId.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_accounts') and hasattr(new_obj, 'db_deleted_accounts'):
+        if hasattr(old_obj, 'db_deleted_accounts'):
             for obj in old_obj.db_deleted_accounts:
                 n_obj = DBOpmAccountId.update_version(obj, trans_dict)
                 new_obj.db_deleted_accounts.append(n_obj)
@@ -1910,7 +2032,7 @@ class DBOpmUsed(object):
         elif hasattr(old_obj, 'db_opm_times') and old_obj.db_opm_times is not None:
             for obj in old_obj.db_opm_times:
                 new_obj.db_add_opm_time(DBOpmTime.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_opm_times') and hasattr(new_obj, 'db_deleted_opm_times'):
+        if hasattr(old_obj, 'db_deleted_opm_times'):
             for obj in old_obj.db_deleted_opm_times:
                 n_obj = DBOpmTime.update_version(obj, trans_dict)
                 new_obj.db_deleted_opm_times.append(n_obj)
@@ -1950,17 +2072,11 @@ class DBOpmUsed(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_effect)
-        children.extend(self.db_deleted_role)
-        children.extend(self.db_deleted_cause)
-        children.extend(self.db_deleted_accounts)
-        children.extend(self.db_deleted_opm_times)
-        if remove:
-            self.db_deleted_effect = []
-            self.db_deleted_role = []
-            self.db_deleted_cause = []
-            self.db_deleted_accounts = []
-            self.db_deleted_opm_times = []
+        children.extend(self._db_get_deleted('db_deleted_effect', remove))
+        children.extend(self._db_get_deleted('db_deleted_role', remove))
+        children.extend(self._db_get_deleted('db_deleted_cause', remove))
+        children.extend(self._db_get_deleted('db_deleted_accounts', remove))
+        children.extend(self._db_get_deleted('db_deleted_opm_times', remove))
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -2065,10 +2181,18 @@ class DBOpmUsed(object):
     
 
 
-class DBOpmArtifactIdCause(object):
+class DBOpmArtifactIdCause(_DBSlotsBase):
 
     vtType = 'opm_artifact_id_cause'
 
+    __slots__ = (
+        '_db_id',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+
     def __init__(self, id=None):
         self._db_id = id
         self.is_dirty = True
@@ -2137,10 +2261,18 @@ class DBOpmArtifactIdCause(object):
     
 
 
-class DBRefProvEntity(object):
+class DBRefProvEntity(_DBSlotsBase):
 
     vtType = 'ref_prov_entity'
 
+    __slots__ = (
+        '_db_prov_ref',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+
     def __init__(self, prov_ref=None):
         self._db_prov_ref = prov_ref
         self.is_dirty = True
@@ -2209,10 +2341,24 @@ class DBRefProvEntity(object):
     
 
 
-class DBVtConnection(object):
+class DBVtConnection(_DBSlotsBase):
 
     vtType = 'vt_connection'
 
+    __slots__ = (
+        '_db_id',
+        '_db_vt_source',
+        '_db_vt_dest',
+        '_db_vt_source_port',
+        '_db_vt_dest_port',
+        '_db_vt_source_signature',
+        '_db_vt_dest_signature',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+
     def __init__(self, id=None, vt_source=None, vt_dest=None, vt_source_port=None, vt_dest_port=None, vt_source_signature=None, vt_dest_signature=None):
         self._db_id = id
         self._db_vt_source = vt_source
@@ -2400,10 +2546,19 @@ class DBVtConnection(object):
     def getPrimaryKey(self):
         return self._db_id
 
-class DBOpmAccount(object):
+class DBOpmAccount(_DBSlotsBase):
 
     vtType = 'opm_account'
 
+    __slots__ = (
+        '_db_id',
+        '_db_value',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+
     def __init__(self, id=None, value=None):
         self._db_id = id
         self._db_value = value
@@ -2491,13 +2646,40 @@ class DBOpmAccount(object):
     def getPrimaryKey(self):
         return self._db_id
 
-class DBGroupExec(object):
+class DBGroupExec(_DBSlotsBase):
 
     vtType = 'group_exec'
 
+    __slots__ = (
+        '_db_item_execs',
+        '_db_id',
+        '_db_ts_start',
+        '_db_ts_end',
+        '_db_cached',
+        '_db_module_id',
+        '_db_group_name',
+        '_db_group_type',
+        '_db_completed',
+        '_db_error',
+        '_db_machine_id',
+        '_db_annotations',
+        'db_deleted_item_execs',
+        'db_item_execs_id_index',
+        'db_deleted_annotations',
+        'db_annotations_id_index',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+    _db_lazy_slots = {
+        'db_deleted_item_execs': list,
+        'db_item_execs_id_index': dict,
+        'db_deleted_annotations': list,
+        'db_annotations_id_index': dict,
+        }
+
     def __init__(self, item_execs=None, id=None, ts_start=None, ts_end=None, cached=None, module_id=None, group_name=None, group_type=None, completed=None, error=None, machine_id=None, annotations=None):
-        self.db_deleted_item_execs = []
-        self.db_item_execs_id_index = {}
         if item_execs is None:
             self._db_item_execs = []
         else:
@@ -2514,8 +2696,6 @@ class DBGroupExec(object):
         self._db_completed = completed
         self._db_error = error
         self._db_machine_id = machine_id
-        self.db_deleted_annotations = []
-        self.db_annotations_id_index = {}
         if annotations is None:
             self._db_annotations = []
         else:
@@ -2562,8 +2742,10 @@ class DBGroupExec(object):
                 cp._db_machine_id = id_remap[('machine', self._db_machine_id)]
         
         # recreate indices and set flags
-        cp.db_item_execs_id_index = dict((v.db_id, v) for v in cp._db_item_execs)
-        cp.db_annotations_id_index = dict((v.db_id, v) for v in cp._db_annotations)
+        if cp._db_item_execs:
+            cp.db_item_execs_id_index = dict((v.db_id, v) for v in cp._db_item_execs)
+        if cp._db_annotations:
+            cp.db_annotations_id_index = dict((v.db_id, v) for v in cp._db_annotations)
         if not new_ids:
             cp.is_dirty = self.is_dirty
             cp.is_new = self.is_new
@@ -2588,7 +2770,7 @@ class DBGroupExec(object):
                     new_obj.db_add_item_exec(DBGroupExec.update_version(obj, trans_dict))
                 elif obj.vtType == 'loop_exec':
                     new_obj.db_add_item_exec(DBLoopExec.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_item_execs') and hasattr(new_obj, 'db_deleted_item_execs'):
+        if hasattr(old_obj, 'db_deleted_item_execs'):
             for obj in old_obj.db_deleted_item_execs:
                 if obj.vtType == 'module_exec':
                     n_obj = DBModuleExec.update_version(obj, trans_dict)
@@ -2656,7 +2838,7 @@ class DBGroupExec(object):
         elif hasattr(old_obj, 'db_annotations') and old_obj.db_annotations is not None:
             for obj in old_obj.db_annotations:
                 new_obj.db_add_annotation(DBAnnotation.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_annotations') and hasattr(new_obj, 'db_deleted_annotations'):
+        if hasattr(old_obj, 'db_deleted_annotations'):
             for obj in old_obj.db_deleted_annotations:
                 n_obj = DBAnnotation.update_version(obj, trans_dict)
                 new_obj.db_deleted_annotations.append(n_obj)
@@ -2684,11 +2866,8 @@ class DBGroupExec(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_annotations)
-        children.extend(self.db_deleted_item_execs)
-        if remove:
-            self.db_deleted_annotations = []
-            self.db_deleted_item_execs = []
+        children.extend(self._db_get_deleted('db_deleted_annotations', remove))
+        children.extend(self._db_get_deleted('db_deleted_item_execs', remove))
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -2917,10 +3096,18 @@ class DBGroupExec(object):
     def getPrimaryKey(self):
         return self._db_id
 
-class DBOpmAgentId(object):
+class DBOpmAgentId(_DBSlotsBase):
 
     vtType = 'opm_agent_id'
 
+    __slots__ = (
+        '_db_id',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+
     def __init__(self, id=None):
         self._db_id = id
         self.is_dirty = True
@@ -2989,10 +3176,23 @@ class DBOpmAgentId(object):
     
 
 
-class DBParameter(object):
+class DBParameter(_DBSlotsBase):
 
     vtType = 'parameter'
 
+    __slots__ = (
+        '_db_id',
+        '_db_pos',
+        '_db_name',
+        '_db_type',
+        '_db_val',
+        '_db_alias',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+
     def __init__(self, id=None, pos=None, name=None, type=None, val=None, alias=None):
         self._db_id = id
         self._db_pos = pos
@@ -3160,27 +3360,83 @@ class DBParameter(object):
     def getPrimaryKey(self):
         return self._db_id
 
-class DBVistrail(object):
+class DBVistrail(_DBSlotsBase):
 
     vtType = 'vistrail'
 
+    __slots__ = (
+        '_db_id',
+        '_db_entity_type',
+        '_db_version',
+        '_db_name',
+        '_db_last_modified',
+        '_db_actions',
+        '_db_tags',
+        '_db_annotations',
+        '_db_controlParameters',
+        '_db_vistrailVariables',
+        '_db_parameter_explorations',
+        '_db_actionAnnotations',
+        'db_deleted_actions',
+        'db_actions_id_index',
+        'db_deleted_tags',
+        'db_tags_id_index',
+        'db_tags_name_index',
+        'db_deleted_annotations',
+        'db_annotations_id_index',
+        'db_annotations_key_index',
+        'db_deleted_controlParameters',
+        'db_controlParameters_id_index',
+        'db_controlParameters_name_index',
+        'db_deleted_vistrailVariables',
+        'db_vistrailVariables_name_index',
+        'db_vistrailVariables_uuid_index',
+        'db_deleted_parameter_explorations',
+        'db_parameter_explorations_id_index',
+        'db_deleted_actionAnnotations',
+        'db_actionAnnotations_id_index',
+        'db_actionAnnotations_action_id_index',
+        'db_actionAnnotations_key_index',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+    _db_lazy_slots = {
+        'db_deleted_actions': list,
+        'db_actions_id_index': dict,
+        'db_deleted_tags': list,
+        'db_tags_id_index': dict,
+        'db_tags_name_index': dict,
+        'db_deleted_annotations': list,
+        'db_annotations_id_index': dict,
+        'db_annotations_key_index': dict,
+        'db_deleted_controlParameters': list,
+        'db_controlParameters_id_index': dict,
+        'db_controlParameters_name_index': dict,
+        'db_deleted_vistrailVariables': list,
+        'db_vistrailVariables_name_index': dict,
+        'db_vistrailVariables_uuid_index': dict,
+        'db_deleted_parameter_explorations': list,
+        'db_parameter_explorations_id_index': dict,
+        'db_deleted_actionAnnotations': list,
+        'db_actionAnnotations_id_index': dict,
+        'db_actionAnnotations_action_id_index': dict,
+        'db_actionAnnotations_key_index': dict,
+        }
+
     def __init__(self, id=None, entity_type=None, version=None, name=None, last_modified=None, actions=None, tags=None, annotations=None, controlParameters=None, vistrailVariables=None, parameter_explorations=None, actionAnnotations=None):
         self._db_id = id
         self._db_entity_type = entity_type
         self._db_version = version
         self._db_name = name
         self._db_last_modified = last_modified
-        self.db_deleted_actions = []
-        self.db_actions_id_index = {}
         if actions is None:
             self._db_actions = []
         else:
             self._db_actions = actions
             for v in self._db_actions:
                 self.db_actions_id_index[v.db_id] = v
-        self.db_deleted_tags = []
-        self.db_tags_id_index = {}
-        self.db_tags_name_index = {}
         if tags is None:
             self._db_tags = []
         else:
@@ -3188,9 +3444,6 @@ class DBVistrail(object):
             for v in self._db_tags:
                 self.db_tags_id_index[v.db_id] = v
                 self.db_tags_name_index[v.db_name] = v
-        self.db_deleted_annotations = []
-        self.db_annotations_id_index = {}
-        self.db_annotations_key_index = {}
         if annotations is None:
             self._db_annotations = []
         else:
@@ -3198,9 +3451,6 @@ class DBVistrail(object):
             for v in self._db_annotations:
                 self.db_annotations_id_index[v.db_id] = v
                 self.db_annotations_key_index[v.db_key] = v
-        self.db_deleted_controlParameters = []
-        self.db_controlParameters_id_index = {}
-        self.db_controlParameters_name_index = {}
         if controlParameters is None:
             self._db_controlParameters = []
         else:
@@ -3208,9 +3458,6 @@ class DBVistrail(object):
             for v in self._db_controlParameters:
                 self.db_controlParameters_id_index[v.db_id] = v
                 self.db_controlParameters_name_index[v.db_name] = v
-        self.db_deleted_vistrailVariables = []
-        self.db_vistrailVariables_name_index = {}
-        self.db_vistrailVariables_uuid_index = {}
         if vistrailVariables is None:
             self._db_vistrailVariables = []
         else:
@@ -3218,18 +3465,12 @@ class DBVistrail(object):
             for v in self._db_vistrailVariables:
                 self.db_vistrailVariables_name_index[v.db_name] = v
                 self.db_vistrailVariables_uuid_index[v.db_uuid] = v
-        self.db_deleted_parameter_explorations = []
-        self.db_parameter_explorations_id_index = {}
         if parameter_explorations is None:
             self._db_parameter_explorations = []
         else:
             self._db_parameter_explorations = parameter_explorations
             for v in self._db_parameter_explorations:
                 self.db_parameter_explorations_id_index[v.db_id] = v
-        self.db_deleted_actionAnnotations = []
-        self.db_actionAnnotations_id_index = {}
-        self.db_actionAnnotations_action_id_index = {}
-        self.db_actionAnnotations_key_index = {}
         if actionAnnotations is None:
             self._db_actionAnnotations = []
         else:
@@ -3289,19 +3530,26 @@ class DBVistrail(object):
             cp.db_id = new_id
         
         # recreate indices and set flags
-        cp.db_actions_id_index = dict((v.db_id, v) for v in cp._db_actions)
-        cp.db_tags_id_index = dict((v.db_id, v) for v in cp._db_tags)
-        cp.db_tags_name_index = dict((v.db_name, v) for v in cp._db_tags)
-        cp.db_annotations_id_index = dict((v.db_id, v) for v in cp._db_annotations)
-        cp.db_annotations_key_index = dict((v.db_key, v) for v in cp._db_annotations)
-        cp.db_controlParameters_id_index = dict((v.db_id, v) for v in cp._db_controlParameters)
-        cp.db_controlParameters_name_index = dict((v.db_name, v) for v in cp._db_controlParameters)
-        cp.db_vistrailVariables_name_index = dict((v.db_name, v) for v in cp._db_vistrailVariables)
-        cp.db_vistrailVariables_uuid_index = dict((v.db_uuid, v) for v in cp._db_vistrailVariables)
-        cp.db_parameter_explorations_id_index = dict((v.db_id, v) for v in cp._db_parameter_explorations)
-        cp.db_actionAnnotations_id_index = dict((v.db_id, v) for v in cp._db_actionAnnotations)
-        cp.db_actionAnnotations_action_id_index = dict(((v.db_action_id,v.db_key), v) for v in cp._db_actionAnnotations)
-        cp.db_actionAnnotations_key_index = dict(((v.db_key,v.db_value), v) for v in cp._db_actionAnnotations)
+        if cp._db_actions:
+            cp.db_actions_id_index = dict((v.db_id, v) for v in cp._db_actions)
+        if cp._db_tags:
+            cp.db_tags_id_index = dict((v.db_id, v) for v in cp._db_tags)
+            cp.db_tags_name_index = dict((v.db_name, v) for v in cp._db_tags)
+        if cp._db_annotations:
+            cp.db_annotations_id_index = dict((v.db_id, v) for v in cp._db_annotations)
+            cp.db_annotations_key_index = dict((v.db_key, v) for v in cp._db_annotations)
+        if cp._db_controlParameters:
+            cp.db_controlParameters_id_index = dict((v.db_id, v) for v in cp._db_controlParameters)
+            cp.db_controlParameters_name_index = dict((v.db_name, v) for v in cp._db_controlParameters)
+        if cp._db_vistrailVariables:
+            cp.db_vistrailVariables_name_index = dict((v.db_name, v) for v in cp._db_vistrailVariables)
+            cp.db_vistrailVariables_uuid_index = dict((v.db_uuid, v) for v in cp._db_vistrailVariables)
+        if cp._db_parameter_explorations:
+            cp.db_parameter_explorations_id_index = dict((v.db_id, v) for v in cp._db_parameter_explorations)
+        if cp._db_actionAnnotations:
+            cp.db_actionAnnotations_id_index = dict((v.db_id, v) for v in cp._db_actionAnnotations)
+            cp.db_actionAnnotations_action_id_index = dict(((v.db_action_id,v.db_key), v) for v in cp._db_actionAnnotations)
+            cp.db_actionAnnotations_key_index = dict(((v.db_key,v.db_value), v) for v in cp._db_actionAnnotations)
         if not new_ids:
             cp.is_dirty = self.is_dirty
             cp.is_new = self.is_new
@@ -3346,7 +3594,7 @@ class DBVistrail(object):
         elif hasattr(old_obj, 'db_actions') and old_obj.db_actions is not None:
             for obj in old_obj.db_actions:
                 new_obj.db_add_action(DBAction.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_actions') and hasattr(new_obj, 'db_deleted_actions'):
+        if hasattr(old_obj, 'db_deleted_actions'):
             for obj in old_obj.db_deleted_actions:
                 n_obj = DBAction.update_version(obj, trans_dict)
                 new_obj.db_deleted_actions.append(n_obj)
@@ -3357,7 +3605,7 @@ class DBVistrail(object):
         elif hasattr(old_obj, 'db_tags') and old_obj.db_tags is not None:
             for obj in old_obj.db_tags:
                 new_obj.db_add_tag(DBTag.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_tags') and hasattr(new_obj, 'db_deleted_tags'):
+        if hasattr(old_obj, 'db_deleted_tags'):
             for obj in old_obj.db_deleted_tags:
                 n_obj = DBTag.update_version(obj, trans_dict)
                 new_obj.db_deleted_tags.append(n_obj)
@@ -3368,7 +3616,7 @@ class DBVistrail(object):
         elif hasattr(old_obj, 'db_annotations') and old_obj.db_annotations is not None:
             for obj in old_obj.db_annotations:
                 new_obj.db_add_annotation(DBAnnotation.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_annotations') and hasattr(new_obj, 'db_deleted_annotations'):
+        if hasattr(old_obj, 'db_deleted_annotations'):
             for obj in old_obj.db_deleted_annotations:
                 n_obj = DBAnnotation.update_version(obj, trans_dict)
                 new_obj.db_deleted_annotations.append(n_obj)
@@ -3379,7 +3627,7 @@ class DBVistrail(object):
         elif hasattr(old_obj, 'db_controlParameters') and old_obj.db_controlParameters is not None:
             for obj in old_obj.db_controlParameters:
                 new_obj.db_add_controlParameter(DBControlParameter.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_controlParameters') and hasattr(new_obj, 'db_deleted_controlParameters'):
+        if hasattr(old_obj, 'db_deleted_controlParameters'):
             for obj in old_obj.db_deleted_controlParameters:
                 n_obj = DBControlParameter.update_version(obj, trans_dict)
                 new_obj.db_deleted_controlParameters.append(n_obj)
@@ -3390,7 +3638,7 @@ class DBVistrail(object):
         elif hasattr(old_obj, 'db_vistrailVariables') and old_obj.db_vistrailVariables is not None:
             for obj in old_obj.db_vistrailVariables:
                 new_obj.db_add_vistrailVariable(DBVistrailVariable.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_vistrailVariables') and hasattr(new_obj, 'db_deleted_vistrailVariables'):
+        if hasattr(old_obj, 'db_deleted_vistrailVariables'):
             for obj in old_obj.db_deleted_vistrailVariables:
                 n_obj = DBVistrailVariable.update_version(obj, trans_dict)
                 new_obj.db_deleted_vistrailVariables.append(n_obj)
@@ -3401,7 +3649,7 @@ class DBVistrail(object):
         elif hasattr(old_obj, 'db_parameter_explorations') and old_obj.db_parameter_explorations is not None:
             for obj in old_obj.db_parameter_explorations:
                 new_obj.db_add_parameter_exploration(DBParameterExploration.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_parameter_explorations') and hasattr(new_obj, 'db_deleted_parameter_explorations'):
+        if hasattr(old_obj, 'db_deleted_parameter_explorations'):
             for obj in old_obj.db_deleted_parameter_explorations:
                 n_obj = DBParameterExploration.update_version(obj, trans_dict)
                 new_obj.db_deleted_parameter_explorations.append(n_obj)
@@ -3412,7 +3660,7 @@ class DBVistrail(object):
         elif hasattr(old_obj, 'db_actionAnnotations') and old_obj.db_actionAnnotations is not None:
             for obj in old_obj.db_actionAnnotations:
                 new_obj.db_add_actionAnnotation(DBActionAnnotation.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_actionAnnotations') and hasattr(new_obj, 'db_deleted_actionAnnotations'):
+        if hasattr(old_obj, 'db_deleted_actionAnnotations'):
             for obj in old_obj.db_deleted_actionAnnotations:
                 n_obj = DBActionAnnotation.update_version(obj, trans_dict)
                 new_obj.db_deleted_actionAnnotations.append(n_obj)
@@ -3475,21 +3723,13 @@ class DBVistrail(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_actions)
-        children.extend(self.db_deleted_tags)
-        children.extend(self.db_deleted_annotations)
-        children.extend(self.db_deleted_controlParameters)
-        children.extend(self.db_deleted_vistrailVariables)
-        children.extend(self.db_deleted_parameter_explorations)
-        children.extend(self.db_deleted_actionAnnotations)
-        if remove:
-            self.db_deleted_actions = []
-            self.db_deleted_tags = []
-            self.db_deleted_annotations = []
-            self.db_deleted_controlParameters = []
-            self.db_deleted_vistrailVariables = []
-            self.db_deleted_parameter_explorations = []
-            self.db_deleted_actionAnnotations = []
+        children.extend(self._db_get_deleted('db_deleted_actions', remove))
+        children.extend(self._db_get_deleted('db_deleted_tags', remove))
+        children.extend(self._db_get_deleted('db_deleted_annotations', remove))
+        children.extend(self._db_get_deleted('db_deleted_controlParameters', remove))
+        children.extend(self._db_get_deleted('db_deleted_vistrailVariables', remove))
+        children.extend(self._db_get_deleted('db_deleted_parameter_explorations', remove))
+        children.extend(self._db_get_deleted('db_deleted_actionAnnotations', remove))
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -3923,12 +4163,23 @@ class DBVistrail(object):
     def getPrimaryKey(self):
         return self._db_id
 
-class DBOpmArtifactValue(object):
+class DBOpmArtifactValue(_DBSlotsBase):
 
     vtType = 'opm_artifact_value'
 
+    __slots__ = (
+        '_db_value',
+        'db_deleted_value',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+    _db_lazy_slots = {
+        'db_deleted_value': list,
+        }
+
     def __init__(self, value=None):
-        self.db_deleted_value = []
         self._db_value = value
         self.is_dirty = True
         self.is_new = True
@@ -3972,7 +4223,7 @@ class DBOpmArtifactValue(object):
                 new_obj.db_add_value(DBPortSpec.update_version(obj, trans_dict))
             elif obj.vtType == 'function':
                 new_obj.db_add_value(DBFunction.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_value') and hasattr(new_obj, 'db_deleted_value'):
+        if hasattr(old_obj, 'db_deleted_value'):
             for obj in old_obj.db_deleted_value:
                 if obj.vtType == 'portSpec':
                     n_obj = DBPortSpec.update_version(obj, trans_dict)
@@ -3994,9 +4245,7 @@ class DBOpmArtifactValue(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_value)
-        if remove:
-            self.db_deleted_value = []
+        children.extend(self._db_get_deleted('db_deleted_value', remove))
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -4021,10 +4270,18 @@ class DBOpmArtifactValue(object):
     
 
 
-class DBConfigStr(object):
+class DBConfigStr(_DBSlotsBase):
 
     vtType = 'config_str'
 
+    __slots__ = (
+        '_db_value',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+
     def __init__(self, value=None):
         self._db_value = value
         self.is_dirty = True
@@ -4091,17 +4348,33 @@ class DBConfigStr(object):
     
 
 
-class DBStartup(object):
+class DBStartup(_DBSlotsBase):
 
     vtType = 'startup'
 
+    __slots__ = (
+        '_db_version',
+        '_db_configuration',
+        '_db_enabled_packages',
+        '_db_disabled_packages',
+        'db_deleted_configuration',
+        'db_deleted_enabled_packages',
+        'db_deleted_disabled_packages',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+    _db_lazy_slots = {
+        'db_deleted_configuration': list,
+        'db_deleted_enabled_packages': list,
+        'db_deleted_disabled_packages': list,
+        }
+
     def __init__(self, version=None, configuration=None, enabled_packages=None, disabled_packages=None):
         self._db_version = version
-        self.db_deleted_configuration = []
         self._db_configuration = configuration
-        self.db_deleted_enabled_packages = []
         self._db_enabled_packages = enabled_packages
-        self.db_deleted_disabled_packages = []
         self._db_disabled_packages = disabled_packages
         self.is_dirty = True
         self.is_new = True
@@ -4151,7 +4424,7 @@ class DBStartup(object):
         elif hasattr(old_obj, 'db_configuration') and old_obj.db_configuration is not None:
             obj = old_obj.db_configuration
             new_obj.db_add_configuration(DBConfiguration.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_configuration') and hasattr(new_obj, 'db_deleted_configuration'):
+        if hasattr(old_obj, 'db_deleted_configuration'):
             for obj in old_obj.db_deleted_configuration:
                 n_obj = DBConfiguration.update_version(obj, trans_dict)
                 new_obj.db_deleted_configuration.append(n_obj)
@@ -4161,7 +4434,7 @@ class DBStartup(object):
         elif hasattr(old_obj, 'db_enabled_packages') and old_obj.db_enabled_packages is not None:
             obj = old_obj.db_enabled_packages
             new_obj.db_add_enabled_packages(DBEnabledPackages.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_enabled_packages') and hasattr(new_obj, 'db_deleted_enabled_packages'):
+        if hasattr(old_obj, 'db_deleted_enabled_packages'):
             for obj in old_obj.db_deleted_enabled_packages:
                 n_obj = DBEnabledPackages.update_version(obj, trans_dict)
                 new_obj.db_deleted_enabled_packages.append(n_obj)
@@ -4171,7 +4444,7 @@ class DBStartup(object):
         elif hasattr(old_obj, 'db_disabled_packages') and old_obj.db_disabled_packages is not None:
             obj = old_obj.db_disabled_packages
             new_obj.db_add_disabled_packages(DBDisabledPackages.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_disabled_packages') and hasattr(new_obj, 'db_deleted_disabled_packages'):
+        if hasattr(old_obj, 'db_deleted_disabled_packages'):
             for obj in old_obj.db_deleted_disabled_packages:
                 n_obj = DBDisabledPackages.update_version(obj, trans_dict)
                 new_obj.db_deleted_disabled_packages.append(n_obj)
@@ -4197,13 +4470,9 @@ class DBStartup(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_configuration)
-        children.extend(self.db_deleted_enabled_packages)
-        children.extend(self.db_deleted_disabled_packages)
-        if remove:
-            self.db_deleted_configuration = []
-            self.db_deleted_enabled_packages = []
-            self.db_deleted_disabled_packages = []
+        children.extend(self._db_get_deleted('db_deleted_configuration', remove))
+        children.extend(self._db_get_deleted('db_deleted_enabled_packages', remove))
+        children.extend(self._db_get_deleted('db_deleted_disabled_packages', remove))
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -4828,10 +5097,23 @@ class DBModule(object):
     def getPrimaryKey(self):
         return self._db_id
 
-class DBPort(object):
+class DBPort(_DBSlotsBase):
 
     vtType = 'port'
 
+    __slots__ = (
+        '_db_id',
+        '_db_type',
+        '_db_moduleId',
+        '_db_moduleName',
+        '_db_name',
+        '_db_signature',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+
     def __init__(self, id=None, type=None, moduleId=None, moduleName=None, name=None, signature=None):
         self._db_id = id
         self._db_type = type
@@ -5001,13 +5283,25 @@ class DBPort(object):
     def getPrimaryKey(self):
         return self._db_id
 
-class DBOpmAgents(object):
+class DBOpmAgents(_DBSlotsBase):
 
     vtType = 'opm_agents'
 
+    __slots__ = (
+        '_db_agents',
+        'db_deleted_agents',
+        'db_agents_id_index',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+    _db_lazy_slots = {
+        'db_deleted_agents': list,
+        'db_agents_id_index': dict,
+        }
+
     def __init__(self, agents=None):
-        self.db_deleted_agents = []
-        self.db_agents_id_index = {}
         if agents is None:
             self._db_agents = []
         else:
@@ -5037,7 +5331,8 @@ class DBOpmAgents(object):
             cp.db_id = new_id
         
         # recreate indices and set flags
-        cp.db_agents_id_index = dict((v.db_id, v) for v in cp._db_agents)
+        if cp._db_agents:
+            cp.db_agents_id_index = dict((v.db_id, v) for v in cp._db_agents)
         if not new_ids:
             cp.is_dirty = self.is_dirty
             cp.is_new = self.is_new
@@ -5057,7 +5352,7 @@ class DBOpmAgents(object):
         elif hasattr(old_obj, 'db_agents') and old_obj.db_agents is not None:
             for obj in old_obj.db_agents:
                 new_obj.db_add_agent(DBOpmAgent.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_agents') and hasattr(new_obj, 'db_deleted_agents'):
+        if hasattr(old_obj, 'db_deleted_agents'):
             for obj in old_obj.db_deleted_agents:
                 n_obj = DBOpmAgent.update_version(obj, trans_dict)
                 new_obj.db_deleted_agents.append(n_obj)
@@ -5078,9 +5373,7 @@ class DBOpmAgents(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_agents)
-        if remove:
-            self.db_deleted_agents = []
+        children.extend(self._db_get_deleted('db_deleted_agents', remove))
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -5133,12 +5426,23 @@ class DBOpmAgents(object):
     
 
 
-class DBOpmDependencies(object):
+class DBOpmDependencies(_DBSlotsBase):
 
     vtType = 'opm_dependencies'
 
+    __slots__ = (
+        '_db_dependencys',
+        'db_deleted_dependencys',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+    _db_lazy_slots = {
+        'db_deleted_dependencys': list,
+        }
+
     def __init__(self, dependencys=None):
-        self.db_deleted_dependencys = []
         if dependencys is None:
             self._db_dependencys = []
         else:
@@ -5194,7 +5498,7 @@ class DBOpmDependencies(object):
                     new_obj.db_add_dependency(DBOpmWasDerivedFrom.update_version(obj, trans_dict))
                 elif obj.vtType == 'opm_was_controlled_by':
                     new_obj.db_add_dependency(DBOpmWasControlledBy.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_dependencys') and hasattr(new_obj, 'db_deleted_dependencys'):
+        if hasattr(old_obj, 'db_deleted_dependencys'):
             for obj in old_obj.db_deleted_dependencys:
                 if obj.vtType == 'opm_used':
                     n_obj = DBOpmUsed.update_version(obj, trans_dict)
@@ -5228,9 +5532,7 @@ class DBOpmDependencies(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_dependencys)
-        if remove:
-            self.db_deleted_dependencys = []
+        children.extend(self._db_get_deleted('db_deleted_dependencys', remove))
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -5261,17 +5563,33 @@ class DBOpmDependencies(object):
     
 
 
-class DBPEFunction(object):
+class DBPEFunction(_DBSlotsBase):
 
     vtType = 'pe_function'
 
+    __slots__ = (
+        '_db_id',
+        '_db_module_id',
+        '_db_port_name',
+        '_db_is_alias',
+        '_db_parameters',
+        'db_deleted_parameters',
+        'db_parameters_id_index',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+    _db_lazy_slots = {
+        'db_deleted_parameters': list,
+        'db_parameters_id_index': dict,
+        }
+
     def __init__(self, id=None, module_id=None, port_name=None, is_alias=None, parameters=None):
         self._db_id = id
         self._db_module_id = module_id
         self._db_port_name = port_name
         self._db_is_alias = is_alias
-        self.db_deleted_parameters = []
-        self.db_parameters_id_index = {}
         if parameters is None:
             self._db_parameters = []
         else:
@@ -5306,7 +5624,8 @@ class DBPEFunction(object):
                 cp._db_module_id = id_remap[('module', self._db_module_id)]
         
         # recreate indices and set flags
-        cp.db_parameters_id_index = dict((v.db_id, v) for v in cp._db_parameters)
+        if cp._db_parameters:
+            cp.db_parameters_id_index = dict((v.db_id, v) for v in cp._db_parameters)
         if not new_ids:
             cp.is_dirty = self.is_dirty
             cp.is_new = self.is_new
@@ -5346,7 +5665,7 @@ class DBPEFunction(object):
         elif hasattr(old_obj, 'db_parameters') and old_obj.db_parameters is not None:
             for obj in old_obj.db_parameters:
                 new_obj.db_add_parameter(DBPEParameter.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_parameters') and hasattr(new_obj, 'db_deleted_parameters'):
+        if hasattr(old_obj, 'db_deleted_parameters'):
             for obj in old_obj.db_deleted_parameters:
                 n_obj = DBPEParameter.update_version(obj, trans_dict)
                 new_obj.db_deleted_parameters.append(n_obj)
@@ -5367,9 +5686,7 @@ class DBPEFunction(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_parameters)
-        if remove:
-            self.db_deleted_parameters = []
+        children.extend(self._db_get_deleted('db_deleted_parameters', remove))
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -5475,13 +5792,51 @@ class DBPEFunction(object):
     def getPrimaryKey(self):
         return self._db_id
 
-class DBWorkflow(object):
+class DBWorkflow(_DBSlotsBase):
 
     vtType = 'workflow'
 
+    __slots__ = (
+        '_db_modules',
+        '_db_id',
+        '_db_entity_type',
+        '_db_name',
+        '_db_version',
+        '_db_last_modified',
+        '_db_connections',
+        '_db_annotations',
+        '_db_plugin_datas',
+        '_db_others',
+        '_db_vistrail_id',
+        'db_deleted_modules',
+        'db_modules_id_index',
+        'db_deleted_connections',
+        'db_connections_id_index',
+        'db_deleted_annotations',
+        'db_annotations_id_index',
+        'db_deleted_plugin_datas',
+        'db_plugin_datas_id_index',
+        'db_deleted_others',
+        'db_others_id_index',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+    _db_lazy_slots = {
+        'db_deleted_modules': list,
+        'db_modules_id_index': dict,
+        'db_deleted_connections': list,
+        'db_connections_id_index': dict,
+        'db_deleted_annotations': list,
+        'db_annotations_id_index': dict,
+        'db_deleted_plugin_datas': list,
+        'db_plugin_datas_id_index': dict,
+        'db_deleted_others': list,
+        'db_others_id_index': dict,
+        }
+
     def __init__(self, modules=None, id=None, entity_type=None, name=None, version=None, last_modified=None, connections=None, annotations=None, plugin_datas=None, others=None, vistrail_id=None):
-        self.db_deleted_modules = []
-        self.db_modules_id_index = {}
         if modules is None:
             self._db_modules = []
         else:
@@ -5493,32 +5848,24 @@ class DBWorkflow(object):
         self._db_name = name
         self._db_version = version
         self._db_last_modified = last_modified
-        self.db_deleted_connections = []
-        self.db_connections_id_index = {}
         if connections is None:
             self._db_connections = []
         else:
             self._db_connections = connections
             for v in self._db_connections:
                 self.db_connections_id_index[v.db_id] = v
-        self.db_deleted_annotations = []
-        self.db_annotations_id_index = {}
         if annotations is None:
             self._db_annotations = []
         else:
             self._db_annotations = annotations
             for v in self._db_annotations:
                 self.db_annotations_id_index[v.db_id] = v
-        self.db_deleted_plugin_datas = []
-        self.db_plugin_datas_id_index = {}
         if plugin_datas is None:
             self._db_plugin_datas = []
         else:
             self._db_plugin_datas = plugin_datas
             for v in self._db_plugin_datas:
                 self.db_plugin_datas_id_index[v.db_id] = v
-        self.db_deleted_others = []
-        self.db_others_id_index = {}
         if others is None:
             self._db_others = []
         else:
@@ -5572,11 +5919,16 @@ class DBWorkflow(object):
                 cp._db_vistrail_id = id_remap[('vistrail', self._db_vistrail_id)]
         
         # recreate indices and set flags
-        cp.db_modules_id_index = dict((v.db_id, v) for v in cp._db_modules)
-        cp.db_connections_id_index = dict((v.db_id, v) for v in cp._db_connections)
-        cp.db_annotations_id_index = dict((v.db_id, v) for v in cp._db_annotations)
-        cp.db_plugin_datas_id_index = dict((v.db_id, v) for v in cp._db_plugin_datas)
-        cp.db_others_id_index = dict((v.db_id, v) for v in cp._db_others)
+        if cp._db_modules:
+            cp.db_modules_id_index = dict((v.db_id, v) for v in cp._db_modules)
+        if cp._db_connections:
+            cp.db_connections_id_index = dict((v.db_id, v) for v in cp._db_connections)
+        if cp._db_annotations:
+            cp.db_annotations_id_index = dict((v.db_id, v) for v in cp._db_annotations)
+        if cp._db_plugin_datas:
+            cp.db_plugin_datas_id_index = dict((v.db_id, v) for v in cp._db_plugin_datas)
+        if cp._db_others:
+            cp.db_others_id_index = dict((v.db_id, v) for v in cp._db_others)
         if not new_ids:
             cp.is_dirty = self.is_dirty
             cp.is_new = self.is_new
@@ -5601,7 +5953,7 @@ class DBWorkflow(object):
                     new_obj.db_add_module(DBAbstraction.update_version(obj, trans_dict))
                 elif obj.vtType == 'group':
                     new_obj.db_add_module(DBGroup.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_modules') and hasattr(new_obj, 'db_deleted_modules'):
+        if hasattr(old_obj, 'db_deleted_modules'):
             for obj in old_obj.db_deleted_modules:
                 if obj.vtType == 'module':
                     n_obj = DBModule.update_version(obj, trans_dict)
@@ -5644,7 +5996,7 @@ class DBWorkflow(object):
         elif hasattr(old_obj, 'db_connections') and old_obj.db_connections is not None:
             for obj in old_obj.db_connections:
                 new_obj.db_add_connection(DBConnection.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_connections') and hasattr(new_obj, 'db_deleted_connections'):
+        if hasattr(old_obj, 'db_deleted_connections'):
             for obj in old_obj.db_deleted_connections:
                 n_obj = DBConnection.update_version(obj, trans_dict)
                 new_obj.db_deleted_connections.append(n_obj)
@@ -5655,7 +6007,7 @@ class DBWorkflow(object):
         elif hasattr(old_obj, 'db_annotations') and old_obj.db_annotations is not None:
             for obj in old_obj.db_annotations:
                 new_obj.db_add_annotation(DBAnnotation.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_annotations') and hasattr(new_obj, 'db_deleted_annotations'):
+        if hasattr(old_obj, 'db_deleted_annotations'):
             for obj in old_obj.db_deleted_annotations:
                 n_obj = DBAnnotation.update_version(obj, trans_dict)
                 new_obj.db_deleted_annotations.append(n_obj)
@@ -5666,7 +6018,7 @@ class DBWorkflow(object):
         elif hasattr(old_obj, 'db_plugin_datas') and old_obj.db_plugin_datas is not None:
             for obj in old_obj.db_plugin_datas:
                 new_obj.db_add_plugin_data(DBPluginData.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_plugin_datas') and hasattr(new_obj, 'db_deleted_plugin_datas'):
+        if hasattr(old_obj, 'db_deleted_plugin_datas'):
             for obj in old_obj.db_deleted_plugin_datas:
                 n_obj = DBPluginData.update_version(obj, trans_dict)
                 new_obj.db_deleted_plugin_datas.append(n_obj)
@@ -5677,7 +6029,7 @@ class DBWorkflow(object):
         elif hasattr(old_obj, 'db_others') and old_obj.db_others is not None:
             for obj in old_obj.db_others:
                 new_obj.db_add_other(DBOther.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_others') and hasattr(new_obj, 'db_deleted_others'):
+        if hasattr(old_obj, 'db_deleted_others'):
             for obj in old_obj.db_deleted_others:
                 n_obj = DBOther.update_version(obj, trans_dict)
                 new_obj.db_deleted_others.append(n_obj)
@@ -5731,17 +6083,11 @@ class DBWorkflow(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_connections)
-        children.extend(self.db_deleted_annotations)
-        children.extend(self.db_deleted_plugin_datas)
-        children.extend(self.db_deleted_others)
-        children.extend(self.db_deleted_modules)
-        if remove:
-            self.db_deleted_connections = []
-            self.db_deleted_annotations = []
-            self.db_deleted_plugin_datas = []
-            self.db_deleted_others = []
-            self.db_deleted_modules = []
+        children.extend(self._db_get_deleted('db_deleted_connections', remove))
+        children.extend(self._db_get_deleted('db_deleted_annotations', remove))
+        children.extend(self._db_get_deleted('db_deleted_plugin_datas', remove))
+        children.extend(self._db_get_deleted('db_deleted_others', remove))
+        children.extend(self._db_get_deleted('db_deleted_modules', remove))
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -6053,16 +6399,31 @@ class DBWorkflow(object):
     def getPrimaryKey(self):
         return self._db_id
 
-class DBMashupAction(object):
+class DBMashupAction(_DBSlotsBase):
 
     vtType = 'mashup_action'
 
+    __slots__ = (
+        '_db_id',
+        '_db_prevId',
+        '_db_date',
+        '_db_user',
+        '_db_mashup',
+        'db_deleted_mashup',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+    _db_lazy_slots = {
+        'db_deleted_mashup': list,
+        }
+
     def __init__(self, id=None, prevId=None, date=None, user=None, mashup=None):
         self._db_id = id
         self._db_prevId = prevId
         self._db_date = date
         self._db_user = user
-        self.db_deleted_mashup = []
         self._db_mashup = mashup
         self.is_dirty = True
         self.is_new = True
@@ -6128,7 +6489,7 @@ class DBMashupAction(object):
         elif hasattr(old_obj, 'db_mashup') and old_obj.db_mashup is not None:
             obj = old_obj.db_mashup
             new_obj.db_add_mashup(DBMashup.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_mashup') and hasattr(new_obj, 'db_deleted_mashup'):
+        if hasattr(old_obj, 'db_deleted_mashup'):
             for obj in old_obj.db_deleted_mashup:
                 n_obj = DBMashup.update_version(obj, trans_dict)
                 new_obj.db_deleted_mashup.append(n_obj)
@@ -6146,9 +6507,7 @@ class DBMashupAction(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_mashup)
-        if remove:
-            self.db_deleted_mashup = []
+        children.extend(self._db_get_deleted('db_deleted_mashup', remove))
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -6358,12 +6717,29 @@ class DBConfiguration(object):
     
 
 
-class DBChange(object):
+class DBChange(_DBSlotsBase):
 
     vtType = 'change'
 
+    __slots__ = (
+        '_db_data',
+        '_db_id',
+        '_db_what',
+        '_db_oldObjId',
+        '_db_newObjId',
+        '_db_parentObjId',
+        '_db_parentObjType',
+        'db_deleted_data',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+    _db_lazy_slots = {
+        'db_deleted_data': list,
+        }
+
     def __init__(self, data=None, id=None, what=None, oldObjId=None, newObjId=None, parentObjId=None, parentObjType=None):
-        self.db_deleted_data = []
         self._db_data = data
         self._db_id = id
         self._db_what = what
@@ -6446,7 +6822,7 @@ class DBChange(object):
                 new_obj.db_add_data(DBOther.update_version(obj, trans_dict))
             elif obj.vtType == 'plugin_data':
                 new_obj.db_add_data(DBPluginData.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_data') and hasattr(new_obj, 'db_deleted_data'):
+        if hasattr(old_obj, 'db_deleted_data'):
             for obj in old_obj.db_deleted_data:
                 if obj.vtType == 'module':
                     n_obj = DBModule.update_version(obj, trans_dict)
@@ -6531,9 +6907,7 @@ class DBChange(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_data)
-        if remove:
-            self.db_deleted_data = []
+        children.extend(self._db_get_deleted('db_deleted_data', remove))
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -6637,10 +7011,33 @@ class DBChange(object):
     def getPrimaryKey(self):
         return self._db_id
 
-class DBPackage(object):
+class DBPackage(_DBSlotsBase):
 
     vtType = 'package'
 
+    __slots__ = (
+        '_db_id',
+        '_db_name',
+        '_db_identifier',
+        '_db_codepath',
+        '_db_load_configuration',
+        '_db_version',
+        '_db_description',
+        '_db_module_descriptors',
+        'db_deleted_module_descriptors',
+        'db_module_descriptors_id_index',
+        'db_module_descriptors_name_index',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+    _db_lazy_slots = {
+        'db_deleted_module_descriptors': list,
+        'db_module_descriptors_id_index': dict,
+        'db_module_descriptors_name_index': dict,
+        }
+
     def __init__(self, id=None, name=None, identifier=None, codepath=None, load_configuration=None, version=None, description=None, module_descriptors=None):
         self._db_id = id
         self._db_name = name
@@ -6649,9 +7046,6 @@ class DBPackage(object):
         self._db_load_configuration = load_configuration
         self._db_version = version
         self._db_description = description
-        self.db_deleted_module_descriptors = []
-        self.db_module_descriptors_id_index = {}
-        self.db_module_descriptors_name_index = {}
         if module_descriptors is None:
             self._db_module_descriptors = []
         else:
@@ -6688,8 +7082,9 @@ class DBPackage(object):
             cp.db_id = new_id
         
         # recreate indices and set flags
-        cp.db_module_descriptors_id_index = dict((v.db_id, v) for v in cp._db_module_descriptors)
-        cp.db_module_descriptors_name_index = dict(((v.db_name,v.db_namespace,v.db_version), v) for v in cp._db_module_descriptors)
+        if cp._db_module_descriptors:
+            cp.db_module_descriptors_id_index = dict((v.db_id, v) for v in cp._db_module_descriptors)
+            cp.db_module_descriptors_name_index = dict(((v.db_name,v.db_namespace,v.db_version), v) for v in cp._db_module_descriptors)
         if not new_ids:
             cp.is_dirty = self.is_dirty
             cp.is_new = self.is_new
@@ -6744,7 +7139,7 @@ class DBPackage(object):
         elif hasattr(old_obj, 'db_module_descriptors') and old_obj.db_module_descriptors is not None:
             for obj in old_obj.db_module_descriptors:
                 new_obj.db_add_module_descriptor(DBModuleDescriptor.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_module_descriptors') and hasattr(new_obj, 'db_deleted_module_descriptors'):
+        if hasattr(old_obj, 'db_deleted_module_descriptors'):
             for obj in old_obj.db_deleted_module_descriptors:
                 n_obj = DBModuleDescriptor.update_version(obj, trans_dict)
                 new_obj.db_deleted_module_descriptors.append(n_obj)
@@ -6765,9 +7160,7 @@ class DBPackage(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_module_descriptors)
-        if remove:
-            self.db_deleted_module_descriptors = []
+        children.extend(self._db_get_deleted('db_deleted_module_descriptors', remove))
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -6919,16 +7312,31 @@ class DBPackage(object):
     def getPrimaryKey(self):
         return self._db_id
 
-class DBLoopExec(object):
+class DBLoopExec(_DBSlotsBase):
 
     vtType = 'loop_exec'
 
+    __slots__ = (
+        '_db_id',
+        '_db_ts_start',
+        '_db_ts_end',
+        '_db_loop_iterations',
+        'db_deleted_loop_iterations',
+        'db_loop_iterations_id_index',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+    _db_lazy_slots = {
+        'db_deleted_loop_iterations': list,
+        'db_loop_iterations_id_index': dict,
+        }
+
     def __init__(self, id=None, ts_start=None, ts_end=None, loop_iterations=None):
         self._db_id = id
         self._db_ts_start = ts_start
         self._db_ts_end = ts_end
-        self.db_deleted_loop_iterations = []
-        self.db_loop_iterations_id_index = {}
         if loop_iterations is None:
             self._db_loop_iterations = []
         else:
@@ -6960,7 +7368,8 @@ class DBLoopExec(object):
             cp.db_id = new_id
         
         # recreate indices and set flags
-        cp.db_loop_iterations_id_index = dict((v.db_id, v) for v in cp._db_loop_iterations)
+        if cp._db_loop_iterations:
+            cp.db_loop_iterations_id_index = dict((v.db_id, v) for v in cp._db_loop_iterations)
         if not new_ids:
             cp.is_dirty = self.is_dirty
             cp.is_new = self.is_new
@@ -6995,7 +7404,7 @@ class DBLoopExec(object):
         elif hasattr(old_obj, 'db_loop_iterations') and old_obj.db_loop_iterations is not None:
             for obj in old_obj.db_loop_iterations:
                 new_obj.db_add_loop_iteration(DBLoopIteration.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_loop_iterations') and hasattr(new_obj, 'db_deleted_loop_iterations'):
+        if hasattr(old_obj, 'db_deleted_loop_iterations'):
             for obj in old_obj.db_deleted_loop_iterations:
                 n_obj = DBLoopIteration.update_version(obj, trans_dict)
                 new_obj.db_deleted_loop_iterations.append(n_obj)
@@ -7016,9 +7425,7 @@ class DBLoopExec(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_loop_iterations)
-        if remove:
-            self.db_deleted_loop_iterations = []
+        children.extend(self._db_get_deleted('db_deleted_loop_iterations', remove))
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -7111,15 +7518,29 @@ class DBLoopExec(object):
     def getPrimaryKey(self):
         return self._db_id
 
-class DBConnection(object):
+class DBConnection(_DBSlotsBase):
 
     vtType = 'connection'
 
+    __slots__ = (
+        '_db_id',
+        '_db_ports',
+        'db_deleted_ports',
+        'db_ports_id_index',
+        'db_ports_type_index',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+    _db_lazy_slots = {
+        'db_deleted_ports': list,
+        'db_ports_id_index': dict,
+        'db_ports_type_index': dict,
+        }
+
     def __init__(self, id=None, ports=None):
         self._db_id = id
-        self.db_deleted_ports = []
-        self.db_ports_id_index = {}
-        self.db_ports_type_index = {}
         if ports is None:
             self._db_ports = []
         else:
@@ -7150,8 +7571,9 @@ class DBConnection(object):
             cp.db_id = new_id
         
         # recreate indices and set flags
-        cp.db_ports_id_index = dict((v.db_id, v) for v in cp._db_ports)
-        cp.db_ports_type_index = dict((v.db_type, v) for v in cp._db_ports)
+        if cp._db_ports:
+            cp.db_ports_id_index = dict((v.db_id, v) for v in cp._db_ports)
+            cp.db_ports_type_index = dict((v.db_type, v) for v in cp._db_ports)
         if not new_ids:
             cp.is_dirty = self.is_dirty
             cp.is_new = self.is_new
@@ -7176,7 +7598,7 @@ class DBConnection(object):
         elif hasattr(old_obj, 'db_ports') and old_obj.db_ports is not None:
             for obj in old_obj.db_ports:
                 new_obj.db_add_port(DBPort.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_ports') and hasattr(new_obj, 'db_deleted_ports'):
+        if hasattr(old_obj, 'db_deleted_ports'):
             for obj in old_obj.db_deleted_ports:
                 n_obj = DBPort.update_version(obj, trans_dict)
                 new_obj.db_deleted_ports.append(n_obj)
@@ -7197,9 +7619,7 @@ class DBConnection(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_ports)
-        if remove:
-            self.db_deleted_ports = []
+        children.extend(self._db_get_deleted('db_deleted_ports', remove))
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -7273,10 +7693,18 @@ class DBConnection(object):
     def getPrimaryKey(self):
         return self._db_id
 
-class DBConfigBool(object):
+class DBConfigBool(_DBSlotsBase):
 
     vtType = 'config_bool'
 
+    __slots__ = (
+        '_db_value',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+
     def __init__(self, value=None):
         self._db_value = value
         self.is_dirty = True
@@ -7343,13 +7771,37 @@ class DBConfigBool(object):
     
 
 
-class DBAction(object):
+class DBAction(_DBSlotsBase):
 
     vtType = 'action'
 
+    __slots__ = (
+        '_db_operations',
+        '_db_id',
+        '_db_prevId',
+        '_db_date',
+        '_db_session',
+        '_db_user',
+        '_db_annotations',
+        'db_deleted_operations',
+        'db_operations_id_index',
+        'db_deleted_annotations',
+        'db_annotations_id_index',
+        'db_annotations_key_index',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+    _db_lazy_slots = {
+        'db_deleted_operations': list,
+        'db_operations_id_index': dict,
+        'db_deleted_annotations': list,
+        'db_annotations_id_index': dict,
+        'db_annotations_key_index': dict,
+        }
+
     def __init__(self, operations=None, id=None, prevId=None, date=None, session=None, user=None, annotations=None):
-        self.db_deleted_operations = []
-        self.db_operations_id_index = {}
         if operations is None:
             self._db_operations = []
         else:
@@ -7361,9 +7813,6 @@ class DBAction(object):
         self._db_date = date
         self._db_session = session
         self._db_user = user
-        self.db_deleted_annotations = []
-        self.db_annotations_id_index = {}
-        self.db_annotations_key_index = {}
         if annotations is None:
             self._db_annotations = []
         else:
@@ -7404,9 +7853,11 @@ class DBAction(object):
                 cp._db_prevId = id_remap[('action', self._db_prevId)]
         
         # recreate indices and set flags
-        cp.db_operations_id_index = dict((v.db_id, v) for v in cp._db_operations)
-        cp.db_annotations_id_index = dict((v.db_id, v) for v in cp._db_annotations)
-        cp.db_annotations_key_index = dict((v.db_key, v) for v in cp._db_annotations)
+        if cp._db_operations:
+            cp.db_operations_id_index = dict((v.db_id, v) for v in cp._db_operations)
+        if cp._db_annotations:
+            cp.db_annotations_id_index = dict((v.db_id, v) for v in cp._db_annotations)
+            cp.db_annotations_key_index = dict((v.db_key, v) for v in cp._db_annotations)
         if not new_ids:
             cp.is_dirty = self.is_dirty
             cp.is_new = self.is_new
@@ -7431,7 +7882,7 @@ class DBAction(object):
                     new_obj.db_add_operation(DBDelete.update_version(obj, trans_dict))
                 elif obj.vtType == 'change':
                     new_obj.db_add_operation(DBChange.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_operations') and hasattr(new_obj, 'db_deleted_operations'):
+        if hasattr(old_obj, 'db_deleted_operations'):
             for obj in old_obj.db_deleted_operations:
                 if obj.vtType == 'add':
                     n_obj = DBAdd.update_version(obj, trans_dict)
@@ -7474,7 +7925,7 @@ class DBAction(object):
         elif hasattr(old_obj, 'db_annotations') and old_obj.db_annotations is not None:
             for obj in old_obj.db_annotations:
                 new_obj.db_add_annotation(DBAnnotation.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_annotations') and hasattr(new_obj, 'db_deleted_annotations'):
+        if hasattr(old_obj, 'db_deleted_annotations'):
             for obj in old_obj.db_deleted_annotations:
                 n_obj = DBAnnotation.update_version(obj, trans_dict)
                 new_obj.db_deleted_annotations.append(n_obj)
@@ -7502,11 +7953,8 @@ class DBAction(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_annotations)
-        children.extend(self.db_deleted_operations)
-        if remove:
-            self.db_deleted_annotations = []
-            self.db_deleted_operations = []
+        children.extend(self._db_get_deleted('db_deleted_annotations', remove))
+        children.extend(self._db_get_deleted('db_deleted_operations', remove))
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -7677,13 +8125,25 @@ class DBAction(object):
     def getPrimaryKey(self):
         return self._db_id
 
-class DBStartupPackage(object):
+class DBStartupPackage(_DBSlotsBase):
 
     vtType = 'startup_package'
 
+    __slots__ = (
+        '_db_name',
+        '_db_configuration',
+        'db_deleted_configuration',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+    _db_lazy_slots = {
+        'db_deleted_configuration': list,
+        }
+
     def __init__(self, name=None, configuration=None):
         self._db_name = name
-        self.db_deleted_configuration = []
         self._db_configuration = configuration
         self.is_dirty = True
         self.is_new = True
@@ -7729,7 +8189,7 @@ class DBStartupPackage(object):
         elif hasattr(old_obj, 'db_configuration') and old_obj.db_configuration is not None:
             obj = old_obj.db_configuration
             new_obj.db_add_configuration(DBConfiguration.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_configuration') and hasattr(new_obj, 'db_deleted_configuration'):
+        if hasattr(old_obj, 'db_deleted_configuration'):
             for obj in old_obj.db_deleted_configuration:
                 n_obj = DBConfiguration.update_version(obj, trans_dict)
                 new_obj.db_deleted_configuration.append(n_obj)
@@ -7747,9 +8207,7 @@ class DBStartupPackage(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_configuration)
-        if remove:
-            self.db_deleted_configuration = []
+        children.extend(self._db_get_deleted('db_deleted_configuration', remove))
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -7787,10 +8245,18 @@ class DBStartupPackage(object):
     
 
 
-class DBConfigInt(object):
+class DBConfigInt(_DBSlotsBase):
 
     vtType = 'config_int'
 
+    __slots__ = (
+        '_db_value',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+
     def __init__(self, value=None):
         self._db_value = value
         self.is_dirty = True
@@ -7857,10 +8323,18 @@ class DBConfigInt(object):
     
 
 
-class DBOpmProcessIdEffect(object):
+class DBOpmProcessIdEffect(_DBSlotsBase):
 
     vtType = 'opm_process_id_effect'
 
+    __slots__ = (
+        '_db_id',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+
     def __init__(self, id=None):
         self._db_id = id
         self.is_dirty = True
@@ -7929,10 +8403,18 @@ class DBOpmProcessIdEffect(object):
     
 
 
-class DBRefProvPlan(object):
+class DBRefProvPlan(_DBSlotsBase):
 
     vtType = 'ref_prov_plan'
 
+    __slots__ = (
+        '_db_prov_ref',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+
     def __init__(self, prov_ref=None):
         self._db_prov_ref = prov_ref
         self.is_dirty = True
@@ -8001,20 +8483,34 @@ class DBRefProvPlan(object):
     
 
 
-class DBOpmAccounts(object):
+class DBOpmAccounts(_DBSlotsBase):
 
     vtType = 'opm_accounts'
 
+    __slots__ = (
+        '_db_accounts',
+        '_db_opm_overlapss',
+        'db_deleted_accounts',
+        'db_accounts_id_index',
+        'db_deleted_opm_overlapss',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+    _db_lazy_slots = {
+        'db_deleted_accounts': list,
+        'db_accounts_id_index': dict,
+        'db_deleted_opm_overlapss': list,
+        }
+
     def __init__(self, accounts=None, opm_overlapss=None):
-        self.db_deleted_accounts = []
-        self.db_accounts_id_index = {}
         if accounts is None:
             self._db_accounts = []
         else:
             self._db_accounts = accounts
             for v in self._db_accounts:
                 self.db_accounts_id_index[v.db_id] = v
-        self.db_deleted_opm_overlapss = []
         if opm_overlapss is None:
             self._db_opm_overlapss = []
         else:
@@ -8046,7 +8542,8 @@ class DBOpmAccounts(object):
             cp.db_id = new_id
         
         # recreate indices and set flags
-        cp.db_accounts_id_index = dict((v.db_id, v) for v in cp._db_accounts)
+        if cp._db_accounts:
+            cp.db_accounts_id_index = dict((v.db_id, v) for v in cp._db_accounts)
         if not new_ids:
             cp.is_dirty = self.is_dirty
             cp.is_new = self.is_new
@@ -8066,7 +8563,7 @@ class DBOpmAccounts(object):
         elif hasattr(old_obj, 'db_accounts') and old_obj.db_accounts is not None:
             for obj in old_obj.db_accounts:
                 new_obj.db_add_account(DBOpmAccount.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_accounts') and hasattr(new_obj, 'db_deleted_accounts'):
+        if hasattr(old_obj, 'db_deleted_accounts'):
             for obj in old_obj.db_deleted_accounts:
                 n_obj = DBOpmAccount.update_version(obj, trans_dict)
                 new_obj.db_deleted_accounts.append(n_obj)
@@ -8077,7 +8574,7 @@ class DBOpmAccounts(object):
         elif hasattr(old_obj, 'db_opm_overlapss') and old_obj.db_opm_overlapss is not None:
             for obj in old_obj.db_opm_overlapss:
                 new_obj.db_add_opm_overlaps(DBOpmOverlaps.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_opm_overlapss') and hasattr(new_obj, 'db_deleted_opm_overlapss'):
+        if hasattr(old_obj, 'db_deleted_opm_overlapss'):
             for obj in old_obj.db_deleted_opm_overlapss:
                 n_obj = DBOpmOverlaps.update_version(obj, trans_dict)
                 new_obj.db_deleted_opm_overlapss.append(n_obj)
@@ -8105,11 +8602,8 @@ class DBOpmAccounts(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_accounts)
-        children.extend(self.db_deleted_opm_overlapss)
-        if remove:
-            self.db_deleted_accounts = []
-            self.db_deleted_opm_overlapss = []
+        children.extend(self._db_get_deleted('db_deleted_accounts', remove))
+        children.extend(self._db_get_deleted('db_deleted_opm_overlapss', remove))
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -8185,10 +8679,18 @@ class DBOpmAccounts(object):
     
 
 
-class DBRefProvAgent(object):
+class DBRefProvAgent(_DBSlotsBase):
 
     vtType = 'ref_prov_agent'
 
+    __slots__ = (
+        '_db_prov_ref',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+
     def __init__(self, prov_ref=None):
         self._db_prov_ref = prov_ref
         self.is_dirty = True
@@ -8257,10 +8759,32 @@ class DBRefProvAgent(object):
     
 
 
-class DBPortSpec(object):
+class DBPortSpec(_DBSlotsBase):
 
     vtType = 'portSpec'
 
+    __slots__ = (
+        '_db_id',
+        '_db_name',
+        '_db_type',
+        '_db_optional',
+        '_db_depth',
+        '_db_sort_key',
+        '_db_portSpecItems',
+        '_db_min_conns',
+        '_db_max_conns',
+        'db_deleted_portSpecItems',
+        'db_portSpecItems_id_index',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+    _db_lazy_slots = {
+        'db_deleted_portSpecItems': list,
+        'db_portSpecItems_id_index': dict,
+        }
+
     def __init__(self, id=None, name=None, type=None, optional=None, depth=None, sort_key=None, portSpecItems=None, min_conns=None, max_conns=None):
         self._db_id = id
         self._db_name = name
@@ -8268,8 +8792,6 @@ class DBPortSpec(object):
         self._db_optional = optional
         self._db_depth = depth
         self._db_sort_key = sort_key
-        self.db_deleted_portSpecItems = []
-        self.db_portSpecItems_id_index = {}
         if portSpecItems is None:
             self._db_portSpecItems = []
         else:
@@ -8308,7 +8830,8 @@ class DBPortSpec(object):
             cp.db_id = new_id
         
         # recreate indices and set flags
-        cp.db_portSpecItems_id_index = dict((v.db_id, v) for v in cp._db_portSpecItems)
+        if cp._db_portSpecItems:
+            cp.db_portSpecItems_id_index = dict((v.db_id, v) for v in cp._db_portSpecItems)
         if not new_ids:
             cp.is_dirty = self.is_dirty
             cp.is_new = self.is_new
@@ -8358,7 +8881,7 @@ class DBPortSpec(object):
         elif hasattr(old_obj, 'db_portSpecItems') and old_obj.db_portSpecItems is not None:
             for obj in old_obj.db_portSpecItems:
                 new_obj.db_add_portSpecItem(DBPortSpecItem.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_portSpecItems') and hasattr(new_obj, 'db_deleted_portSpecItems'):
+        if hasattr(old_obj, 'db_deleted_portSpecItems'):
             for obj in old_obj.db_deleted_portSpecItems:
                 n_obj = DBPortSpecItem.update_version(obj, trans_dict)
                 new_obj.db_deleted_portSpecItems.append(n_obj)
@@ -8385,9 +8908,7 @@ class DBPortSpec(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_portSpecItems)
-        if remove:
-            self.db_deleted_portSpecItems = []
+        children.extend(self._db_get_deleted('db_deleted_portSpecItems', remove))
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -8545,13 +9066,25 @@ class DBPortSpec(object):
     def getPrimaryKey(self):
         return self._db_id
 
-class DBEnabledPackages(object):
+class DBEnabledPackages(_DBSlotsBase):
 
     vtType = 'enabled_packages'
 
+    __slots__ = (
+        '_db_packages',
+        'db_deleted_packages',
+        'db_packages_name_index',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+    _db_lazy_slots = {
+        'db_deleted_packages': list,
+        'db_packages_name_index': dict,
+        }
+
     def __init__(self, packages=None):
-        self.db_deleted_packages = []
-        self.db_packages_name_index = {}
         if packages is None:
             self._db_packages = []
         else:
@@ -8581,7 +9114,8 @@ class DBEnabledPackages(object):
             cp.db_id = new_id
         
         # recreate indices and set flags
-        cp.db_packages_name_index = dict((v.db_name, v) for v in cp._db_packages)
+        if cp._db_packages:
+            cp.db_packages_name_index = dict((v.db_name, v) for v in cp._db_packages)
         if not new_ids:
             cp.is_dirty = self.is_dirty
             cp.is_new = self.is_new
@@ -8601,7 +9135,7 @@ class DBEnabledPackages(object):
         elif hasattr(old_obj, 'db_packages') and old_obj.db_packages is not None:
             for obj in old_obj.db_packages:
                 new_obj.db_add_package(DBStartupPackage.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_packages') and hasattr(new_obj, 'db_deleted_packages'):
+        if hasattr(old_obj, 'db_deleted_packages'):
             for obj in old_obj.db_deleted_packages:
                 n_obj = DBStartupPackage.update_version(obj, trans_dict)
                 new_obj.db_deleted_packages.append(n_obj)
@@ -8622,9 +9156,7 @@ class DBEnabledPackages(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_packages)
-        if remove:
-            self.db_deleted_packages = []
+        children.extend(self._db_get_deleted('db_deleted_packages', remove))
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -8661,15 +9193,29 @@ class DBEnabledPackages(object):
     
 
 
-class DBOpmArtifact(object):
+class DBOpmArtifact(_DBSlotsBase):
 
     vtType = 'opm_artifact'
 
+    __slots__ = (
+        '_db_id',
+        '_db_value',
+        '_db_accounts',
+        'db_deleted_value',
+        'db_deleted_accounts',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+    _db_lazy_slots = {
+        'db_deleted_value': list,
+        'db_deleted_accounts': list,
+        }
+
     def __init__(self, id=None, value=None, accounts=None):
         self._db_id = id
-        self.db_deleted_value = []
         self._db_value = value
-        self.db_deleted_accounts = []
         if accounts is None:
             self._db_accounts = []
         else:
@@ -8722,7 +9268,7 @@ class DBOpmArtifact(object):
         elif hasattr(old_obj, 'db_value') and old_obj.db_value is not None:
             obj = old_obj.db_value
             new_obj.db_add_value(DBOpmArtifactValue.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_value') and hasattr(new_obj, 'db_deleted_value'):
+        if hasattr(old_obj, 'db_deleted_value'):
             for obj in old_obj.db_deleted_value:
                 n_obj = DBOpmArtifactValue.update_version(obj, trans_dict)
                 new_obj.db_deleted_value.append(n_obj)
@@ -8733,7 +9279,7 @@ class DBOpmArtifact(object):
         elif hasattr(old_obj, 'db_accounts') and old_obj.db_accounts is not None:
             for obj in old_obj.db_accounts:
                 new_obj.db_add_account(DBOpmAccountId.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_accounts') and hasattr(new_obj, 'db_deleted_accounts'):
+        if hasattr(old_obj, 'db_deleted_accounts'):
             for obj in old_obj.db_deleted_accounts:
                 n_obj = DBOpmAccountId.update_version(obj, trans_dict)
                 new_obj.db_deleted_accounts.append(n_obj)
@@ -8758,11 +9304,8 @@ class DBOpmArtifact(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_value)
-        children.extend(self.db_deleted_accounts)
-        if remove:
-            self.db_deleted_value = []
-            self.db_deleted_accounts = []
+        children.extend(self._db_get_deleted('db_deleted_value', remove))
+        children.extend(self._db_get_deleted('db_deleted_accounts', remove))
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -8824,18 +9367,36 @@ class DBOpmArtifact(object):
     def getPrimaryKey(self):
         return self._db_id
 
-class DBLog(object):
+class DBLog(_DBSlotsBase):
 
     vtType = 'log'
 
+    __slots__ = (
+        '_db_id',
+        '_db_entity_type',
+        '_db_version',
+        '_db_name',
+        '_db_last_modified',
+        '_db_workflow_execs',
+        '_db_vistrail_id',
+        'db_deleted_workflow_execs',
+        'db_workflow_execs_id_index',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+    _db_lazy_slots = {
+        'db_deleted_workflow_execs': list,
+        'db_workflow_execs_id_index': dict,
+        }
+
     def __init__(self, id=None, entity_type=None, version=None, name=None, last_modified=None, workflow_execs=None, vistrail_id=None):
         self._db_id = id
         self._db_entity_type = entity_type
         self._db_version = version
         self._db_name = name
         self._db_last_modified = last_modified
-        self.db_deleted_workflow_execs = []
-        self.db_workflow_execs_id_index = {}
         if workflow_execs is None:
             self._db_workflow_execs = []
         else:
@@ -8873,7 +9434,8 @@ class DBLog(object):
                 cp._db_vistrail_id = id_remap[('vistrail', self._db_vistrail_id)]
         
         # recreate indices and set flags
-        cp.db_workflow_execs_id_index = dict((v.db_id, v) for v in cp._db_workflow_execs)
+        if cp._db_workflow_execs:
+            cp.db_workflow_execs_id_index = dict((v.db_id, v) for v in cp._db_workflow_execs)
         if not new_ids:
             cp.is_dirty = self.is_dirty
             cp.is_new = self.is_new
@@ -8918,7 +9480,7 @@ class DBLog(object):
         elif hasattr(old_obj, 'db_workflow_execs') and old_obj.db_workflow_execs is not None:
             for obj in old_obj.db_workflow_execs:
                 new_obj.db_add_workflow_exec(DBWorkflowExec.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_workflow_execs') and hasattr(new_obj, 'db_deleted_workflow_execs'):
+        if hasattr(old_obj, 'db_deleted_workflow_execs'):
             for obj in old_obj.db_deleted_workflow_execs:
                 n_obj = DBWorkflowExec.update_version(obj, trans_dict)
                 new_obj.db_deleted_workflow_execs.append(n_obj)
@@ -8944,9 +9506,7 @@ class DBLog(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_workflow_execs)
-        if remove:
-            self.db_deleted_workflow_execs = []
+        children.extend(self._db_get_deleted('db_deleted_workflow_execs', remove))
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -9078,13 +9638,31 @@ class DBLog(object):
     def getPrimaryKey(self):
         return self._db_id
 
-class DBLoopIteration(object):
+class DBLoopIteration(_DBSlotsBase):
 
     vtType = 'loop_iteration'
 
+    __slots__ = (
+        '_db_item_execs',
+        '_db_id',
+        '_db_ts_start',
+        '_db_ts_end',
+        '_db_iteration',
+        '_db_completed',
+        '_db_error',
+        'db_deleted_item_execs',
+        'db_item_execs_id_index',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+    _db_lazy_slots = {
+        'db_deleted_item_execs': list,
+        'db_item_execs_id_index': dict,
+        }
+
     def __init__(self, item_execs=None, id=None, ts_start=None, ts_end=None, iteration=None, completed=None, error=None):
-        self.db_deleted_item_execs = []
-        self.db_item_execs_id_index = {}
         if item_execs is None:
             self._db_item_execs = []
         else:
@@ -9125,7 +9703,8 @@ class DBLoopIteration(object):
             cp.db_id = new_id
         
         # recreate indices and set flags
-        cp.db_item_execs_id_index = dict((v.db_id, v) for v in cp._db_item_execs)
+        if cp._db_item_execs:
+            cp.db_item_execs_id_index = dict((v.db_id, v) for v in cp._db_item_execs)
         if not new_ids:
             cp.is_dirty = self.is_dirty
             cp.is_new = self.is_new
@@ -9150,7 +9729,7 @@ class DBLoopIteration(object):
                     new_obj.db_add_item_exec(DBGroupExec.update_version(obj, trans_dict))
                 elif obj.vtType == 'loop_exec':
                     new_obj.db_add_item_exec(DBLoopExec.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_item_execs') and hasattr(new_obj, 'db_deleted_item_execs'):
+        if hasattr(old_obj, 'db_deleted_item_execs'):
             for obj in old_obj.db_deleted_item_execs:
                 if obj.vtType == 'module_exec':
                     n_obj = DBModuleExec.update_version(obj, trans_dict)
@@ -9208,9 +9787,7 @@ class DBLoopIteration(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_item_execs)
-        if remove:
-            self.db_deleted_item_execs = []
+        children.extend(self._db_get_deleted('db_deleted_item_execs', remove))
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -9342,10 +9919,18 @@ class DBLoopIteration(object):
     def getPrimaryKey(self):
         return self._db_id
 
-class DBOpmProcessIdCause(object):
+class DBOpmProcessIdCause(_DBSlotsBase):
 
     vtType = 'opm_process_id_cause'
 
+    __slots__ = (
+        '_db_id',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+
     def __init__(self, id=None):
         self._db_id = id
         self.is_dirty = True
@@ -9414,13 +9999,25 @@ class DBOpmProcessIdCause(object):
     
 
 
-class DBOpmArtifacts(object):
+class DBOpmArtifacts(_DBSlotsBase):
 
     vtType = 'opm_artifacts'
 
+    __slots__ = (
+        '_db_artifacts',
+        'db_deleted_artifacts',
+        'db_artifacts_id_index',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+    _db_lazy_slots = {
+        'db_deleted_artifacts': list,
+        'db_artifacts_id_index': dict,
+        }
+
     def __init__(self, artifacts=None):
-        self.db_deleted_artifacts = []
-        self.db_artifacts_id_index = {}
         if artifacts is None:
             self._db_artifacts = []
         else:
@@ -9450,7 +10047,8 @@ class DBOpmArtifacts(object):
             cp.db_id = new_id
         
         # recreate indices and set flags
-        cp.db_artifacts_id_index = dict((v.db_id, v) for v in cp._db_artifacts)
+        if cp._db_artifacts:
+            cp.db_artifacts_id_index = dict((v.db_id, v) for v in cp._db_artifacts)
         if not new_ids:
             cp.is_dirty = self.is_dirty
             cp.is_new = self.is_new
@@ -9470,7 +10068,7 @@ class DBOpmArtifacts(object):
         elif hasattr(old_obj, 'db_artifacts') and old_obj.db_artifacts is not None:
             for obj in old_obj.db_artifacts:
                 new_obj.db_add_artifact(DBOpmArtifact.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_artifacts') and hasattr(new_obj, 'db_deleted_artifacts'):
+        if hasattr(old_obj, 'db_deleted_artifacts'):
             for obj in old_obj.db_deleted_artifacts:
                 n_obj = DBOpmArtifact.update_version(obj, trans_dict)
                 new_obj.db_deleted_artifacts.append(n_obj)
@@ -9491,9 +10089,7 @@ class DBOpmArtifacts(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_artifacts)
-        if remove:
-            self.db_deleted_artifacts = []
+        children.extend(self._db_get_deleted('db_deleted_artifacts', remove))
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -9546,10 +10142,22 @@ class DBOpmArtifacts(object):
     
 
 
-class DBPEParameter(object):
+class DBPEParameter(_DBSlotsBase):
 
     vtType = 'pe_parameter'
 
+    __slots__ = (
+        '_db_id',
+        '_db_pos',
+        '_db_interpolator',
+        '_db_value',
+        '_db_dimension',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+
     def __init__(self, id=None, pos=None, interpolator=None, value=None, dimension=None):
         self._db_id = id
         self._db_pos = pos
@@ -9697,13 +10305,47 @@ class DBPEParameter(object):
     def getPrimaryKey(self):
         return self._db_id
 
-class DBWorkflowExec(object):
+class DBWorkflowExec(_DBSlotsBase):
 
     vtType = 'workflow_exec'
 
+    __slots__ = (
+        '_db_item_execs',
+        '_db_id',
+        '_db_user',
+        '_db_ip',
+        '_db_session',
+        '_db_vt_version',
+        '_db_ts_start',
+        '_db_ts_end',
+        '_db_parent_id',
+        '_db_parent_type',
+        '_db_parent_version',
+        '_db_completed',
+        '_db_name',
+        '_db_annotations',
+        '_db_machines',
+        'db_deleted_item_execs',
+        'db_item_execs_id_index',
+        'db_deleted_annotations',
+        'db_annotations_id_index',
+        'db_deleted_machines',
+        'db_machines_id_index',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+    _db_lazy_slots = {
+        'db_deleted_item_execs': list,
+        'db_item_execs_id_index': dict,
+        'db_deleted_annotations': list,
+        'db_annotations_id_index': dict,
+        'db_deleted_machines': list,
+        'db_machines_id_index': dict,
+        }
+
     def __init__(self, item_execs=None, id=None, user=None, ip=None, session=None, vt_version=None, ts_start=None, ts_end=None, parent_id=None, parent_type=None, parent_version=None, completed=None, name=None, annotations=None, machines=None):
-        self.db_deleted_item_execs = []
-        self.db_item_execs_id_index = {}
         if item_execs is None:
             self._db_item_execs = []
         else:
@@ -9722,16 +10364,12 @@ class DBWorkflowExec(object):
         self._db_parent_version = parent_version
         self._db_completed = completed
         self._db_name = name
-        self.db_deleted_annotations = []
-        self.db_annotations_id_index = {}
         if annotations is None:
             self._db_annotations = []
         else:
             self._db_annotations = annotations
             for v in self._db_annotations:
                 self.db_annotations_id_index[v.db_id] = v
-        self.db_deleted_machines = []
-        self.db_machines_id_index = {}
         if machines is None:
             self._db_machines = []
         else:
@@ -9780,9 +10418,12 @@ class DBWorkflowExec(object):
             cp.db_id = new_id
         
         # recreate indices and set flags
-        cp.db_item_execs_id_index = dict((v.db_id, v) for v in cp._db_item_execs)
-        cp.db_annotations_id_index = dict((v.db_id, v) for v in cp._db_annotations)
-        cp.db_machines_id_index = dict((v.db_id, v) for v in cp._db_machines)
+        if cp._db_item_execs:
+            cp.db_item_execs_id_index = dict((v.db_id, v) for v in cp._db_item_execs)
+        if cp._db_annotations:
+            cp.db_annotations_id_index = dict((v.db_id, v) for v in cp._db_annotations)
+        if cp._db_machines:
+            cp.db_machines_id_index = dict((v.db_id, v) for v in cp._db_machines)
         if not new_ids:
             cp.is_dirty = self.is_dirty
             cp.is_new = self.is_new
@@ -9807,7 +10448,7 @@ class DBWorkflowExec(object):
                     new_obj.db_add_item_exec(DBGroupExec.update_version(obj, trans_dict))
                 elif obj.vtType == 'loop_exec':
                     new_obj.db_add_item_exec(DBLoopExec.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_item_execs') and hasattr(new_obj, 'db_deleted_item_execs'):
+        if hasattr(old_obj, 'db_deleted_item_execs'):
             for obj in old_obj.db_deleted_item_execs:
                 if obj.vtType == 'module_exec':
                     n_obj = DBModuleExec.update_version(obj, trans_dict)
@@ -9885,7 +10526,7 @@ class DBWorkflowExec(object):
         elif hasattr(old_obj, 'db_annotations') and old_obj.db_annotations is not None:
             for obj in old_obj.db_annotations:
                 new_obj.db_add_annotation(DBAnnotation.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_annotations') and hasattr(new_obj, 'db_deleted_annotations'):
+        if hasattr(old_obj, 'db_deleted_annotations'):
             for obj in old_obj.db_deleted_annotations:
                 n_obj = DBAnnotation.update_version(obj, trans_dict)
                 new_obj.db_deleted_annotations.append(n_obj)
@@ -9896,7 +10537,7 @@ class DBWorkflowExec(object):
         elif hasattr(old_obj, 'db_machines') and old_obj.db_machines is not None:
             for obj in old_obj.db_machines:
                 new_obj.db_add_machine(DBMachine.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_machines') and hasattr(new_obj, 'db_deleted_machines'):
+        if hasattr(old_obj, 'db_deleted_machines'):
             for obj in old_obj.db_deleted_machines:
                 n_obj = DBMachine.update_version(obj, trans_dict)
                 new_obj.db_deleted_machines.append(n_obj)
@@ -9931,13 +10572,9 @@ class DBWorkflowExec(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_annotations)
-        children.extend(self.db_deleted_machines)
-        children.extend(self.db_deleted_item_execs)
-        if remove:
-            self.db_deleted_annotations = []
-            self.db_deleted_machines = []
-            self.db_deleted_item_execs = []
+        children.extend(self._db_get_deleted('db_deleted_annotations', remove))
+        children.extend(self._db_get_deleted('db_deleted_machines', remove))
+        children.extend(self._db_get_deleted('db_deleted_item_execs', remove))
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -10237,10 +10874,20 @@ class DBWorkflowExec(object):
     def getPrimaryKey(self):
         return self._db_id
 
-class DBLocation(object):
+class DBLocation(_DBSlotsBase):
 
     vtType = 'location'
 
+    __slots__ = (
+        '_db_id',
+        '_db_x',
+        '_db_y',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+
     def __init__(self, id=None, x=None, y=None):
         self._db_id = id
         self._db_x = x
@@ -10348,16 +10995,31 @@ class DBLocation(object):
     def getPrimaryKey(self):
         return self._db_id
 
-class DBFunction(object):
+class DBFunction(_DBSlotsBase):
 
     vtType = 'function'
 
+    __slots__ = (
+        '_db_id',
+        '_db_pos',
+        '_db_name',
+        '_db_parameters',
+        'db_deleted_parameters',
+        'db_parameters_id_index',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+    _db_lazy_slots = {
+        'db_deleted_parameters': list,
+        'db_parameters_id_index': dict,
+        }
+
     def __init__(self, id=None, pos=None, name=None, parameters=None):
         self._db_id = id
         self._db_pos = pos
         self._db_name = name
-        self.db_deleted_parameters = []
-        self.db_parameters_id_index = {}
         if parameters is None:
             self._db_parameters = []
         else:
@@ -10389,7 +11051,8 @@ class DBFunction(object):
             cp.db_id = new_id
         
         # recreate indices and set flags
-        cp.db_parameters_id_index = dict((v.db_id, v) for v in cp._db_parameters)
+        if cp._db_parameters:
+            cp.db_parameters_id_index = dict((v.db_id, v) for v in cp._db_parameters)
         if not new_ids:
             cp.is_dirty = self.is_dirty
             cp.is_new = self.is_new
@@ -10424,7 +11087,7 @@ class DBFunction(object):
         elif hasattr(old_obj, 'db_parameters') and old_obj.db_parameters is not None:
             for obj in old_obj.db_parameters:
                 new_obj.db_add_parameter(DBParameter.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_parameters') and hasattr(new_obj, 'db_deleted_parameters'):
+        if hasattr(old_obj, 'db_deleted_parameters'):
             for obj in old_obj.db_deleted_parameters:
                 n_obj = DBParameter.update_version(obj, trans_dict)
                 new_obj.db_deleted_parameters.append(n_obj)
@@ -10445,9 +11108,7 @@ class DBFunction(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_parameters)
-        if remove:
-            self.db_deleted_parameters = []
+        children.extend(self._db_get_deleted('db_deleted_parameters', remove))
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -10540,10 +11201,23 @@ class DBFunction(object):
     def getPrimaryKey(self):
         return self._db_id
 
-class DBActionAnnotation(object):
+class DBActionAnnotation(_DBSlotsBase):
 
     vtType = 'actionAnnotation'
 
+    __slots__ = (
+        '_db_id',
+        '_db_key',
+        '_db_value',
+        '_db_action_id',
+        '_db_date',
+        '_db_user',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+
     def __init__(self, id=None, key=None, value=None, action_id=None, date=None, user=None):
         self._db_id = id
         self._db_key = key
@@ -10713,10 +11387,31 @@ class DBActionAnnotation(object):
     def getPrimaryKey(self):
         return self._db_id
 
-class DBProvActivity(object):
+class DBProvActivity(_DBSlotsBase):
 
     vtType = 'prov_activity'
 
+    __slots__ = (
+        '_db_id',
+        '_db_startTime',
+        '_db_endTime',
+        '_db_vt_id',
+        '_db_vt_type',
+        '_db_vt_cached',
+        '_db_vt_completed',
+        '_db_vt_machine_id',
+        '_db_vt_error',
+        '_db_is_part_of',
+        'db_deleted_is_part_of',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+    _db_lazy_slots = {
+        'db_deleted_is_part_of': list,
+        }
+
     def __init__(self, id=None, startTime=None, endTime=None, vt_id=None, vt_type=None, vt_cached=None, vt_completed=None, vt_machine_id=None, vt_error=None, is_part_of=None):
         self._db_id = id
         self._db_startTime = startTime
@@ -10727,7 +11422,6 @@ class DBProvActivity(object):
         self._db_vt_completed = vt_completed
         self._db_vt_machine_id = vt_machine_id
         self._db_vt_error = vt_error
-        self.db_deleted_is_part_of = []
         self._db_is_part_of = is_part_of
         self.is_dirty = True
         self.is_new = True
@@ -10821,7 +11515,7 @@ class DBProvActivity(object):
         elif hasattr(old_obj, 'db_is_part_of') and old_obj.db_is_part_of is not None:
             obj = old_obj.db_is_part_of
             new_obj.db_add_is_part_of(DBIsPartOf.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_is_part_of') and hasattr(new_obj, 'db_deleted_is_part_of'):
+        if hasattr(old_obj, 'db_deleted_is_part_of'):
             for obj in old_obj.db_deleted_is_part_of:
                 n_obj = DBIsPartOf.update_version(obj, trans_dict)
                 new_obj.db_deleted_is_part_of.append(n_obj)
@@ -10839,9 +11533,7 @@ class DBProvActivity(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_is_part_of)
-        if remove:
-            self.db_deleted_is_part_of = []
+        children.extend(self._db_get_deleted('db_deleted_is_part_of', remove))
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -10984,14 +11676,28 @@ class DBProvActivity(object):
     def getPrimaryKey(self):
         return self._db_id
 
-class DBProvUsage(object):
+class DBProvUsage(_DBSlotsBase):
 
     vtType = 'prov_usage'
 
+    __slots__ = (
+        '_db_prov_activity',
+        '_db_prov_entity',
+        '_db_prov_role',
+        'db_deleted_prov_activity',
+        'db_deleted_prov_entity',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+    _db_lazy_slots = {
+        'db_deleted_prov_activity': list,
+        'db_deleted_prov_entity': list,
+        }
+
     def __init__(self, prov_activity=None, prov_entity=None, prov_role=None):
-        self.db_deleted_prov_activity = []
         self._db_prov_activity = prov_activity
-        self.db_deleted_prov_entity = []
         self._db_prov_entity = prov_entity
         self._db_prov_role = prov_role
         self.is_dirty = True
@@ -11035,7 +11741,7 @@ class DBProvUsage(object):
         elif hasattr(old_obj, 'db_prov_activity') and old_obj.db_prov_activity is not None:
             obj = old_obj.db_prov_activity
             new_obj.db_add_prov_activity(DBRefProvActivity.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_prov_activity') and hasattr(new_obj, 'db_deleted_prov_activity'):
+        if hasattr(old_obj, 'db_deleted_prov_activity'):
             for obj in old_obj.db_deleted_prov_activity:
                 n_obj = DBRefProvActivity.update_version(obj, trans_dict)
                 new_obj.db_deleted_prov_activity.append(n_obj)
@@ -11045,7 +11751,7 @@ class DBProvUsage(object):
         elif hasattr(old_obj, 'db_prov_entity') and old_obj.db_prov_entity is not None:
             obj = old_obj.db_prov_entity
             new_obj.db_add_prov_entity(DBRefProvEntity.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_prov_entity') and hasattr(new_obj, 'db_deleted_prov_entity'):
+        if hasattr(old_obj, 'db_deleted_prov_entity'):
             for obj in old_obj.db_deleted_prov_entity:
                 n_obj = DBRefProvEntity.update_version(obj, trans_dict)
                 new_obj.db_deleted_prov_entity.append(n_obj)
@@ -11072,11 +11778,8 @@ class DBProvUsage(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_prov_activity)
-        children.extend(self.db_deleted_prov_entity)
-        if remove:
-            self.db_deleted_prov_activity = []
-            self.db_deleted_prov_entity = []
+        children.extend(self._db_get_deleted('db_deleted_prov_activity', remove))
+        children.extend(self._db_get_deleted('db_deleted_prov_entity', remove))
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -11131,10 +11834,18 @@ class DBProvUsage(object):
     
 
 
-class DBOpmArtifactIdEffect(object):
+class DBOpmArtifactIdEffect(_DBSlotsBase):
 
     vtType = 'opm_artifact_id_effect'
 
+    __slots__ = (
+        '_db_id',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+
     def __init__(self, id=None):
         self._db_id = id
         self.is_dirty = True
@@ -11203,20 +11914,39 @@ class DBOpmArtifactIdEffect(object):
     
 
 
-class DBOpmGraph(object):
+class DBOpmGraph(_DBSlotsBase):
 
     vtType = 'opm_graph'
 
+    __slots__ = (
+        '_db_accounts',
+        '_db_processes',
+        '_db_artifacts',
+        '_db_agents',
+        '_db_dependencies',
+        'db_deleted_accounts',
+        'db_deleted_processes',
+        'db_deleted_artifacts',
+        'db_deleted_agents',
+        'db_deleted_dependencies',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+    _db_lazy_slots = {
+        'db_deleted_accounts': list,
+        'db_deleted_processes': list,
+        'db_deleted_artifacts': list,
+        'db_deleted_agents': list,
+        'db_deleted_dependencies': list,
+        }
+
     def __init__(self, accounts=None, processes=None, artifacts=None, agents=None, dependencies=None):
-        self.db_deleted_accounts = []
         self._db_accounts = accounts
-        self.db_deleted_processes = []
         self._db_processes = processes
-        self.db_deleted_artifacts = []
         self._db_artifacts = artifacts
-        self.db_deleted_agents = []
         self._db_agents = agents
-        self.db_deleted_dependencies = []
         self._db_dependencies = dependencies
         self.is_dirty = True
         self.is_new = True
@@ -11265,7 +11995,7 @@ class DBOpmGraph(object):
         elif hasattr(old_obj, 'db_accounts') and old_obj.db_accounts is not None:
             obj = old_obj.db_accounts
             new_obj.db_add_accounts(DBOpmAccounts.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_accounts') and hasattr(new_obj, 'db_deleted_accounts'):
+        if hasattr(old_obj, 'db_deleted_accounts'):
             for obj in old_obj.db_deleted_accounts:
                 n_obj = DBOpmAccounts.update_version(obj, trans_dict)
                 new_obj.db_deleted_accounts.append(n_obj)
@@ -11275,7 +12005,7 @@ class DBOpmGraph(object):
         elif hasattr(old_obj, 'db_processes') and old_obj.db_processes is not None:
             obj = old_obj.db_processes
             new_obj.db_add_processes(DBOpmProcesses.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_processes') and hasattr(new_obj, 'db_deleted_processes'):
+        if hasattr(old_obj, 'db_deleted_processes'):
             for obj in old_obj.db_deleted_processes:
                 n_obj = DBOpmProcesses.update_version(obj, trans_dict)
                 new_obj.db_deleted_processes.append(n_obj)
@@ -11285,7 +12015,7 @@ class DBOpmGraph(object):
         elif hasattr(old_obj, 'db_artifacts') and old_obj.db_artifacts is not None:
             obj = old_obj.db_artifacts
             new_obj.db_add_artifacts(DBOpmArtifacts.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_artifacts') and hasattr(new_obj, 'db_deleted_artifacts'):
+        if hasattr(old_obj, 'db_deleted_artifacts'):
             for obj in old_obj.db_deleted_artifacts:
                 n_obj = DBOpmArtifacts.update_version(obj, trans_dict)
                 new_obj.db_deleted_artifacts.append(n_obj)
@@ -11295,7 +12025,7 @@ class DBOpmGraph(object):
         elif hasattr(old_obj, 'db_agents') and old_obj.db_agents is not None:
             obj = old_obj.db_agents
             new_obj.db_add_agents(DBOpmAgents.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_agents') and hasattr(new_obj, 'db_deleted_agents'):
+        if hasattr(old_obj, 'db_deleted_agents'):
             for obj in old_obj.db_deleted_agents:
                 n_obj = DBOpmAgents.update_version(obj, trans_dict)
                 new_obj.db_deleted_agents.append(n_obj)
@@ -11305,7 +12035,7 @@ class DBOpmGraph(object):
         elif hasattr(old_obj, 'db_dependencies') and old_obj.db_dependencies is not None:
             obj = old_obj.db_dependencies
             new_obj.db_add_dependencies(DBOpmDependencies.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_dependencies') and hasattr(new_obj, 'db_deleted_dependencies'):
+        if hasattr(old_obj, 'db_deleted_dependencies'):
             for obj in old_obj.db_deleted_dependencies:
                 n_obj = DBOpmDependencies.update_version(obj, trans_dict)
                 new_obj.db_deleted_dependencies.append(n_obj)
@@ -11339,17 +12069,11 @@ class DBOpmGraph(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_accounts)
-        children.extend(self.db_deleted_processes)
-        children.extend(self.db_deleted_artifacts)
-        children.extend(self.db_deleted_agents)
-        children.extend(self.db_deleted_dependencies)
-        if remove:
-            self.db_deleted_accounts = []
-            self.db_deleted_processes = []
-            self.db_deleted_artifacts = []
-            self.db_deleted_agents = []
-            self.db_deleted_dependencies = []
+        children.extend(self._db_get_deleted('db_deleted_accounts', remove))
+        children.extend(self._db_get_deleted('db_deleted_processes', remove))
+        children.extend(self._db_get_deleted('db_deleted_artifacts', remove))
+        children.extend(self._db_get_deleted('db_deleted_agents', remove))
+        children.extend(self._db_get_deleted('db_deleted_dependencies', remove))
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -11442,10 +12166,18 @@ class DBOpmGraph(object):
     
 
 
-class DBIsPartOf(object):
+class DBIsPartOf(_DBSlotsBase):
 
     vtType = 'is_part_of'
 
+    __slots__ = (
+        '_db_prov_ref',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+
     def __init__(self, prov_ref=None):
         self._db_prov_ref = prov_ref
         self.is_dirty = True
@@ -11512,23 +12244,42 @@ class DBIsPartOf(object):
     
 
 
-class DBOpmWasDerivedFrom(object):
+class DBOpmWasDerivedFrom(_DBSlotsBase):
 
     vtType = 'opm_was_derived_from'
 
+    __slots__ = (
+        '_db_effect',
+        '_db_role',
+        '_db_cause',
+        '_db_accounts',
+        '_db_opm_times',
+        'db_deleted_effect',
+        'db_deleted_role',
+        'db_deleted_cause',
+        'db_deleted_accounts',
+        'db_deleted_opm_times',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+    _db_lazy_slots = {
+        'db_deleted_effect': list,
+        'db_deleted_role': list,
+        'db_deleted_cause': list,
+        'db_deleted_accounts': list,
+        'db_deleted_opm_times': list,
+        }
+
     def __init__(self, effect=None, role=None, cause=None, accounts=None, opm_times=None):
-        self.db_deleted_effect = []
         self._db_effect = effect
-        self.db_deleted_role = []
         self._db_role = role
-        self.db_deleted_cause = []
         self._db_cause = cause
-        self.db_deleted_accounts = []
         if accounts is None:
             self._db_accounts = []
         else:
             self._db_accounts = accounts
-        self.db_deleted_opm_times = []
         if opm_times is None:
             self._db_opm_times = []
         else:
@@ -11584,7 +12335,7 @@ class DBOpmWasDerivedFrom(object):
         elif hasattr(old_obj, 'db_effect') and old_obj.db_effect is not None:
             obj = old_obj.db_effect
             new_obj.db_add_effect(DBOpmArtifactIdEffect.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_effect') and hasattr(new_obj, 'db_deleted_effect'):
+        if hasattr(old_obj, 'db_deleted_effect'):
             for obj in old_obj.db_deleted_effect:
                 n_obj = DBOpmArtifactIdEffect.update_version(obj, trans_dict)
                 new_obj.db_deleted_effect.append(n_obj)
@@ -11594,7 +12345,7 @@ class DBOpmWasDerivedFrom(object):
         elif hasattr(old_obj, 'db_role') and old_obj.db_role is not None:
             obj = old_obj.db_role
             new_obj.db_add_role(DBOpmRole.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_role') and hasattr(new_obj, 'db_deleted_role'):
+        if hasattr(old_obj, 'db_deleted_role'):
             for obj in old_obj.db_deleted_role:
                 n_obj = DBOpmRole.update_version(obj, trans_dict)
                 new_obj.db_deleted_role.append(n_obj)
@@ -11604,7 +12355,7 @@ class DBOpmWasDerivedFrom(object):
         elif hasattr(old_obj, 'db_cause') and old_obj.db_cause is not None:
             obj = old_obj.db_cause
             new_obj.db_add_cause(DBOpmArtifactIdCause.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_cause') and hasattr(new_obj, 'db_deleted_cause'):
+        if hasattr(old_obj, 'db_deleted_cause'):
             for obj in old_obj.db_deleted_cause:
                 n_obj = DBOpmArtifactIdCause.update_version(obj, trans_dict)
                 new_obj.db_deleted_cause.append(n_obj)
@@ -11615,7 +12366,7 @@ class DBOpmWasDerivedFrom(object):
         elif hasattr(old_obj, 'db_accounts') and old_obj.db_accounts is not None:
             for obj in old_obj.db_accounts:
                 new_obj.db_add_account(DBOpmAccountId.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_accounts') and hasattr(new_obj, 'db_deleted_accounts'):
+        if hasattr(old_obj, 'db_deleted_accounts'):
             for obj in old_obj.db_deleted_accounts:
                 n_obj = DBOpmAccountId.update_version(obj, trans_dict)
                 new_obj.db_deleted_accounts.append(n_obj)
@@ -11626,7 +12377,7 @@ class DBOpmWasDerivedFrom(object):
         elif hasattr(old_obj, 'db_opm_times') and old_obj.db_opm_times is not None:
             for obj in old_obj.db_opm_times:
                 new_obj.db_add_opm_time(DBOpmTime.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_opm_times') and hasattr(new_obj, 'db_deleted_opm_times'):
+        if hasattr(old_obj, 'db_deleted_opm_times'):
             for obj in old_obj.db_deleted_opm_times:
                 n_obj = DBOpmTime.update_version(obj, trans_dict)
                 new_obj.db_deleted_opm_times.append(n_obj)
@@ -11666,17 +12417,11 @@ class DBOpmWasDerivedFrom(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_effect)
-        children.extend(self.db_deleted_role)
-        children.extend(self.db_deleted_cause)
-        children.extend(self.db_deleted_accounts)
-        children.extend(self.db_deleted_opm_times)
-        if remove:
-            self.db_deleted_effect = []
-            self.db_deleted_role = []
-            self.db_deleted_cause = []
-            self.db_deleted_accounts = []
-            self.db_deleted_opm_times = []
+        children.extend(self._db_get_deleted('db_deleted_effect', remove))
+        children.extend(self._db_get_deleted('db_deleted_role', remove))
+        children.extend(self._db_get_deleted('db_deleted_cause', remove))
+        children.extend(self._db_get_deleted('db_deleted_accounts', remove))
+        children.extend(self._db_get_deleted('db_deleted_opm_times', remove))
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -11781,10 +12526,20 @@ class DBOpmWasDerivedFrom(object):
     
 
 
-class DBControlParameter(object):
+class DBControlParameter(_DBSlotsBase):
 
     vtType = 'controlParameter'
 
+    __slots__ = (
+        '_db_id',
+        '_db_name',
+        '_db_value',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+
     def __init__(self, id=None, name=None, value=None):
         self._db_id = id
         self._db_name = name
@@ -11892,10 +12647,19 @@ class DBControlParameter(object):
     def getPrimaryKey(self):
         return self._db_id
 
-class DBPluginData(object):
+class DBPluginData(_DBSlotsBase):
 
     vtType = 'plugin_data'
 
+    __slots__ = (
+        '_db_id',
+        '_db_data',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+
     def __init__(self, id=None, data=None):
         self._db_id = id
         self._db_data = data
@@ -11983,10 +12747,22 @@ class DBPluginData(object):
     def getPrimaryKey(self):
         return self._db_id
 
-class DBDelete(object):
+class DBDelete(_DBSlotsBase):
 
     vtType = 'delete'
 
+    __slots__ = (
+        '_db_id',
+        '_db_what',
+        '_db_objectId',
+        '_db_parentObjId',
+        '_db_parentObjType',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+
     def __init__(self, id=None, what=None, objectId=None, parentObjId=None, parentObjType=None):
         self._db_id = id
         self._db_what = what
@@ -12138,10 +12914,23 @@ class DBDelete(object):
     def getPrimaryKey(self):
         return self._db_id
 
-class DBVistrailVariable(object):
+class DBVistrailVariable(_DBSlotsBase):
 
     vtType = 'vistrailVariable'
 
+    __slots__ = (
+        '_db_name',
+        '_db_uuid',
+        '_db_package',
+        '_db_module',
+        '_db_namespace',
+        '_db_value',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+
     def __init__(self, name=None, uuid=None, package=None, module=None, namespace=None, value=None):
         self._db_name = name
         self._db_uuid = uuid
@@ -12309,12 +13098,23 @@ class DBVistrailVariable(object):
     def getPrimaryKey(self):
         return self._db_name
 
-class DBOpmOverlaps(object):
+class DBOpmOverlaps(_DBSlotsBase):
 
     vtType = 'opm_overlaps'
 
+    __slots__ = (
+        '_db_opm_account_ids',
+        'db_deleted_opm_account_ids',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+    _db_lazy_slots = {
+        'db_deleted_opm_account_ids': list,
+        }
+
     def __init__(self, opm_account_ids=None):
-        self.db_deleted_opm_account_ids = []
         if opm_account_ids is None:
             self._db_opm_account_ids = []
         else:
@@ -12361,7 +13161,7 @@ class DBOpmOverlaps(object):
         elif hasattr(old_obj, 'db_opm_account_ids') and old_obj.db_opm_account_ids is not None:
             for obj in old_obj.db_opm_account_ids:
                 new_obj.db_add_opm_account_id(DBOpmAccountId.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_opm_account_ids') and hasattr(new_obj, 'db_deleted_opm_account_ids'):
+        if hasattr(old_obj, 'db_deleted_opm_account_ids'):
             for obj in old_obj.db_deleted_opm_account_ids:
                 n_obj = DBOpmAccountId.update_version(obj, trans_dict)
                 new_obj.db_deleted_opm_account_ids.append(n_obj)
@@ -12382,9 +13182,7 @@ class DBOpmOverlaps(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_opm_account_ids)
-        if remove:
-            self.db_deleted_opm_account_ids = []
+        children.extend(self._db_get_deleted('db_deleted_opm_account_ids', remove))
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -12415,23 +13213,42 @@ class DBOpmOverlaps(object):
     
 
 
-class DBOpmWasTriggeredBy(object):
+class DBOpmWasTriggeredBy(_DBSlotsBase):
 
     vtType = 'opm_was_triggered_by'
 
+    __slots__ = (
+        '_db_effect',
+        '_db_role',
+        '_db_cause',
+        '_db_accounts',
+        '_db_opm_times',
+        'db_deleted_effect',
+        'db_deleted_role',
+        'db_deleted_cause',
+        'db_deleted_accounts',
+        'db_deleted_opm_times',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+    _db_lazy_slots = {
+        'db_deleted_effect': list,
+        'db_deleted_role': list,
+        'db_deleted_cause': list,
+        'db_deleted_accounts': list,
+        'db_deleted_opm_times': list,
+        }
+
     def __init__(self, effect=None, role=None, cause=None, accounts=None, opm_times=None):
-        self.db_deleted_effect = []
         self._db_effect = effect
-        self.db_deleted_role = []
         self._db_role = role
-        self.db_deleted_cause = []
         self._db_cause = cause
-        self.db_deleted_accounts = []
         if accounts is None:
             self._db_accounts = []
         else:
             self._db_accounts = accounts
-        self.db_deleted_opm_times = []
         if opm_times is None:
             self._db_opm_times = []
         else:
@@ -12487,7 +13304,7 @@ class DBOpmWasTriggeredBy(object):
         elif hasattr(old_obj, 'db_effect') and old_obj.db_effect is not None:
             obj = old_obj.db_effect
             new_obj.db_add_effect(DBOpmProcessIdEffect.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_effect') and hasattr(new_obj, 'db_deleted_effect'):
+        if hasattr(old_obj, 'db_deleted_effect'):
             for obj in old_obj.db_deleted_effect:
                 n_obj = DBOpmProcessIdEffect.update_version(obj, trans_dict)
                 new_obj.db_deleted_effect.append(n_obj)
@@ -12497,7 +13314,7 @@ class DBOpmWasTriggeredBy(object):
         elif hasattr(old_obj, 'db_role') and old_obj.db_role is not None:
             obj = old_obj.db_role
             new_obj.db_add_role(DBOpmRole.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_role') and hasattr(new_obj, 'db_deleted_role'):
+        if hasattr(old_obj, 'db_deleted_role'):
             for obj in old_obj.db_deleted_role:
                 n_obj = DBOpmRole.update_version(obj, trans_dict)
                 new_obj.db_deleted_role.append(n_obj)
@@ -12507,7 +13324,7 @@ class DBOpmWasTriggeredBy(object):
         elif hasattr(old_obj, 'db_cause') and old_obj.db_cause is not None:
             obj = old_obj.db_cause
             new_obj.db_add_cause(DBOpmProcessIdCause.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_cause') and hasattr(new_obj, 'db_deleted_cause'):
+        if hasattr(old_obj, 'db_deleted_cause'):
             for obj in old_obj.db_deleted_cause:
                 n_obj = DBOpmProcessIdCause.update_version(obj, trans_dict)
                 new_obj.db_deleted_cause.append(n_obj)
@@ -12518,7 +13335,7 @@ class DBOpmWasTriggeredBy(object):
         elif hasattr(old_obj, 'db_accounts') and old_obj.db_accounts is not None:
             for obj in old_obj.db_accounts:
                 new_obj.db_add_account(DBOpmAccountId.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_accounts') and hasattr(new_obj, 'db_deleted_accounts'):
+        if hasattr(old_obj, 'db_deleted_accounts'):
             for obj in old_obj.db_deleted_accounts:
                 n_obj = DBOpmAccountId.update_version(obj, trans_dict)
                 new_obj.db_deleted_accounts.append(n_obj)
@@ -12529,7 +13346,7 @@ class DBOpmWasTriggeredBy(object):
         elif hasattr(old_obj, 'db_opm_times') and old_obj.db_opm_times is not None:
             for obj in old_obj.db_opm_times:
                 new_obj.db_add_opm_time(DBOpmTime.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_opm_times') and hasattr(new_obj, 'db_deleted_opm_times'):
+        if hasattr(old_obj, 'db_deleted_opm_times'):
             for obj in old_obj.db_deleted_opm_times:
                 n_obj = DBOpmTime.update_version(obj, trans_dict)
                 new_obj.db_deleted_opm_times.append(n_obj)
@@ -12569,17 +13386,11 @@ class DBOpmWasTriggeredBy(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_effect)
-        children.extend(self.db_deleted_role)
-        children.extend(self.db_deleted_cause)
-        children.extend(self.db_deleted_accounts)
-        children.extend(self.db_deleted_opm_times)
-        if remove:
-            self.db_deleted_effect = []
-            self.db_deleted_role = []
-            self.db_deleted_cause = []
-            self.db_deleted_accounts = []
-            self.db_deleted_opm_times = []
+        children.extend(self._db_get_deleted('db_deleted_effect', remove))
+        children.extend(self._db_get_deleted('db_deleted_role', remove))
+        children.extend(self._db_get_deleted('db_deleted_cause', remove))
+        children.extend(self._db_get_deleted('db_deleted_accounts', remove))
+        children.extend(self._db_get_deleted('db_deleted_opm_times', remove))
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -12684,10 +13495,33 @@ class DBOpmWasTriggeredBy(object):
     
 
 
-class DBModuleDescriptor(object):
+class DBModuleDescriptor(_DBSlotsBase):
 
     vtType = 'module_descriptor'
 
+    __slots__ = (
+        '_db_id',
+        '_db_name',
+        '_db_package',
+        '_db_namespace',
+        '_db_package_version',
+        '_db_version',
+        '_db_base_descriptor_id',
+        '_db_portSpecs',
+        'db_deleted_portSpecs',
+        'db_portSpecs_id_index',
+        'db_portSpecs_name_index',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+    _db_lazy_slots = {
+        'db_deleted_portSpecs': list,
+        'db_portSpecs_id_index': dict,
+        'db_portSpecs_name_index': dict,
+        }
+
     def __init__(self, id=None, name=None, package=None, namespace=None, package_version=None, version=None, base_descriptor_id=None, portSpecs=None):
         self._db_id = id
         self._db_name = name
@@ -12696,9 +13530,6 @@ class DBModuleDescriptor(object):
         self._db_package_version = package_version
         self._db_version = version
         self._db_base_descriptor_id = base_descriptor_id
-        self.db_deleted_portSpecs = []
-        self.db_portSpecs_id_index = {}
-        self.db_portSpecs_name_index = {}
         if portSpecs is None:
             self._db_portSpecs = []
         else:
@@ -12737,8 +13568,9 @@ class DBModuleDescriptor(object):
                 cp._db_base_descriptor_id = id_remap[('module_descriptor', self._db_base_descriptor_id)]
         
         # recreate indices and set flags
-        cp.db_portSpecs_id_index = dict((v.db_id, v) for v in cp._db_portSpecs)
-        cp.db_portSpecs_name_index = dict(((v.db_name,v.db_type), v) for v in cp._db_portSpecs)
+        if cp._db_portSpecs:
+            cp.db_portSpecs_id_index = dict((v.db_id, v) for v in cp._db_portSpecs)
+            cp.db_portSpecs_name_index = dict(((v.db_name,v.db_type), v) for v in cp._db_portSpecs)
         if not new_ids:
             cp.is_dirty = self.is_dirty
             cp.is_new = self.is_new
@@ -12793,7 +13625,7 @@ class DBModuleDescriptor(object):
         elif hasattr(old_obj, 'db_portSpecs') and old_obj.db_portSpecs is not None:
             for obj in old_obj.db_portSpecs:
                 new_obj.db_add_portSpec(DBPortSpec.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_portSpecs') and hasattr(new_obj, 'db_deleted_portSpecs'):
+        if hasattr(old_obj, 'db_deleted_portSpecs'):
             for obj in old_obj.db_deleted_portSpecs:
                 n_obj = DBPortSpec.update_version(obj, trans_dict)
                 new_obj.db_deleted_portSpecs.append(n_obj)
@@ -12814,9 +13646,7 @@ class DBModuleDescriptor(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_portSpecs)
-        if remove:
-            self.db_deleted_portSpecs = []
+        children.extend(self._db_get_deleted('db_deleted_portSpecs', remove))
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -12968,10 +13798,19 @@ class DBModuleDescriptor(object):
     def getPrimaryKey(self):
         return self._db_id
 
-class DBTag(object):
+class DBTag(_DBSlotsBase):
 
     vtType = 'tag'
 
+    __slots__ = (
+        '_db_id',
+        '_db_name',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+
     def __init__(self, id=None, name=None):
         self._db_id = id
         self._db_name = name
@@ -13061,10 +13900,18 @@ class DBTag(object):
     def getPrimaryKey(self):
         return self._db_id
 
-class DBOpmRole(object):
+class DBOpmRole(_DBSlotsBase):
 
     vtType = 'opm_role'
 
+    __slots__ = (
+        '_db_value',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+
     def __init__(self, value=None):
         self._db_value = value
         self.is_dirty = True
@@ -13131,54 +13978,81 @@ class DBOpmRole(object):
     
 
 
-class DBProvDocument(object):
+class DBProvDocument(_DBSlotsBase):
 
     vtType = 'prov_document'
 
+    __slots__ = (
+        '_db_prov_entitys',
+        '_db_prov_activitys',
+        '_db_prov_agents',
+        '_db_vt_connections',
+        '_db_prov_usages',
+        '_db_prov_generations',
+        '_db_prov_associations',
+        'db_deleted_prov_entitys',
+        'db_prov_entitys_id_index',
+        'db_deleted_prov_activitys',
+        'db_prov_activitys_id_index',
+        'db_deleted_prov_agents',
+        'db_prov_agents_id_index',
+        'db_deleted_vt_connections',
+        'db_vt_connections_id_index',
+        'db_deleted_prov_usages',
+        'db_deleted_prov_generations',
+        'db_deleted_prov_associations',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+    _db_lazy_slots = {
+        'db_deleted_prov_entitys': list,
+        'db_prov_entitys_id_index': dict,
+        'db_deleted_prov_activitys': list,
+        'db_prov_activitys_id_index': dict,
+        'db_deleted_prov_agents': list,
+        'db_prov_agents_id_index': dict,
+        'db_deleted_vt_connections': list,
+        'db_vt_connections_id_index': dict,
+        'db_deleted_prov_usages': list,
+        'db_deleted_prov_generations': list,
+        'db_deleted_prov_associations': list,
+        }
+
     def __init__(self, prov_entitys=None, prov_activitys=None, prov_agents=None, vt_connections=None, prov_usages=None, prov_generations=None, prov_associations=None):
-        self.db_deleted_prov_entitys = []
-        self.db_prov_entitys_id_index = {}
         if prov_entitys is None:
             self._db_prov_entitys = []
         else:
             self._db_prov_entitys = prov_entitys
             for v in self._db_prov_entitys:
                 self.db_prov_entitys_id_index[v.db_id] = v
-        self.db_deleted_prov_activitys = []
-        self.db_prov_activitys_id_index = {}
         if prov_activitys is None:
             self._db_prov_activitys = []
         else:
             self._db_prov_activitys = prov_activitys
             for v in self._db_prov_activitys:
                 self.db_prov_activitys_id_index[v.db_id] = v
-        self.db_deleted_prov_agents = []
-        self.db_prov_agents_id_index = {}
         if prov_agents is None:
             self._db_prov_agents = []
         else:
             self._db_prov_agents = prov_agents
             for v in self._db_prov_agents:
                 self.db_prov_agents_id_index[v.db_id] = v
-        self.db_deleted_vt_connections = []
-        self.db_vt_connections_id_index = {}
         if vt_connections is None:
             self._db_vt_connections = []
         else:
             self._db_vt_connections = vt_connections
             for v in self._db_vt_connections:
                 self.db_vt_connections_id_index[v.db_id] = v
-        self.db_deleted_prov_usages = []
         if prov_usages is None:
             self._db_prov_usages = []
         else:
             self._db_prov_usages = prov_usages
-        self.db_deleted_prov_generations = []
         if prov_generations is None:
             self._db_prov_generations = []
         else:
             self._db_prov_generations = prov_generations
-        self.db_deleted_prov_associations = []
         if prov_associations is None:
             self._db_prov_associations = []
         else:
@@ -13230,10 +14104,14 @@ class DBProvDocument(object):
             cp.db_id = new_id
         
         # recreate indices and set flags
-        cp.db_prov_entitys_id_index = dict((v.db_id, v) for v in cp._db_prov_entitys)
-        cp.db_prov_activitys_id_index = dict((v.db_id, v) for v in cp._db_prov_activitys)
-        cp.db_prov_agents_id_index = dict((v.db_id, v) for v in cp._db_prov_agents)
-        cp.db_vt_connections_id_index = dict((v.db_id, v) for v in cp._db_vt_connections)
+        if cp._db_prov_entitys:
+            cp.db_prov_entitys_id_index = dict((v.db_id, v) for v in cp._db_prov_entitys)
+        if cp._db_prov_activitys:
+            cp.db_prov_activitys_id_index = dict((v.db_id, v) for v in cp._db_prov_activitys)
+        if cp._db_prov_agents:
+            cp.db_prov_agents_id_index = dict((v.db_id, v) for v in cp._db_prov_agents)
+        if cp._db_vt_connections:
+            cp.db_vt_connections_id_index = dict((v.db_id, v) for v in cp._db_vt_connections)
         if not new_ids:
             cp.is_dirty = self.is_dirty
             cp.is_new = self.is_new
@@ -13253,7 +14131,7 @@ class DBProvDocument(object):
         elif hasattr(old_obj, 'db_prov_entitys') and old_obj.db_prov_entitys is not None:
             for obj in old_obj.db_prov_entitys:
                 new_obj.db_add_prov_entity(DBProvEntity.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_prov_entitys') and hasattr(new_obj, 'db_deleted_prov_entitys'):
+        if hasattr(old_obj, 'db_deleted_prov_entitys'):
             for obj in old_obj.db_deleted_prov_entitys:
                 n_obj = DBProvEntity.update_version(obj, trans_dict)
                 new_obj.db_deleted_prov_entitys.append(n_obj)
@@ -13264,7 +14142,7 @@ class DBProvDocument(object):
         elif hasattr(old_obj, 'db_prov_activitys') and old_obj.db_prov_activitys is not None:
             for obj in old_obj.db_prov_activitys:
                 new_obj.db_add_prov_activity(DBProvActivity.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_prov_activitys') and hasattr(new_obj, 'db_deleted_prov_activitys'):
+        if hasattr(old_obj, 'db_deleted_prov_activitys'):
             for obj in old_obj.db_deleted_prov_activitys:
                 n_obj = DBProvActivity.update_version(obj, trans_dict)
                 new_obj.db_deleted_prov_activitys.append(n_obj)
@@ -13275,7 +14153,7 @@ class DBProvDocument(object):
         elif hasattr(old_obj, 'db_prov_agents') and old_obj.db_prov_agents is not None:
             for obj in old_obj.db_prov_agents:
                 new_obj.db_add_prov_agent(DBProvAgent.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_prov_agents') and hasattr(new_obj, 'db_deleted_prov_agents'):
+        if hasattr(old_obj, 'db_deleted_prov_agents'):
             for obj in old_obj.db_deleted_prov_agents:
                 n_obj = DBProvAgent.update_version(obj, trans_dict)
                 new_obj.db_deleted_prov_agents.append(n_obj)
@@ -13286,7 +14164,7 @@ class DBProvDocument(object):
         elif hasattr(old_obj, 'db_vt_connections') and old_obj.db_vt_connections is not None:
             for obj in old_obj.db_vt_connections:
                 new_obj.db_add_vt_connection(DBVtConnection.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_vt_connections') and hasattr(new_obj, 'db_deleted_vt_connections'):
+        if hasattr(old_obj, 'db_deleted_vt_connections'):
             for obj in old_obj.db_deleted_vt_connections:
                 n_obj = DBVtConnection.update_version(obj, trans_dict)
                 new_obj.db_deleted_vt_connections.append(n_obj)
@@ -13297,7 +14175,7 @@ class DBProvDocument(object):
         elif hasattr(old_obj, 'db_prov_usages') and old_obj.db_prov_usages is not None:
             for obj in old_obj.db_prov_usages:
                 new_obj.db_add_prov_usage(DBProvUsage.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_prov_usages') and hasattr(new_obj, 'db_deleted_prov_usages'):
+        if hasattr(old_obj, 'db_deleted_prov_usages'):
             for obj in old_obj.db_deleted_prov_usages:
                 n_obj = DBProvUsage.update_version(obj, trans_dict)
                 new_obj.db_deleted_prov_usages.append(n_obj)
@@ -13308,7 +14186,7 @@ class DBProvDocument(object):
         elif hasattr(old_obj, 'db_prov_generations') and old_obj.db_prov_generations is not None:
             for obj in old_obj.db_prov_generations:
                 new_obj.db_add_prov_generation(DBProvGeneration.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_prov_generations') and hasattr(new_obj, 'db_deleted_prov_generations'):
+        if hasattr(old_obj, 'db_deleted_prov_generations'):
             for obj in old_obj.db_deleted_prov_generations:
                 n_obj = DBProvGeneration.update_version(obj, trans_dict)
                 new_obj.db_deleted_prov_generations.append(n_obj)
@@ -13319,7 +14197,7 @@ class DBProvDocument(object):
         elif hasattr(old_obj, 'db_prov_associations') and old_obj.db_prov_associations is not None:
             for obj in old_obj.db_prov_associations:
                 new_obj.db_add_prov_association(DBProvAssociation.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_prov_associations') and hasattr(new_obj, 'db_deleted_prov_associations'):
+        if hasattr(old_obj, 'db_deleted_prov_associations'):
             for obj in old_obj.db_deleted_prov_associations:
                 n_obj = DBProvAssociation.update_version(obj, trans_dict)
                 new_obj.db_deleted_prov_associations.append(n_obj)
@@ -13382,21 +14260,13 @@ class DBProvDocument(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_prov_entitys)
-        children.extend(self.db_deleted_prov_activitys)
-        children.extend(self.db_deleted_prov_agents)
-        children.extend(self.db_deleted_vt_connections)
-        children.extend(self.db_deleted_prov_usages)
-        children.extend(self.db_deleted_prov_generations)
-        children.extend(self.db_deleted_prov_associations)
-        if remove:
-            self.db_deleted_prov_entitys = []
-            self.db_deleted_prov_activitys = []
-            self.db_deleted_prov_agents = []
-            self.db_deleted_vt_connections = []
-            self.db_deleted_prov_usages = []
-            self.db_deleted_prov_generations = []
-            self.db_deleted_prov_associations = []
+        children.extend(self._db_get_deleted('db_deleted_prov_entitys', remove))
+        children.extend(self._db_get_deleted('db_deleted_prov_activitys', remove))
+        children.extend(self._db_get_deleted('db_deleted_prov_agents', remove))
+        children.extend(self._db_get_deleted('db_deleted_vt_connections', remove))
+        children.extend(self._db_get_deleted('db_deleted_prov_usages', remove))
+        children.extend(self._db_get_deleted('db_deleted_prov_generations', remove))
+        children.extend(self._db_get_deleted('db_deleted_prov_associations', remove))
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -13653,13 +14523,25 @@ class DBProvDocument(object):
     
 
 
-class DBOpmProcesses(object):
+class DBOpmProcesses(_DBSlotsBase):
 
     vtType = 'opm_processes'
 
+    __slots__ = (
+        '_db_processs',
+        'db_deleted_processs',
+        'db_processs_id_index',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+    _db_lazy_slots = {
+        'db_deleted_processs': list,
+        'db_processs_id_index': dict,
+        }
+
     def __init__(self, processs=None):
-        self.db_deleted_processs = []
-        self.db_processs_id_index = {}
         if processs is None:
             self._db_processs = []
         else:
@@ -13689,7 +14571,8 @@ class DBOpmProcesses(object):
             cp.db_id = new_id
         
         # recreate indices and set flags
-        cp.db_processs_id_index = dict((v.db_id, v) for v in cp._db_processs)
+        if cp._db_processs:
+            cp.db_processs_id_index = dict((v.db_id, v) for v in cp._db_processs)
         if not new_ids:
             cp.is_dirty = self.is_dirty
             cp.is_new = self.is_new
@@ -13709,7 +14592,7 @@ class DBOpmProcesses(object):
         elif hasattr(old_obj, 'db_processs') and old_obj.db_processs is not None:
             for obj in old_obj.db_processs:
                 new_obj.db_add_process(DBOpmProcess.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_processs') and hasattr(new_obj, 'db_deleted_processs'):
+        if hasattr(old_obj, 'db_deleted_processs'):
             for obj in old_obj.db_deleted_processs:
                 n_obj = DBOpmProcess.update_version(obj, trans_dict)
                 new_obj.db_deleted_processs.append(n_obj)
@@ -13730,9 +14613,7 @@ class DBOpmProcesses(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_processs)
-        if remove:
-            self.db_deleted_processs = []
+        children.extend(self._db_get_deleted('db_deleted_processs', remove))
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -13785,10 +14666,18 @@ class DBOpmProcesses(object):
     
 
 
-class DBOpmAccountId(object):
+class DBOpmAccountId(_DBSlotsBase):
 
     vtType = 'opm_account_id'
 
+    __slots__ = (
+        '_db_id',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+
     def __init__(self, id=None):
         self._db_id = id
         self.is_dirty = True
@@ -13857,10 +14746,26 @@ class DBOpmAccountId(object):
     
 
 
-class DBPortSpecItem(object):
+class DBPortSpecItem(_DBSlotsBase):
 
     vtType = 'portSpecItem'
 
+    __slots__ = (
+        '_db_id',
+        '_db_pos',
+        '_db_module',
+        '_db_package',
+        '_db_namespace',
+        '_db_label',
+        '_db_default',
+        '_db_values',
+        '_db_entry_type',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+
     def __init__(self, id=None, pos=None, module=None, package=None, namespace=None, label=None, default=None, values=None, entry_type=None):
         self._db_id = id
         self._db_pos = pos
@@ -14088,10 +14993,34 @@ class DBPortSpecItem(object):
     def getPrimaryKey(self):
         return self._db_id
 
-class DBMashupComponent(object):
+class DBMashupComponent(_DBSlotsBase):
 
     vtType = 'mashup_component'
 
+    __slots__ = (
+        '_db_id',
+        '_db_vtid',
+        '_db_vttype',
+        '_db_vtparent_type',
+        '_db_vtparent_id',
+        '_db_vtpos',
+        '_db_vtmid',
+        '_db_pos',
+        '_db_type',
+        '_db_val',
+        '_db_minVal',
+        '_db_maxVal',
+        '_db_stepSize',
+        '_db_strvaluelist',
+        '_db_widget',
+        '_db_seq',
+        '_db_parent',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+
     def __init__(self, id=None, vtid=None, vttype=None, vtparent_type=None, vtparent_id=None, vtpos=None, vtmid=None, pos=None, type=None, val=None, minVal=None, maxVal=None, stepSize=None, strvaluelist=None, widget=None, seq=None, parent=None):
         self._db_id = id
         self._db_vtid = vtid
@@ -14479,16 +15408,36 @@ class DBMashupComponent(object):
     def getPrimaryKey(self):
         return self._db_id
 
-class DBMashup(object):
+class DBMashup(_DBSlotsBase):
 
     vtType = 'mashup'
 
+    __slots__ = (
+        '_db_id',
+        '_db_name',
+        '_db_version',
+        '_db_aliases',
+        '_db_type',
+        '_db_vtid',
+        '_db_layout',
+        '_db_geometry',
+        '_db_has_seq',
+        'db_deleted_aliases',
+        'db_aliases_id_index',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+    _db_lazy_slots = {
+        'db_deleted_aliases': list,
+        'db_aliases_id_index': dict,
+        }
+
     def __init__(self, id=None, name=None, version=None, aliases=None, type=None, vtid=None, layout=None, geometry=None, has_seq=None):
         self._db_id = id
         self._db_name = name
         self._db_version = version
-        self.db_deleted_aliases = []
-        self.db_aliases_id_index = {}
         if aliases is None:
             self._db_aliases = []
         else:
@@ -14532,7 +15481,8 @@ class DBMashup(object):
                 cp._db_vtid = id_remap[('vistrail', self._db_vtid)]
         
         # recreate indices and set flags
-        cp.db_aliases_id_index = dict((v.db_id, v) for v in cp._db_aliases)
+        if cp._db_aliases:
+            cp.db_aliases_id_index = dict((v.db_id, v) for v in cp._db_aliases)
         if not new_ids:
             cp.is_dirty = self.is_dirty
             cp.is_new = self.is_new
@@ -14567,7 +15517,7 @@ class DBMashup(object):
         elif hasattr(old_obj, 'db_aliases') and old_obj.db_aliases is not None:
             for obj in old_obj.db_aliases:
                 new_obj.db_add_alias(DBMashupAlias.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_aliases') and hasattr(new_obj, 'db_deleted_aliases'):
+        if hasattr(old_obj, 'db_deleted_aliases'):
             for obj in old_obj.db_deleted_aliases:
                 n_obj = DBMashupAlias.update_version(obj, trans_dict)
                 new_obj.db_deleted_aliases.append(n_obj)
@@ -14613,9 +15563,7 @@ class DBMashup(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_aliases)
-        if remove:
-            self.db_deleted_aliases = []
+        children.extend(self._db_get_deleted('db_deleted_aliases', remove))
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -14773,10 +15721,23 @@ class DBMashup(object):
     def getPrimaryKey(self):
         return self._db_id
 
-class DBMachine(object):
+class DBMachine(_DBSlotsBase):
 
     vtType = 'machine'
 
+    __slots__ = (
+        '_db_id',
+        '_db_name',
+        '_db_os',
+        '_db_architecture',
+        '_db_processor',
+        '_db_ram',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+
     def __init__(self, id=None, name=None, os=None, architecture=None, processor=None, ram=None):
         self._db_id = id
         self._db_name = name
@@ -14946,10 +15907,18 @@ class DBMachine(object):
     def getPrimaryKey(self):
         return self._db_id
 
-class DBConfigFloat(object):
+class DBConfigFloat(_DBSlotsBase):
 
     vtType = 'config_float'
 
+    __slots__ = (
+        '_db_value',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+
     def __init__(self, value=None):
         self._db_value = value
         self.is_dirty = True
@@ -15016,10 +15985,20 @@ class DBConfigFloat(object):
     
 
 
-class DBOther(object):
+class DBOther(_DBSlotsBase):
 
     vtType = 'other'
 
+    __slots__ = (
+        '_db_id',
+        '_db_key',
+        '_db_value',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+
     def __init__(self, id=None, key=None, value=None):
         self._db_id = id
         self._db_key = key
@@ -15127,10 +16106,18 @@ class DBOther(object):
     def getPrimaryKey(self):
         return self._db_id
 
-class DBRefProvActivity(object):
+class DBRefProvActivity(_DBSlotsBase):
 
     vtType = 'ref_prov_activity'
 
+    __slots__ = (
+        '_db_prov_ref',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+
     def __init__(self, prov_ref=None):
         self._db_prov_ref = prov_ref
         self.is_dirty = True
@@ -15684,10 +16671,25 @@ class DBAbstraction(object):
     def getPrimaryKey(self):
         return self._db_id
 
-class DBProvAgent(object):
+class DBProvAgent(_DBSlotsBase):
 
     vtType = 'prov_agent'
 
+    __slots__ = (
+        '_db_id',
+        '_db_vt_id',
+        '_db_prov_type',
+        '_db_prov_label',
+        '_db_vt_machine_os',
+        '_db_vt_machine_architecture',
+        '_db_vt_machine_processor',
+        '_db_vt_machine_ram',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+
     def __init__(self, id=None, vt_id=None, prov_type=None, prov_label=None, vt_machine_os=None, vt_machine_architecture=None, vt_machine_processor=None, vt_machine_ram=None):
         self._db_id = id
         self._db_vt_id = vt_id
@@ -15895,27 +16897,57 @@ class DBProvAgent(object):
     def getPrimaryKey(self):
         return self._db_id
 
-class DBMashuptrail(object):
+class DBMashuptrail(_DBSlotsBase):
 
     vtType = 'mashuptrail'
 
+    __slots__ = (
+        '_db_id',
+        '_db_name',
+        '_db_version',
+        '_db_vtVersion',
+        '_db_last_modified',
+        '_db_actions',
+        '_db_annotations',
+        '_db_actionAnnotations',
+        'db_deleted_actions',
+        'db_actions_id_index',
+        'db_deleted_annotations',
+        'db_annotations_id_index',
+        'db_annotations_key_index',
+        'db_deleted_actionAnnotations',
+        'db_actionAnnotations_id_index',
+        'db_actionAnnotations_action_id_index',
+        'db_actionAnnotations_key_index',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+    _db_lazy_slots = {
+        'db_deleted_actions': list,
+        'db_actions_id_index': dict,
+        'db_deleted_annotations': list,
+        'db_annotations_id_index': dict,
+        'db_annotations_key_index': dict,
+        'db_deleted_actionAnnotations': list,
+        'db_actionAnnotations_id_index': dict,
+        'db_actionAnnotations_action_id_index': dict,
+        'db_actionAnnotations_key_index': dict,
+        }
+
     def __init__(self, id=None, name=None, version=None, vtVersion=None, last_modified=None, actions=None, annotations=None, actionAnnotations=None):
         self._db_id = id
         self._db_name = name
         self._db_version = version
         self._db_vtVersion = vtVersion
         self._db_last_modified = last_modified
-        self.db_deleted_actions = []
-        self.db_actions_id_index = {}
         if actions is None:
             self._db_actions = []
         else:
             self._db_actions = actions
             for v in self._db_actions:
                 self.db_actions_id_index[v.db_id] = v
-        self.db_deleted_annotations = []
-        self.db_annotations_id_index = {}
-        self.db_annotations_key_index = {}
         if annotations is None:
             self._db_annotations = []
         else:
@@ -15923,10 +16955,6 @@ class DBMashuptrail(object):
             for v in self._db_annotations:
                 self.db_annotations_id_index[v.db_id] = v
                 self.db_annotations_key_index[v.db_key] = v
-        self.db_deleted_actionAnnotations = []
-        self.db_actionAnnotations_id_index = {}
-        self.db_actionAnnotations_action_id_index = {}
-        self.db_actionAnnotations_key_index = {}
         if actionAnnotations is None:
             self._db_actionAnnotations = []
         else:
@@ -15970,12 +16998,15 @@ class DBMashuptrail(object):
             cp.db_id = new_id
         
         # recreate indices and set flags
-        cp.db_actions_id_index = dict((v.db_id, v) for v in cp._db_actions)
-        cp.db_annotations_id_index = dict((v.db_id, v) for v in cp._db_annotations)
-        cp.db_annotations_key_index = dict((v.db_key, v) for v in cp._db_annotations)
-        cp.db_actionAnnotations_id_index = dict((v.db_id, v) for v in cp._db_actionAnnotations)
-        cp.db_actionAnnotations_action_id_index = dict(((v.db_action_id,v.db_key), v) for v in cp._db_actionAnnotations)
-        cp.db_actionAnnotations_key_index = dict(((v.db_key,v.db_value), v) for v in cp._db_actionAnnotations)
+        if cp._db_actions:
+            cp.db_actions_id_index = dict((v.db_id, v) for v in cp._db_actions)
+        if cp._db_annotations:
+            cp.db_annotations_id_index = dict((v.db_id, v) for v in cp._db_annotations)
+            cp.db_annotations_key_index = dict((v.db_key, v) for v in cp._db_annotations)
+        if cp._db_actionAnnotations:
+            cp.db_actionAnnotations_id_index = dict((v.db_id, v) for v in cp._db_actionAnnotations)
+            cp.db_actionAnnotations_action_id_index = dict(((v.db_action_id,v.db_key), v) for v in cp._db_actionAnnotations)
+            cp.db_actionAnnotations_key_index = dict(((v.db_key,v.db_value), v) for v in cp._db_actionAnnotations)
         if not new_ids:
             cp.is_dirty = self.is_dirty
             cp.is_new = self.is_new
@@ -16020,7 +17051,7 @@ class DBMashuptrail(object):
         elif hasattr(old_obj, 'db_actions') and old_obj.db_actions is not None:
             for obj in old_obj.db_actions:
                 new_obj.db_add_action(DBMashupAction.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_actions') and hasattr(new_obj, 'db_deleted_actions'):
+        if hasattr(old_obj, 'db_deleted_actions'):
             for obj in old_obj.db_deleted_actions:
                 n_obj = DBMashupAction.update_version(obj, trans_dict)
                 new_obj.db_deleted_actions.append(n_obj)
@@ -16031,7 +17062,7 @@ class DBMashuptrail(object):
         elif hasattr(old_obj, 'db_annotations') and old_obj.db_annotations is not None:
             for obj in old_obj.db_annotations:
                 new_obj.db_add_annotation(DBAnnotation.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_annotations') and hasattr(new_obj, 'db_deleted_annotations'):
+        if hasattr(old_obj, 'db_deleted_annotations'):
             for obj in old_obj.db_deleted_annotations:
                 n_obj = DBAnnotation.update_version(obj, trans_dict)
                 new_obj.db_deleted_annotations.append(n_obj)
@@ -16042,7 +17073,7 @@ class DBMashuptrail(object):
         elif hasattr(old_obj, 'db_actionAnnotations') and old_obj.db_actionAnnotations is not None:
             for obj in old_obj.db_actionAnnotations:
                 new_obj.db_add_actionAnnotation(DBMashupActionAnnotation.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_actionAnnotations') and hasattr(new_obj, 'db_deleted_actionAnnotations'):
+        if hasattr(old_obj, 'db_deleted_actionAnnotations'):
             for obj in old_obj.db_deleted_actionAnnotations:
                 n_obj = DBMashupActionAnnotation.update_version(obj, trans_dict)
                 new_obj.db_deleted_actionAnnotations.append(n_obj)
@@ -16077,13 +17108,9 @@ class DBMashuptrail(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_actions)
-        children.extend(self.db_deleted_annotations)
-        children.extend(self.db_deleted_actionAnnotations)
-        if remove:
-            self.db_deleted_actions = []
-            self.db_deleted_annotations = []
-            self.db_deleted_actionAnnotations = []
+        children.extend(self._db_get_deleted('db_deleted_actions', remove))
+        children.extend(self._db_get_deleted('db_deleted_annotations', remove))
+        children.extend(self._db_get_deleted('db_deleted_actionAnnotations', remove))
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -16316,10 +17343,32 @@ class DBMashuptrail(object):
     def getPrimaryKey(self):
         return self._db_id
 
-class DBRegistry(object):
+class DBRegistry(_DBSlotsBase):
 
     vtType = 'registry'
 
+    __slots__ = (
+        '_db_id',
+        '_db_entity_type',
+        '_db_version',
+        '_db_root_descriptor_id',
+        '_db_name',
+        '_db_last_modified',
+        '_db_packages',
+        'db_deleted_packages',
+        'db_packages_id_index',
+        'db_packages_identifier_index',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+    _db_lazy_slots = {
+        'db_deleted_packages': list,
+        'db_packages_id_index': dict,
+        'db_packages_identifier_index': dict,
+        }
+
     def __init__(self, id=None, entity_type=None, version=None, root_descriptor_id=None, name=None, last_modified=None, packages=None):
         self._db_id = id
         self._db_entity_type = entity_type
@@ -16327,9 +17376,6 @@ class DBRegistry(object):
         self._db_root_descriptor_id = root_descriptor_id
         self._db_name = name
         self._db_last_modified = last_modified
-        self.db_deleted_packages = []
-        self.db_packages_id_index = {}
-        self.db_packages_identifier_index = {}
         if packages is None:
             self._db_packages = []
         else:
@@ -16367,8 +17413,9 @@ class DBRegistry(object):
                 cp._db_root_descriptor_id = id_remap[('module_descriptor', self._db_root_descriptor_id)]
         
         # recreate indices and set flags
-        cp.db_packages_id_index = dict((v.db_id, v) for v in cp._db_packages)
-        cp.db_packages_identifier_index = dict(((v.db_identifier,v.db_version), v) for v in cp._db_packages)
+        if cp._db_packages:
+            cp.db_packages_id_index = dict((v.db_id, v) for v in cp._db_packages)
+            cp.db_packages_identifier_index = dict(((v.db_identifier,v.db_version), v) for v in cp._db_packages)
         if not new_ids:
             cp.is_dirty = self.is_dirty
             cp.is_new = self.is_new
@@ -16418,7 +17465,7 @@ class DBRegistry(object):
         elif hasattr(old_obj, 'db_packages') and old_obj.db_packages is not None:
             for obj in old_obj.db_packages:
                 new_obj.db_add_package(DBPackage.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_packages') and hasattr(new_obj, 'db_deleted_packages'):
+        if hasattr(old_obj, 'db_deleted_packages'):
             for obj in old_obj.db_deleted_packages:
                 n_obj = DBPackage.update_version(obj, trans_dict)
                 new_obj.db_deleted_packages.append(n_obj)
@@ -16439,9 +17486,7 @@ class DBRegistry(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_packages)
-        if remove:
-            self.db_deleted_packages = []
+        children.extend(self._db_get_deleted('db_deleted_packages', remove))
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -16580,14 +17625,27 @@ class DBRegistry(object):
     def getPrimaryKey(self):
         return self._db_id
 
-class DBOpmAgent(object):
+class DBOpmAgent(_DBSlotsBase):
 
     vtType = 'opm_agent'
 
+    __slots__ = (
+        '_db_id',
+        '_db_value',
+        '_db_accounts',
+        'db_deleted_accounts',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+    _db_lazy_slots = {
+        'db_deleted_accounts': list,
+        }
+
     def __init__(self, id=None, value=None, accounts=None):
         self._db_id = id
         self._db_value = value
-        self.db_deleted_accounts = []
         if accounts is None:
             self._db_accounts = []
         else:
@@ -16645,7 +17703,7 @@ class DBOpmAgent(object):
         elif hasattr(old_obj, 'db_accounts') and old_obj.db_accounts is not None:
             for obj in old_obj.db_accounts:
                 new_obj.db_add_account(DBOpmAccountId.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_accounts') and hasattr(new_obj, 'db_deleted_accounts'):
+        if hasattr(old_obj, 'db_deleted_accounts'):
             for obj in old_obj.db_deleted_accounts:
                 n_obj = DBOpmAccountId.update_version(obj, trans_dict)
                 new_obj.db_deleted_accounts.append(n_obj)
@@ -16666,9 +17724,7 @@ class DBOpmAgent(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_accounts)
-        if remove:
-            self.db_deleted_accounts = []
+        children.extend(self._db_get_deleted('db_deleted_accounts', remove))
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -16726,10 +17782,34 @@ class DBOpmAgent(object):
     def getPrimaryKey(self):
         return self._db_id
 
-class DBProvEntity(object):
+class DBProvEntity(_DBSlotsBase):
 
     vtType = 'prov_entity'
 
+    __slots__ = (
+        '_db_id',
+        '_db_prov_type',
+        '_db_prov_label',
+        '_db_prov_value',
+        '_db_vt_id',
+        '_db_vt_type',
+        '_db_vt_desc',
+        '_db_vt_package',
+        '_db_vt_version',
+        '_db_vt_cache',
+        '_db_vt_location_x',
+        '_db_vt_location_y',
+        '_db_is_part_of',
+        'db_deleted_is_part_of',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+    _db_lazy_slots = {
+        'db_deleted_is_part_of': list,
+        }
+
     def __init__(self, id=None, prov_type=None, prov_label=None, prov_value=None, vt_id=None, vt_type=None, vt_desc=None, vt_package=None, vt_version=None, vt_cache=None, vt_location_x=None, vt_location_y=None, is_part_of=None):
         self._db_id = id
         self._db_prov_type = prov_type
@@ -16743,7 +17823,6 @@ class DBProvEntity(object):
         self._db_vt_cache = vt_cache
         self._db_vt_location_x = vt_location_x
         self._db_vt_location_y = vt_location_y
-        self.db_deleted_is_part_of = []
         self._db_is_part_of = is_part_of
         self.is_dirty = True
         self.is_new = True
@@ -16855,7 +17934,7 @@ class DBProvEntity(object):
         elif hasattr(old_obj, 'db_is_part_of') and old_obj.db_is_part_of is not None:
             obj = old_obj.db_is_part_of
             new_obj.db_add_is_part_of(DBIsPartOf.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_is_part_of') and hasattr(new_obj, 'db_deleted_is_part_of'):
+        if hasattr(old_obj, 'db_deleted_is_part_of'):
             for obj in old_obj.db_deleted_is_part_of:
                 n_obj = DBIsPartOf.update_version(obj, trans_dict)
                 new_obj.db_deleted_is_part_of.append(n_obj)
@@ -16873,9 +17952,7 @@ class DBProvEntity(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_is_part_of)
-        if remove:
-            self.db_deleted_is_part_of = []
+        children.extend(self._db_get_deleted('db_deleted_is_part_of', remove))
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -17057,10 +18134,20 @@ class DBProvEntity(object):
     def getPrimaryKey(self):
         return self._db_id
 
-class DBAnnotation(object):
+class DBAnnotation(_DBSlotsBase):
 
     vtType = 'annotation'
 
+    __slots__ = (
+        '_db_id',
+        '_db_key',
+        '_db_value',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+
     def __init__(self, id=None, key=None, value=None):
         self._db_id = id
         self._db_key = key
@@ -17168,10 +18255,20 @@ class DBAnnotation(object):
     def getPrimaryKey(self):
         return self._db_id
 
-class DBOpmTime(object):
+class DBOpmTime(_DBSlotsBase):
 
     vtType = 'opm_time'
 
+    __slots__ = (
+        '_db_no_later_than',
+        '_db_no_earlier_than',
+        '_db_clock_id',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+
     def __init__(self, no_later_than=None, no_earlier_than=None, clock_id=None):
         self._db_no_later_than = no_later_than
         self._db_no_earlier_than = no_earlier_than
@@ -17278,10 +18375,31 @@ class DBOpmTime(object):
     
 
 
-class DBParameterExploration(object):
+class DBParameterExploration(_DBSlotsBase):
 
     vtType = 'parameter_exploration'
 
+    __slots__ = (
+        '_db_id',
+        '_db_action_id',
+        '_db_name',
+        '_db_date',
+        '_db_user',
+        '_db_dims',
+        '_db_layout',
+        '_db_functions',
+        'db_deleted_functions',
+        'db_functions_id_index',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+    _db_lazy_slots = {
+        'db_deleted_functions': list,
+        'db_functions_id_index': dict,
+        }
+
     def __init__(self, id=None, action_id=None, name=None, date=None, user=None, dims=None, layout=None, functions=None):
         self._db_id = id
         self._db_action_id = action_id
@@ -17290,8 +18408,6 @@ class DBParameterExploration(object):
         self._db_user = user
         self._db_dims = dims
         self._db_layout = layout
-        self.db_deleted_functions = []
-        self.db_functions_id_index = {}
         if functions is None:
             self._db_functions = []
         else:
@@ -17329,7 +18445,8 @@ class DBParameterExploration(object):
                 cp._db_action_id = id_remap[('action', self._db_action_id)]
         
         # recreate indices and set flags
-        cp.db_functions_id_index = dict((v.db_id, v) for v in cp._db_functions)
+        if cp._db_functions:
+            cp.db_functions_id_index = dict((v.db_id, v) for v in cp._db_functions)
         if not new_ids:
             cp.is_dirty = self.is_dirty
             cp.is_new = self.is_new
@@ -17384,7 +18501,7 @@ class DBParameterExploration(object):
         elif hasattr(old_obj, 'db_functions') and old_obj.db_functions is not None:
             for obj in old_obj.db_functions:
                 new_obj.db_add_function(DBPEFunction.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_functions') and hasattr(new_obj, 'db_deleted_functions'):
+        if hasattr(old_obj, 'db_deleted_functions'):
             for obj in old_obj.db_deleted_functions:
                 n_obj = DBPEFunction.update_version(obj, trans_dict)
                 new_obj.db_deleted_functions.append(n_obj)
@@ -17405,9 +18522,7 @@ class DBParameterExploration(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_functions)
-        if remove:
-            self.db_deleted_functions = []
+        children.extend(self._db_get_deleted('db_deleted_functions', remove))
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -17552,10 +18667,23 @@ class DBParameterExploration(object):
     def getPrimaryKey(self):
         return self._db_id
 
-class DBMashupActionAnnotation(object):
+class DBMashupActionAnnotation(_DBSlotsBase):
 
     vtType = 'mashup_actionAnnotation'
 
+    __slots__ = (
+        '_db_id',
+        '_db_key',
+        '_db_value',
+        '_db_action_id',
+        '_db_date',
+        '_db_user',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+
     def __init__(self, id=None, key=None, value=None, action_id=None, date=None, user=None):
         self._db_id = id
         self._db_key = key
@@ -17725,15 +18853,29 @@ class DBMashupActionAnnotation(object):
     def getPrimaryKey(self):
         return self._db_id
 
-class DBOpmProcess(object):
+class DBOpmProcess(_DBSlotsBase):
 
     vtType = 'opm_process'
 
+    __slots__ = (
+        '_db_id',
+        '_db_value',
+        '_db_accounts',
+        'db_deleted_value',
+        'db_deleted_accounts',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+    _db_lazy_slots = {
+        'db_deleted_value': list,
+        'db_deleted_accounts': list,
+        }
+
     def __init__(self, id=None, value=None, accounts=None):
         self._db_id = id
-        self.db_deleted_value = []
         self._db_value = value
-        self.db_deleted_accounts = []
         if accounts is None:
             self._db_accounts = []
         else:
@@ -17786,7 +18928,7 @@ class DBOpmProcess(object):
         elif hasattr(old_obj, 'db_value') and old_obj.db_value is not None:
             obj = old_obj.db_value
             new_obj.db_add_value(DBOpmProcessValue.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_value') and hasattr(new_obj, 'db_deleted_value'):
+        if hasattr(old_obj, 'db_deleted_value'):
             for obj in old_obj.db_deleted_value:
                 n_obj = DBOpmProcessValue.update_version(obj, trans_dict)
                 new_obj.db_deleted_value.append(n_obj)
@@ -17797,7 +18939,7 @@ class DBOpmProcess(object):
         elif hasattr(old_obj, 'db_accounts') and old_obj.db_accounts is not None:
             for obj in old_obj.db_accounts:
                 new_obj.db_add_account(DBOpmAccountId.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_accounts') and hasattr(new_obj, 'db_deleted_accounts'):
+        if hasattr(old_obj, 'db_deleted_accounts'):
             for obj in old_obj.db_deleted_accounts:
                 n_obj = DBOpmAccountId.update_version(obj, trans_dict)
                 new_obj.db_deleted_accounts.append(n_obj)
@@ -17822,11 +18964,8 @@ class DBOpmProcess(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_value)
-        children.extend(self.db_deleted_accounts)
-        if remove:
-            self.db_deleted_value = []
-            self.db_deleted_accounts = []
+        children.extend(self._db_get_deleted('db_deleted_value', remove))
+        children.extend(self._db_get_deleted('db_deleted_accounts', remove))
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -17888,13 +19027,25 @@ class DBOpmProcess(object):
     def getPrimaryKey(self):
         return self._db_id
 
-class DBDisabledPackages(object):
+class DBDisabledPackages(_DBSlotsBase):
 
     vtType = 'disabled_packages'
 
+    __slots__ = (
+        '_db_packages',
+        'db_deleted_packages',
+        'db_packages_name_index',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+    _db_lazy_slots = {
+        'db_deleted_packages': list,
+        'db_packages_name_index': dict,
+        }
+
     def __init__(self, packages=None):
-        self.db_deleted_packages = []
-        self.db_packages_name_index = {}
         if packages is None:
             self._db_packages = []
         else:
@@ -17924,7 +19075,8 @@ class DBDisabledPackages(object):
             cp.db_id = new_id
         
         # recreate indices and set flags
-        cp.db_packages_name_index = dict((v.db_name, v) for v in cp._db_packages)
+        if cp._db_packages:
+            cp.db_packages_name_index = dict((v.db_name, v) for v in cp._db_packages)
         if not new_ids:
             cp.is_dirty = self.is_dirty
             cp.is_new = self.is_new
@@ -17944,7 +19096,7 @@ class DBDisabledPackages(object):
         elif hasattr(old_obj, 'db_packages') and old_obj.db_packages is not None:
             for obj in old_obj.db_packages:
                 new_obj.db_add_package(DBStartupPackage.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_packages') and hasattr(new_obj, 'db_deleted_packages'):
+        if hasattr(old_obj, 'db_deleted_packages'):
             for obj in old_obj.db_deleted_packages:
                 n_obj = DBStartupPackage.update_version(obj, trans_dict)
                 new_obj.db_deleted_packages.append(n_obj)
@@ -17965,9 +19117,7 @@ class DBDisabledPackages(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_packages)
-        if remove:
-            self.db_deleted_packages = []
+        children.extend(self._db_get_deleted('db_deleted_packages', remove))
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -18004,10 +19154,38 @@ class DBDisabledPackages(object):
     
 
 
-class DBModuleExec(object):
+class DBModuleExec(_DBSlotsBase):
 
     vtType = 'module_exec'
 
+    __slots__ = (
+        '_db_id',
+        '_db_ts_start',
+        '_db_ts_end',
+        '_db_cached',
+        '_db_module_id',
+        '_db_module_name',
+        '_db_completed',
+        '_db_error',
+        '_db_machine_id',
+        '_db_annotations',
+        '_db_loop_execs',
+        'db_deleted_annotations',
+        'db_annotations_id_index',
+        'db_deleted_loop_execs',
+        'db_loop_execs_id_index',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+    _db_lazy_slots = {
+        'db_deleted_annotations': list,
+        'db_annotations_id_index': dict,
+        'db_deleted_loop_execs': list,
+        'db_loop_execs_id_index': dict,
+        }
+
     def __init__(self, id=None, ts_start=None, ts_end=None, cached=None, module_id=None, module_name=None, completed=None, error=None, machine_id=None, annotations=None, loop_execs=None):
         self._db_id = id
         self._db_ts_start = ts_start
@@ -18018,16 +19196,12 @@ class DBModuleExec(object):
         self._db_completed = completed
         self._db_error = error
         self._db_machine_id = machine_id
-        self.db_deleted_annotations = []
-        self.db_annotations_id_index = {}
         if annotations is None:
             self._db_annotations = []
         else:
             self._db_annotations = annotations
             for v in self._db_annotations:
                 self.db_annotations_id_index[v.db_id] = v
-        self.db_deleted_loop_execs = []
-        self.db_loop_execs_id_index = {}
         if loop_execs is None:
             self._db_loop_execs = []
         else:
@@ -18073,8 +19247,10 @@ class DBModuleExec(object):
                 cp._db_machine_id = id_remap[('machine', self._db_machine_id)]
         
         # recreate indices and set flags
-        cp.db_annotations_id_index = dict((v.db_id, v) for v in cp._db_annotations)
-        cp.db_loop_execs_id_index = dict((v.db_id, v) for v in cp._db_loop_execs)
+        if cp._db_annotations:
+            cp.db_annotations_id_index = dict((v.db_id, v) for v in cp._db_annotations)
+        if cp._db_loop_execs:
+            cp.db_loop_execs_id_index = dict((v.db_id, v) for v in cp._db_loop_execs)
         if not new_ids:
             cp.is_dirty = self.is_dirty
             cp.is_new = self.is_new
@@ -18139,7 +19315,7 @@ class DBModuleExec(object):
         elif hasattr(old_obj, 'db_annotations') and old_obj.db_annotations is not None:
             for obj in old_obj.db_annotations:
                 new_obj.db_add_annotation(DBAnnotation.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_annotations') and hasattr(new_obj, 'db_deleted_annotations'):
+        if hasattr(old_obj, 'db_deleted_annotations'):
             for obj in old_obj.db_deleted_annotations:
                 n_obj = DBAnnotation.update_version(obj, trans_dict)
                 new_obj.db_deleted_annotations.append(n_obj)
@@ -18150,7 +19326,7 @@ class DBModuleExec(object):
         elif hasattr(old_obj, 'db_loop_execs') and old_obj.db_loop_execs is not None:
             for obj in old_obj.db_loop_execs:
                 new_obj.db_add_loop_exec(DBLoopExec.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_loop_execs') and hasattr(new_obj, 'db_deleted_loop_execs'):
+        if hasattr(old_obj, 'db_deleted_loop_execs'):
             for obj in old_obj.db_deleted_loop_execs:
                 n_obj = DBLoopExec.update_version(obj, trans_dict)
                 new_obj.db_deleted_loop_execs.append(n_obj)
@@ -18178,11 +19354,8 @@ class DBModuleExec(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_annotations)
-        children.extend(self.db_deleted_loop_execs)
-        if remove:
-            self.db_deleted_annotations = []
-            self.db_deleted_loop_execs = []
+        children.extend(self._db_get_deleted('db_deleted_annotations', remove))
+        children.extend(self._db_get_deleted('db_deleted_loop_execs', remove))
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -18398,16 +19571,32 @@ class DBModuleExec(object):
     def getPrimaryKey(self):
         return self._db_id
 
-class DBProvAssociation(object):
+class DBProvAssociation(_DBSlotsBase):
 
     vtType = 'prov_association'
 
+    __slots__ = (
+        '_db_prov_activity',
+        '_db_prov_agent',
+        '_db_prov_plan',
+        '_db_prov_role',
+        'db_deleted_prov_activity',
+        'db_deleted_prov_agent',
+        'db_deleted_prov_plan',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+    _db_lazy_slots = {
+        'db_deleted_prov_activity': list,
+        'db_deleted_prov_agent': list,
+        'db_deleted_prov_plan': list,
+        }
+
     def __init__(self, prov_activity=None, prov_agent=None, prov_plan=None, prov_role=None):
-        self.db_deleted_prov_activity = []
         self._db_prov_activity = prov_activity
-        self.db_deleted_prov_agent = []
         self._db_prov_agent = prov_agent
-        self.db_deleted_prov_plan = []
         self._db_prov_plan = prov_plan
         self._db_prov_role = prov_role
         self.is_dirty = True
@@ -18453,7 +19642,7 @@ class DBProvAssociation(object):
         elif hasattr(old_obj, 'db_prov_activity') and old_obj.db_prov_activity is not None:
             obj = old_obj.db_prov_activity
             new_obj.db_add_prov_activity(DBRefProvActivity.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_prov_activity') and hasattr(new_obj, 'db_deleted_prov_activity'):
+        if hasattr(old_obj, 'db_deleted_prov_activity'):
             for obj in old_obj.db_deleted_prov_activity:
                 n_obj = DBRefProvActivity.update_version(obj, trans_dict)
                 new_obj.db_deleted_prov_activity.append(n_obj)
@@ -18463,7 +19652,7 @@ class DBProvAssociation(object):
         elif hasattr(old_obj, 'db_prov_agent') and old_obj.db_prov_agent is not None:
             obj = old_obj.db_prov_agent
             new_obj.db_add_prov_agent(DBRefProvAgent.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_prov_agent') and hasattr(new_obj, 'db_deleted_prov_agent'):
+        if hasattr(old_obj, 'db_deleted_prov_agent'):
             for obj in old_obj.db_deleted_prov_agent:
                 n_obj = DBRefProvAgent.update_version(obj, trans_dict)
                 new_obj.db_deleted_prov_agent.append(n_obj)
@@ -18473,7 +19662,7 @@ class DBProvAssociation(object):
         elif hasattr(old_obj, 'db_prov_plan') and old_obj.db_prov_plan is not None:
             obj = old_obj.db_prov_plan
             new_obj.db_add_prov_plan(DBRefProvPlan.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_prov_plan') and hasattr(new_obj, 'db_deleted_prov_plan'):
+        if hasattr(old_obj, 'db_deleted_prov_plan'):
             for obj in old_obj.db_deleted_prov_plan:
                 n_obj = DBRefProvPlan.update_version(obj, trans_dict)
                 new_obj.db_deleted_prov_plan.append(n_obj)
@@ -18504,13 +19693,9 @@ class DBProvAssociation(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_prov_activity)
-        children.extend(self.db_deleted_prov_agent)
-        children.extend(self.db_deleted_prov_plan)
-        if remove:
-            self.db_deleted_prov_activity = []
-            self.db_deleted_prov_agent = []
-            self.db_deleted_prov_plan = []
+        children.extend(self._db_get_deleted('db_deleted_prov_activity', remove))
+        children.extend(self._db_get_deleted('db_deleted_prov_agent', remove))
+        children.extend(self._db_get_deleted('db_deleted_prov_plan', remove))
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -18582,12 +19767,23 @@ class DBProvAssociation(object):
     
 
 
-class DBOpmProcessValue(object):
+class DBOpmProcessValue(_DBSlotsBase):
 
     vtType = 'opm_process_value'
 
+    __slots__ = (
+        '_db_value',
+        'db_deleted_value',
+        'is_dirty',
+        'is_new',
+        '__dict__',
+        '__weakref__',
+        )
+    _db_lazy_slots = {
+        'db_deleted_value': list,
+        }
+
     def __init__(self, value=None):
-        self.db_deleted_value = []
         self._db_value = value
         self.is_dirty = True
         self.is_new = True
@@ -18633,7 +19829,7 @@ class DBOpmProcessValue(object):
                 new_obj.db_add_value(DBGroupExec.update_version(obj, trans_dict))
             elif obj.vtType == 'loop_exec':
                 new_obj.db_add_value(DBLoopExec.update_version(obj, trans_dict))
-        if hasattr(old_obj, 'db_deleted_value') and hasattr(new_obj, 'db_deleted_value'):
+        if hasattr(old_obj, 'db_deleted_value'):
             for obj in old_obj.db_deleted_value:
                 if obj.vtType == 'module_exec':
                     n_obj = DBModuleExec.update_version(obj, trans_dict)
@@ -18658,9 +19854,7 @@ class DBOpmProcessValue(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_value)
-        if remove:
-            self.db_deleted_value = []
+        children.extend(self._db_get_deleted('db_deleted_value', remove))
         return children
     def has_changes(self):
         if self.is_dirty:
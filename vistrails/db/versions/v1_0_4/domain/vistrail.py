@@ -41,6 +41,7 @@ import hashlib
 from auto_gen import DBVistrail as _DBVistrail
 from auto_gen import DBAdd, DBChange, DBDelete, DBAbstraction, DBGroup, \
     DBModule, DBAnnotation, DBActionAnnotation, DBParameterExploration
+from action import DBAction
 from id_scope import IdScope
 
 class DBVistrail(_DBVistrail):
@@ -92,30 +93,16 @@ class DBVistrail(_DBVistrail):
         return new_obj
 
     def update_id_scope(self):
-        def getOldObjId(operation):
-            if operation.vtType == 'change':
-                return operation.db_oldObjId
-            return operation.db_objectId
-
-        def getNewObjId(operation):
-            if operation.vtType == 'change':
-                return operation.db_newObjId
-            return operation.db_objectId
-
         for action in self.db_actions:
             self.idScope.updateBeginId('action', action.db_id+1)
             if action.db_session is not None:
                 self.idScope.updateBeginId('session', action.db_session + 1)
-            for operation in action.db_operations:
-                self.idScope.updateBeginId('operation', operation.db_id+1)
-                if operation.vtType == 'add' or operation.vtType == 'change':
-                    # update ids of data
-                    self.idScope.updateBeginId(operation.db_what, 
-                                               getNewObjId(operation)+1)
-                    if operation.db_data is None:
-                        if operation.vtType == 'change':
-                            operation.db_objectId = operation.db_oldObjId
-                    self.db_add_object(operation.db_data)
+            # operations that are not loaded yet were accounted for by the
+            # loader, and get added when they are read
+            if not (isinstance(action, DBAction) and
+                    action.db_has_lazy_operations()):
+                for operation in action.db_operations:
+                    self.update_operation_id_scope(operation)
             for annotation in action.db_annotations:
                 self.idScope.updateBeginId('annotation', annotation.db_id+1)
         
@@ -127,6 +114,20 @@ class DBVistrail(_DBVistrail):
             self.idScope.updateBeginId('parameter_exploration',
                                        paramexp.db_id+1)
 
+    def update_operation_id_scope(self, operation):
+        self.idScope.updateBeginId('operation', operation.db_id+1)
+        if operation.vtType == 'add' or operation.vtType == 'change':
+            # update ids of data
+            if operation.vtType == 'change':
+                new_obj_id = operation.db_newObjId
+            else:
+                new_obj_id = operation.db_objectId
+            self.idScope.updateBeginId(operation.db_what, new_obj_id+1)
+            if operation.db_data is None:
+                if operation.vtType == 'change':
+                    operation.db_objectId = operation.db_oldObjId
+            self.db_add_object(operation.db_data)
+
     def db_add_object(self, obj):
         self.db_objects[(obj.vtType, obj.db_id)] = obj
 
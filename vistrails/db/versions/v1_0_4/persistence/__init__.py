@@ -35,6 +35,8 @@
 ###############################################################################
 from __future__ import division
 
+from itertools import izip
+
 from xml.auto_gen import XMLDAOListBase
 from sql.auto_gen import SQLDAOListBase
 from vistrails.core.system import get_elementtree_library
@@ -106,7 +108,6 @@ class DAOList(dict):
 
     def open_from_db(self, db_connection, vtType, id=None, lock=False, 
                      global_props=None):
-        all_objects = {}
         if global_props is None:
             global_props = {}
         if id is not None:
@@ -124,59 +125,8 @@ class DAOList(dict):
                                        "id '%s' exist in the database" % \
                                            (vtType, id))
         
-        all_objects.update(res_objects)
         res = res_objects.values()[0]
-        global_props = {'entity_id': res.db_id,
-                        'entity_type': res.vtType}
-
-        # collect all commands so that they can be executed together
-        # daoList should contain (dao_type, dao, dbCommand) values
-        daoList = []
-        # dbCommandList should contain dbCommand values
-        dbCommandList = []
-        
-        # generate SELECT statements
-        for dao_type, dao in self['sql'].iteritems():
-            if dao_type in root_set:
-                continue
-
-            daoList.append([dao_type, dao, None])
-            dbCommand = dao.get_sql_select(db_connection, global_props, lock)
-            dbCommandList.append(dbCommand)
-            
-        # Exacute all select statements
-        results = self['sql'][vtType].executeSQLGroup(db_connection,
-                                                      dbCommandList, True)
-
-        # add result to correct dao
-        for i in xrange(len(daoList)):
-            daoList[i][2] = results[i]
-        
-        # process results
-        for dao_type, dao, data in daoList:
-            current_objs = dao.process_sql_columns(data, global_props)
-            all_objects.update(current_objs)
-
-            if dao_type == DBGroup.vtType:
-                for key, obj in current_objs.iteritems():
-                    new_props = {'parent_id': key[1],
-                                 'entity_id': global_props['entity_id'],
-                                 'entity_type': global_props['entity_type']}
-                    res_obj = self.open_from_db(db_connection, 
-                                                DBWorkflow.vtType, 
-                                                None, lock, new_props)
-                    res_dict = {}
-                    res_dict[(res_obj.vtType, res_obj.db_id)] = res_obj
-                    all_objects.update(res_dict)
-
-        for key, obj in all_objects.iteritems():
-            if key[0] == vtType and key[1] == id:
-                continue
-            self['sql'][obj.vtType].from_sql_fast(obj, all_objects)
-        for obj in all_objects.itervalues():
-            obj.is_dirty = False
-            obj.is_new = False
-
+        self.open_children_from_db(db_connection, [res], lock)
         return res
 
     def open_many_from_db(self, db_connection, vtType, ids, lock=False):
@@ -193,18 +143,8 @@ class DAOList(dict):
 
         # list of final objects
         objects = []
-        # list of selects
-        selects = []
-        # list of children id:all_objects_dict
-        all_objects_dict = {}
-        # process each result and extract child SELECTS
-        # daoList should contain (id, dao_type, dao, result) values
-        daoList = []
-        # selects should contain dbCommand values
-        selects = []
-        global_props = {}
         for id, data in zip(ids, results):
-            res_objects = log_dao.process_sql_columns(data, global_props)
+            res_objects = log_dao.process_sql_columns(data, {})
             if len(res_objects) > 1:
                 raise VistrailsDBException("More than object of type '%s' and "
                                            "id '%s' exist in the database" % \
@@ -213,58 +153,105 @@ class DAOList(dict):
                 raise VistrailsDBException("No objects of type '%s' and "
                                            "id '%s' exist in the database" % \
                                                (vtType, id))
-            all_objects = {}
-            all_objects_dict[id] = all_objects
-            all_objects.update(res_objects)
             objects.append(res_objects.values()[0])
-            # collect all commands so that they can be executed together
-        
-            # generate SELECT statements for children
-            for dao_type, dao in self['sql'].iteritems():
-                if dao_type in root_set:
-                    continue
-    
-                daoList.append([id, dao_type, dao, None])
-                dbCommand = dao.get_sql_select(db_connection, global_props, lock)
-                selects.append(dbCommand)
-
-        # Execute all child select statements
-        results = self['sql'][vtType].executeSQLGroup(db_connection,
-                                                      selects, True)
-        for i in xrange(len(daoList)):
-            daoList[i][3] = results[i]
-
-        # process results
-        for id, dao_type, dao, data in daoList:
-            all_objects = all_objects_dict[id]
-            current_objs = dao.process_sql_columns(data, global_props)
-            all_objects.update(current_objs)
-
-            if dao_type == DBGroup.vtType:
-                for key, obj in current_objs.iteritems():
-                    new_props = {'parent_id': key[1],
-                                 'entity_id': global_props['entity_id'],
-                                 'entity_type': global_props['entity_type']}
-                    res_obj = self.open_from_db(db_connection, 
-                                                DBWorkflow.vtType, 
-                                                None, lock, new_props)
-                    res_dict = {}
-                    res_dict[(res_obj.vtType, res_obj.db_id)] = res_obj
-                    all_objects.update(res_dict)
 
-        
-        for id, all_objects in all_objects_dict.iteritems():
+        self.open_children_from_db(db_connection, objects, lock)
+        return objects
+
+    def open_children_from_db(self, db_connection, roots, lock=False):
+        """open_children_from_db(db_connection, roots: list, lock: bool)
+              -> None
+
+        Loads the children of the given root objects, including the
+        workflows of their groups, and attaches them.
+
+        Rows are stored with the type and id of the entity they belong to,
+        which is the root object or the workflow of a group. All the
+        entities at the same depth are loaded together with one SELECT
+        statement per table, so that the number of queries only depends on
+        how deeply groups are nested. Objects are then assembled separately
+        for each entity since their ids are only unique within it.
+        """
+        # maps (entity_type, entity_id) to the objects of that entity
+        entities = {}
+        level = []
+        for root in roots:
+            key = (root.vtType, root.db_id)
+            entities[key] = {key: root}
+            level.append(key)
+
+        while level:
+            # generate SELECT statements for the entities at this depth
+            dbCommandList = []
+            daoList = []
+            for entity_type in set(t for t, _ in level):
+                ids = sorted(i for t, i in level if t == entity_type)
+                global_props = {'entity_type': entity_type,
+                                'entity_id': ids}
+                for dao_type, dao in self['sql'].iteritems():
+                    # workflows of groups are stored with their parent
+                    if (dao_type in root_set and
+                            dao_type != DBWorkflow.vtType):
+                        continue
+                    daoList.append(dao)
+                    dbCommandList.append(dao.get_sql_select(db_connection,
+                                                            global_props,
+                                                            lock))
+
+            # Execute all select statements
+            results = self['sql'][DBWorkflow.vtType].executeSQLGroup(
+                db_connection, dbCommandList, True)
+
+            # split the objects between their entities
+            workflows = []
+            for dao, data in izip(daoList, results):
+                for key, obj in dao.process_sql_columns(data, {}).iteritems():
+                    if obj.vtType == DBWorkflow.vtType:
+                        workflows.append(obj)
+                    else:
+                        entity = (obj.db_entity_type, obj.db_entity_id)
+                        entities[entity][key] = obj
+
+            # the workflows of this level's groups are the next entities
+            group_workflows = {}
+            for workflow in workflows:
+                entity = (workflow.db_entity_type, workflow.db_entity_id)
+                group_key = (DBGroup.vtType, workflow.db_group)
+                if group_key not in entities[entity]:
+                    continue
+                if (entity, group_key) in group_workflows:
+                    raise VistrailsDBException("More than object of type "
+                                               "'%s' and id '%s' exist in "
+                                               "the database" % \
+                                                   (DBWorkflow.vtType, None))
+                group_workflows[(entity, group_key)] = workflow
+            for entity in level:
+                for group_key in entities[entity].keys():
+                    if group_key[0] != DBGroup.vtType:
+                        continue
+                    if (entity, group_key) not in group_workflows:
+                        raise VistrailsDBException("No objects of type '%s' "
+                                                   "and id '%s' exist in the "
+                                                   "database" % \
+                                                       (DBWorkflow.vtType,
+                                                        None))
+            level = []
+            for (entity, group_key), workflow in group_workflows.iteritems():
+                key = (workflow.vtType, workflow.db_id)
+                entities[entity][key] = workflow
+                entities[key] = {key: workflow}
+                level.append(key)
+
+        # assemble each entity
+        for entity, all_objects in entities.iteritems():
             for key, obj in all_objects.iteritems():
-                if key[0] == vtType and key[1] == id:
+                if key == entity:
                     continue
                 self['sql'][obj.vtType].from_sql_fast(obj, all_objects)
-        for id, dao_type, dao, data in daoList:
-            all_objects = all_objects_dict[id]
+        for all_objects in entities.itervalues():
             for obj in all_objects.itervalues():
                 obj.is_dirty = False
                 obj.is_new = False
-    
-        return objects
 
     def save_to_db(self, db_connection, obj, do_copy=False, global_props=None):
         if do_copy == 'with_ids':
@@ -301,45 +288,10 @@ class DAOList(dict):
         if not len(children):
             return
 
-        # list of all children
-        dbCommandList = []
-        writtenChildren = []
-        # process remaining children
-        for (child, _, _) in children:
-            dbCommand = self['sql'][child.vtType].set_sql_command(
-                            db_connection, child, global_props, do_copy)
-            if dbCommand is not None:
-                dbCommandList.append(dbCommand)
-                writtenChildren.append(child)
-            self['sql'][child.vtType].to_sql_fast(child, do_copy)
-
-        # Debug version of Execute all insert/update statements
-        #results = [self['sql'][children[0][0].vtType].executeSQL(
-        #                      db_connection, c, False) for c in dbCommandList]
-
-        # Execute all insert/update statements
-        results = self['sql'][children[0][0].vtType].executeSQLGroup(
-                                                    db_connection,
-                                                    dbCommandList, False)
-        resultDict = dict(zip(writtenChildren, results))
-        # process remaining children
-        for (child, _, _) in children:
-            if child in resultDict:
-                lastId = resultDict[child]
-                self['sql'][child.vtType].set_sql_process(child, 
-                                                          global_props,
-                                                          lastId)
-            self['sql'][child.vtType].to_sql_fast(child, do_copy)
-            if child.vtType == DBGroup.vtType:
-                if child.db_workflow:
-                    # print '*** entity_type:', global_props['entity_type']
-                    new_props = {'entity_id': global_props['entity_id'],
-                                 'entity_type': global_props['entity_type']}
-                    is_dirty = child.db_workflow.is_dirty
-                    child.db_workflow.db_entity_type = DBWorkflow.vtType
-                    child.db_workflow.is_dirty = is_dirty
-                    self.save_to_db(db_connection, child.db_workflow, do_copy,
-                                    new_props)
+        self.save_children_to_db(db_connection,
+                                 [(child, global_props)
+                                  for (child, _, _) in children],
+                                 do_copy)
 
     def save_many_to_db(self, db_connection, objList, do_copy=False):
         if do_copy == 'with_ids':
@@ -373,8 +325,7 @@ class DAOList(dict):
                                                     db_connection,
                                                     dbCommandList, False)
         resultDict = dict(zip(writtenChildren, results))
-        dbCommandList = []
-        writtenChildren = []
+        new_children = []
         for child, children in childrenDict.iteritems():
             # process objects
             if child in resultDict:
@@ -398,42 +349,67 @@ class DAOList(dict):
             child.is_dirty = False
             child.is_new = False
             
-            # list of all children
-            # process remaining children
-            for (child, _, _) in children:
-                dbCommand = self['sql'][child.vtType].set_sql_command(
-                                db_connection, child, global_props, do_copy)
-                if dbCommand is not None:
-                    dbCommandList.append(dbCommand)
-                    writtenChildren.append(child)
-                self['sql'][child.vtType].to_sql_fast(child, do_copy)
-    
-        # Execute all child insert/update statements
-        results = self['sql'][children[0][0].vtType].executeSQLGroup(
-                                                        db_connection,
-                                                        dbCommandList, False)
-        resultDict = dict(zip(writtenChildren, results))
+            new_children.extend((child, global_props)
+                                for (child, _, _) in children)
+
+        self.save_children_to_db(db_connection, new_children, do_copy)
+
+    def save_children_to_db(self, db_connection, children, do_copy=False):
+        """save_children_to_db(db_connection, children: list,
+                               do_copy: bool) -> None
+
+        Writes the new and modified objects from children, a list of
+        (object, global_props) pairs where parents come before their
+        children. Objects that haven't changed are not written, and the
+        statements for the others are grouped per table and sent with
+        executemany(). Written objects are marked as clean, so that the next
+        save only writes what changed since this one. The workflows of
+        groups are then saved recursively.
+        """
+        # INSERT and UPDATE statements, with the values for each object
+        statements = []
+        statement_values = {}
+        written = []
+        groups = []
+        for (child, global_props) in children:
+            dao = self['sql'][child.vtType]
+            dbCommand = dao.set_sql_command(db_connection, child,
+                                            global_props, do_copy)
+            if dbCommand is None:
+                pass
+            elif child.db_id is None:
+                # the id is assigned by the database, and is needed for
+                # the children of this object
+                lastId = dao.executeSQL(db_connection, dbCommand, False)
+                dao.set_sql_process(child, global_props, lastId)
+                written.append(child)
+            else:
+                statement, values = dbCommand
+                if statement not in statement_values:
+                    statements.append(statement)
+                    statement_values[statement] = []
+                statement_values[statement].append(values)
+                written.append(child)
+            dao.to_sql_fast(child, do_copy)
+            if child.vtType == DBGroup.vtType and child.db_workflow:
+                groups.append((child, global_props))
+
+        dao = self['sql'][DBWorkflow.vtType]
+        for statement in statements:
+            dao.executeSQLMany(db_connection, statement,
+                               statement_values[statement])
+        for child in written:
+            child.is_dirty = False
+            child.is_new = False
 
-        for child, children in childrenDict.iteritems():
-            global_props = global_propsDict[child]
-            # process remaining children
-            for (child, _, _) in children:
-                if child in resultDict:
-                    lastId = resultDict[child]
-                    self['sql'][child.vtType].set_sql_process(child, 
-                                                              global_props,
-                                                              lastId)
-                self['sql'][child.vtType].to_sql_fast(child, do_copy)
-                if child.vtType == DBGroup.vtType:
-                    if child.db_workflow:
-                        # print '*** entity_type:', global_props['entity_type']
-                        new_props = {'entity_id': global_props['entity_id'],
-                                     'entity_type': global_props['entity_type']}
-                        is_dirty = child.db_workflow.is_dirty
-                        child.db_workflow.db_entity_type = DBWorkflow.vtType
-                        child.db_workflow.is_dirty = is_dirty
-                        self.save_to_db(db_connection, child.db_workflow, do_copy,
-                                        new_props)
+        for (child, global_props) in groups:
+            new_props = {'entity_id': global_props['entity_id'],
+                         'entity_type': global_props['entity_type']}
+            is_dirty = child.db_workflow.is_dirty
+            child.db_workflow.db_entity_type = DBWorkflow.vtType
+            child.db_workflow.is_dirty = is_dirty
+            self.save_to_db(db_connection, child.db_workflow, do_copy,
+                            new_props)
 
     def delete_from_db(self, db_connection, type, obj_id):
         if type not in root_set:
@@ -473,3 +449,116 @@ class DAOList(dict):
             msg = "Invalid VisTrails serialized object %s" % str
             raise VistrailsDBException(msg)
             return None
+
+###############################################################################
+
+import unittest
+
+from vistrails.db.versions.v1_0_4.persistence.sql.sql_dao import SQLDAO
+
+
+class TestSQLPersistence(unittest.TestCase):
+    def setUp(self):
+        import os
+        import re
+        import sqlite3
+        from vistrails.db.services import io
+
+        self._old_db_lib = io._db_lib
+        io.set_db_lib(sqlite3)
+        self.db = sqlite3.connect(':memory:')
+        schema = os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                              'schemas', 'sql', 'vistrails.sql')
+        with open(schema) as fp:
+            script = fp.read()
+        script = re.sub(r'\s*engine=InnoDB', '', script)
+        script = script.replace('int not null auto_increment primary key',
+                                'integer primary key autoincrement')
+        self.db.executescript(script)
+
+    def tearDown(self):
+        from vistrails.db.services import io
+
+        self.db.close()
+        io.set_db_lib(self._old_db_lib)
+
+    def make_workflow(self, workflow_id, depth):
+        from vistrails.db.versions.v1_0_4.domain import DBModule
+        modules = [DBModule(id=1, name='Module%d' % depth,
+                            package='org.vistrails.vistrails.basic')]
+        workflow = DBWorkflow(id=workflow_id, name='depth %d' % depth,
+                              entity_type=DBWorkflow.vtType,
+                              modules=modules)
+        if depth > 0:
+            group = DBGroup(id=2, name='Group',
+                            workflow=self.make_workflow(workflow_id * 10,
+                                                        depth - 1))
+            workflow.db_add_module(group)
+        return workflow
+
+    def test_nested_groups(self):
+        """Loads groups within groups with a query per table and level."""
+        dao_list = DAOList()
+        dao_list.save_to_db(self.db, self.make_workflow(1, 3))
+
+        statements = []
+        class Cursor(object):
+            def __init__(self, cursor):
+                self._cursor = cursor
+            def execute(self, statement, *args):
+                statements.append(statement)
+                return self._cursor.execute(statement, *args)
+            def __getattr__(self, name):
+                return getattr(self._cursor, name)
+        class Connection(object):
+            def cursor(_):
+                return Cursor(self.db.cursor())
+        workflow = dao_list.open_from_db(Connection(), DBWorkflow.vtType, 1)
+        # one SELECT for the workflow, then one per table for each depth
+        nb_tables = len([t for t in dao_list['sql']
+                         if t not in root_set]) + 1
+        self.assertEqual(len(statements), 1 + 4 * nb_tables)
+
+        for depth in xrange(3, -1, -1):
+            self.assertEqual(workflow.db_name, 'depth %d' % depth)
+            self.assertFalse(workflow.is_dirty)
+            modules = dict((m.db_id, m) for m in workflow.db_modules)
+            self.assertEqual(modules[1].db_name, 'Module%d' % depth)
+            if depth > 0:
+                self.assertEqual(sorted(modules), [1, 2])
+                workflow = modules[2].db_workflow
+            else:
+                self.assertEqual(sorted(modules), [1])
+
+    def test_incremental_save(self):
+        """Saving again only writes the objects that changed."""
+        from vistrails.db.versions.v1_0_4.domain import DBModule
+
+        dao_list = DAOList()
+        workflow = self.make_workflow(1, 1)
+        dao_list.save_to_db(self.db, workflow)
+        self.assertFalse(any(m.is_dirty or m.is_new
+                             for m in workflow.db_modules))
+
+        workflow.db_get_module_by_id(1).db_name = 'Renamed'
+        workflow.db_add_module(DBModule(id=3, name='Added',
+                                        package='org.vistrails.vistrails.basic'))
+        statements = []
+        old_execute_many = SQLDAO.executeSQLMany
+        def execute_many(dao, db, dbCommand, valuesList):
+            statements.append((dbCommand.split()[0], len(valuesList)))
+            return old_execute_many(dao, db, dbCommand, valuesList)
+        SQLDAO.executeSQLMany = execute_many
+        try:
+            dao_list.save_to_db(self.db, workflow)
+        finally:
+            SQLDAO.executeSQLMany = old_execute_many
+        self.assertEqual(sorted(statements), [('INSERT', 1), ('UPDATE', 1)])
+
+        self.assertEqual(
+                sorted(self.db.execute("SELECT id, name FROM module WHERE "
+                                       "entity_id = 1").fetchall()),
+                [(1, 'Renamed'), (3, 'Added')])
+        loaded = dao_list.open_from_db(self.db, DBWorkflow.vtType, 1)
+        self.assertEqual(sorted(m.db_name for m in loaded.db_modules),
+                         ['Added', 'Group', 'Renamed'])
@@ -41,7 +41,7 @@ from datetime import date, datetime
 from vistrails.core import debug
 from vistrails.core.system import strftime, time_strptime
 from vistrails.db import VistrailsDBException
-from vistrails.db.services.io import get_db_lib
+from vistrails.db.services.io import format_prepared_statement, get_db_lib
 
 class SQLDAO:
     def __init__(self):
@@ -137,9 +137,16 @@ class SQLDAO:
         whereClause = ''
         values = []
         for column, value in whereMap.iteritems():
-            whereStr += '%s%s = %%s' % \
-                        (whereClause, column)
-            values.append(value)
+            if isinstance(value, (list, tuple)):
+                # select the rows matching any of the values
+                whereStr += '%s%s IN (%s)' % \
+                            (whereClause, column,
+                             ', '.join(['%s'] * len(value)))
+                values.extend(value)
+            else:
+                whereStr += '%s%s = %%s' % \
+                            (whereClause, column)
+                values.append(value)
             whereClause = ' AND '
         dbCommand = """SELECT %s FROM %s WHERE %s""" % \
                     (columnStr, table, whereStr)
@@ -206,7 +213,7 @@ class SQLDAO:
         data = None
         cursor = db.cursor()
         try:
-            cursor.execute(dbCommand, values)
+            cursor.execute(format_prepared_statement(dbCommand), values)
             if isFetch:
                 data = cursor.fetchall()
             else:
@@ -218,10 +225,30 @@ class SQLDAO:
             cursor.close()
         return data
 
+    def executeSQLMany(self, db, dbCommand, valuesList):
+        """ Executes the same INSERT or UPDATE statement once for each
+            tuple of values, using the cursor's executemany()
+        """
+        cursor = db.cursor()
+        try:
+            cursor.executemany(format_prepared_statement(dbCommand),
+                               valuesList)
+        except Exception, e:
+            raise VistrailsDBException('Command "%s" with %d sets of values '
+                                       'failed: %s' % (dbCommand,
+                                                       len(valuesList), e))
+        finally:
+            cursor.close()
+
     def executeSQLGroup(self, db, dbCommandList, isFetch):
         """ Executes a command consisting of multiple SELECT statements
             It returns a list of results from the SELECT statements
         """
+        if not hasattr(db, 'escape'):
+            # Only MySQLdb can send several statements at once; execute
+            # them one after the other on other database libraries
+            return [self.executeSQL(db, cmd_tuple, isFetch)
+                    for cmd_tuple in dbCommandList]
         data = []
         # break up into bundles
         BUNDLE_SIZE = 10000
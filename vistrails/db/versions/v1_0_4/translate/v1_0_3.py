@@ -48,7 +48,8 @@ from vistrails.db.versions.v1_0_4.domain import DBVistrail, DBVistrailVariable,
                                       DBConfigInt, DBConfigFloat, \
                                       DBConfiguration, DBStartupPackage, \
                                       DBLoopIteration, DBLoopExec, \
-                                      DBModuleExec, DBGroupExec
+                                      DBModuleExec, DBGroupExec, \
+                                      DBMashuptrail
 
 from vistrails.db.services.vistrail import materializeWorkflow
 from xml.dom.minidom import parseString
@@ -186,6 +187,11 @@ def translateRegistry(_registry):
     registry.db_version = '1.0.4'
     return registry
 
+def translateMashuptrail(_mashuptrail):
+    mashuptrail = DBMashuptrail.update_version(_mashuptrail, {})
+    mashuptrail.db_version = '1.0.4'
+    return mashuptrail
+
 def translateStartup(_startup):
     # format is {<old_name>: <new_name>} or
     # {<old_name>: (<new_name> | None, [conversion_f | None, inner_d | None])
@@ -42,7 +42,7 @@ from vistrails.core import debug
 from vistrails.core.configuration import get_vistrails_configuration, \
     get_vistrails_persistent_configuration
 from vistrails.core.modules.vistrails_module import ModuleSuspended
-from vistrails.core.vistrail.job import module_name
+from vistrails.core.vistrail.job import get_job_watcher, module_name
 from vistrails.gui import theme
 from vistrails.gui.common_widgets import QDockPushButton
 from vistrails.gui.vistrails_palette import QVistrailsPaletteInterface
@@ -134,12 +134,16 @@ class QJobTree(QtGui.QTreeWidget):
             menu.exec_(event.globalPos())
 
 class QJobView(QtGui.QWidget, QVistrailsPaletteInterface):
+    # emitted from the JobWatcher thread with a QVistrailItem and job ids
+    jobs_ready = QtCore.pyqtSignal(object, object)
+
     def __init__(self, parent=None):
         QtGui.QWidget.__init__(self, parent)
 
         self.timer_id = None
         self.updating_now = False
         self.widgets = {}
+        self.jobs_ready.connect(self.check_ready_jobs)
 
         self.layout = QtGui.QVBoxLayout()
 
@@ -150,7 +154,7 @@ class QJobView(QtGui.QWidget, QVistrailsPaletteInterface):
         buttonsLayout.addWidget(run_now)
         run_all = QDockPushButton("Check all")
         run_all.setToolTip("Check all jobs now")
-        run_all.clicked.connect(self.timerEvent)
+        run_all.clicked.connect(lambda: self.check_jobs())
         buttonsLayout.addWidget(run_all)
         label = QtGui.QLabel('Refresh interval (seconds):')
         buttonsLayout.addWidget(label)
@@ -234,13 +238,16 @@ class QJobView(QtGui.QWidget, QVistrailsPaletteInterface):
                 self.timer_id = None
         get_vistrails_configuration().jobCheckInterval = refresh
         get_vistrails_persistent_configuration().jobCheckInterval = refresh
+        get_job_watcher().wakeup()
         self.updating_now = False
 
-    def update_job(self, job, force=True):
+    def update_job(self, job, force=True, poll=True):
         """ Checks specified job
 
             force: bool - True means we should ask user to resume jobs
             that has been paused
+            poll: bool - True means the handles are checked now, else the
+            status found by the JobWatcher is used
         """
         if isinstance(job, QJobItem):
             vistrail_item = job.vistrail()
@@ -251,7 +258,7 @@ class QJobView(QtGui.QWidget, QVistrailsPaletteInterface):
             job = None
         else:
             for workflow_item in job.workflowItems.values():
-                self.update_job(workflow_item, force)
+                self.update_job(workflow_item, force, poll)
             return
         jm = vistrail_item.jobMonitor
         workflow = workflow_item.workflow
@@ -292,16 +299,16 @@ class QJobView(QtGui.QWidget, QVistrailsPaletteInterface):
             return
 
         job_items = workflow_item.jobs.values() if job is None else [job]
-        for job_item in job_items:
-            if job_item.job.finished or job_item.job.ready:
-                continue
-            try:
-                # call monitor
-                if jm.isDone(job_item.handle):
-                    job_item.job.ready = True
-            except Exception, e:
-                debug.critical("Error checking job %s: %s" %
-                               (workflow_item.text(0), e))
+        if poll:
+            # jobs on the same queue are checked at once
+            handles = dict((job_item.job.id, job_item.handle)
+                           for job_item in job_items
+                           if job_item.handle and
+                              not (job_item.job.finished or
+                                   job_item.job.ready))
+            for job_id in jm.checkHandles(handles):
+                workflow_item.jobs[job_id].job.ready = True
+                jm.unwatchJob(job_id)
         if workflow_item.updateJobs():
             QJobView.instance().set_visible(True)
 
@@ -324,9 +331,8 @@ class QJobView(QtGui.QWidget, QVistrailsPaletteInterface):
                         QtGui.QMessageBox.Ok)
                 return
             if self.autorun.isChecked():
-                jm.startWorkflow(workflow)
                 self.updating_now = False
-                workflow_item.execute()
+                workflow_item.execute_ready()
                 self.updating_now = True
                 return
             ret = QtGui.QMessageBox.information(self, "Job Ready",
@@ -334,12 +340,17 @@ class QJobView(QtGui.QWidget, QVistrailsPaletteInterface):
                     'continue execution now?' % workflow_item.text(0),
                     QtGui.QMessageBox.Ok, QtGui.QMessageBox.Cancel)
             if ret == QtGui.QMessageBox.Ok:
-                jm.startWorkflow(workflow)
                 self.updating_now = False
-                workflow_item.execute()
+                workflow_item.execute_ready()
                 self.updating_now = True
+        elif self.autorun.isChecked() and any(job_item.job.ready
+                                              for job_item in job_items):
+            # resume the parts of the pipeline whose jobs completed
+            self.updating_now = False
+            workflow_item.execute_ready()
+            self.updating_now = True
 
-    def check_jobs(self, job=None):
+    def check_jobs(self, job=None, poll=True):
         if self.updating_now:
             return
         self.updating_now = True
@@ -347,9 +358,25 @@ class QJobView(QtGui.QWidget, QVistrailsPaletteInterface):
             if job is None:
                 for i in xrange(self.jobView.topLevelItemCount()):
                     vistrail_item = self.jobView.topLevelItem(i)
-                    self.update_job(vistrail_item, force=False)
+                    self.update_job(vistrail_item, force=False, poll=poll)
             else:
-                self.update_job(job)
+                self.update_job(job, poll=poll)
+        finally:
+            self.updating_now = False
+
+    def check_ready_jobs(self, vistrail_item, ids):
+        """Jobs reported done by the JobWatcher.
+        """
+        if (self.updating_now or
+                self.jobView.indexOfTopLevelItem(vistrail_item) == -1):
+            # the timer will see them later
+            return
+        self.updating_now = True
+        try:
+            ids = set(ids)
+            for workflow_item in vistrail_item.workflowItems.values():
+                if ids.intersection(workflow_item.jobs):
+                    self.update_job(workflow_item, force=False, poll=False)
         finally:
             self.updating_now = False
 
@@ -360,7 +387,9 @@ class QJobView(QtGui.QWidget, QVistrailsPaletteInterface):
         self.check_jobs(items[0])
 
     def timerEvent(self, id=None):
-        self.check_jobs()
+        # handles are polled by the JobWatcher, this only looks for
+        # workflows that need to be executed to get them
+        self.check_jobs(poll=False)
 
     def keyPressEvent(self, event):
         if event.key() in [QtCore.Qt.Key_Delete, QtCore.Qt.Key_Backspace]:
@@ -464,6 +493,11 @@ class QVistrailItem(QtGui.QTreeWidgetItem):
         """Empty callback.
         """
 
+    def jobsReady(self, ids):
+        """Callback from the JobWatcher thread, passed on to the GUI thread.
+        """
+        QJobView.instance().jobs_ready.emit(self, ids)
+
     def addJob(self, job):
         """ addJob(self, job: job.Module) -> None
         Callback, adds or updates a job in the interface.
@@ -710,6 +744,25 @@ class QWorkflowItem(QtGui.QTreeWidgetItem):
             return
         self.goto().execute()
 
+    def execute_ready(self):
+        """ Shows this pipeline and executes the parts of it whose jobs
+            completed, without checking the jobs that are still running
+        """
+        try:
+            int(self.workflow.version)
+        except ValueError:
+            # this is not a pipeline id
+            return
+        view = self.goto()
+        controller = view.controller
+        sinks = controller.jobMonitor.resumeWorkflow(
+                self.workflow, controller.current_pipeline)
+        if not sinks:
+            return
+        controller.execute_user_workflow(reason='Resume Jobs', sinks=sinks)
+        from vistrails.gui.vistrails_window import _app
+        _app.notify('execution_updated')
+
     def pause(self):
         self.paused = True
         self.setIcon(1, theme.get_current_theme().JOB_SCHEDULED)
@@ -105,6 +105,17 @@ class QModuleOptions(QtGui.QDialog, QVistrailsPaletteInterface):
         self.portCombiner = QPortCombineTreeWidget()
         self.layout().addWidget(self.portCombiner)
         self.portCombiner.setVisible(False)
+
+        layout = QtGui.QHBoxLayout()
+        layout.addWidget(QtGui.QLabel("Parallel iterations:"))
+        layout.setStretch(0, 0)
+        self.workersEdit = QtGui.QLineEdit()
+        self.workersEdit.setValidator(QtGui.QIntValidator(1, 1024, self))
+        self.workersEdit.setToolTip('Number of list iterations to execute at '
+                                    'the same time (default=1)')
+        layout.addWidget(self.workersEdit)
+        layout.setStretch(1, 1)
+        self.layout().addLayout(layout)
         
         whileLayout = QtGui.QVBoxLayout()
 
@@ -204,6 +215,7 @@ class QModuleOptions(QtGui.QDialog, QVistrailsPaletteInterface):
         self.whileButton.toggled.connect(self.stateChanged)
         self.whileButton.toggled.connect(self.whileToggled)
         self.condEdit.textChanged.connect(self.stateChanged)
+        self.workersEdit.textChanged.connect(self.stateChanged)
         self.maxEdit.textChanged.connect(self.stateChanged)
         self.delayEdit.textChanged.connect(self.stateChanged)
         self.feedInputEdit.textChanged.connect(self.stateChanged)
@@ -292,6 +304,7 @@ class QModuleOptions(QtGui.QDialog, QVistrailsPaletteInterface):
             self.pairwiseButton.setEnabled(False)
             self.cartesianButton.setEnabled(False)
             self.customButton.setEnabled(False)
+            self.workersEdit.setEnabled(False)
             self.whileButton.setEnabled(False)
             self.condEdit.setVisible(False)
             self.maxEdit.setVisible(False)
@@ -314,6 +327,8 @@ class QModuleOptions(QtGui.QDialog, QVistrailsPaletteInterface):
         self.cartesianButton.setEnabled(True)
         self.cartesianButton.setChecked(True)
         self.customButton.setEnabled(True)
+        self.workersEdit.setEnabled(True)
+        self.workersEdit.setText('')
 
         self.whileButton.setEnabled(True)
         self.whileButton.setChecked(False)
@@ -339,6 +354,9 @@ class QModuleOptions(QtGui.QDialog, QVistrailsPaletteInterface):
             self.portCombiner.setVisible(type not in ['pairwise', 'cartesian'])
             if type not in ['pairwise', 'cartesian']:
                 self.portCombiner.setValue(type)
+        if module.has_control_parameter_with_name(ModuleControlParam.LOOP_WORKERS_KEY):
+            workers = module.get_control_parameter_by_name(ModuleControlParam.LOOP_WORKERS_KEY).value
+            self.workersEdit.setText(workers)
         if module.has_control_parameter_with_name(ModuleControlParam.WHILE_COND_KEY) or \
            module.has_control_parameter_with_name(ModuleControlParam.WHILE_MAX_KEY):
             self.whileButton.setChecked(True)
@@ -373,6 +391,8 @@ class QModuleOptions(QtGui.QDialog, QVistrailsPaletteInterface):
         else:
             value = self.portCombiner.getValue()
         values.append((ModuleControlParam.LOOP_KEY, value))
+        values.append((ModuleControlParam.LOOP_WORKERS_KEY,
+                       self.workersEdit.text()))
         _while = self.whileButton.isChecked()
         values.append((ModuleControlParam.WHILE_COND_KEY,
                        _while and self.condEdit.text()))
@@ -146,39 +146,52 @@ def positionPipelines(sheetPrefix, sheetCount, rowCount, colCount,
     of sheetCount x rowCount x colCount cells
 
     """
-
-    # at this point, we know that we have the spreadsheet loaded
-    from vistrails.packages.spreadsheet.spreadsheet_execute import \
-        assignPipelineCellLocations
-
     modifiedPipelines = []
     pipelinePositions = []
     for pId in xrange(len(pipelines)):
-        root_pipeline = copy.copy(pipelines[pId])
-        col = pId % colCount
-        row = (pId // colCount) % rowCount
-        sheet = (pId // (colCount*rowCount)) % sheetCount
-
-        decodedCells = decodeConfiguration(root_pipeline, cells)
-        vRCount = (max(c[1] for c in decodedCells) + 1) if len(decodedCells) else 1
-        vCCount = (max(c[2] for c in decodedCells) + 1) if len(decodedCells) else 1
-        # still need to go through each separately
-        for (id_list, vRow, vCol) in decodedCells:
-            sheet_name = "%s %d" % (sheetPrefix, sheet)
-            min_row_count = rowCount * vRCount
-            min_col_count = colCount * vCCount
-            real_row = row*vRCount+vRow+1
-            real_col = col*vCCount+vCol+1
-            root_pipeline = \
-                assignPipelineCellLocations(root_pipeline, sheet_name,
-                                            real_row, real_col,
-                                            [id_list], min_row_count,
-                                            min_col_count)
-
+        root_pipeline, position = positionPipeline(sheetPrefix, sheetCount,
+                                                   rowCount, colCount, pId,
+                                                   pipelines[pId], cells)
         modifiedPipelines.append(root_pipeline)
-        pipelinePositions.append((row, col, sheet))
+        pipelinePositions.append(position)
     return modifiedPipelines, pipelinePositions
 
+def positionPipeline(sheetPrefix, sheetCount, rowCount, colCount, pId,
+                     pipeline, cells):
+    """ positionPipeline(sheetPrefix: str, sheetCount: int, rowCount: int,
+                         colCount: int, pId: int, pipeline: Pipeline,
+                         cells: List) -> (Pipeline, (int, int, int))
+    Apply the virtual cell location to pipeline pId in a parameter
+    exploration, and returns it with its (row, col, sheet) position
+
+    """
+
+    # at this point, we know that we have the spreadsheet loaded
+    from vistrails.packages.spreadsheet.spreadsheet_execute import \
+        assignPipelineCellLocations
+
+    root_pipeline = copy.copy(pipeline)
+    col = pId % colCount
+    row = (pId // colCount) % rowCount
+    sheet = (pId // (colCount*rowCount)) % sheetCount
+
+    decodedCells = decodeConfiguration(root_pipeline, cells)
+    vRCount = (max(c[1] for c in decodedCells) + 1) if len(decodedCells) else 1
+    vCCount = (max(c[2] for c in decodedCells) + 1) if len(decodedCells) else 1
+    # still need to go through each separately
+    for (id_list, vRow, vCol) in decodedCells:
+        sheet_name = "%s %d" % (sheetPrefix, sheet)
+        min_row_count = rowCount * vRCount
+        min_col_count = colCount * vCCount
+        real_row = row*vRCount+vRow+1
+        real_col = col*vCCount+vCol+1
+        root_pipeline = \
+            assignPipelineCellLocations(root_pipeline, sheet_name,
+                                        real_row, real_col,
+                                        [id_list], min_row_count,
+                                        min_col_count)
+    return root_pipeline, (row, col, sheet)
+
 def assembleThumbnails(images, name, background='#000000'):
     """ assembleThumbnails(images {(sheet, row, col):filename}, name: 'str',
                            background: str)"""
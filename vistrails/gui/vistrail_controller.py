@@ -51,11 +51,15 @@ import vistrails.core.db.action
 from vistrails.core.interpreter.default import get_default_interpreter
 from vistrails.core.vistrail.job import Workflow as JobWorkflow
 from vistrails.core.layout.version_tree_layout import VistrailsTreeLayoutLW
+from vistrails.core.log.controller import DummyLogController, LogController
+from vistrails.core.log.log import Log
+from vistrails.core.log.workflow_exec import WorkflowExec
 from vistrails.core.log.opm_graph import OpmGraph
 from vistrails.core.log.prov_document import ProvDocument
 from vistrails.core.modules.abstraction import identifier as abstraction_pkg
 from vistrails.core.modules.module_registry import get_module_registry
-from vistrails.core.param_explore import ActionBasedParameterExploration
+from vistrails.core.param_explore import ActionBasedParameterExploration, \
+    can_run_parallel, iter_parallel_points
 from vistrails.core.query.version import TrueSearch
 from vistrails.core.query.visual import VisualQuery
 from vistrails.core.utils import DummyView, VistrailsInternalError, InvalidPipeline
@@ -1255,29 +1259,31 @@ class VistrailController(QtCore.QObject, BaseController):
         if self.current_pipeline and actions:
             pe_log_id = uuid.uuid1()
             explorer = ActionBasedParameterExploration()
-            (pipelines, performedActions) = explorer.explore(
-                self.current_pipeline, actions, pre_actions)
             
             dim = [max(1, len(a)) for a in actions]
             if use_spreadsheet:
-                from vistrails.gui.paramexplore.virtual_cell import positionPipelines, assembleThumbnails
+                from vistrails.gui.paramexplore.virtual_cell import positionPipeline, assembleThumbnails
                 from vistrails.gui.paramexplore.pe_view import QParamExploreView
-                modifiedPipelines, pipelinePositions = positionPipelines(
-                    'PE#%d %s' % (QParamExploreView.explorationId, self.name),
-                    dim[2], dim[1], dim[0], pipelines, pe.layout, self)
+                sheetPrefix = 'PE#%d %s' % (QParamExploreView.explorationId,
+                                            self.name)
+                def placePipeline(pi, pipeline):
+                    return positionPipeline(sheetPrefix, dim[2], dim[1],
+                                            dim[0], pi, pipeline, pe.layout)
                 QParamExploreView.explorationId += 1
             else:
-                from vistrails.core.param_explore import _pipelinePositions
-                modifiedPipelines = pipelines
-                pipelinePositions = _pipelinePositions(
-                    dim[2], dim[1], dim[0], pipelines)
-
-            mCount = []
-            for p in modifiedPipelines:
-                if len(mCount)==0:
-                    mCount.append(0)
-                else:
-                    mCount.append(len(p.modules)+mCount[len(mCount)-1])
+                from vistrails.core.param_explore import _pipelinePosition
+                def placePipeline(pi, pipeline):
+                    return pipeline, _pipelinePosition(dim[2], dim[1],
+                                                       dim[0], pi)
+
+            # pipelines are built one at a time, and all have the same
+            # number of modules
+            pCount = explorer.count(actions)
+            mCount = len(placePipeline(0, self.current_pipeline)[0].modules)
+            workers = getattr(get_vistrails_configuration(),
+                              'parameterExplorationWorkers')
+            parallel = (workers > 1 and pCount > 1 and not use_spreadsheet and
+                        can_run_parallel())
 
             from vistrails.gui.job_monitor import QJobView
             jobView = QJobView.instance()
@@ -1291,7 +1297,7 @@ class VistrailController(QtCore.QObject, BaseController):
                 # Now execute the pipelines
 
                 if showProgress:
-                    totalProgress = sum([len(p.modules) for p in modifiedPipelines])
+                    totalProgress = pCount * mCount
                     self.progress = PEProgressDialog(self.vistrail_view, totalProgress)
                     self.progress.show()
 
@@ -1299,67 +1305,119 @@ class VistrailController(QtCore.QObject, BaseController):
 
                 images = {}
                 errors = []
-                for pi in xrange(len(modifiedPipelines)):
-                    if showProgress:
-                        self.progress.setValue(mCount[pi])
-                        QtCore.QCoreApplication.processEvents()
-                        if self.progress.wasCanceled():
-                            break
-                        def moduleExecuted(objId):
-                            if not self.progress.wasCanceled():
-                                self.progress.setValue(self.progress.value()+1)
-                                QtCore.QCoreApplication.processEvents()
+
+                def executeKwargs(pipelinePosition, performedActions):
                     if use_spreadsheet:
                         name = os.path.splitext(self.name)[0] + \
-                                             ("_%s_%s_%s" % pipelinePositions[pi])
+                                             ("_%s_%s_%s" % pipelinePosition)
                         extra_info['nameDumpCells'] = name
                         if 'pathDumpCells' in extra_info:
-                            images[pipelinePositions[pi]] = \
+                            images[pipelinePosition] = \
                                        os.path.join(extra_info['pathDumpCells'], name)
-                    pe_cell_id = (pe_log_id,) + pipelinePositions[pi]
+                    pe_cell_id = (pe_log_id,) + pipelinePosition
                     kwargs = {'locator': self.locator,
-                              'job_monitor': self.jobMonitor,
                               'current_version': self.current_version,
                               'reason': 'Parameter Exploration %s %s_%s_%s' % pe_cell_id,
-                              'logger': self.get_logger(),
-                              'actions': performedActions[pi],
+                              'actions': performedActions,
                               'extra_info': extra_info
                               }
-                    if view:
-                        kwargs['view'] = view
-                    if showProgress:
-                        kwargs['module_executed_hook'] = [moduleExecuted]
                     if self.get_vistrail_variables():
                         # remove vars used in pe
                         vars = dict([(v.uuid, v) for v in self.get_vistrail_variables()
                                 if v.uuid not in vistrail_vars])
                         kwargs['vistrail_variables'] = lambda x: vars.get(x, None)
+                    return kwargs
 
-                    # Create job
-                    # check if a job exist for this workflow
-                    job_id = 'Parameter Exploration %s %s %s_%s_%s' % ((self.current_version, pe.id) + pipelinePositions[pi])
-
-                    current_workflow = None
-                    for wf in self.jobMonitor.workflows.itervalues():
-                        if job_id == wf.version:
-                            current_workflow = wf
-                            self.jobMonitor.startWorkflow(wf)
-                            break
-                    if not current_workflow:
-                        current_workflow = JobWorkflow(job_id)
-                        self.jobMonitor.startWorkflow(current_workflow)
-                    try:
-                        result = interpreter.execute(modifiedPipelines[pi], **kwargs)
-                    finally:
-                        self.jobMonitor.finishWorkflow()
-
-                    for error in result.errors.itervalues():
+                def addErrors(pipelinePosition, pointErrors):
+                    for error in pointErrors:
                         if use_spreadsheet:
-                            pp = pipelinePositions[pi]
+                            pp = pipelinePosition
                             errors.append(((pp[1], pp[0], pp[2]), error))
                         else:
                             errors.append(((0,0,0), error))
 
+                if parallel:
+                    def executePoint(pi):
+                        # runs in a worker process, which logs the execution
+                        # in its own log
+                        pipeline, performedActions = explorer.explore_point(
+                            self.current_pipeline, actions, pre_actions, pi)
+                        pipeline, pipelinePosition = placePipeline(pi,
+                                                                   pipeline)
+                        kwargs = executeKwargs(pipelinePosition,
+                                               performedActions)
+                        log = Log()
+                        if self.logging_on():
+                            kwargs['logger'] = LogController(log)
+                        else:
+                            kwargs['logger'] = DummyLogController
+                        result = interpreter.execute(pipeline, **kwargs)
+                        wf_execs = [vistrails.core.db.io.serialize(wf_exec)
+                                    for wf_exec in log.workflow_execs]
+                        return (pipelinePosition,
+                                [str(error) for error in result.errors.itervalues()],
+                                wf_execs)
+
+                    order = explorer.explore_order(self.current_pipeline,
+                                                   actions, pre_actions)
+                    points = iter_parallel_points(executePoint, order,
+                                                  workers)
+                    for done, (pi, (pipelinePosition, pointErrors, wf_execs)) \
+                            in enumerate(points):
+                        for wf_exec in wf_execs:
+                            wf_exec = vistrails.core.db.io.unserialize(
+                                    wf_exec, WorkflowExec)
+                            self.log.add_workflow_exec_copy(wf_exec)
+                        addErrors(pipelinePosition, pointErrors)
+                        if showProgress:
+                            self.progress.setValue((done + 1) * mCount)
+                            QtCore.QCoreApplication.processEvents()
+                            if self.progress.wasCanceled():
+                                points.close()
+                                break
+                else:
+                    points = explorer.iter_explore(self.current_pipeline,
+                                                   actions, pre_actions)
+                    for done, (pi, pipeline, performedActions) in \
+                            enumerate(points):
+                        if showProgress:
+                            self.progress.setValue(done * mCount)
+                            QtCore.QCoreApplication.processEvents()
+                            if self.progress.wasCanceled():
+                                break
+                            def moduleExecuted(objId):
+                                if not self.progress.wasCanceled():
+                                    self.progress.setValue(self.progress.value()+1)
+                                    QtCore.QCoreApplication.processEvents()
+                        pipeline, pipelinePosition = placePipeline(pi, pipeline)
+                        kwargs = executeKwargs(pipelinePosition, performedActions)
+                        kwargs['job_monitor'] = self.jobMonitor
+                        kwargs['logger'] = self.get_logger()
+                        if view:
+                            kwargs['view'] = view
+                        if showProgress:
+                            kwargs['module_executed_hook'] = [moduleExecuted]
+
+                        # Create job
+                        # check if a job exist for this workflow
+                        job_id = 'Parameter Exploration %s %s %s_%s_%s' % ((self.current_version, pe.id) + pipelinePosition)
+
+                        current_workflow = None
+                        for wf in self.jobMonitor.workflows.itervalues():
+                            if job_id == wf.version:
+                                current_workflow = wf
+                                self.jobMonitor.startWorkflow(wf)
+                                break
+                        if not current_workflow:
+                            current_workflow = JobWorkflow(job_id)
+                            self.jobMonitor.startWorkflow(current_workflow)
+                        try:
+                            result = interpreter.execute(pipeline, **kwargs)
+                        finally:
+                            self.jobMonitor.finishWorkflow()
+
+                        addErrors(pipelinePosition, result.errors.itervalues())
+
             finally:
                 jobView.updating_now = False
                 if showProgress:
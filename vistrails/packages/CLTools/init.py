@@ -36,14 +36,19 @@
 
 from __future__ import division
 
+import copy
 import errno
 import json
+import multiprocessing
 import os
 import shutil
 import subprocess
 import sys
+import threading
+import time
 
-from vistrails.core.modules.vistrails_module import Module, ModuleError, IncompleteImplementation, new_module
+from vistrails.core.modules.vistrails_module import Concurrent, Module, \
+    ModuleError, IncompleteImplementation, new_module
 import vistrails.core.modules.module_registry
 from vistrails.core import debug
 from vistrails.core.packagemanager import get_package_manager
@@ -56,16 +61,49 @@ import identifiers
 cl_tools = {}
 
 
-class CLTools(Module):
+class CLTools(Concurrent, Module):
     """ CLTools is the base Module.
      We will create a SUDSWebService Module for each method published by 
      the web service.
 
     """
+    @classmethod
+    def max_concurrent(cls):
+        return _max_processes()
+
     def compute(self):
         raise IncompleteImplementation # pragma: no cover
 
 
+def _max_processes():
+    """Number of commands that may run at the same time.
+
+    This is the 'max_processes' configuration option, or the number of CPUs.
+    """
+    if configuration.check('max_processes'):
+        return max(1, configuration.max_processes)
+    try:
+        return multiprocessing.cpu_count()
+    except NotImplementedError: # pragma: no cover
+        return 1
+
+_process_slots = None
+_process_slots_lock = threading.Lock()
+
+def _get_process_slots():
+    """Semaphore bounding the number of commands running at the same time.
+
+    Modules run concurrently from the pipeline and from list iterations, so
+    this is what enforces the limit overall.
+    """
+    global _process_slots
+    limit = _max_processes()
+    with _process_slots_lock:
+        if _process_slots is None or _process_slots[0] != limit:
+            _process_slots = (limit, threading.BoundedSemaphore(limit))
+        return _process_slots[1]
+
+
 SUFFIX = '.clt'
 DEFAULTFILESUFFIX = '.cld'
 
@@ -85,6 +123,51 @@ def _eintr_retry_call(func, *args):
             raise
 
 
+FICLONE = 0x40049409 # from linux/fs.h
+
+
+def _reflink(src, dst):
+    """Makes dst a copy-on-write clone of src, if the filesystem allows it.
+
+    Returns True on success; this is only supported on Linux, by filesystems
+    such as Btrfs or XFS.
+    """
+    if not sys.platform.startswith('linux'):
+        return False
+    import fcntl
+    try:
+        with open(src, 'rb') as fsrc:
+            with open(dst, 'wb') as fdst:
+                fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+    except (IOError, OSError):
+        return False
+    return True
+
+
+def _copy_file(src, dst, hardlink=False):
+    """Copies src to dst, sharing the data with src when possible.
+
+    If hardlink is True, dst is made a hard link to src; this is only correct
+    if the tool replaces the file instead of modifying it in place.
+    Otherwise, a copy-on-write clone is attempted before falling back to a
+    full copy.
+
+    Returns the method used: 'hardlink', 'reflink' or 'copy'.
+    """
+    if hardlink:
+        try:
+            os.remove(dst)
+            os.link(src, dst)
+        except OSError:
+            pass
+        else:
+            return 'hardlink'
+    if _reflink(src, dst):
+        return 'reflink'
+    shutil.copyfile(src, dst)
+    return 'copy'
+
+
 def _add_tool(path):
     # first create classes
     tool_name = os.path.basename(path)
@@ -113,6 +196,7 @@ def _add_tool(path):
         fail_with_cmd = 'options' in self.conf and 'fail_with_cmd' in self.conf['options']
         setOutput = [] # (name, File) - set File contents as output for name
         open_files = []
+        std_files = {} # (stream name) -> file name, to count bytes
         stdin = None
         kwargs = {}
         for type, name, klass, options in self.conf['args']:
@@ -175,8 +259,9 @@ def _add_tool(path):
                 outfile = self.interpreter.filePool.create_file(
                         suffix=options.get('suffix', DEFAULTFILESUFFIX))
                 try:
-                    shutil.copyfile(value.name, outfile.name)
-                except IOError, e: # pragma: no cover
+                    _copy_file(value.name, outfile.name,
+                               options.get('hardlink', False))
+                except (IOError, OSError), e: # pragma: no cover
                     raise ModuleError(self,
                                       "Error copying file '%s': %s" %
                                       (value.name, debug.format_exception(e)))
@@ -191,13 +276,10 @@ def _add_tool(path):
             type = type.lower()
             if self.has_input(name):
                 value = self.get_input(name)
+                # files are always connected directly to the process
                 if "file" == type:
-                    if file_std:
-                        f = open(value.name, 'rb')
-                    else:
-                        f = open(value.name, 'rb')
-                        stdin = f.read()
-                        f.close()
+                    f = open(value.name, 'rb')
+                    std_files['stdin'] = value.name
                 elif "string" == type:
                     if file_std:
                         file = self.interpreter.filePool.create_file()
@@ -209,32 +291,17 @@ def _add_tool(path):
                         stdin = value
                 else: # pragma: no cover
                     raise ValueError
-                if file_std:
+                if stdin is None:
                     open_files.append(f)
                     kwargs['stdin'] = f.fileno()
                 else:
                     kwargs['stdin'] = subprocess.PIPE
-        if "stdout" in self.conf:
-            if file_std:
-                name, type, options = self.conf["stdout"]
-                type = type.lower()
-                file = self.interpreter.filePool.create_file(
-                        suffix=DEFAULTFILESUFFIX)
-                if "file" == type:
-                    self.set_output(name, file)
-                elif "string" == type:
-                    setOutput.append((name, file))
-                else: # pragma: no cover
-                    raise ValueError
-                f = open(file.name, 'wb')
-                open_files.append(f)
-                kwargs['stdout'] = f.fileno()
-            else:
-                kwargs['stdout'] = subprocess.PIPE
-        if "stderr" in self.conf:
-            if file_std:
-                name, type, options = self.conf["stderr"]
-                type = type.lower()
+        for std in ('stdout', 'stderr'):
+            if std not in self.conf:
+                continue
+            name, type, options = self.conf[std]
+            type = type.lower()
+            if file_std or "file" == type:
                 file = self.interpreter.filePool.create_file(
                         suffix=DEFAULTFILESUFFIX)
                 if "file" == type:
@@ -245,9 +312,10 @@ def _add_tool(path):
                     raise ValueError
                 f = open(file.name, 'wb')
                 open_files.append(f)
-                kwargs['stderr'] = f.fileno()
+                std_files[std] = file.name
+                kwargs[std] = f.fileno()
             else:
-                kwargs['stderr'] = subprocess.PIPE
+                kwargs[std] = subprocess.PIPE
 
         if fail_with_cmd:
             return_code = 0
@@ -311,18 +379,27 @@ def _add_tool(path):
         if 'dir' in self.conf:
             kwargs['cwd'] = self.conf['dir']
 
-        process = subprocess.Popen(args, **kwargs)
-        if file_std:
-            process.wait()
-        else:
-            #if stdin:
-            #    print "stdin:", len(stdin), stdin[:30]
+        with _get_process_slots():
+            start = time.time()
+            process = subprocess.Popen(args, **kwargs)
+            # only strings go through pipes, files are connected directly
             stdout, stderr = _eintr_retry_call(process.communicate, stdin)
-            #stdout, stderr = process.communicate(stdin)
-            #if stdout:
-            #    print "stdout:", len(stdout), stdout[:30]
-            #if stderr:
-            #    print "stderr:", len(stderr), stderr[:30]
+            elapsed = time.time() - start
+
+        for f in open_files:
+            f.close()
+
+        # write timing and byte counts to execution provenance
+        counters = {'execution_time': '%.3f' % elapsed}
+        for std, data in (('stdin', stdin),
+                          ('stdout', stdout),
+                          ('stderr', stderr)):
+            if data is not None:
+                counters['%s_bytes' % std] = str(len(data))
+            elif std in std_files:
+                counters['%s_bytes' % std] = str(
+                        os.path.getsize(std_files[std]))
+        self.annotate(counters)
 
         if return_code is not None:
             if process.returncode != return_code:
@@ -330,43 +407,15 @@ def _add_tool(path):
                                   process.returncode, return_code))
         self.set_output('return_code', process.returncode)
 
-        for f in open_files:
-            f.close()
-
         for name, file in setOutput:
             f = open(file.name, 'rb')
             self.set_output(name, f.read())
             f.close()
 
-        if not file_std:
-            if "stdout" in self.conf:
-                name, type, options = self.conf["stdout"]
-                type = type.lower()
-                if "file" == type:
-                    file = self.interpreter.filePool.create_file(
-                            suffix=DEFAULTFILESUFFIX)
-                    f = open(file.name, 'wb')
-                    f.write(stdout)
-                    f.close()
-                    self.set_output(name, file)
-                elif "string" == type:
-                    self.set_output(name, stdout)
-                else: # pragma: no cover
-                    raise ValueError
-            if "stderr" in self.conf:
-                name, type, options = self.conf["stderr"]
-                type = type.lower()
-                if "file" == type:
-                    file = self.interpreter.filePool.create_file(
-                            suffix=DEFAULTFILESUFFIX)
-                    f = open(file.name, 'wb')
-                    f.write(stderr)
-                    f.close()
-                    self.set_output(name, file)
-                elif "string" == type:
-                    self.set_output(name, stderr)
-                else: # pragma: no cover
-                    raise ValueError
+        if stdout is not None:
+            self.set_output(self.conf["stdout"][0], stdout)
+        if stderr is not None:
+            self.set_output(self.conf["stderr"][0], stderr)
 
 
     # create docstring
@@ -531,6 +580,7 @@ def callContextMenu(name):
 ###############################################################################
 
 import unittest
+from vistrails.core.configuration import get_vistrails_configuration
 from vistrails.tests.utils import execute, intercept_results
 
 
@@ -586,3 +636,119 @@ class TestCLTools(unittest.TestCase):
         """With std_using_files: use files instead of pipes.
         """
         self.do_the_test('intern_cltools_2')
+
+    def test_file_streams(self):
+        """Connects files to stdin and stdout, and copies inputoutput files.
+        """
+        import tempfile
+        fd, f_io = tempfile.mkstemp(suffix='.cltest')
+        os.close(fd)
+        try:
+            with open(f_io, 'wb') as fp:
+                fp.write('original')
+            with intercept_results(
+                    self._tools['intern_cltools_3'],
+                    'return_code', 'stdout', 'stderr', 'f_io') as (
+                    return_code, stdout, stderr, f_io_out):
+                self.assertFalse(execute([
+                        ('intern_cltools_3', 'org.vistrails.vistrails.cltools', [
+                            ('stdin', [('File',
+                                        self.testdir + '/test_1.cltest')]),
+                            ('f_io', [('File', f_io)]),
+                        ]),
+                    ]))
+            self.assertEqual(return_code, [0])
+            self.assertEqual(stderr, ['done'])
+            with open(stdout[0].name, 'rb') as fp:
+                self.assertEqual(fp.read(), 'THIS IS A\nTEST')
+            with open(f_io_out[0].name, 'rb') as fp:
+                self.assertEqual(fp.read(), 'original\nmodified')
+            with open(f_io, 'rb') as fp:
+                self.assertEqual(fp.read(), 'original')
+        finally:
+            os.remove(f_io)
+
+    def run_rendezvous(self, max_processes, count):
+        """Runs two commands that each wait for `count` of them to start.
+
+        Returns the (start, end) times they recorded, sorted.
+        """
+        global configuration
+        import tempfile
+        old_configuration = configuration
+        configuration = copy.copy(configuration)
+        configuration.max_processes = max_processes
+        directory = tempfile.mkdtemp(prefix='vt_cltools_')
+        try:
+            with intercept_results(self._tools['intern_cltools_4'],
+                                   'return_code') as (return_code,):
+                self.assertFalse(execute([
+                        ('intern_cltools_4', 'org.vistrails.vistrails.cltools', [
+                            ('directory', [('String', directory)]),
+                            ('count', [('Integer', str(count))]),
+                        ]),
+                        ('intern_cltools_4', 'org.vistrails.vistrails.cltools', [
+                            ('directory', [('String', directory)]),
+                            ('count', [('Integer', str(count))]),
+                        ]),
+                    ]))
+            self.assertEqual(return_code, [0, 0])
+            times = []
+            for name in os.listdir(directory):
+                if name.endswith('.start'):
+                    name = os.path.join(directory, name[:-6])
+                    with open(name + '.start') as fp:
+                        start = float(fp.read())
+                    with open(name + '.end') as fp:
+                        end = float(fp.read())
+                    times.append((start, end))
+            return sorted(times)
+        finally:
+            configuration = old_configuration
+            shutil.rmtree(directory)
+
+    def test_concurrent(self):
+        """Independent commands run at the same time, up to max_processes.
+        """
+        # Each command waits for the other to start
+        times = self.run_rendezvous(2, 2)
+        self.assertLess(max(s for s, e in times), min(e for s, e in times))
+        # The second command starts after the first one exits
+        times = self.run_rendezvous(1, 1)
+        self.assertEqual(len(times), 2)
+        self.assertLessEqual(times[0][1], times[1][0])
+
+        # Same if concurrent modules are turned off
+        conf = get_vistrails_configuration()
+        old_concurrent = conf.concurrentModules
+        conf.concurrentModules = False
+        try:
+            times = self.run_rendezvous(2, 1)
+        finally:
+            conf.concurrentModules = old_concurrent
+        self.assertLessEqual(times[0][1], times[1][0])
+
+
+class TestCopyFile(unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        self.directory = tempfile.mkdtemp(prefix='vt_cltools_')
+        self.src = os.path.join(self.directory, 'src')
+        self.dst = os.path.join(self.directory, 'dst')
+        with open(self.src, 'wb') as fp:
+            fp.write('some content')
+        open(self.dst, 'wb').close()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_copy(self):
+        self.assertIn(_copy_file(self.src, self.dst), ('reflink', 'copy'))
+        with open(self.dst, 'rb') as fp:
+            self.assertEqual(fp.read(), 'some content')
+        self.assertFalse(os.path.samefile(self.src, self.dst))
+
+    @unittest.skipUnless(hasattr(os, 'link'), "No hard links on this system")
+    def test_hardlink(self):
+        self.assertEqual(_copy_file(self.src, self.dst, True), 'hardlink')
+        self.assertTrue(os.path.samefile(self.src, self.dst))
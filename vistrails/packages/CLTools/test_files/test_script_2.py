@@ -0,0 +1,24 @@
+# pragma: no testimport
+
+from __future__ import division
+
+import sys
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+
+    if len(args) != 1:
+        sys.stderr.write("Wrong number of parameters\n")
+        sys.exit(1)
+
+    stdin = getattr(sys.stdin, 'buffer', sys.stdin)
+    stdout = getattr(sys.stdout, 'buffer', sys.stdout)
+    stdout.write(stdin.read().upper())
+
+    with open(args[0], 'ab') as fp:
+        fp.write(b'\nmodified')
+
+    sys.stderr.write("done")
+
+    sys.exit(0)
@@ -0,0 +1,33 @@
+# pragma: no testimport
+
+from __future__ import division
+
+import os
+import sys
+import time
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+
+    if len(args) != 2:
+        sys.stderr.write("Wrong number of parameters\n")
+        sys.exit(1)
+
+    directory, count = args[0], int(args[1])
+    name = os.path.join(directory, '%d' % os.getpid())
+
+    # Wait until `count` commands have started
+    with open(name + '.start', 'w') as fp:
+        fp.write(repr(time.time()))
+    deadline = time.time() + 30
+    while sum(1 for f in os.listdir(directory)
+              if f.endswith('.start')) < count:
+        if time.time() > deadline:
+            sys.stderr.write("Timed out waiting for other commands\n")
+            sys.exit(1)
+        time.sleep(0.01)
+    with open(name + '.end', 'w') as fp:
+        fp.write(repr(time.time()))
+
+    sys.exit(0)
@@ -954,6 +954,20 @@ class QArgWidget(QtGui.QWidget):
         layout2.addWidget(self.suffixLabel)
         layout2.addWidget(self.suffix)
 
+        # inputoutput's can use a hard link instead of a copy
+        self.hardlink = QtGui.QCheckBox()
+        self.hardlink.setChecked(bool(self.options.get('hardlink', False)))
+        self.hardlinkLabel = QtGui.QLabel('Hard link:')
+        tt = ('Pass a hard link to the input file instead of a copy. Only '
+              'check this if the command replaces the file instead of '
+              'modifying it')
+        self.hardlinkLabel.setToolTip(tt)
+        self.hardlink.setToolTip(tt)
+        layout2.addWidget(self.hardlinkLabel)
+        layout2.addWidget(self.hardlink)
+        self.hardlinkLabel.setVisible(False)
+        self.hardlink.setVisible(False)
+
         self.typeChanged()
         self.klassChanged()
 
@@ -997,6 +1011,8 @@ class QArgWidget(QtGui.QWidget):
         suffix = self.suffix.text()
         if (type == 'output' or type == 'inputoutput') and suffix:
             self.options['suffix'] = suffix
+        if type == 'inputoutput' and self.hardlink.isChecked():
+            self.options['hardlink'] = True
 
     def setValues(self):
         if self.argtype not in self.stdTypes:
@@ -1013,6 +1029,8 @@ class QArgWidget(QtGui.QWidget):
         type = self.argtype.lower()
         if type == 'output' or type == 'inputoutput':
             self.suffix.setText(self.options.get('suffix', ''))
+        if type == 'inputoutput':
+            self.hardlink.setChecked(bool(self.options.get('hardlink', False)))
         self.typeChanged()
         self.klassChanged()
 
@@ -1059,6 +1077,8 @@ class QArgWidget(QtGui.QWidget):
             self.klassList.setCurrentIndex(self.klassDict.get(self.klass, 0))
         self.suffixLabel.setVisible(type == 'output' or type == 'inputoutput')
         self.suffix.setVisible(type == 'output' or type == 'inputoutput')
+        self.hardlinkLabel.setVisible(type == 'inputoutput')
+        self.hardlink.setVisible(type == 'inputoutput')
 
     def guess(self, name, count=0):
         """ add argument by guessing what the arg might be """
@@ -38,9 +38,14 @@ from __future__ import division
 
 from vistrails.core.modules.vistrails_module import Module
 from vistrails.core.modules.module_registry import get_module_registry
-from vistrails.core.modules.basic_modules import List, String
+from vistrails.core.modules.basic_modules import Integer, List, String
 
-from engine_manager import EngineManager
+try:
+    from engine_manager import EngineManager
+except ImportError:
+    # IPython is not available, only the local backend can be used
+    EngineManager = None
+from local import shutdown_local_pool
 from map import Map
 
 
@@ -52,14 +57,21 @@ def initialize(*args,**keywords):
     reg.add_input_port(Map, 'InputList', (List, ''))
     reg.add_input_port(Map, 'InputPort', (List, ''))
     reg.add_input_port(Map, 'OutputPort', (String, ''))
+    reg.add_input_port(Map, 'Backend', (String, ''), optional=True,
+                       entry_types=['enum'], values=[['ipython', 'local']])
+    reg.add_input_port(Map, 'Workers', (Integer, ''), optional=True)
     reg.add_output_port(Map, 'Result', (List, ''))
 
 
 def finalize():
-    EngineManager.cleanup()
+    shutdown_local_pool()
+    if EngineManager is not None:
+        EngineManager.cleanup()
 
 
 def menu_items():
+    if EngineManager is None:
+        return ()
     return (
             ("Start new engine processes",
              lambda: EngineManager.start_engines()),
@@ -0,0 +1,428 @@
+###############################################################################
+##
+## Copyright (C) 2014-2016, New York University.
+## Copyright (C) 2011-2014, NYU-Poly.
+## Copyright (C) 2006-2011, University of Utah.
+## All rights reserved.
+## Contact: contact@vistrails.org
+##
+## This file is part of VisTrails.
+##
+## "Redistribution and use in source and binary forms, with or without
+## modification, are permitted provided that the following conditions are met:
+##
+##  - Redistributions of source code must retain the above copyright notice,
+##    this list of conditions and the following disclaimer.
+##  - Redistributions in binary form must reproduce the above copyright
+##    notice, this list of conditions and the following disclaimer in the
+##    documentation and/or other materials provided with the distribution.
+##  - Neither the name of the New York University nor the names of its
+##    contributors may be used to endorse or promote products derived from
+##    this software without specific prior written permission.
+##
+## THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+## AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+## THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+## PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+## CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+## EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+## PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+## OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+## WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR
+## OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF
+## ADVISED OF THE POSSIBILITY OF SUCH DAMAGE."
+##
+###############################################################################
+
+"""Local process pool backend for the Map module.
+
+The IPython backend needs a running cluster, and builds a new controller for
+every element of the list. The LocalPool instead starts worker processes with
+multiprocessing; they are kept running between executions, so their packages
+stay loaded and their interpreter cache stays warm.
+
+The function module is only sent to a worker the first time that worker
+executes it; elements are then sent in chunks, as lists of input values.
+"""
+
+from __future__ import division
+
+import cPickle as pickle
+from itertools import izip
+import multiprocessing
+import Queue
+import traceback
+
+from vistrails.core.db.io import serialize, unserialize
+from vistrails.core.vistrail.module_function import ModuleFunction
+from vistrails.core.vistrail.module_param import ModuleParam
+from vistrails.core.vistrail.pipeline import Pipeline
+from vistrails.db.domain import IdScope
+import vistrails.db.versions
+
+try:
+    import hashlib
+    sha1_hash = hashlib.sha1
+except ImportError:
+    import sha
+    sha1_hash = sha.new
+
+
+###############################################################################
+
+def add_element_functions(module, input_ports, element):
+    """add_element_functions(module: Module, input_ports: list of str,
+                             element: tuple) -> None
+
+    Sets the values of an element of the input list on the input ports of
+    the module, by adding functions to it.
+    """
+    # getting highest id between functions to guarantee unique ids
+    if module.functions:
+        high_id = max(function.db_id for function in module.functions)
+    else:
+        high_id = 0
+
+    # TODO: 'pos' should not be always 0 here
+    id_scope = IdScope(beginId=long(high_id+1))
+    for value, input_port in izip(element, input_ports):
+        p_spec = module.get_port_spec(input_port, 'input')
+        type = p_spec.sigstring[1:-1]
+        descriptor, = p_spec.descriptors()
+
+        mod_function = ModuleFunction(
+                id=id_scope.getNewId(ModuleFunction.vtType),
+                pos=0,
+                name=input_port)
+        mod_param = ModuleParam(id=0L,
+                                pos=0,
+                                type=type,
+                                val=descriptor.module.translate_to_string(
+                                        value))
+        mod_function.add_parameter(mod_param)
+        module.add_function(mod_function)
+
+
+def execute_element(module, input_ports, element, output_port):
+    """execute_element(module: Module, input_ports: list of str,
+                       element: tuple, output_port: str) -> dict
+
+    Executes the module on one element, with the default interpreter (whose
+    cache is kept). Returns the same dictionary as map.execute_wf.
+    """
+    from vistrails.core.interpreter.default import get_default_interpreter
+    from vistrails.core.log.controller import LogController
+    from vistrails.core.log.log import Log
+    from vistrails.core.modules.vistrails_module import Module, ModuleError
+    from vistrails.core.utils import DummyView
+
+    module = module.do_copy()
+    add_element_functions(module, input_ports, element)
+    pipeline = Pipeline(version=vistrails.db.versions.currentVersion)
+    pipeline.add_module(module)
+
+    log = Log()
+    interpreter = get_default_interpreter()
+    result = interpreter.execute(pipeline,
+                                 view=DummyView(),
+                                 logger=LogController(log),
+                                 reason='Parallel Flow Local Execution')
+
+    # Build a list of errors
+    errors = []
+    for key, error in result.errors.iteritems():
+        errors.append('%s: %s' % (pipeline.modules[key].name, error))
+
+    # Get the execution log
+    try:
+        module_log = log.workflow_execs[0].item_execs[0]
+    except IndexError:
+        errors.append("Module log not found")
+        return dict(errors=errors)
+    machine = log.workflow_execs[0].machines[module_log.machine_id]
+
+    # Get the output value
+    output = None
+    if not result.errors:
+        # Might not be in result.executed if it came from the cache
+        executed_module = result.objects[module.id]
+        try:
+            output = executed_module.get_output(output_port)
+        except ModuleError:
+            errors.append("Output port not found: %s" % output_port)
+            return dict(errors=errors)
+        if isinstance(output, Module):
+            errors.append("Output value is a Module instance")
+            return dict(errors=errors)
+        try:
+            pickle.dumps(output, pickle.HIGHEST_PROTOCOL)
+        except Exception, e:
+            errors.append("Output value cannot be sent back: %s" % e)
+            return dict(errors=errors)
+
+    return dict(errors=errors,
+                output=output,
+                xml_log=serialize(module_log),
+                machine_log=serialize(machine))
+
+
+def worker_main(worker_id, tasks, results):
+    """Main loop of a worker process.
+
+    Tasks are (key, workflow, input_ports, output_port, chunk) tuples, where
+    workflow is None if this worker already received it under that key, and
+    chunk is a list of (index, element) pairs. None stops the worker.
+    """
+    from vistrails.core.application import get_vistrails_application, init
+
+    # Forked workers get the application of the parent process
+    if get_vistrails_application() is None:
+        init({'spawned': True, 'batch': True, 'singleInstance': False},
+             args=[])
+
+    modules = {}
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        key, workflow, input_ports, output_port, chunk = task
+        if workflow is not None:
+            modules[key] = unserialize(workflow, Pipeline).module_list[0]
+        module = modules[key]
+        chunk_results = []
+        for index, element in chunk:
+            try:
+                result = execute_element(module, input_ports, element,
+                                         output_port)
+            except Exception:
+                result = dict(errors=[traceback.format_exc()])
+            chunk_results.append((index, result))
+        results.put((worker_id, chunk_results))
+
+
+class LocalWorker(object):
+    def __init__(self, worker_id, results):
+        self.tasks = multiprocessing.Queue()
+        self.process = multiprocessing.Process(
+                target=worker_main,
+                args=(worker_id, self.tasks, results))
+        self.process.daemon = True
+        self.process.start()
+        self.workflows = set()  # keys of the workflows sent to this worker
+
+
+class LocalPool(object):
+    """A pool of VisTrails worker processes on the local machine.
+    """
+    def __init__(self, nb_workers):
+        self.nb_workers = max(1, nb_workers)
+        self._workers = []
+        self._results = None
+        self._packages = None
+
+    @staticmethod
+    def _enabled_packages():
+        from vistrails.core.modules.module_registry import get_module_registry
+        return frozenset(get_module_registry().packages)
+
+    def _ensure_workers(self):
+        packages = self._enabled_packages()
+        if self._workers and packages != self._packages:
+            # Workers would be missing the newly-enabled packages
+            self.shutdown()
+        if not self._workers:
+            self._results = multiprocessing.Queue()
+            self._packages = packages
+            self._workers = [LocalWorker(i, self._results)
+                             for i in xrange(self.nb_workers)]
+
+    def map(self, workflow, input_ports, output_port, elements,
+            chunk_size=None):
+        """map(workflow: str, input_ports: list of str, output_port: str,
+               elements: list of tuples, chunk_size: int) -> list of dict
+
+        Executes the serialized module once for each element, returning the
+        dictionaries built by execute_element() in the order of elements.
+        """
+        self._ensure_workers()
+        if chunk_size is None:
+            chunk_size = max(1, len(elements) // (self.nb_workers * 4))
+        key = sha1_hash(workflow).hexdigest()
+        indexed = list(enumerate(elements))
+        chunks = [indexed[i:i + chunk_size]
+                  for i in xrange(0, len(indexed), chunk_size)]
+        chunks.reverse()
+
+        results = [None] * len(elements)
+        busy = set()
+        def dispatch(worker_id):
+            worker = self._workers[worker_id]
+            if key in worker.workflows:
+                wf = None
+            else:
+                wf = workflow
+                worker.workflows.add(key)
+            worker.tasks.put((key, wf, input_ports, output_port,
+                              chunks.pop()))
+            busy.add(worker_id)
+
+        try:
+            for worker_id in xrange(len(self._workers)):
+                if not chunks:
+                    break
+                dispatch(worker_id)
+            while busy:
+                try:
+                    worker_id, chunk_results = self._results.get(True, 1.0)
+                except Queue.Empty:
+                    for worker_id in busy:
+                        if not self._workers[worker_id].process.is_alive():
+                            raise RuntimeError("Local worker process %d "
+                                               "died" % worker_id)
+                    continue
+                busy.discard(worker_id)
+                for index, result in chunk_results:
+                    results[index] = result
+                if chunks:
+                    dispatch(worker_id)
+        except:
+            # Don't leave workers with pending tasks around
+            self.shutdown()
+            raise
+        return results
+
+    def shutdown(self):
+        """shutdown() -> None
+
+        Stops the worker processes.
+        """
+        for worker in self._workers:
+            if worker.process.is_alive():
+                worker.tasks.put(None)
+        for worker in self._workers:
+            worker.process.join(5)
+            if worker.process.is_alive():
+                worker.process.terminate()
+        self._workers = []
+        self._results = None
+        self._packages = None
+
+
+_local_pool = None
+
+def get_local_pool(nb_workers=None):
+    """get_local_pool(nb_workers: int) -> LocalPool
+
+    Returns the pool of local workers, restarting it if a different number
+    of workers is requested (all the processors by default).
+    """
+    global _local_pool
+    if nb_workers is None:
+        nb_workers = multiprocessing.cpu_count()
+    if _local_pool is not None and _local_pool.nb_workers != nb_workers:
+        _local_pool.shutdown()
+        _local_pool = None
+    if _local_pool is None:
+        _local_pool = LocalPool(nb_workers)
+    return _local_pool
+
+def shutdown_local_pool():
+    global _local_pool
+    if _local_pool is not None:
+        _local_pool.shutdown()
+        _local_pool = None
+
+###############################################################################
+
+import unittest
+
+from vistrails.tests.utils import enable_package
+
+
+class TestLocalPool(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        enable_package('org.vistrails.vistrails.pythoncalc')
+
+    def make_workflow(self, op):
+        from vistrails.core.packagemanager import get_package_manager
+        from vistrails.core.vistrail.module import Module
+
+        identifier = 'org.vistrails.vistrails.pythoncalc'
+        pkg = get_package_manager().get_package(identifier)
+        functions = [
+                ModuleFunction(id=0L, name='value2', parameters=[
+                    ModuleParam(id=0L, pos=0, type='Float', val='2.0')]),
+                ModuleFunction(id=1L, name='op', parameters=[
+                    ModuleParam(id=1L, pos=0, type='String', val=op)])]
+        module = Module(id=0L, name='PythonCalc', package=identifier,
+                        version=pkg.version, functions=functions)
+        pipeline = Pipeline(version=vistrails.db.versions.currentVersion)
+        pipeline.add_module(module)
+        return serialize(pipeline)
+
+    def test_map(self):
+        pool = LocalPool(2)
+        try:
+            wf = self.make_workflow('*')
+            elements = [(1.0,), (2.0,), (3.0,), (4.0,), (5.0,)]
+            for i in xrange(2):
+                results = pool.map(wf, ['value1'], 'value', elements,
+                                   chunk_size=1)
+                self.assertEqual([r['errors'] for r in results], [[]] * 5)
+                self.assertEqual([r['output'] for r in results],
+                                 [2.0, 4.0, 6.0, 8.0, 10.0])
+            # The workflow was sent once to each worker
+            key = sha1_hash(wf).hexdigest()
+            for worker in pool._workers:
+                self.assertEqual(worker.workflows, set([key]))
+
+            results = pool.map(self.make_workflow('-'), ['value1'], 'value',
+                               elements)
+            self.assertEqual([r['output'] for r in results],
+                             [-1.0, 0.0, 1.0, 2.0, 3.0])
+        finally:
+            pool.shutdown()
+
+    def test_error(self):
+        pool = LocalPool(1)
+        try:
+            results = pool.map(self.make_workflow('%'), ['value1'], 'value',
+                               [(1.0,)])
+            self.assertEqual(len(results[0]['errors']), 1)
+            self.assertIsNone(results[0]['output'])
+
+            # The worker is still usable
+            results = pool.map(self.make_workflow('+'), ['value1'], 'value',
+                               [(1.0,)])
+            self.assertEqual(results[0]['output'], 3.0)
+        finally:
+            pool.shutdown()
+
+    def test_map_module(self):
+        """Runs the Map module with the local backend."""
+        from vistrails.tests.utils import execute, intercept_result
+        from .map import Map
+
+        enable_package('edu.poly.vistrails.parallel_flow')
+        try:
+            with intercept_result(Map, 'Result') as results:
+                self.assertFalse(execute([
+                        ('PythonCalc', 'org.vistrails.vistrails.pythoncalc', [
+                            ('value2', [('Float', '2.0')]),
+                            ('op', [('String', '*')]),
+                        ]),
+                        ('Map', 'edu.poly.vistrails.parallel_flow', [
+                            ('InputList', [('List', '[1.0, 2.0, 3.5]')]),
+                            ('InputPort', [('List', "['value1']")]),
+                            ('OutputPort', [('String', 'value')]),
+                            ('Backend', [('String', 'local')]),
+                            ('Workers', [('Integer', '2')]),
+                        ]),
+                    ],
+                    [
+                        (0, 'self', 1, 'FunctionPort'),
+                    ]))
+            self.assertEqual(results, [[2.0, 4.0, 7.0]])
+        finally:
+            shutdown_local_pool()
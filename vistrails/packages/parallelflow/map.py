@@ -52,24 +52,19 @@ from vistrails.core.modules.vistrails_module import Module, ModuleError, \
 from vistrails.core.vistrail.annotation import Annotation
 from vistrails.core.vistrail.controller import VistrailController
 from vistrails.core.vistrail.group import Group
-from vistrails.core.vistrail.module_function import ModuleFunction
-from vistrails.core.vistrail.module_param import ModuleParam
 from vistrails.core.vistrail.pipeline import Pipeline
 from vistrails.core.vistrail.vistrail import Vistrail
-from vistrails.db.domain import IdScope
 import vistrails.db.versions
 
 import copy
 import inspect
-from itertools import izip
 import os
 import re
 import sys
 import tempfile
 
-from IPython.parallel.error import CompositeError
-
 from .api import get_client
+from .local import add_element_functions, get_local_pool
 
 try:
     import hashlib
@@ -178,6 +173,14 @@ _ansi_code = re.compile(r'%s(?:(?:\[[^A-Za-z]*[A-Za-z])|[^\[])' % '\x1B')
 def strip_ansi_codes(s):
     return _ansi_code.sub('', s)
 
+def ipython_available():
+    try:
+        import IPython.parallel
+    except ImportError:
+        return False
+    else:
+        return True
+
 ###############################################################################
 # Map Operator
 #
@@ -187,6 +190,10 @@ class Map(Module):
     The FunctionPort should be connected to the 'self' output of the module you
     want to execute.
     The InputList is the list of values to be scattered on the engines.
+    If Backend is 'local', the values are scattered on worker processes on
+    this machine instead (Workers of them, one per processor by default), so
+    that no IPython cluster is needed. This is the default if IPython is not
+    installed.
     """
     def __init__(self):
         Module.__init__(self)
@@ -227,6 +234,86 @@ class Map(Module):
                                   e_msg)
                 for e_type, e_msg, tb, infos in e.elist)
 
+    def execute_ipython(self, module, workflows, nameOutput):
+        """
+        Executes the serialized workflows on IPython engines, returning the
+        dictionaries built by execute_wf.
+        """
+        from IPython.parallel.error import CompositeError
+
+        # IPython stuff
+        try:
+            rc = get_client()
+        except Exception, error:
+            raise ModuleError(self, "Exception while loading IPython: %s" %
+                              debug.format_exception(error))
+        if rc is None:
+            raise ModuleError(self, "Couldn't get an IPython connection")
+        engines = rc.ids
+        if not engines:
+            raise ModuleError(
+                    self,
+                    "Exception while loading IPython: No IPython engines "
+                    "detected!")
+
+        # initializes each engine
+        # importing modules and initializing the VisTrails application
+        # in the engines *only* in the first execution on this engine
+        uninitialized = []
+        for eng in engines:
+            try:
+                rc[eng]['init']
+            except Exception:
+                uninitialized.append(eng)
+        if uninitialized:
+            init_view = rc[uninitialized]
+            with init_view.sync_imports():
+                import tempfile
+                import inspect
+
+                # VisTrails API
+                import vistrails
+                import vistrails.core
+                import vistrails.core.db.action
+                import vistrails.core.application
+                import vistrails.core.modules.module_registry
+                from vistrails.core.db.io import serialize
+                from vistrails.core.vistrail.vistrail import Vistrail
+                from vistrails.core.vistrail.pipeline import Pipeline
+                from vistrails.core.db.locator import XMLFileLocator
+                from vistrails.core.vistrail.controller import VistrailController
+                from vistrails.core.interpreter.default import get_default_interpreter
+
+            # initializing a VisTrails application
+            try:
+                init_view.execute(
+                        'app = vistrails.core.application.init('
+                        '        {"spawned": True},'
+                        '        args=[])',
+                        block=True)
+            except CompositeError, e:
+                self.print_compositeerror(e)
+                raise ModuleError(self, "Error initializing application on "
+                                  "IPython engines:\n"
+                                  "%s" % self.list_exceptions(e))
+
+            init_view['init'] = True
+
+        # setting computing color
+        module.logging.set_computing(module)
+
+        # executing function in engines
+        # each map returns a dictionary
+        try:
+            ldview = rc.load_balanced_view()
+            map_result = ldview.map_sync(execute_wf, workflows, [nameOutput]*len(workflows))
+        except CompositeError, e:
+            self.print_compositeerror(e)
+            raise ModuleError(self, "Error from IPython engines:\n"
+                              "%s" % self.list_exceptions(e))
+
+        return map_result
+
     def updateFunctionPort(self):
         """
         Function to be used inside the updateUsptream method of the Map module. It
@@ -246,7 +333,14 @@ class Map(Module):
             element_is_iter = True
             inputList = rawInputList
 
+        backend = self.force_get_input('Backend', None)
+        if backend is None:
+            backend = 'ipython' if ipython_available() else 'local'
+        elif backend not in ('ipython', 'local'):
+            raise ModuleError(self, "Unknown backend %r" % backend)
+
         workflows = []
+        elements = []
         module = None
         vtType = None
 
@@ -272,6 +366,13 @@ class Map(Module):
                 self.typeChecking(connector.obj, nameInput, inputList)
                 self.setInputValues(connector.obj, nameInput, element, i)
 
+                if backend == 'local':
+                    # the workers set the values of each element on the
+                    # module themselves, it is only serialized once
+                    elements.append(tuple(element))
+                    if workflows:
+                        continue
+
                 pipeline_db_module = original_pipeline.modules[module_id].do_copy()
 
                 # transforming a subworkflow in a group
@@ -293,19 +394,7 @@ class Map(Module):
                     group.pipeline = pipeline_db_module.pipeline
                     pipeline_db_module = group
 
-                # getting highest id between functions to guarantee unique ids
-                # TODO: can get current IdScope here?
-                if pipeline_db_module.functions:
-                    high_id = max(function.db_id
-                                  for function in pipeline_db_module.functions)
-                else:
-                    high_id = 0
-
-                # adding function and parameter to module in pipeline
-                # TODO: 'pos' should not be always 0 here
-                id_scope = IdScope(beginId=long(high_id+1))
-                for elementValue, inputPort in izip(element, nameInput):
-
+                for inputPort in nameInput:
                     p_spec = pipeline_db_module.get_port_spec(inputPort, 'input')
                     descrs = p_spec.descriptors()
                     if len(descrs) != 1:
@@ -316,18 +405,11 @@ class Map(Module):
                         raise ModuleError(
                                 self,
                                 "Module inputs should be Constant types")
-                    type = p_spec.sigstring[1:-1]
 
-                    mod_function = ModuleFunction(id=id_scope.getNewId(ModuleFunction.vtType),
-                                                  pos=0,
-                                                  name=inputPort)
-                    mod_param = ModuleParam(id=0L,
-                                            pos=0,
-                                            type=type,
-                                            val=elementValue)
-
-                    mod_function.add_parameter(mod_param)
-                    pipeline_db_module.add_function(mod_function)
+                # adding function and parameter to module in pipeline
+                if backend != 'local':
+                    add_element_functions(pipeline_db_module, nameInput,
+                                          element)
 
                 # serializing module
                 wf = self.serialize_module(pipeline_db_module)
@@ -336,76 +418,22 @@ class Map(Module):
             # getting first connector, ignoring the rest
             break
 
-        # IPython stuff
-        try:
-            rc = get_client()
-        except Exception, error:
-            raise ModuleError(self, "Exception while loading IPython: %s" %
-                              debug.format_exception(error))
-        if rc is None:
-            raise ModuleError(self, "Couldn't get an IPython connection")
-        engines = rc.ids
-        if not engines:
-            raise ModuleError(
-                    self,
-                    "Exception while loading IPython: No IPython engines "
-                    "detected!")
-
-        # initializes each engine
-        # importing modules and initializing the VisTrails application
-        # in the engines *only* in the first execution on this engine
-        uninitialized = []
-        for eng in engines:
-            try:
-                rc[eng]['init']
-            except Exception:
-                uninitialized.append(eng)
-        if uninitialized:
-            init_view = rc[uninitialized]
-            with init_view.sync_imports():
-                import tempfile
-                import inspect
-
-                # VisTrails API
-                import vistrails
-                import vistrails.core
-                import vistrails.core.db.action
-                import vistrails.core.application
-                import vistrails.core.modules.module_registry
-                from vistrails.core.db.io import serialize
-                from vistrails.core.vistrail.vistrail import Vistrail
-                from vistrails.core.vistrail.pipeline import Pipeline
-                from vistrails.core.db.locator import XMLFileLocator
-                from vistrails.core.vistrail.controller import VistrailController
-                from vistrails.core.interpreter.default import get_default_interpreter
-
-            # initializing a VisTrails application
-            try:
-                init_view.execute(
-                        'app = vistrails.core.application.init('
-                        '        {"spawned": True},'
-                        '        args=[])',
-                        block=True)
-            except CompositeError, e:
-                self.print_compositeerror(e)
-                raise ModuleError(self, "Error initializing application on "
-                                  "IPython engines:\n"
-                                  "%s" % self.list_exceptions(e))
-
-            init_view['init'] = True
-
-        # setting computing color
-        module.logging.set_computing(module)
-
-        # executing function in engines
-        # each map returns a dictionary
-        try:
-            ldview = rc.load_balanced_view()
-            map_result = ldview.map_sync(execute_wf, workflows, [nameOutput]*len(workflows))
-        except CompositeError, e:
-            self.print_compositeerror(e)
-            raise ModuleError(self, "Error from IPython engines:\n"
-                              "%s" % self.list_exceptions(e))
+        if backend == 'local':
+            # setting computing color
+            module.logging.set_computing(module)
+
+            if elements:
+                pool = get_local_pool(self.force_get_input('Workers', None))
+                try:
+                    map_result = pool.map(workflows[0], nameInput,
+                                          nameOutput, elements)
+                except Exception, e:
+                    raise ModuleError(self, "Error from local workers: %s" %
+                                      debug.format_exception(e))
+            else:
+                map_result = []
+        else:
+            map_result = self.execute_ipython(module, workflows, nameOutput)
 
         # verifying errors
         errors = []
@@ -429,6 +457,10 @@ class Map(Module):
             self.result.append(output)
 
         # including execution logs
+        if getattr(self.logging.log, 'log', None) is None:
+            # execution is not being logged
+            return
+        machine_ids = {}
         for engine in range(len(map_result)):
             log = map_result[engine]['xml_log']
             exec_ = None
@@ -451,8 +483,13 @@ class Map(Module):
             exec_.annotations = annotations
 
             # before adding the execution log, we need to get the machine information
-            machine = unserialize(map_result[engine]['machine_log'], Machine)
-            machine_id = self.logging.add_machine(machine)
+            # (local workers all report the same machine)
+            machine_log = map_result[engine]['machine_log']
+            machine_id = machine_ids.get(machine_log)
+            if machine_id is None:
+                machine = unserialize(machine_log, Machine)
+                machine_id = self.logging.add_machine(machine)
+                machine_ids[machine_log] = machine_id
 
             # recursively add machine information to execution items
             def add_machine_recursive(exec_):
@@ -49,7 +49,7 @@ from vistrails.core.configuration import ConfigField, \
     get_vistrails_configuration
 from vistrails.core.modules.output_modules import OutputMode, OutputModeConfig
 from vistrails.core.modules.vistrails_module import Module, NotCacheable, \
-    ModuleError
+    NotThreadSafe, ModuleError
 
 from .spreadsheet_base import StandardSheetReference, \
     StandardSingleCellSheetReference
@@ -170,7 +170,7 @@ class CellLocation(Module):
         self.set_output('value', loc)
 
 
-class SpreadsheetCell(NotCacheable, Module):
+class SpreadsheetCell(NotCacheable, NotThreadSafe, Module):
     """
     SpreadsheetCell is a base class to other widget types. It provides
     a simple protocol to dispatch information to the spreadsheet
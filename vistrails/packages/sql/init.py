@@ -36,9 +36,11 @@
 
 from __future__ import division
 
+from itertools import izip
 from sqlalchemy.engine import create_engine
 from sqlalchemy.engine.url import URL
 from sqlalchemy.exc import SQLAlchemyError
+import threading
 import urllib
 
 from vistrails.core.db.action import create_action
@@ -53,11 +55,105 @@ from vistrails.core.utils import versions_increasing
 from vistrails.packages.tabledata.common import TableObject
 
 
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+def get_engine(url):
+    """Gets the engine for a database URL, creating it if needed.
+
+    Engines hold a pool of connections; they are shared by all the modules
+    connecting to the same database, and reused across executions.
+    """
+    key = str(url)
+    with _engines_lock:
+        try:
+            return _engines[key]
+        except KeyError:
+            engine = _engines[key] = create_engine(url)
+            return engine
+
+
+def dispose_engines():
+    """Closes the pooled connections of all engines, and forgets them.
+    """
+    with _engines_lock:
+        for engine in _engines.itervalues():
+            engine.dispose()
+        _engines.clear()
+
+
+def make_table(rows, keys):
+    """Builds a TableObject from a list of rows, column by column.
+    """
+    if rows:
+        columns = [list(column) for column in izip(*rows)]
+    else:
+        columns = [[] for key in keys]
+    return TableObject(columns, len(rows), keys)
+
+
+class ResultStream(object):
+    """Iterates on the rows of a query as tables of `batch_size` rows.
+
+    The transaction is committed once all the rows have been read. If the
+    stream is closed before that, explicitly or because it is no longer
+    referenced (for instance because a downstream module failed), the
+    results are closed and the transaction is rolled back.
+    """
+    def __init__(self, results, rows, batch_size, transaction):
+        self._results = results
+        self._keys = results.keys()
+        self._rows = rows
+        self._batch_size = batch_size
+        self._transaction = transaction
+
+    def __iter__(self):
+        return self
+
+    def next(self):
+        if self._results is None:
+            raise StopIteration
+        try:
+            if self._rows is None:
+                self._rows = self._results.fetchmany(self._batch_size)
+            rows, self._rows = self._rows, None
+        except:
+            self.close()
+            raise
+        if not rows:
+            self._finish(True)
+            raise StopIteration
+        return make_table(rows, self._keys)
+
+    def close(self):
+        if self._results is not None:
+            self._finish(False)
+
+    def __del__(self):
+        self.close()
+
+    def _finish(self, commit):
+        results, transaction = self._results, self._transaction
+        self._results = self._transaction = None
+        try:
+            results.close()
+        finally:
+            if commit:
+                transaction.commit()
+            else:
+                transaction.rollback()
+
+
 class DBConnection(Module):
     """Connects to a database.
 
     If the URI you enter uses a driver which is not currently installed,
     VisTrails will try to set it up.
+
+    The connection is checked out of a pool shared with the other modules
+    using the same database; it is returned to it when the module is removed
+    from the cache.
     """
     _input_ports = [('protocol', '(basic:String)'),
                     ('user', '(basic:String)',
@@ -71,6 +167,15 @@ class DBConnection(Module):
                     ('db_name', '(basic:String)')]
     _output_ports = [('connection', '(DBConnection)')]
 
+    _connection = None
+
+    def clear(self):
+        # Returns the connection to the engine's pool
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+        Module.clear(self)
+
     def compute(self):
         url = URL(drivername=self.get_input('protocol'),
                   username=self.force_get_input('user', None),
@@ -80,7 +185,7 @@ class DBConnection(Module):
                   database=self.get_input('db_name'))
 
         try:
-            engine = create_engine(url)
+            engine = get_engine(url)
         except ImportError, e:
             driver = url.drivername
             installed = False
@@ -122,7 +227,7 @@ class DBConnection(Module):
                 raise ModuleError(self,
                                   "Failed to install required driver")
             try:
-                engine = create_engine(url)
+                engine = get_engine(url)
             except Exception, e:
                 raise ModuleError(self,
                                   "Couldn't connect to the database: %s" %
@@ -135,22 +240,44 @@ class DBConnection(Module):
                     "SQLAlchemy has no support for protocol %r -- are you "
                     "sure you spelled that correctly?" % url.drivername)
 
-        self.set_output('connection', engine.connect())
+        self._connection = engine.connect()
+        self.set_output('connection', self._connection)
 
 
 class SQLSource(Module):
+    """Runs a SQL query on a database.
+
+    The rows are fetched in batches and stored column by column in the
+    `result` table. If `batch_size` is set, the query uses a server-side
+    cursor where the database supports it, and `result` is streamed to
+    downstream modules as tables of that many rows; `resultSet` is then not
+    set.
+    """
     _settings = ModuleSettings(configure_widget=
             'vistrails.packages.sql.widgets:SQLSourceConfigurationWidget')
     _input_ports = [('connection', '(DBConnection)'),
                     ('cacheResults', '(basic:Boolean)'),
-                    ('source', '(basic:String)')]
+                    ('source', '(basic:String)'),
+                    ('batch_size', '(basic:Integer)',
+                     {'optional': True})]
     _output_ports = [('connection', '(DBConnection)'),
                      ('result', '(org.vistrails.vistrails.tabledata:Table)'),
                      ('resultSet', '(basic:List)')]
 
+    FETCH_SIZE = 1024
+
+    _stream = None
+
     def is_cacheable(self):
         return False
 
+    def clear(self):
+        # Ends the transaction of a stream that was not read completely
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+        Module.clear(self)
+
     def compute(self):
         cached = False
         if self.has_input('cacheResults'):
@@ -158,15 +285,21 @@ class SQLSource(Module):
             self.is_cacheable = lambda: cached
         connection = self.get_input('connection')
         self.set_output('connection', connection)
+        batch_size = self.force_get_input('batch_size', None)
         inputs = dict((k, self.get_input(k)) for k in self.inputPorts.iterkeys()
-                  if k not in ('source', 'connection', 'cacheResults'))
+                  if k not in ('source', 'connection', 'cacheResults',
+                               'batch_size'))
         s = urllib.unquote(str(self.get_input('source')))
 
         try:
             transaction = connection.begin()
-            results = connection.execute(s, inputs)
+            if batch_size:
+                results = connection.execution_options(
+                        stream_results=True).execute(s, inputs)
+            else:
+                results = connection.execute(s, inputs)
             try:
-                rows = results.fetchall()
+                rows = results.fetchmany(batch_size or self.FETCH_SIZE)
             except Exception:
                 self.set_output('result', None)
                 self.set_output('resultSet', None)
@@ -174,17 +307,48 @@ class SQLSource(Module):
                 # results.returns_rows is True
                 # We don't use 'if return_rows' because this attribute didn't
                 # use to exist
-                table = TableObject.from_dicts(rows, results.keys())
-                self.set_output('result', table)
-                self.set_output('resultSet', rows)
+                if batch_size:
+                    self._stream = ResultStream(results, rows, batch_size,
+                                                transaction)
+                    self.set_streaming_output('result', self._stream)
+                    self.set_output('resultSet', None)
+                    return
+                elif 'resultSet' in self.outputPorts:
+                    # The port is connected, we need to keep the rows
+                    rows.extend(results.fetchall())
+                    self.set_output('result',
+                                    make_table(rows, results.keys()))
+                    self.set_output('resultSet', rows)
+                else:
+                    self.set_output('result',
+                                    self.fetch_table(results, rows))
             transaction.commit()
         except SQLAlchemyError, e:
             raise ModuleError(self, debug.format_exception(e))
 
+    def fetch_table(self, results, rows):
+        """Fetches the remaining rows, building the table's columns.
+
+        Only one batch of rows is held at a time.
+        """
+        keys = results.keys()
+        columns = [[] for key in keys]
+        nb_rows = 0
+        while rows:
+            for column, values in izip(columns, izip(*rows)):
+                column.extend(values)
+            nb_rows += len(rows)
+            rows = results.fetchmany(self.FETCH_SIZE)
+        return TableObject(columns, nb_rows, keys)
+
 
 _modules = [DBConnection, SQLSource]
 
 
+def finalize():
+    dispose_engines()
+
+
 def handle_module_upgrade_request(controller, module_id, pipeline):
     # Before 0.0.3, SQLSource's resultSet output was type ListOfElements (which
     #   doesn't exist anymore)
@@ -335,3 +499,160 @@ class TestSQL(unittest.TestCase):
                 os.remove(test_db)
             except OSError:
                 pass # Oops, we are leaking the file here...
+
+    def make_test_db(self, rows):
+        import os
+        import sqlite3
+        import tempfile
+
+        test_db_fd, test_db = tempfile.mkstemp(suffix='.sqlite3')
+        os.close(test_db_fd)
+        self.addCleanup(os.remove, test_db)
+        conn = sqlite3.connect(test_db)
+        cur = conn.cursor()
+        cur.execute('''
+                CREATE TABLE test(name VARCHAR(24) PRIMARY KEY,
+                                  age INTEGER NOT NULL)
+                ''')
+        cur.executemany('''
+                INSERT INTO test(name, age)
+                VALUES(:name, :age)
+                ''',
+                rows)
+        conn.commit()
+        conn.close()
+        return test_db
+
+    def test_engine_pool(self):
+        """Checks that engines are reused for the same URL.
+        """
+        url1 = URL(drivername='sqlite', database='/tmp/a.sqlite3')
+        url2 = URL(drivername='sqlite', database='/tmp/b.sqlite3')
+        engine = get_engine(url1)
+        self.assertIs(get_engine(URL(drivername='sqlite',
+                                     database='/tmp/a.sqlite3')),
+                      engine)
+        self.assertIsNot(get_engine(url2), engine)
+
+    def test_connection_released(self):
+        """Checks that the connection is closed when leaving the cache.
+        """
+        from vistrails.core.interpreter.cached import CachedInterpreter
+        from vistrails.tests.utils import execute, intercept_result
+        identifier = 'org.vistrails.vistrails.sql'
+
+        test_db = self.make_test_db([])
+        with intercept_result(DBConnection, 'connection') as connection:
+            self.assertFalse(execute([
+                    ('DBConnection', identifier, [
+                        ('protocol', [('String', 'sqlite')]),
+                        ('db_name', [('String', test_db)]),
+                    ]),
+                ],
+                interpreter=CachedInterpreter.get()))
+        connection, = connection
+        # Kept open while the module is cached
+        self.assertFalse(connection.closed)
+        CachedInterpreter.flush()
+        self.assertTrue(connection.closed)
+
+    def test_fetch_batches(self):
+        """Queries a table in several fetchmany() calls.
+        """
+        import urllib2
+        from vistrails.tests.utils import execute, intercept_result
+        identifier = 'org.vistrails.vistrails.sql'
+
+        test_db = self.make_test_db([{'name': 'p%d' % i, 'age': i}
+                                     for i in xrange(10)])
+        old_fetch_size = SQLSource.FETCH_SIZE
+        SQLSource.FETCH_SIZE = 3
+        try:
+            with intercept_result(SQLSource, 'result') as table:
+                self.assertFalse(execute([
+                        ('DBConnection', identifier, [
+                            ('protocol', [('String', 'sqlite')]),
+                            ('db_name', [('String', test_db)]),
+                        ]),
+                        ('SQLSource', identifier, [
+                            ('source', [('String', urllib2.quote(
+                                "SELECT age, name FROM test ORDER BY age"))]),
+                        ]),
+                    ],
+                    [
+                        (0, 'connection', 1, 'connection'),
+                    ]))
+        finally:
+            SQLSource.FETCH_SIZE = old_fetch_size
+        table, = table
+        self.assertEqual((table.rows, table.columns), (10, 2))
+        self.assertEqual(table.names, ['age', 'name'])
+        self.assertEqual(table.get_column(0), range(10))
+        self.assertEqual(table.get_column(1), ['p%d' % i for i in xrange(10)])
+
+    def test_result_stream(self):
+        """Checks that streams end their transaction, read fully or not.
+        """
+        test_db = self.make_test_db([{'name': 'p%d' % i, 'age': i}
+                                     for i in xrange(5)])
+        engine = get_engine(URL(drivername='sqlite', database=test_db))
+        connection = engine.connect()
+        self.addCleanup(connection.close)
+        def stream():
+            transaction = connection.begin()
+            results = connection.execute(
+                    "SELECT age, name FROM test ORDER BY age")
+            return ResultStream(results, results.fetchmany(2), 2,
+                                transaction)
+
+        tables = list(stream())
+        self.assertEqual([t.rows for t in tables], [2, 2, 1])
+        self.assertEqual(tables[2].get_column(0), [4])
+        self.assertFalse(connection.in_transaction())
+
+        partial = stream()
+        self.assertEqual(partial.next().rows, 2)
+        self.assertTrue(connection.in_transaction())
+        partial.close()
+        self.assertFalse(connection.in_transaction())
+        self.assertRaises(StopIteration, partial.next)
+
+        # Never read
+        stream()
+        self.assertFalse(connection.in_transaction())
+
+    def test_streaming_sqlite3(self):
+        """Streams the result of a query to WriteCSV.
+        """
+        import urllib2
+        from vistrails.packages.tabledata.write.write_csv import WriteCSV
+        from vistrails.tests.utils import execute, intercept_result
+        identifier = 'org.vistrails.vistrails.sql'
+
+        test_db = self.make_test_db([{'name': 'John', 'age': 25},
+                                     {'name': 'Lara', 'age': 21},
+                                     {'name': 'Michael', 'age': 78}])
+        with intercept_result(WriteCSV, 'file') as results:
+            self.assertFalse(execute([
+                    ('DBConnection', identifier, [
+                        ('protocol', [('String', 'sqlite')]),
+                        ('db_name', [('String', test_db)]),
+                    ]),
+                    ('SQLSource', identifier, [
+                        ('source', [('String', urllib2.quote(
+                            "SELECT name, age FROM test ORDER BY age"))]),
+                        ('batch_size', [('Integer', '2')]),
+                    ]),
+                    ('write|WriteCSV', 'org.vistrails.vistrails.tabledata', [
+                    ]),
+                ],
+                [
+                    (0, 'connection', 1, 'connection'),
+                    (1, 'result', 2, 'table'),
+                ]))
+        with open(results[-1].name, 'rb') as fp:
+            self.assertEqual(fp.read(),
+                             'name;age\n'
+                             'Lara;21\n'
+                             'John;25\n'
+                             'Michael;78\n')
@@ -58,11 +58,16 @@ extraction and conversion routines.
 
 from __future__ import division
 
+from vistrails.core.configuration import ConfigurationObject
 from vistrails.core.packagemanager import get_package_manager
 
 from .identifiers import *
 
 
+configuration = ConfigurationObject(csv_cache=False,
+                                    csv_cache_dir=(None, str))
+
+
 def package_dependencies():
     pm = get_package_manager()
     spreadsheet_identifier = 'org.vistrails.vistrails.spreadsheet'
@@ -72,6 +72,39 @@ def get_numpy(required=True):
     return _numpy
 
 
+def object_array(column):
+    """Makes a numpy array of objects from a column.
+
+    Unlike numpy.array(), this doesn't try to turn sequences into additional
+    dimensions, nor to find a common type.
+    """
+    numpy = get_numpy()
+    array = numpy.empty(len(column), dtype=object)
+    try:
+        array[:] = column
+    except ValueError:
+        # Elements are sequences
+        for i, value in enumerate(column):
+            array[i] = value
+    return array
+
+
+def take_rows(column, rows):
+    """Gets the values of a column at the given row indexes.
+
+    If numpy is available, `rows` should be an array of indexes, and this is
+    a vectorized operation. NumPy arrays give NumPy arrays, while other
+    columns are returned as lists.
+    """
+    numpy = get_numpy(False)
+    if numpy is None:
+        return [column[i] for i in rows]
+    elif isinstance(column, numpy.ndarray):
+        return column[rows]
+    else:
+        return object_array(column)[rows].tolist()
+
+
 class InternalModuleError(Exception):
     """Track ModuleError in subclasses."""
 
@@ -153,12 +186,31 @@ class Table(Module):
     _output_ports = [('value', 'Table')]
 
     def set_output(self, port_name, value):
-        if self.list_depth == 0 and value is not None and port_name == 'value':
+        if (self.list_depth <= 0 and port_name == 'value' and
+                isinstance(value, TableObject)):
             if value.name is None:
                 value.name = self.force_get_input('name', None)
         Module.set_output(self, port_name, value)
 
 
+def compute_batches(module):
+    """Runs a table operation on each batch of a streamed table.
+
+    Modules that can work on a table one batch of rows at a time implement
+    compute_batch() and pass this to Module.set_streaming() when their input
+    is a stream; compute_batch() is then called once the values of each batch
+    are set on the module's input ports.
+    """
+    while True:
+        try:
+            module.compute_batch()
+        except ModuleError:
+            raise
+        except Exception, e:
+            raise ModuleError(module, str(e))
+        yield
+
+
 def choose_column(nb_columns, column_names=None, name=None, index=None):
     """Selects a column in a table either by name or index.
 
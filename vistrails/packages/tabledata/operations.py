@@ -35,12 +35,14 @@
 
 from __future__ import division
 
+from itertools import izip
+import operator
 import re
 
-from vistrails.core.modules.vistrails_module import ModuleError
+from vistrails.core.modules.vistrails_module import ModuleError, Streaming
 
 from .common import get_numpy, TableObject, Table, \
-    choose_column, choose_columns
+    choose_column, choose_columns, compute_batches, object_array, take_rows
 
 # FIXME use pandas?
 
@@ -56,7 +58,7 @@ def utf8(obj):
 
 class JoinedTables(TableObject):
     def __init__(self, left_t, right_t, left_key_col, right_key_col,
-                 case_sensitive=False, always_prefix=False):
+                 case_sensitive=False, always_prefix=False, right_keys=None):
         self.left_t = left_t
         self.right_t = right_t
         self.left_key_col = left_key_col
@@ -65,9 +67,9 @@ class JoinedTables(TableObject):
         self.always_prefix = always_prefix
 
         self.build_column_names()
-        self.compute_row_map()
+        self.compute_row_map(right_keys)
         self.column_cache = {}
-        self.rows = len(self.row_map)
+        self.rows = len(self.left_rows)
 
     def build_column_names(self):
         left_name = self.left_t.name
@@ -101,27 +103,31 @@ class JoinedTables(TableObject):
         if (index, numeric) in self.column_cache:
             return self.column_cache[(index, numeric)]
 
-        result = []
         if index < self.left_t.columns:
             column = self.left_t.get_column(index, numeric)
-            for i in xrange(self.left_t.rows):
-                if i in self.row_map:
-                    result.append(column[i])
+            rows = self.left_rows
         else:
             column = self.right_t.get_column(index - self.left_t.columns,
                                              numeric)
-            for i in xrange(self.left_t.rows):
-                if i in self.row_map:
-                    j = self.row_map[i]
-                    result.append(column[j])
+            rows = self.right_rows
 
         numpy = get_numpy(False)
         if numeric and numpy is not None:
-            result = numpy.array(result, dtype=numpy.float32)
+            result = numpy.asarray(column, dtype=numpy.float32)[rows]
+        else:
+            result = take_rows(column, rows)
         self.column_cache[(index, numeric)] = result
         return result
 
-    def compute_row_map(self):
+    def compute_row_map(self, right_keys=None):
+        """Matches the rows of the left table with rows of the right table.
+
+        This sets left_rows and right_rows, the indexes of the rows that go
+        together in the result (as arrays if numpy is available).
+
+        `right_keys` is the index of the right table's keys from a previous
+        join with the same right table, if any; it is kept as right_keys.
+        """
         def build_key_dict(table, key_col):
             column = table.get_column(key_col)
             if self.case_sensitive:
@@ -132,19 +138,31 @@ class JoinedTables(TableObject):
                                 for i, val in enumerate(column))
             return key_dict
 
-        right_keys = build_key_dict(self.right_t, self.right_key_col)
+        if right_keys is None:
+            right_keys = build_key_dict(self.right_t, self.right_key_col)
+        self.right_keys = right_keys
 
-        self.row_map = {}
+        left_rows = []
+        right_rows = []
         for left_row_idx, key in enumerate(
                 self.left_t.get_column(self.left_key_col)):
             key = utf8(key).strip()
             if not self.case_sensitive:
                 key = key.upper()
-            if key in right_keys:
-                self.row_map[left_row_idx] = right_keys[key]
+            right_row_idx = right_keys.get(key)
+            if right_row_idx is not None:
+                left_rows.append(left_row_idx)
+                right_rows.append(right_row_idx)
+
+        numpy = get_numpy(False)
+        if numpy is not None:
+            left_rows = numpy.array(left_rows, dtype=numpy.intp)
+            right_rows = numpy.array(right_rows, dtype=numpy.intp)
+        self.left_rows = left_rows
+        self.right_rows = right_rows
 
 
-class JoinTables(Table):
+class JoinTables(Streaming, Table):
     """Joins data from two tables using equality of a pair of columns.
 
     This creates a table by combining the fields from the two tables. It will
@@ -152,6 +170,9 @@ class JoinTables(Table):
     row from one of the table has a value for the selected field that doesn't
     exist in the other table, that row will not appear in the result
     (*INNER JOIN* semantics).
+
+    The left table can be streamed, in which case each batch is joined with
+    the whole right table.
     """
     _input_ports = [('left_table', 'Table'),
                     ('right_table', 'Table'),
@@ -165,7 +186,17 @@ class JoinTables(Table):
                      {"optional": True, "defaults": str(["False"])})]
     _output_ports = [('value', Table)]
 
+    _right_keys = None
+
     def compute(self):
+        if 'right_table' in self.streamed_ports:
+            raise ModuleError(self, "Only left_table can be streamed")
+        if self.streamed_ports:
+            self.set_streaming(compute_batches)
+        else:
+            self.compute_batch()
+
+    def compute_batch(self):
         left_t = self.get_input('left_table')
         right_t = self.get_input('right_table')
         case_sensitive = self.get_input('case_sensitive')
@@ -189,7 +220,8 @@ class JoinTables(Table):
         right_key_col = get_column_idx(right_t, "right")
 
         table = JoinedTables(left_t, right_t, left_key_col, right_key_col,
-                             case_sensitive, always_prefix)
+                             case_sensitive, always_prefix, self._right_keys)
+        self._right_keys = table.right_keys
         self.set_output('value', table)
 
 
@@ -209,7 +241,7 @@ class ProjectedTable(TableObject):
         return self.table.rows
 
 
-class ProjectTable(Table):
+class ProjectTable(Streaming, Table):
     """Build a table from the columns of another table.
 
     This allows you to restrict, reorder or rename the columns of a table. You
@@ -223,6 +255,12 @@ class ProjectTable(Table):
     _output_ports = [("value", Table)]
 
     def compute(self):
+        if self.streamed_ports:
+            self.set_streaming(compute_batches)
+        else:
+            self.compute_batch()
+
+    def compute_batch(self):
         table = self.get_input("table")
         try:
             indexes = choose_columns(
@@ -255,7 +293,26 @@ class ProjectTable(Table):
         self.set_output("value", projected_table)
 
 
-class SelectFromTable(Table):
+class SelectedTable(TableObject):
+    def __init__(self, table, rows):
+        self.table = table
+        self.row_indexes = rows
+        self.columns = table.columns
+        self.names = table.names
+        self.rows = len(rows)
+        self.column_cache = {}
+
+    def get_column(self, index, numeric=False):
+        if (index, numeric) in self.column_cache:
+            return self.column_cache[(index, numeric)]
+
+        result = take_rows(self.table.get_column(index, numeric),
+                           self.row_indexes)
+        self.column_cache[(index, numeric)] = result
+        return result
+
+
+class SelectFromTable(Streaming, Table):
     """Builds a table from the rows of another table.
 
     This allows you to filter the records in a table according to a condition
@@ -294,7 +351,44 @@ class SelectFromTable(Table):
         else:
             raise ValueError("Invalid comparison operator %r" % comparer)
 
+    @staticmethod
+    def make_mask(column, comparand, comparer):
+        """Evaluates a condition on a whole column, using numpy.
+
+        Returns an array of booleans.
+        """
+        numpy = get_numpy()
+        if isinstance(comparand, float):
+            column = numpy.asarray(column, dtype=numpy.float64)
+        elif comparer != '=~':
+            column = object_array(column)
+        if comparer == '==':
+            return column == comparand
+        elif comparer == '!=':
+            return column != comparand
+        elif comparer == '<':
+            return column < comparand
+        elif comparer == '>':
+            return column > comparand
+        elif comparer == '<=':
+            return column <= comparand
+        elif comparer == '>=':
+            return column >= comparand
+        elif comparer == '=~':
+            regex = re.compile(comparand)
+            return numpy.fromiter((regex.search(v) is not None
+                                   for v in column),
+                                  dtype=bool, count=len(column))
+        else:
+            raise ValueError("Invalid comparison operator %r" % comparer)
+
     def compute(self):
+        if self.streamed_ports:
+            self.set_streaming(compute_batches)
+        else:
+            self.compute_batch()
+
+    def compute_batch(self):
         table = self.get_input('table')
 
         if self.has_input('str_expr'):
@@ -317,17 +411,21 @@ class SelectFromTable(Table):
                                   "No column %d, table only has %d columns" % (
                                   idx, table.columns))
 
-        condition = self.make_condition(comparand, comparer)
         numeric = isinstance(comparand, float)
         column = table.get_column(idx, numeric)
-        matched_rows = [i
-                        for i, col_val in enumerate(column)
-                        if condition(col_val)]
-        columns = []
-        for col in xrange(table.columns):
-            column = table.get_column(col)
-            columns.append([column[row] for row in matched_rows])
-        selected_table = TableObject(columns, len(matched_rows), table.names)
+        numpy = get_numpy(False)
+        try:
+            if numpy is not None:
+                matched_rows = numpy.flatnonzero(
+                        self.make_mask(column, comparand, comparer))
+            else:
+                condition = self.make_condition(comparand, comparer)
+                matched_rows = [i
+                                for i, col_val in enumerate(column)
+                                if condition(col_val)]
+        except ValueError, e:
+            raise ModuleError(self, e.message)
+        selected_table = SelectedTable(table, matched_rows)
         self.set_output('value', selected_table)
 
 
@@ -339,10 +437,37 @@ class AggregatedTable(TableObject):
         self.group_col = group_col
 
         self.build_map()
+        self.aggregated = None
+        self.column_cache = {}
 
     def build_map(self):
+        self.columns = 2
+        if self.table.names is not None:
+            self.names = [self.table.names[self.group_col],
+                          self.table.names[self.col]]
+
+        keys = self.table.get_column(self.group_col)
+        numpy = get_numpy(False)
+        if numpy is not None:
+            try:
+                uniques, first_rows, inverse = numpy.unique(
+                        object_array(keys),
+                        return_index=True, return_inverse=True)
+            except TypeError:
+                pass # Keys can't be sorted
+            else:
+                # Number the groups in the order they first appear
+                order = numpy.argsort(first_rows, kind='mergesort')
+                rank = numpy.empty_like(order)
+                rank[order] = numpy.arange(len(order))
+                self.group_ids = rank[inverse]
+                self.first_rows = first_rows[order]
+                self.rows = len(order)
+                return
+
+        self.group_ids = None
         agg_map = {}
-        for i, val in enumerate(self.table.get_column(self.group_col)):
+        for i, val in enumerate(keys):
             if val in agg_map:
                 agg_map[val].append(i)
             else:
@@ -350,12 +475,55 @@ class AggregatedTable(TableObject):
         self.agg_rows = [(min(rows), rows) for rows in agg_map.itervalues()]
         self.agg_rows.sort()
         self.rows = len(self.agg_rows)
-        self.columns = 2
-        if self.table.names is not None:
-            self.names = [self.table.names[self.group_col],
-                          self.table.names[self.col]]
+
+    def aggregate(self, numpy):
+        """Computes the aggregated column with vectorized group-by operations.
+        """
+        nb_groups = self.rows
+        if self.op == 'count':
+            return numpy.bincount(self.group_ids, minlength=nb_groups)
+        elif self.op not in ('sum', 'average', 'min', 'max'):
+            raise ValueError('Unknown operation: "%s"' % self.op)
+        values = numpy.asarray(self.table.get_column(self.col, True),
+                               dtype=numpy.float64)
+        if self.op in ('sum', 'average'):
+            sums = numpy.bincount(self.group_ids, weights=values,
+                                  minlength=nb_groups)
+            if self.op == 'sum':
+                return sums
+            return sums / numpy.bincount(self.group_ids, minlength=nb_groups)
+        else:
+            # Sort the values by group, then reduce each contiguous run
+            order = numpy.argsort(self.group_ids, kind='mergesort')
+            starts = numpy.searchsorted(self.group_ids[order],
+                                        numpy.arange(nb_groups))
+            if self.op == 'min':
+                return numpy.minimum.reduceat(values[order], starts)
+            else:
+                return numpy.maximum.reduceat(values[order], starts)
 
     def get_column(self, index, numeric=False):
+        if (index, numeric) in self.column_cache:
+            return self.column_cache[(index, numeric)]
+
+        if self.group_ids is not None:
+            if index == 0:
+                col = self.table.get_column(self.group_col, numeric)
+                result = take_rows(col, self.first_rows)
+            else:
+                if self.aggregated is None:
+                    self.aggregated = self.aggregate(get_numpy()).tolist()
+                result = self.aggregated
+        else:
+            result = self.aggregate_rows(index, numeric)
+        self.column_cache[(index, numeric)] = result
+        return result
+
+    def aggregate_rows(self, index, numeric):
+        """Computes a column from the lists of rows of each group.
+
+        This is used when numpy is not available or the keys can't be sorted.
+        """
         def average(value_iter):
             # value_iter can only be used once
             sum = 0
@@ -381,8 +549,73 @@ class AggregatedTable(TableObject):
                 raise ValueError('Unknown operation: "%s"' % self.op)
 
 
-class AggregateColumn(Table):
+class PartialAggregate(object):
+    """Performs a *group by* operation one batch of rows at a time.
+
+    Only the aggregated value of each group is kept between batches.
+    """
+    combiners = {'sum': operator.add,
+                 'count': operator.add,
+                 'average': operator.add,
+                 'min': min,
+                 'max': max}
+
+    def __init__(self, op, col, group_col):
+        if op not in self.combiners:
+            raise ValueError('Unknown operation: "%s"' % op)
+        self.op = op
+        self.col = col
+        self.group_col = group_col
+
+        self.names = None
+        self.keys = []
+        self.groups = {}
+        self.values = []
+        self.counts = []
+
+    def update(self, table):
+        if table.names is not None:
+            self.names = [table.names[self.group_col],
+                          table.names[self.col]]
+
+        if self.op == 'average':
+            batch = AggregatedTable(table, 'sum', self.col, self.group_col)
+            counts = AggregatedTable(table, 'count', self.col,
+                                     self.group_col).get_column(1)
+        else:
+            batch = AggregatedTable(table, self.op, self.col, self.group_col)
+            counts = None
+
+        combine = self.combiners[self.op]
+        for i, (key, value) in enumerate(izip(batch.get_column(0),
+                                              batch.get_column(1))):
+            group = self.groups.get(key)
+            if group is None:
+                self.groups[key] = len(self.keys)
+                self.keys.append(key)
+                self.values.append(value)
+                if counts is not None:
+                    self.counts.append(counts[i])
+            else:
+                self.values[group] = combine(self.values[group], value)
+                if counts is not None:
+                    self.counts[group] += counts[i]
+
+    def get_table(self):
+        if self.op == 'average':
+            values = [value / count
+                      for value, count in izip(self.values, self.counts)]
+        else:
+            values = list(self.values)
+        return TableObject([list(self.keys), values], len(self.keys),
+                           self.names)
+
+
+class AggregateColumn(Streaming, Table):
     """Performs a *group by* operation on a table.
+
+    If the table is streamed, it is aggregated one batch at a time and the
+    result is only output once the whole stream has been read.
     """
     _input_ports = [('table', 'Table'),
                     ('op', 'basic:String',
@@ -394,9 +627,36 @@ class AggregateColumn(Table):
                     ('group_by_index', 'basic:Integer')]
     _output_ports = [('value', 'Table')]
 
+    _partial = None
+
     def compute(self):
+        if self.streamed_ports:
+            self.set_streaming_reduce(AggregateColumn.add_batch,
+                                      AggregateColumn.set_aggregate)
+            return
+
+        table = self.get_input('table')
+        col_idx, gb_idx = self.choose_columns(table)
+        res_table = AggregatedTable(table, self.get_input('op'),
+                                    col_idx, gb_idx)
+        self.set_output('value', res_table)
+
+    def add_batch(self):
         table = self.get_input('table')
-        op = self.get_input('op')
+        if self._partial is None:
+            col_idx, gb_idx = self.choose_columns(table)
+            self._partial = PartialAggregate(self.get_input('op'),
+                                             col_idx, gb_idx)
+        self._partial.update(table)
+
+    def set_aggregate(self):
+        if self._partial is None:
+            # Empty stream
+            self.set_output('value', TableObject([[], []], 0, None))
+        else:
+            self.set_output('value', self._partial.get_table())
+
+    def choose_columns(self, table):
         column_name = self.force_get_input('column_name', None)
         column_index = self.force_get_input('column_index', None)
         col_idx = choose_column(table.columns,
@@ -409,9 +669,7 @@ class AggregateColumn(Table):
                                column_names=table.names,
                                name=group_by_name,
                                index=group_by_index)
-
-        res_table = AggregatedTable(table, op, col_idx, gb_idx)
-        self.set_output('value', res_table)
+        return col_idx, gb_idx
 
 _modules = [JoinTables, ProjectTable, SelectFromTable, AggregateColumn]
 
@@ -736,3 +994,161 @@ class TestAggregate(unittest.TestCase):
                                    ('group_by_index', [('Integer', '2')])])
         self.assertEqual(table.get_column(0, False), ['T', 'F'])
         self.assertEqual(table.get_column(1, True), [-7, 21])
+
+    def test_aggregate_count(self):
+        table = self.do_aggregate([('op', [('String', 'count')]),
+                                   ('column_index', [('Integer', '0')]),
+                                   ('group_by_index', [('Integer', '1')])])
+        self.assertEqual(table.get_column(0, False), ['a', 'b', 'd', 'e'])
+        self.assertEqual(table.get_column(1, True), [3, 2, 1, 1])
+
+    def test_aggregate_max(self):
+        table = self.do_aggregate([('op', [('String', 'max')]),
+                                   ('column_index', [('Integer', '3')]),
+                                   ('group_by_index', [('Integer', '1')])])
+        self.assertEqual(table.get_column(0, False), ['a', 'b', 'd', 'e'])
+        self.assertEqual(table.get_column(1, True), [100, 23, 41, 21])
+
+
+class TestColumnar(unittest.TestCase):
+    """Checks the vectorized operations against row-by-row computations.
+    """
+    def setUp(self):
+        import random
+        rand = random.Random(4)
+        self.keys = [rand.choice(['x', 'y', 'z', 3]) for i in xrange(1000)]
+        self.values = [rand.randint(-50, 50) for i in xrange(1000)]
+        self.table = TableObject([self.keys, self.values], 1000,
+                                 ['key', 'value'])
+
+    def test_select(self):
+        mask = SelectFromTable.make_mask(self.table.get_column(1, True),
+                                         12.0, '<=')
+        selected = SelectedTable(self.table, mask.nonzero()[0])
+        rows = [i for i, v in enumerate(self.values) if v <= 12]
+        self.assertEqual(selected.rows, len(rows))
+        self.assertEqual(selected.get_column(0),
+                         [self.keys[i] for i in rows])
+        self.assertEqual(list(selected.get_column(1, True)),
+                         [self.values[i] for i in rows])
+
+        mask = SelectFromTable.make_mask(self.keys, 'y', '!=')
+        self.assertEqual(list(mask), [k != 'y' for k in self.keys])
+
+    def test_aggregate(self):
+        for op, func in [('sum', sum), ('min', min), ('max', max),
+                         ('count', len)]:
+            table = AggregatedTable(self.table, op, 1, 0)
+            groups = []
+            for key in self.keys:
+                if key not in groups:
+                    groups.append(key)
+            self.assertEqual(table.get_column(0), groups)
+            expected = [func([v for k, v in izip(self.keys, self.values)
+                              if k == key])
+                        for key in groups]
+            self.assertEqual(table.get_column(1), expected)
+            self.assertEqual(table.get_column(1, True), expected)
+            # Columns are computed once
+            self.assertIs(table.get_column(1, True), table.get_column(1))
+
+    def test_partial_aggregate(self):
+        for op in ('sum', 'min', 'max', 'count', 'average'):
+            partial = PartialAggregate(op, 1, 0)
+            for start in xrange(0, 1000, 128):
+                partial.update(TableObject(
+                        [self.keys[start:start + 128],
+                         self.values[start:start + 128]],
+                        len(self.keys[start:start + 128]),
+                        ['key', 'value']))
+            result = partial.get_table()
+            expected = AggregatedTable(self.table, op, 1, 0)
+            self.assertEqual(result.names, ['key', 'value'])
+            self.assertEqual(result.get_column(0), expected.get_column(0))
+            for v1, v2 in izip(result.get_column(1), expected.get_column(1)):
+                self.assertAlmostEqual(v1, v2)
+
+
+class TestStreaming(unittest.TestCase):
+    def test_csv_select_aggregate_write(self):
+        """Streams a CSV file through select and aggregate to a CSV file.
+        """
+        import os
+        import tempfile
+        from .write.write_csv import WriteCSV
+
+        fd, filename = tempfile.mkstemp(suffix='.csv')
+        try:
+            with os.fdopen(fd, 'wb') as fp:
+                fp.write('key,value\n'
+                         'a,1\n'
+                         'b,2\n'
+                         'a,3\n'
+                         'c,-1\n'
+                         'b,5\n'
+                         'a,10\n'
+                         'c,-4\n')
+            with intercept_result(WriteCSV, 'file') as results:
+                self.assertFalse(execute([
+                        ('read|CSVFile', identifier, [
+                            ('file', [('File', filename)]),
+                            ('delimiter', [('String', ',')]),
+                            ('header_present', [('Boolean', 'True')]),
+                            ('batch_size', [('Integer', '2')]),
+                        ]),
+                        ('SelectFromTable', identifier, [
+                            ('float_expr', [('String', 'value'),
+                                            ('String', '>'),
+                                            ('Float', '0')]),
+                        ]),
+                        ('AggregateColumn', identifier, [
+                            ('op', [('String', 'sum')]),
+                            ('column_name', [('String', 'value')]),
+                            ('group_by_name', [('String', 'key')]),
+                        ]),
+                        ('write|WriteCSV', identifier, [
+                            ('delimiter', [('String', ',')]),
+                        ]),
+                    ],
+                    [
+                        (0, 'value', 1, 'table'),
+                        (1, 'value', 2, 'table'),
+                        (2, 'value', 3, 'table'),
+                    ]))
+        finally:
+            os.remove(filename)
+        with open(results[-1].name, 'rb') as fp:
+            self.assertEqual(fp.read(),
+                             'key,value\n'
+                             'a,14.0\n'
+                             'b,7.0\n')
+
+    def test_csv_batches(self):
+        """Streams a CSV file straight to WriteCSV.
+        """
+        import os
+        from .write.write_csv import WriteCSV
+
+        test_file = os.path.join(os.path.dirname(__file__),
+                                 'test_files', 'test.csv')
+        with intercept_result(WriteCSV, 'file') as results:
+            self.assertFalse(execute([
+                    ('read|CSVFile', identifier, [
+                        ('file', [('File', test_file)]),
+                        ('batch_size', [('Integer', '2')]),
+                    ]),
+                    ('ProjectTable', identifier, [
+                        ('column_indexes', [('List', '[2, 0]')]),
+                    ]),
+                    ('write|WriteCSV', identifier, []),
+                ],
+                [
+                    (0, 'value', 1, 'table'),
+                    (1, 'value', 2, 'table'),
+                ]))
+        with open(results[-1].name, 'rb') as fp:
+            self.assertEqual(fp.read(),
+                             'col moutarde;col 1\n'
+                             '4;-1\n'
+                             'not a number;2\n'
+                             '7;6\n')
@@ -36,10 +36,27 @@
 from __future__ import division
 
 import csv
+import errno
+from itertools import islice, izip
+import json
+import mmap
 import operator
+import os
+import shutil
+import tempfile
+
+from vistrails.core import debug
+from vistrails.core.system import current_dot_vistrails
 
 from ..common import get_numpy, TableObject, Table, InternalModuleError
 
+try:
+    import hashlib
+    sha1_hash = hashlib.sha1
+except ImportError:
+    import sha
+    sha1_hash = sha.new
+
 
 def count_lines(fp):
     lines = 0
@@ -48,6 +65,228 @@ def count_lines(fp):
     return lines
 
 
+def transpose_rows(rows, nb_columns, first_row, short):
+    """Turns a list of rows into a list of columns.
+
+    Missing fields are read as empty strings; the first row missing a field is
+    recorded in `short` for each column, as a (line, nb_fields) tuple (lines
+    are counted from 1, after `first_row`).
+    """
+    if min(len(row) for row in rows) >= nb_columns:
+        return zip(*rows)
+    columns = [[] for i in xrange(nb_columns)]
+    for rownb, row in enumerate(rows, first_row + 1):
+        for i in xrange(nb_columns):
+            if i < len(row):
+                columns[i].append(row[i])
+            else:
+                columns[i].append('')
+                short.setdefault(i, (rownb, len(row)))
+    return columns
+
+
+def check_short_rows(short, index):
+    """Raises ValueError if a row is missing column `index`.
+    """
+    if index in short:
+        rownb, nb_fields = short[index]
+        raise ValueError("Invalid CSV file: only %d fields on line %d "
+                         "(column %d requested)" % (nb_fields, rownb, index))
+
+
+def parse_floats(strings):
+    """Converts a list of strings to an array of floats.
+
+    Fields that are not numbers are NaN.
+    """
+    numpy = get_numpy()
+    try:
+        return numpy.array(strings, dtype=bytes).astype(numpy.float32)
+    except ValueError:
+        array = numpy.empty(len(strings), dtype=numpy.float32)
+        for i, value in enumerate(strings):
+            try:
+                array[i] = float(value)
+            except ValueError:
+                array[i] = numpy.nan
+        return array
+
+
+class CSVColumnCache(object):
+    """On-disk cache of the columns of a CSV file.
+
+    The file is parsed once, in chunks of rows, and the fields of each column
+    are stored in a directory: concatenated in a 'colN.str' file, with their
+    offsets in a 'colN.off.npy' array. Numeric versions of the columns are
+    converted from these on first use and stored as 'colN.num.npy'.
+    Everything is memory-mapped when read.
+
+    The directory is keyed by the file's path, size and modification time,
+    and the parameters used to read it, so it can be reused across modules
+    and sessions. Entries for older versions of the same file are removed;
+    entries for the same version read with other parameters are kept.
+    """
+    CHUNK_ROWS = 65536
+
+    def __init__(self, directory, filename, skip_lines, columns,
+                 make_reader, reader_key):
+        self.filename = filename
+        self.skip_lines = skip_lines
+        self.columns = columns
+        self.make_reader = make_reader
+
+        stat = os.stat(filename)
+        path_key = sha1_hash(os.path.abspath(filename)).hexdigest()
+        self.stamp = sha1_hash(repr((stat.st_size,
+                                     stat.st_mtime))).hexdigest()
+        params_key = sha1_hash(repr((skip_lines, columns,
+                                     reader_key))).hexdigest()
+        self.parent = os.path.join(directory, path_key)
+        self.directory = os.path.join(self.parent,
+                                      '%s_%s' % (self.stamp, params_key))
+
+        self.meta = self._load_meta()
+        if self.meta is None:
+            self._build()
+            self.meta = self._load_meta()
+
+    @property
+    def rows(self):
+        return self.meta['rows']
+
+    def _load_meta(self):
+        try:
+            with open(os.path.join(self.directory, 'meta.json'), 'rb') as fp:
+                meta = json.load(fp)
+        except (IOError, ValueError):
+            return None
+        meta['short'] = dict((int(k), v)
+                             for k, v in meta['short'].iteritems())
+        return meta
+
+    def _build(self):
+        numpy = get_numpy()
+        if not os.path.isdir(self.parent):
+            try:
+                os.makedirs(self.parent)
+            except OSError, e:
+                if e.errno != errno.EEXIST:
+                    raise
+        tmpdir = tempfile.mkdtemp(prefix='.tmp', dir=self.parent)
+        try:
+            blobs = [open(os.path.join(tmpdir, 'col%d.str' % i), 'wb')
+                     for i in xrange(self.columns)]
+            lengths = [[] for i in xrange(self.columns)]
+            short = {}  # column -> (line, nb fields) of first short row
+            rows = 0
+            try:
+                with open(self.filename, 'rb') as fp:
+                    for i in xrange(self.skip_lines):
+                        if not fp.readline():
+                            raise ValueError("skip_lines greater than the "
+                                             "number of lines in the file")
+                    reader = self.make_reader(fp)
+                    while True:
+                        chunk = list(islice(reader, self.CHUNK_ROWS))
+                        if not chunk:
+                            break
+                        columns = transpose_rows(chunk, self.columns, rows,
+                                                 short)
+                        for i in xrange(self.columns):
+                            blobs[i].write(''.join(columns[i]))
+                            lengths[i].append(numpy.fromiter(
+                                    (len(v) for v in columns[i]),
+                                    dtype=numpy.int64,
+                                    count=len(chunk)))
+                        rows += len(chunk)
+            finally:
+                for blob in blobs:
+                    blob.close()
+
+            for i in xrange(self.columns):
+                offsets = numpy.zeros(rows + 1, dtype=numpy.int64)
+                if rows:
+                    numpy.cumsum(numpy.concatenate(lengths[i]),
+                                 out=offsets[1:])
+                numpy.save(os.path.join(tmpdir, 'col%d.off.npy' % i),
+                           offsets)
+            with open(os.path.join(tmpdir, 'meta.json'), 'wb') as fp:
+                json.dump({'rows': rows, 'columns': self.columns,
+                           'short': dict((str(k), v)
+                                         for k, v in short.iteritems())},
+                          fp)
+
+            # Remove the entries for previous versions of this file
+            for entry in os.listdir(self.parent):
+                if not (entry.startswith('.tmp') or
+                        entry.startswith(self.stamp + '_')):
+                    shutil.rmtree(os.path.join(self.parent, entry), True)
+            try:
+                os.rename(tmpdir, self.directory)
+            except OSError:
+                # Another process built it at the same time
+                if self._load_meta() is None:
+                    raise
+        finally:
+            if os.path.exists(tmpdir):
+                shutil.rmtree(tmpdir, True)
+
+    def get_strings(self, index):
+        """Gets a column as a list of strings.
+        """
+        numpy = get_numpy()
+        check_short_rows(self.meta['short'], index)
+        offsets = numpy.load(os.path.join(self.directory,
+                                          'col%d.off.npy' % index),
+                             mmap_mode='r').tolist()
+        if not offsets[-1]:
+            return [''] * self.rows
+        with open(os.path.join(self.directory, 'col%d.str' % index),
+                  'rb') as fp:
+            blob = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return [blob[start:end]
+                    for start, end in izip(offsets[:-1], offsets[1:])]
+        finally:
+            blob.close()
+
+    def get_numeric(self, index):
+        """Gets a column as a read-only array of floats, memory-mapped.
+
+        Fields that are not numbers are NaN.
+        """
+        numpy = get_numpy()
+        filename = os.path.join(self.directory, 'col%d.num.npy' % index)
+        if not os.path.exists(filename):
+            array = parse_floats(self.get_strings(index))
+            fd, tmpname = tempfile.mkstemp(prefix='.tmp', suffix='.npy',
+                                           dir=self.directory)
+            try:
+                with os.fdopen(fd, 'wb') as fp:
+                    numpy.save(fp, array)
+                if os.path.exists(filename):
+                    os.unlink(filename)
+                os.rename(tmpname, filename)
+            except:
+                os.unlink(tmpname)
+                raise
+        if not self.rows:
+            # Can't memory-map an empty array
+            return numpy.load(filename)
+        return numpy.load(filename, mmap_mode='r')
+
+
+def get_csv_cache_directory():
+    """Returns the directory where CSV columns are cached, or None.
+    """
+    from .. import configuration
+    if not configuration.check('csv_cache'):
+        return None
+    if configuration.check('csv_cache_dir'):
+        return configuration.csv_cache_dir
+    return os.path.join(current_dot_vistrails(), 'tabledata_cache')
+
+
 # FIXME : test coverage for CSVTable
 class CSVTable(TableObject):
     def __init__(self, csv_file, header_present, delimiter,
@@ -68,6 +307,40 @@ class CSVTable(TableObject):
             self.skip_lines += 1
 
         self.column_cache = {}
+        self._disk_cache = False
+
+    def make_reader(self, fp):
+        if self.dialect is not None:
+            return csv.reader(fp, dialect=self.dialect)
+        else:
+            return csv.reader(fp, delimiter=self.delimiter)
+
+    def get_disk_cache(self):
+        """Returns the CSVColumnCache for this file, or None.
+
+        The cache is only used if numpy is available and it is enabled in the
+        package's configuration.
+        """
+        if self._disk_cache is not False:
+            return self._disk_cache
+        self._disk_cache = None
+        directory = get_csv_cache_directory()
+        if directory is not None and get_numpy(False) is not None:
+            dialect = self.dialect
+            if dialect is not None and not isinstance(dialect, basestring):
+                dialect = tuple(getattr(dialect, attr, None)
+                                for attr in ('delimiter', 'quotechar',
+                                             'doublequote', 'escapechar',
+                                             'skipinitialspace', 'quoting'))
+            try:
+                self._disk_cache = CSVColumnCache(
+                        directory, self.filename, self.skip_lines,
+                        self.columns, self.make_reader,
+                        (self.delimiter, dialect))
+            except (IOError, OSError), e:
+                debug.warning("Couldn't cache CSV file %s" % self.filename,
+                              e)
+        return self._disk_cache
 
     @staticmethod
     def read_file(filename, delimiter=None, header_present=True,
@@ -125,6 +398,27 @@ class CSVTable(TableObject):
         if (index, numeric) in self.column_cache:
             return self.column_cache[(index, numeric)]
 
+        cache = self.get_disk_cache()
+        result = None
+        if cache is not None:
+            try:
+                if numeric:
+                    result = cache.get_numeric(index)
+                else:
+                    result = cache.get_strings(index)
+            except (IOError, OSError), e:
+                # The cache was removed or can't be written to
+                debug.warning("Couldn't read CSV file %s from cache" %
+                              self.filename, e)
+                self._disk_cache = None
+                cache = None
+        if cache is None:
+            result = self._read_column(index, numeric)
+
+        self.column_cache[(index, numeric)] = result
+        return result
+
+    def _read_column(self, index, numeric):
         numpy = get_numpy(False)
 
         if numeric and numpy is not None:
@@ -141,10 +435,7 @@ class CSVTable(TableObject):
                     if not line:
                         raise ValueError("skip_lines greater than the number "
                                          "of lines in the file")
-                if self.dialect is not None:
-                    reader = csv.reader(fp, dialect=self.dialect)
-                else:
-                    reader = csv.reader(fp, delimiter=self.delimiter)
+                reader = self.make_reader(fp)
 
                 getter = operator.itemgetter(index)
                 try:
@@ -157,20 +448,65 @@ class CSVTable(TableObject):
                                          len(row), rownb, index))
             if numeric:
                 result = [float(e) for e in result]
-
-        self.column_cache[(index, numeric)] = result
         return result
 
+    def iter_batches(self, batch_size):
+        """Reads the file in batches of `batch_size` rows.
+
+        This yields a CSVBatch table for each batch, in a single pass over the
+        file; only the current batch is held in memory.
+        """
+        with open(self.filename, 'rb') as fp:
+            for i in xrange(self.skip_lines):
+                line = fp.readline()
+                if not line:
+                    raise ValueError("skip_lines greater than the number "
+                                     "of lines in the file")
+            reader = self.make_reader(fp)
+            first_row = 0
+            while True:
+                rows = list(islice(reader, batch_size))
+                if not rows:
+                    break
+                short = {}
+                columns = transpose_rows(rows, self.columns, first_row, short)
+                yield CSVBatch([list(columns[i])
+                                for i in xrange(self.columns)],
+                               len(rows), self.names, short)
+                first_row += len(rows)
+
     @property
     def rows(self):
         if self._rows is not None:
             return self._rows
+        cache = self.get_disk_cache()
+        if cache is not None:
+            self._rows = cache.rows
+            return self._rows
         with open(self.filename, 'rb') as fp:
             self._rows = count_lines(fp)
         self._rows -= self.skip_lines
         return self._rows
 
 
+class CSVBatch(TableObject):
+    """A batch of rows from a CSV file, see CSVTable.iter_batches().
+    """
+    def __init__(self, columns, nb_rows, names, short):
+        TableObject.__init__(self, columns, nb_rows, names)
+        self.short = short
+
+    def get_column(self, index, numeric=False):
+        check_short_rows(self.short, index)
+        column = self._columns[index]
+        if not numeric:
+            return column
+        elif get_numpy(False) is not None:
+            return parse_floats(column)
+        else:
+            return [float(e) for e in column]
+
+
 class CSVFile(Table):
     """Reads a table from a CSV file.
 
@@ -178,6 +514,9 @@ class CSVFile(Table):
     able to guess the actual format of the file in most cases, or you can use
     the `delimiter`, `header_present` and `skip_lines` ports to force how the
     file will be read.
+
+    If `batch_size` is set, the file is not loaded at once; the table is
+    streamed to downstream modules as batches of that many rows instead.
     """
     _input_ports = [
             ('file', '(org.vistrails.vistrails.basic:File)'),
@@ -190,6 +529,8 @@ class CSVFile(Table):
             ('skip_lines', '(org.vistrails.vistrails.basic:Integer)',
              {'optional': True, 'defaults': "['0']"}),
             ('dialect', '(org.vistrails.vistrails.basic:String)',
+             {'optional': True}),
+            ('batch_size', '(org.vistrails.vistrails.basic:Integer)',
              {'optional': True})]
     _output_ports = [
             ('column_count', '(org.vistrails.vistrails.basic:Integer)'),
@@ -212,7 +553,12 @@ class CSVFile(Table):
 
         self.set_output('column_count', table.columns)
         self.set_output('column_names', table.names)
-        self.set_output('value', table)
+        batch_size = self.force_get_input('batch_size', None)
+        if batch_size:
+            self.set_streaming_output('value',
+                                      table.iter_batches(batch_size))
+        else:
+            self.set_output('value', table)
 
 
 _modules = [CSVFile]
@@ -338,3 +684,97 @@ class TestCountlines(unittest.TestCase):
         # Single newline
         fp = StringIO("\n")
         self.assertEqual(count_lines(fp), 1)
+
+
+class TestCSVColumnCache(unittest.TestCase):
+    def setUp(self):
+        import copy
+        from ... import tabledata
+        self.package = tabledata
+        self._old_configuration = tabledata.configuration
+        self.configuration = copy.copy(tabledata.configuration)
+        tabledata.configuration = self.configuration
+        self._tmp = tempfile.mkdtemp(prefix='vt_csv_')
+        self.configuration.csv_cache = True
+        self.configuration.csv_cache_dir = os.path.join(self._tmp, 'cache')
+        self.filename = os.path.join(self._tmp, 'table.csv')
+        with open(self.filename, 'wb') as fp:
+            fp.write('a,b,c\n'
+                     '1,x,2.5\n'
+                     '2,"y,z",nan\n'
+                     '3,,x\n'
+                     '4\n')
+
+    def tearDown(self):
+        self.package.configuration = self._old_configuration
+        shutil.rmtree(self._tmp)
+
+    def test_read(self):
+        table = CSVTable(self.filename, True, ',')
+        self.assertIsNotNone(table.get_disk_cache())
+        self.assertEqual(table.rows, 4)
+        self.assertEqual(table.names, ['a', 'b', 'c'])
+        self.assertEqual(list(table.get_column(0, True)), [1, 2, 3, 4])
+        self.assertEqual(table.get_column(0), ['1', '2', '3', '4'])
+        with self.assertRaises(ValueError) as cm:
+            table.get_column(1)
+        self.assertIn("only 1 fields on line 4", cm.exception.args[0])
+
+        # Same results without the cache
+        self.configuration.csv_cache = False
+        nocache = CSVTable(self.filename, True, ',')
+        self.assertIsNone(nocache.get_disk_cache())
+        self.assertEqual(nocache.rows, 4)
+        self.assertEqual(nocache.get_column(0), ['1', '2', '3', '4'])
+
+    def test_reuse(self):
+        """Checks that the cache is reused, unless the file changes.
+        """
+        table = CSVTable(self.filename, True, ',')
+        self.assertEqual(table.rows, 4)
+        orig_build = CSVColumnCache._build
+        builds = []
+        def build(cache):
+            builds.append(cache.filename)
+            orig_build(cache)
+        CSVColumnCache._build = build
+        try:
+            table = CSVTable(self.filename, True, ',')
+            self.assertEqual(table.rows, 4)
+            self.assertEqual(builds, [])
+            self.assertEqual(table.get_column(0), ['1', '2', '3', '4'])
+
+            # Different parameters get their own cache
+            table = CSVTable(self.filename, False, ',', skip_lines=3)
+            self.assertEqual(table.get_column(0), ['3', '4'])
+            self.assertEqual(builds, [self.filename])
+            table = CSVTable(self.filename, True, ',')
+            self.assertEqual(table.get_column(0), ['1', '2', '3', '4'])
+            self.assertEqual(builds, [self.filename])
+
+            with open(self.filename, 'wb') as fp:
+                fp.write('a;b\n'
+                         'u;1\n'
+                         'v;2e3\n')
+            os.utime(self.filename, (0, 0))
+            table = CSVTable(self.filename, True, ';')
+            self.assertEqual(table.get_column(0), ['u', 'v'])
+            self.assertEqual(list(table.get_column(1, True)), [1.0, 2000.0])
+            self.assertEqual(len(builds), 2)
+        finally:
+            CSVColumnCache._build = orig_build
+        # Old entries were removed
+        cache_dir = self.configuration.csv_cache_dir
+        self.assertEqual(len(os.listdir(os.path.join(cache_dir,
+                                                     os.listdir(cache_dir)[0]))),
+                         1)
+
+    def test_cache_removed(self):
+        """Checks that the file is read directly if the cache goes away.
+        """
+        table = CSVTable(self.filename, True, ',')
+        self.assertIsNotNone(table.get_disk_cache())
+        self.assertEqual(table.get_column(0), ['1', '2', '3', '4'])
+        shutil.rmtree(self.configuration.csv_cache_dir)
+        self.assertEqual(list(table.get_column(0, True)), [1, 2, 3, 4])
+        self.assertIsNone(table.get_disk_cache())
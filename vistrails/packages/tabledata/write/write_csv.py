@@ -38,17 +38,20 @@ from __future__ import division
 from itertools import izip
 
 from vistrails.core import debug
-from vistrails.core.modules.vistrails_module import Module, ModuleError
+from vistrails.core.modules.vistrails_module import Module, ModuleError, \
+    Streaming
 
 from ..common import Table
 
 
-class WriteCSV(Module):
+class WriteCSV(Streaming, Module):
     """Writes a table to a CSV file.
 
     You can use the 'delimiter' and 'write_header' ports to choose the format
     you want. By default, the file will include a single-line header if the
     table has column names, and will use semicolon separators (`;`).
+
+    If the table is streamed, each batch is appended to the file as it comes.
     """
     _input_ports = [
             ('table', Table),
@@ -58,11 +61,13 @@ class WriteCSV(Module):
              {'optional': True})]
     _output_ports = [('file', '(org.vistrails.vistrails.basic:File)')]
 
+    _fileobj = None
+
     @staticmethod
-    def write(fname, table, delimiter=';', write_header=True):
+    def write(fname, table, delimiter=';', write_header=True, mode='w'):
         cols = [table.get_column(i) for i in xrange(table.columns)]
 
-        with open(fname, 'w') as fp:
+        with open(fname, mode) as fp:
             if write_header and table.names is not None:
                 fp.write(delimiter.join(table.names) + '\n')
 
@@ -73,36 +78,64 @@ class WriteCSV(Module):
 
         return line
 
+    def check_table(self, table):
+        """Checks that the table can be written, returns write_header.
+        """
+        write_header = self.force_get_input('write_header')
+        if write_header is not False:
+            if table.names is None:
+                if write_header is True:  # pragma: no cover
+                    raise ModuleError(
+                            self,
+                            "write_header is set but the table doesn't "
+                            "have column names")
+
+        if not table.columns:
+            raise ModuleError(
+                    self,
+                    "Table has no columns")
+
+        return write_header is not False
+
+    def write_table(self, table, fileobj, write_header, mode='w'):
+        nb_lines = self.write(fileobj.name, table,
+                              self.get_input('delimiter'),
+                              write_header, mode)
+
+        rows = table.rows
+        if nb_lines != rows:  # pragma: no cover
+            debug.warning("WriteCSV wrote %d lines instead of expected "
+                          "%d" % (nb_lines, rows))
+
     def compute(self):
+        if self.streamed_ports:
+            self.set_streaming_reduce(WriteCSV.write_batch,
+                                      WriteCSV.set_file)
+            return
+
         table = self.get_input('table')
-        delimiter = self.get_input('delimiter')
+        write_header = self.check_table(table)
         fileobj = self.interpreter.filePool.create_file(suffix='.csv')
-        fname = fileobj.name
-
-        with open(fname, 'w') as fp:
-            write_header = self.force_get_input('write_header')
-            if write_header is not False:
-                if table.names is None:
-                    if write_header is True:  # pragma: no cover
-                        raise ModuleError(
-                                self,
-                                "write_header is set but the table doesn't "
-                                "have column names")
-
-            if not table.columns:
-                raise ModuleError(
-                        self,
-                        "Table has no columns")
-
-            nb_lines = self.write(fname, table, delimiter,
-                                  write_header is not False)
-
-            rows = table.rows
-            if nb_lines != rows:  # pragma: no cover
-                debug.warning("WriteCSV wrote %d lines instead of expected "
-                              "%d" % (nb_lines, rows))
-
+        self.write_table(table, fileobj, write_header)
         self.set_output('file', fileobj)
 
+    def write_batch(self):
+        table = self.get_input('table')
+        if self._fileobj is None:
+            write_header = self.check_table(table)
+            self._fileobj = self.interpreter.filePool.create_file(
+                    suffix='.csv')
+            self.write_table(table, self._fileobj, write_header)
+        else:
+            self.write_table(table, self._fileobj, False, 'a')
+
+    def set_file(self):
+        if self._fileobj is None:
+            # Empty stream
+            self._fileobj = self.interpreter.filePool.create_file(
+                    suffix='.csv')
+            open(self._fileobj.name, 'w').close()
+        self.set_output('file', self._fileobj)
+
 
 _modules = [WriteCSV]
@@ -37,7 +37,8 @@ from __future__ import division
 
 from vistrails.core.bundles.pyimport import py_import
 from vistrails.core import debug
-from vistrails.core.modules.vistrails_module import Module, ModuleError
+from vistrails.core.modules.vistrails_module import Module, ModuleError, \
+    Streaming
 
 from ..common import Table
 
@@ -54,35 +55,60 @@ def get_xlwt():
         return None
 
 
-class WriteExcelSpreadsheet(Module):
+class WriteExcelSpreadsheet(Streaming, Module):
     """Writes a table to an Excel spreadsheet file.
+
+    If the table is streamed, the rows of each batch are added to the sheet
+    as they come.
     """
     _input_ports = [('table', Table)]
     _output_ports = [('file', '(org.vistrails.vistrails.basic:File)')]
 
+    _workbook = None
+    _sheet = None
+    _next_row = 0
+
     def compute(self):
-        table = self.get_input('table')
-        rows = table.rows
+        # Each execution writes a new file
+        self._workbook = None
+        self._sheet = None
+        self._next_row = 0
+        if self.streamed_ports:
+            self.set_streaming_reduce(WriteExcelSpreadsheet.write_batch,
+                                      WriteExcelSpreadsheet.save)
+        else:
+            self.write_batch()
+            self.save()
 
-        xlwt = get_xlwt()
-        if xlwt is None: # pragma: no cover
-            raise ModuleError(self, "xlwt is not available")
+    def get_sheet(self):
+        if self._workbook is None:
+            xlwt = get_xlwt()
+            if xlwt is None: # pragma: no cover
+                raise ModuleError(self, "xlwt is not available")
 
-        workbook = xlwt.Workbook()
-        sheet = workbook.add_sheet('Sheet1')
+            self._workbook = xlwt.Workbook()
+            self._sheet = self._workbook.add_sheet('Sheet1')
+        return self._sheet
 
-        fileobj = self.interpreter.filePool.create_file(suffix='.xls')
-        fname = fileobj.name
+    def write_batch(self):
+        table = self.get_input('table')
+        rows = table.rows
+        sheet = self.get_sheet()
 
         for c in xrange(table.columns):
             column = table.get_column(c)
+            r = -1
             for r, e in enumerate(column):
-                sheet.write(r, c, e)
+                sheet.write(self._next_row + r, c, e)
             if r+1 != rows: # pragma: no cover
                 debug.warning("WriteExcelSpreadsheet wrote %d lines instead "
                               "of expected %d" % (r, rows))
+        self._next_row += rows
 
-        workbook.save(fname)
+    def save(self):
+        self.get_sheet()
+        fileobj = self.interpreter.filePool.create_file(suffix='.xls')
+        self._workbook.save(fileobj.name)
         self.set_output('file', fileobj)
 
 
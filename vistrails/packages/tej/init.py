@@ -231,6 +231,22 @@ class RemoteJob(object):
             return True
         return status == tej.RemoteQueue.JOB_DONE
 
+    def batch_key(self):
+        # Queues are shared through QueueCache
+        return self.queue
+
+    def finished_batch(self, handles):
+        """Checks several jobs of this queue with a single connection.
+        """
+        with ServerLogger.hide_output():
+            statuses = dict((job_id, info.get('status'))
+                            for job_id, info in self.queue.list())
+        # Jobs that are not found are done, like in finished()
+        return [statuses.get(handle.job_id,
+                             tej.RemoteQueue.JOB_DONE) ==
+                    tej.RemoteQueue.JOB_DONE
+                for handle in handles]
+
 
 class Job(Module):
     """A reference to a job in a queue.
@@ -73,7 +73,8 @@ def enable_package(identifier):
 
 
 def execute(modules, connections=[], add_port_specs=[],
-            enable_pkg=True, full_results=False):
+            enable_pkg=True, full_results=False, interpreter=None,
+            control_params=[], **kwargs):
     """Build a pipeline and execute it.
 
     This is useful to simply build a pipeline in a test case, and run it. When
@@ -106,6 +107,16 @@ def execute(modules, connections=[], add_port_specs=[],
     It is useful to test modules that can have custom ports through a
     configuration widget.
 
+    control_params is a list of control parameters to set on modules, with
+    the following format:
+        [
+            (mod_id, 'name', 'value'),
+        ]
+
+    interpreter is the interpreter to run the pipeline with; the non-cached
+    interpreter is used by default. Additional keyword arguments are passed on
+    to the interpreter's execute() method.
+
     The function returns the 'errors' dict it gets from the interpreter, so you
     should use a construct like self.assertFalse(execute(...)) if the execution
     is not supposed to fail.
@@ -135,6 +146,8 @@ def execute(modules, connections=[], add_port_specs=[],
     from vistrails.core.utils import DummyView
     from vistrails.core.vistrail.connection import Connection
     from vistrails.core.vistrail.module import Module
+    from vistrails.core.vistrail.module_control_param import \
+        ModuleControlParam
     from vistrails.core.vistrail.module_function import ModuleFunction
     from vistrails.core.vistrail.module_param import ModuleParam
     from vistrails.core.vistrail.pipeline import Pipeline
@@ -158,6 +171,10 @@ def execute(modules, connections=[], add_port_specs=[],
             j += 1
         mod_specs.append(ps)
 
+    control_params_per_module = {} # mod_id -> [(name, value)]
+    for mod_id, name, value in control_params:
+        control_params_per_module.setdefault(mod_id, []).append((name, value))
+
     pipeline = Pipeline()
     module_list = []
     for i, (name, identifier, functions) in enumerate(modules):
@@ -192,6 +209,11 @@ def execute(modules, connections=[], add_port_specs=[],
                         functions=function_list)
         for port_spec in port_spec_per_module.get(i, []):
             module.add_port_spec(port_spec)
+        for j, (cp_name, cp_value) in enumerate(
+                control_params_per_module.get(i, [])):
+            module.add_control_parameter(ModuleControlParam(id=j,
+                                                            name=cp_name,
+                                                            value=cp_value))
         pipeline.add_module(module)
         module_list.append(module)
 
@@ -213,12 +235,14 @@ def execute(modules, connections=[], add_port_specs=[],
                          signature=d_sig),
                 ]))
 
-    interpreter = Interpreter.get()
+    if interpreter is None:
+        interpreter = Interpreter.get()
     result = interpreter.execute(
             pipeline,
             locator=XMLFileLocator('foo.xml'),
             current_version=1,
-            view=DummyView())
+            view=DummyView(),
+            **kwargs)
     if full_results:
         return result
     else: